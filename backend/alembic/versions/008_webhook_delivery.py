@@ -0,0 +1,65 @@
+"""Add webhook batching opt-in and dead-letter queue.
+
+Revision ID: 008_webhook_delivery
+Revises: 007_health_scores
+Create Date: 2026-10-18
+
+Receivers can opt in to coalesced (batched) event payloads, and deliveries
+that exhaust their retries are kept in webhook_dead_letters for replay.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "008_webhook_delivery"
+down_revision: str | None = "007_health_scores"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "webhook_integrations",
+        sa.Column("batch_events", sa.Boolean(), nullable=False, server_default="false"),
+    )
+
+    op.create_table(
+        "webhook_dead_letters",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("webhook_id", postgresql.UUID(as_uuid=True), nullable=False, index=True),
+        sa.Column("event_type", sa.String(100), server_default=""),
+        sa.Column("payload", postgresql.JSONB(), server_default="{}"),
+        sa.Column("error", sa.Text(), server_default=""),
+        sa.Column("status_code", sa.Integer(), server_default="0"),
+        sa.Column("attempts", sa.Integer(), server_default="1"),
+        sa.Column("replayed_at", sa.DateTime(timezone=True)),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+
+    # Pending entries are replayed oldest-first per webhook
+    op.create_index(
+        "ix_webhook_dead_letters_pending",
+        "webhook_dead_letters",
+        ["webhook_id", "created_at"],
+        postgresql_where=sa.text("replayed_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_dead_letters_pending", table_name="webhook_dead_letters")
+    op.drop_table("webhook_dead_letters")
+    op.drop_column("webhook_integrations", "batch_events")
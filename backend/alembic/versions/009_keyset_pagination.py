@@ -0,0 +1,101 @@
+"""Add composite indexes backing keyset pagination.
+
+Revision ID: 009_keyset_pagination
+Revises: 008_webhook_delivery
+Create Date: 2026-10-18
+
+List endpoints page by ``(sort key, id)`` cursors instead of OFFSET. Each
+index below leads with the listing's equality filters and ends with its
+ordering, so ``WHERE ... AND (created_at, id) < (:ts, :id)`` is a single
+range scan however deep the page. Indexes are built CONCURRENTLY because
+audit_trails holds millions of rows in production.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "009_keyset_pagination"
+down_revision: str | None = "008_webhook_delivery"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+# (name, table, columns, partial-index predicate)
+INDEXES: list[tuple[str, str, list, str | None]] = [
+    (
+        "ix_audit_trails_org_created_id",
+        "audit_trails",
+        ["organization_id", "created_at", "id"],
+        None,
+    ),
+    (
+        "ix_audit_trails_org_event_created_id",
+        "audit_trails",
+        ["organization_id", "event_type", "created_at", "id"],
+        None,
+    ),
+    (
+        "ix_compliance_actions_org_created_id",
+        "compliance_actions",
+        ["organization_id", "created_at", "id"],
+        None,
+    ),
+    ("ix_codebase_mappings_created_id", "codebase_mappings", ["created_at", "id"], None),
+    ("ix_requirements_created_id", "requirements", ["created_at", "id"], None),
+    (
+        "ix_requirements_regulation_created_id",
+        "requirements",
+        ["regulation_id", "created_at", "id"],
+        None,
+    ),
+    (
+        "ix_regulations_effective_id",
+        "regulations",
+        [sa.text("effective_date DESC NULLS LAST"), sa.text("id DESC")],
+        None,
+    ),
+    (
+        "ix_repositories_profile_name_id",
+        "repositories",
+        ["customer_profile_id", "full_name", "id"],
+        None,
+    ),
+    (
+        "ix_webhook_integrations_active_created_id",
+        "webhook_integrations",
+        ["created_at", "id"],
+        "active",
+    ),
+    (
+        "ix_webhook_dead_letters_pending_created_id",
+        "webhook_dead_letters",
+        ["created_at", "id"],
+        "replayed_at IS NULL",
+    ),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _columns, _where in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
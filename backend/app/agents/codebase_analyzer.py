@@ -39,6 +39,7 @@ class CodebaseAnalyzer:
         self,
         repository: Repository,
         requirements: list[Requirement],
+        sample_files: dict[str, str] | None = None,
     ) -> list[CodebaseMapping]:
         """Analyze a repository against a set of regulatory requirements.
 
@@ -48,6 +49,7 @@ class CodebaseAnalyzer:
         Args:
             repository: The repository to analyze, including its structure cache and metadata.
             requirements: List of regulatory requirements to map against the codebase.
+            sample_files: Contents of compliance-relevant files, by path, shown to the model.
 
         Returns:
             List of CodebaseMapping objects, one per requirement, containing gap analysis,
@@ -69,13 +71,14 @@ class CodebaseAnalyzer:
 
             mappings = []
 
-            # Get codebase structure (would come from GitHub API in real implementation)
             codebase_structure = repository.structure_cache or {}
             structure_text = self._format_structure(codebase_structure)
 
             async with self._copilot:
                 for requirement in requirements:
-                    mapping = await self._map_requirement(repository, requirement, structure_text)
+                    mapping = await self._map_requirement(
+                        repository, requirement, structure_text, sample_files or {}
+                    )
                     mappings.append(mapping)
 
             await self.db.flush()
@@ -88,6 +91,7 @@ class CodebaseAnalyzer:
         repository: Repository,
         requirement: Requirement,
         structure_text: str,
+        sample_files: dict[str, str],
     ) -> CodebaseMapping:
         """Map a single regulatory requirement to the codebase and persist the result.
 
@@ -98,6 +102,7 @@ class CodebaseAnalyzer:
             repository: The target repository being analyzed.
             requirement: The specific regulatory requirement to map.
             structure_text: Pre-formatted text representation of the codebase structure.
+            sample_files: Contents of compliance-relevant files, by path.
 
         Returns:
             A CodebaseMapping with compliance status, gaps, and affected files.
@@ -119,7 +124,7 @@ class CodebaseAnalyzer:
                     "processes": requirement.processes,
                 },
                 codebase_structure=structure_text,
-                sample_files={},  # Would fetch from GitHub
+                sample_files=sample_files,
                 languages=repository.languages,
             )
 
@@ -3,6 +3,7 @@
 import asyncio
 import json
 import time
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
@@ -24,6 +25,7 @@ from app.core.exceptions import (
     CopilotRateLimitError,
     CopilotTimeoutError,
 )
+from app.core.http import get_shared_http_transport
 from app.core.metrics import get_metrics
 
 
@@ -184,8 +186,11 @@ class CopilotClient:
         self.timeout = timeout or settings.copilot_timeout_seconds
         self.max_retries = max_retries or settings.copilot_max_retries
         self._client: httpx.AsyncClient | None = None
+        self._owns_transport = True
 
     async def __aenter__(self):
+        transport = get_shared_http_transport()
+        self._owns_transport = transport is None
         self._client = httpx.AsyncClient(
             base_url=self.base_url,
             headers={
@@ -193,11 +198,13 @@ class CopilotClient:
                 "Content-Type": "application/json",
             },
             timeout=httpx.Timeout(self.timeout, connect=30.0),
+            transport=transport,
         )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._client:
+        # A shared transport outlives this client, so leave it open
+        if self._client and self._owns_transport:
             await self._client.aclose()
 
     def _create_retry_decorator(self):
@@ -225,6 +232,31 @@ class CopilotClient:
             ),
         )
 
+    async def _raise_for_status(self, response: httpx.Response) -> None:
+        """Map HTTP error responses to Copilot exceptions."""
+        metrics = get_metrics()
+        if response.status_code == 401:
+            metrics.inc_copilot_error()
+            # Auth errors don't trip circuit breaker (not a service issue)
+            raise CopilotAuthenticationError("Invalid or expired Copilot API key")
+        if response.status_code == 429:
+            metrics.inc_copilot_error()
+            await _circuit_breaker.record_failure()
+            retry_after = response.headers.get("Retry-After")
+            raise CopilotRateLimitError(
+                "Copilot API rate limit exceeded",
+                retry_after=int(retry_after) if retry_after else None,
+            )
+        if response.status_code >= 500:
+            metrics.inc_copilot_error()
+            await _circuit_breaker.record_failure()
+            raise CopilotConnectionError(
+                f"Copilot API server error: {response.status_code}",
+                details={"status_code": response.status_code, "body": response.text[:500]},
+            )
+
+        response.raise_for_status()
+
     async def _make_request(self, payload: dict[str, Any]) -> dict[str, Any]:
         """Make HTTP request to Copilot API with error handling and circuit breaker."""
         if not self._client:
@@ -254,28 +286,7 @@ class CopilotClient:
             await _circuit_breaker.record_failure()
             raise CopilotTimeoutError(f"Copilot API timeout: {e}") from e
 
-        # Handle HTTP errors
-        if response.status_code == 401:
-            metrics.inc_copilot_error()
-            # Auth errors don't trip circuit breaker (not a service issue)
-            raise CopilotAuthenticationError("Invalid or expired Copilot API key")
-        if response.status_code == 429:
-            metrics.inc_copilot_error()
-            await _circuit_breaker.record_failure()
-            retry_after = response.headers.get("Retry-After")
-            raise CopilotRateLimitError(
-                "Copilot API rate limit exceeded",
-                retry_after=int(retry_after) if retry_after else None,
-            )
-        if response.status_code >= 500:
-            metrics.inc_copilot_error()
-            await _circuit_breaker.record_failure()
-            raise CopilotConnectionError(
-                f"Copilot API server error: {response.status_code}",
-                details={"status_code": response.status_code, "body": response.text[:500]},
-            )
-
-        response.raise_for_status()
+        await self._raise_for_status(response)
 
         # Record success for circuit breaker
         await _circuit_breaker.record_success()
@@ -346,6 +357,102 @@ class CopilotClient:
             finish_reason=data["choices"][0]["finish_reason"],
         )
 
+    async def _open_stream(self, payload: dict[str, Any]) -> httpx.Response:
+        """Send a streaming completion request and return the open response."""
+        if not self._client:
+            msg = "Client not initialized. Use async with."
+            raise RuntimeError(msg)
+
+        if await _circuit_breaker.is_open():
+            raise CircuitBreakerOpenError(recovery_seconds=60)
+
+        metrics = get_metrics()
+        metrics.inc_copilot_request()
+        request = self._client.build_request("POST", "/v1/chat/completions", json=payload)
+        try:
+            response = await self._client.send(request, stream=True)
+        except httpx.ConnectError as e:
+            metrics.inc_copilot_error()
+            await _circuit_breaker.record_failure()
+            raise CopilotConnectionError(f"Failed to connect to Copilot API: {e}") from e
+        except httpx.TimeoutException as e:
+            metrics.inc_copilot_error()
+            await _circuit_breaker.record_failure()
+            raise CopilotTimeoutError(f"Copilot API timeout: {e}") from e
+
+        if response.status_code >= 400:
+            try:
+                await response.aread()
+                await self._raise_for_status(response)
+            finally:
+                await response.aclose()
+        return response
+
+    async def chat_stream(
+        self,
+        messages: list[CopilotMessage],
+        model: str | None = None,
+        system_message: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        """Stream a chat completion, yielding content deltas as they arrive.
+
+        Opening the stream is retried like ``chat``; once tokens have been
+        yielded a failure is raised to the caller instead of restarting the
+        answer. Closing the generator early (e.g. because the HTTP client
+        went away) closes the upstream response, which cancels generation.
+        """
+        formatted_messages = []
+        if system_message:
+            formatted_messages.append({"role": "system", "content": system_message})
+        for msg in messages:
+            formatted_messages.append({"role": msg.role, "content": msg.content})
+
+        payload = {
+            "model": model or self.default_model,
+            "messages": formatted_messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+        }
+        logger.debug("Sending streaming Copilot request", model=payload["model"])
+
+        open_with_retry = self._create_retry_decorator()(self._open_stream)
+        start_time = time.perf_counter()
+        response = await open_with_retry(payload)
+        metrics = get_metrics()
+        try:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except json.JSONDecodeError as e:
+                    raise CopilotParsingError(
+                        f"Malformed stream chunk: {e}", raw_content=data
+                    ) from e
+                for choice in chunk.get("choices") or []:
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        yield delta
+        except httpx.TimeoutException as e:
+            metrics.inc_copilot_error()
+            await _circuit_breaker.record_failure()
+            raise CopilotTimeoutError(f"Copilot stream timed out: {e}") from e
+        except httpx.TransportError as e:
+            metrics.inc_copilot_error()
+            await _circuit_breaker.record_failure()
+            raise CopilotConnectionError(f"Copilot stream interrupted: {e}") from e
+        finally:
+            await response.aclose()
+
+        await _circuit_breaker.record_success()
+        metrics.observe_copilot_latency(time.perf_counter() - start_time)
+
     def _parse_json_response(
         self,
         content: str,
@@ -652,6 +759,11 @@ async def get_copilot_client() -> CopilotClient:
     return create_copilot_client()
 
 
+def get_circuit_breaker() -> CircuitBreaker:
+    """The circuit breaker shared by all Copilot clients."""
+    return _circuit_breaker
+
+
 async def get_circuit_breaker_state() -> dict[str, Any]:
     """Get circuit breaker state for monitoring and health checks."""
     return await _circuit_breaker.get_state()
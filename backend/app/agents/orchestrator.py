@@ -226,6 +226,7 @@ class ComplianceOrchestrator:
         self,
         repository: Repository,
         requirements: list[Requirement],
+        sample_files: dict[str, str] | None = None,
     ) -> list[CodebaseMapping]:
         """Analyze a repository against a set of requirements for compliance gaps.
 
@@ -235,6 +236,7 @@ class ComplianceOrchestrator:
         Args:
             repository: The repository to analyze.
             requirements: Regulatory requirements to check against.
+            sample_files: Contents of compliance-relevant files, by path.
 
         Returns:
             List of CodebaseMapping objects with compliance status and gap details.
@@ -246,7 +248,7 @@ class ComplianceOrchestrator:
             copilot=copilot,
             audit_service=self.audit_service,
         )
-        return await analyzer.analyze(repository, requirements)
+        return await analyzer.analyze(repository, requirements, sample_files)
 
     async def generate_compliance_fix(
         self,
@@ -0,0 +1,235 @@
+"""Chunking and merging for map-reduce requirement extraction.
+
+A whole regulation does not fit one Copilot request: ``analyze_legal_text``
+reads at most 30k characters, and one huge response is slow and fragile.
+``chunk_regulation`` splits the text into requests of bounded size along
+article boundaries, using the section segmenter of the monitoring parsers.
+
+- Consecutive articles are packed into a chunk up to ``max_tokens``.
+- An article that is too big on its own is split by lines. Each
+  continuation repeats the article heading and the last
+  ``overlap_tokens`` of the previous piece, so an obligation cut at the
+  seam is still seen whole by at least one request. Whole articles need
+  no overlap.
+- Where a chunk ends depends on the articles themselves. A chunk may
+  close after an article whose heading hashes onto a boundary once it
+  holds a quarter of the budget. Editing an article therefore only moves
+  chunk boundaries up to the next such article, and cached results for
+  the rest of the regulation stay valid.
+
+``merge_requirements`` is the reduce step. Requirements found twice,
+whether in overlapping text or in articles that restate each other, are
+merged. Reference ids are then renumbered, because every chunk numbers
+its own requirements from 001.
+"""
+
+import copy
+import re
+import zlib
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.services.monitoring.streaming import RegulatoryDocument, Section
+
+
+DEFAULT_CHUNK_TOKENS = 6_000
+DEFAULT_OVERLAP_TOKENS = 300
+
+# On average one article in this many can end a chunk
+_BOUNDARY_MODULUS = 4
+
+# Scripts written without spaces run about one token per character
+_WIDE_CHARS = re.compile(r"[぀-ヿ㐀-䶿一-鿿가-힯豈-﫿]")
+_NON_WORD = re.compile(r"[\W_]+")
+
+# Near-duplicate descriptions share at least this fraction of their words
+_SIMILAR_WORDS = 0.8
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate model tokens in ``text``.
+
+    About four characters per token for alphabetic scripts and one per
+    CJK or Hangul character, which errs on the high side for both.
+    """
+    wide = len(_WIDE_CHARS.findall(text))
+    return wide + (len(text) - wide + 3) // 4
+
+
+@dataclass
+class TextChunk:
+    """One extraction request's worth of regulation text."""
+
+    index: int
+    pieces: list[str] = field(default_factory=list)
+    headings: list[str] = field(default_factory=list)
+    tokens: int = 0
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(self.pieces)
+
+
+def _split_section(section: Section, max_tokens: int, overlap_tokens: int) -> list[str]:
+    """``section`` as pieces of at most ``max_tokens``, overlapping at the seams."""
+    text = section.text
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    heading = section.heading or (section.lines[0] if section.lines else "")
+    pieces: list[str] = []
+    current: list[str] = []
+    size = 0
+    for line in section.lines:
+        # Lines longer than a whole request are cut by characters
+        while estimate_tokens(line) > max_tokens // 2:
+            cut = len(line) * (max_tokens // 2) // estimate_tokens(line)
+            head, line = line[:cut], line[cut:]
+            current, size = _append(
+                pieces, current, size, head, max_tokens, heading, overlap_tokens
+            )
+        current, size = _append(pieces, current, size, line, max_tokens, heading, overlap_tokens)
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def _append(
+    pieces: list[str],
+    current: list[str],
+    size: int,
+    line: str,
+    max_tokens: int,
+    heading: str,
+    overlap_tokens: int,
+) -> tuple[list[str], int]:
+    tokens = estimate_tokens(line) + 1
+    if current and size + tokens > max_tokens:
+        pieces.append("\n".join(current))
+        # Carry the tail of this piece into the next one
+        carried: list[str] = []
+        carried_size = 0
+        for previous in reversed(current[1:]):
+            carried_size += estimate_tokens(previous) + 1
+            if carried_size > overlap_tokens:
+                break
+            carried.insert(0, previous)
+        current = [f"{heading} (continued)", *carried] if heading else carried
+        size = sum(estimate_tokens(kept) + 1 for kept in current)
+    current.append(line)
+    return current, size + tokens
+
+
+def _is_boundary(section: Section) -> bool:
+    key = section.heading or f"{section.kind} {section.number}"
+    return zlib.crc32(key.encode()) % _BOUNDARY_MODULUS == 0
+
+
+def chunk_regulation(
+    content: str,
+    max_tokens: int = DEFAULT_CHUNK_TOKENS,
+    overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+) -> list[TextChunk]:
+    """Split regulation text (plain or HTML) into article-aligned chunks."""
+    chunks: list[TextChunk] = []
+    current = TextChunk(0)
+
+    for section in RegulatoryDocument(content).sections(merge_parts=True):
+        pieces = _split_section(section, max_tokens, overlap_tokens)
+        for piece in pieces:
+            tokens = estimate_tokens(piece) + 1
+            if current.pieces and current.tokens + tokens > max_tokens:
+                chunks.append(current)
+                current = TextChunk(len(chunks))
+            current.pieces.append(piece)
+            current.tokens += tokens
+            if section.heading and section.heading not in current.headings:
+                current.headings.append(section.heading)
+        if current.tokens >= max_tokens // 4 and _is_boundary(section):
+            chunks.append(current)
+            current = TextChunk(len(chunks))
+
+    if current.pieces:
+        chunks.append(current)
+    return chunks
+
+
+# ----------------------------------------------------------------------
+# Reduce
+# ----------------------------------------------------------------------
+
+
+def _normalized(text: Any) -> str:
+    return _NON_WORD.sub(" ", str(text or "").lower()).strip()
+
+
+def _words(requirement: dict[str, Any]) -> frozenset[str]:
+    return frozenset(_normalized(requirement.get("description")).split())
+
+
+def _articles(requirement: dict[str, Any]) -> frozenset[str]:
+    citations = requirement.get("citations")
+    if not isinstance(citations, list):
+        return frozenset()
+    return frozenset(
+        str(citation.get("article"))
+        for citation in citations
+        if isinstance(citation, dict) and citation.get("article")
+    )
+
+
+def _is_duplicate(kept: dict[str, Any], candidate: dict[str, Any]) -> bool:
+    """Whether two requirements of the same obligation type say the same thing."""
+    source = _normalized(candidate.get("source_text"))
+    if source and source == _normalized(kept.get("source_text")):
+        return True
+    kept_articles, articles = _articles(kept), _articles(candidate)
+    if kept_articles and articles and kept_articles.isdisjoint(articles):
+        return False
+    kept_words, words = _words(kept), _words(candidate)
+    if not kept_words or not words:
+        return False
+    return len(kept_words & words) / len(kept_words | words) >= _SIMILAR_WORDS
+
+
+def _merge_into(kept: dict[str, Any], duplicate: dict[str, Any]) -> None:
+    for key in ("data_types", "processes", "citations"):
+        values = kept.get(key) if isinstance(kept.get(key), list) else []
+        for value in duplicate.get(key) or []:
+            if value not in values:
+                values.append(value)
+        if values:
+            kept[key] = values
+    if isinstance(duplicate.get("confidence"), int | float):
+        kept["confidence"] = max(kept.get("confidence") or 0, duplicate["confidence"])
+    for key, value in duplicate.items():
+        if value and not kept.get(key):
+            kept[key] = value
+
+
+def merge_requirements(
+    chunk_results: Sequence[Sequence[dict[str, Any]]],
+    framework: str,
+) -> list[dict[str, Any]]:
+    """Deduplicate the requirements of all chunks, in document order."""
+    merged: list[dict[str, Any]] = []
+    # Candidates are compared within an obligation type only
+    by_type: dict[str, list[dict[str, Any]]] = {}
+    for requirements in chunk_results:
+        for requirement in requirements:
+            if not isinstance(requirement, dict):
+                continue
+            candidate = copy.deepcopy(requirement)
+            group = by_type.setdefault(str(candidate.get("obligation_type", "")).upper(), [])
+            kept = next((k for k in group if _is_duplicate(k, candidate)), None)
+            if kept is None:
+                group.append(candidate)
+                merged.append(candidate)
+            else:
+                _merge_into(kept, candidate)
+
+    if sum(1 for requirements in chunk_results if requirements) > 1:
+        for number, requirement in enumerate(merged, 1):
+            requirement["reference_id"] = f"REQ-{framework.upper()}-{number:03d}"
+    return merged
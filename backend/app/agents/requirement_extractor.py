@@ -1,23 +1,47 @@
 """Requirement extraction from regulatory text using AI."""
 
+import asyncio
 from typing import Any
 
 import structlog
 from opentelemetry import trace
 
-from app.agents.copilot import CopilotClient
+from app.agents.copilot import CircuitBreakerOpenError, CopilotClient, get_circuit_breaker
+from app.agents.requirement_chunks import (
+    DEFAULT_CHUNK_TOKENS,
+    DEFAULT_OVERLAP_TOKENS,
+    TextChunk,
+    chunk_regulation,
+    merge_requirements,
+)
 from app.models.regulation import Regulation
+from app.services.analysis_cache import AnalysisCache, get_analysis_cache, ruleset_fingerprint
 
 
 logger = structlog.get_logger()
 tracer = trace.get_tracer("complianceagent.requirement_extractor")
 
+# Bump when prompts or chunking change so cached extractions are not reused
+_EXTRACTION_VERSION = 1
+
 
 class RequirementExtractor:
     """Extracts requirements from regulatory text using Copilot AI."""
 
-    def __init__(self, copilot: CopilotClient):
+    def __init__(
+        self,
+        copilot: CopilotClient,
+        *,
+        result_cache: AnalysisCache | None = None,
+        max_chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+        overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+        max_concurrency: int = 4,
+    ):
         self._copilot = copilot
+        self._cache = result_cache if result_cache is not None else get_analysis_cache()
+        self.max_chunk_tokens = max_chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.max_concurrency = max_concurrency
 
     async def extract(
         self,
@@ -26,8 +50,11 @@ class RequirementExtractor:
     ) -> list[dict[str, Any]]:
         """Extract structured compliance requirements from regulatory text using AI.
 
-        Sends the raw regulation text to the Copilot AI for analysis, which returns
-        structured requirement objects with categories, obligations, and confidence scores.
+        The text is split into article-aligned chunks that are analyzed
+        concurrently, and the requirements of all chunks are merged.
+        Chunks whose text was already analyzed for this regulation are
+        served from the analysis cache, so a re-crawl that changed one
+        article only sends that article's chunk.
 
         Args:
             regulation: The regulation metadata (name, jurisdiction, framework).
@@ -44,14 +71,75 @@ class RequirementExtractor:
                 "content.length": len(content),
             },
         ) as span:
-            async with self._copilot:
+            chunks = chunk_regulation(content, self.max_chunk_tokens, self.overlap_tokens)
+            ruleset = ruleset_fingerprint(
+                {
+                    "version": _EXTRACTION_VERSION,
+                    "model": getattr(self._copilot, "default_model", None),
+                    "regulation": regulation.name,
+                    "jurisdiction": regulation.jurisdiction.value,
+                    "framework": regulation.framework.value,
+                }
+            )
+            keys = [AnalysisCache.key("requirements", ruleset, chunk.text) for chunk in chunks]
+            cached = await self._cache.get_many(keys)
+            missing = [
+                (chunk, key) for chunk, key in zip(chunks, keys, strict=True) if key not in cached
+            ]
+
+            fresh: dict[str, list[dict[str, Any]]] = {}
+            if missing:
+                async with self._copilot:
+                    fresh = await self._extract_chunks(regulation, missing)
+
+            results = [
+                fresh[key] if key in fresh else [record[0] for record in cached[key]]
+                for key in keys
+            ]
+            requirements = merge_requirements(results, regulation.framework.value)
+
+            span.set_attribute("chunks.count", len(chunks))
+            span.set_attribute("chunks.cached", len(chunks) - len(missing))
+            span.set_attribute("requirements.extracted_count", len(requirements))
+            logger.info(
+                f"Extracted {len(requirements)} requirements",
+                chunks=len(chunks),
+                cached_chunks=len(chunks) - len(missing),
+            )
+            return requirements
+
+    async def _extract_chunks(
+        self,
+        regulation: Regulation,
+        chunks: list[tuple[TextChunk, str]],
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Requirements per chunk key, at most ``max_concurrency`` requests at a time."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        breaker = get_circuit_breaker()
+
+        async def extract_chunk(chunk: TextChunk, key: str) -> list[dict[str, Any]]:
+            async with semaphore:
+                # Fail fast rather than queue the rest of the document behind
+                # an open circuit
+                if await breaker.is_open():
+                    raise CircuitBreakerOpenError(recovery_seconds=breaker.recovery_timeout)
                 requirements = await self._copilot.analyze_legal_text(
-                    text=content,
+                    text=chunk.text,
                     regulation_name=regulation.name,
                     jurisdiction=regulation.jurisdiction.value,
                     framework=regulation.framework.value,
                 )
-
-            span.set_attribute("requirements.extracted_count", len(requirements))
-            logger.info(f"Extracted {len(requirements)} requirements")
+            # Empty results are not cached: unparseable responses also
+            # come back empty and deserve a retry on the next crawl
+            if requirements:
+                await self._cache.set(key, [(requirement,) for requirement in requirements])
             return requirements
+
+        tasks = [asyncio.ensure_future(extract_chunk(chunk, key)) for chunk, key in chunks]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return {key: result for (_, key), result in zip(chunks, results, strict=True)}
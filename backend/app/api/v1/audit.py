@@ -3,10 +3,11 @@
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, status
 from sqlalchemy import select
 
 from app.api.v1.deps import DB, CurrentOrganization, OrgMember
+from app.core.pagination import Pagination, SortKey
 from app.models.audit import AuditEventType, AuditTrail, ComplianceAction, ComplianceActionStatus
 from app.schemas.audit import (
     AuditTrailRead,
@@ -24,13 +25,12 @@ async def list_audit_trail(
     organization: CurrentOrganization,
     member: OrgMember,
     db: DB,
+    page: Pagination,
     regulation_id: UUID | None = None,
     requirement_id: UUID | None = None,
     event_type: AuditEventType | None = None,
     start_date: datetime | None = None,
     end_date: datetime | None = None,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
 ) -> list[AuditTrail]:
     """List audit trail entries."""
     query = select(AuditTrail).where(AuditTrail.organization_id == organization.id)
@@ -46,10 +46,13 @@ async def list_audit_trail(
     if end_date:
         query = query.where(AuditTrail.created_at <= end_date)
 
-    query = query.order_by(AuditTrail.created_at.desc()).offset(skip).limit(limit)
-
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    result = await page.fetch(
+        db,
+        query,
+        [SortKey(AuditTrail.created_at), SortKey(AuditTrail.id)],
+        scope="audit_trail",
+    )
+    return result.items
 
 
 @router.get("/trail/{entry_id}", response_model=AuditTrailRead)
@@ -83,10 +86,9 @@ async def list_compliance_actions(
     organization: CurrentOrganization,
     member: OrgMember,
     db: DB,
+    page: Pagination,
     status_filter: ComplianceActionStatus | None = None,
     repository_id: UUID | None = None,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
 ) -> list[ComplianceAction]:
     """List compliance actions."""
     query = select(ComplianceAction).where(ComplianceAction.organization_id == organization.id)
@@ -96,10 +98,13 @@ async def list_compliance_actions(
     if repository_id:
         query = query.where(ComplianceAction.repository_id == repository_id)
 
-    query = query.order_by(ComplianceAction.created_at.desc()).offset(skip).limit(limit)
-
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    result = await page.fetch(
+        db,
+        query,
+        [SortKey(ComplianceAction.created_at), SortKey(ComplianceAction.id)],
+        scope="compliance_actions",
+    )
+    return result.items
 
 
 @router.post("/actions", response_model=ComplianceActionRead, status_code=status.HTTP_201_CREATED)
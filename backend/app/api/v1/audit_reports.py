@@ -4,10 +4,12 @@ from datetime import datetime
 from uuid import UUID
 
 import structlog
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import Response
 from pydantic import BaseModel, Field
 
 from app.api.v1.deps import DB, CurrentOrganization, OrgMember
+from app.core.downloads import ranged_file_response
 from app.services.audit_reports import (
     AuditFramework,
     AuditorRole,
@@ -540,3 +542,33 @@ async def export_evidence_package(
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
     return ExportPackageSchema(**package)
+
+
+@router.get(
+    "/reports/{report_id}/export/archive",
+    summary="Download evidence package archive",
+    description=(
+        "Download the evidence package as a ZIP archive with a Merkle-tree manifest. "
+        "Supports Range requests so interrupted downloads can be resumed."
+    ),
+    response_class=Response,
+)
+async def download_evidence_package_archive(
+    report_id: UUID,
+    request: Request,
+    organization: CurrentOrganization,
+    member: OrgMember,
+    db: DB,
+) -> Response:
+    service = AuditReportService(db=db)
+    try:
+        archive = await service.export_evidence_package_archive(report_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    return ranged_file_response(
+        request,
+        archive.path,
+        media_type="application/zip",
+        filename=archive.filename,
+        etag=archive.etag,
+    )
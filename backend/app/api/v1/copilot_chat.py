@@ -330,12 +330,27 @@ async def chat_in_session(session_id: str, request: ChatRequest, db: DB) -> dict
 
 
 @router.post("/sessions/{session_id}/stream", summary="Stream chat response")
-async def stream_chat_response(session_id: str, request: ChatRequest, db: DB) -> list[dict]:
-    """Stream a chat response as SSE events."""
+async def stream_chat_response(
+    session_id: str, request: ChatRequest, db: DB, copilot: CopilotDep
+) -> StreamingResponse:
+    """Stream a chat response as SSE events while the answer is generated."""
     from uuid import UUID as PyUUID
-    svc = CopilotChatService(db)
-    events = await svc.stream_chat(session_id=PyUUID(session_id), message=request.message)
-    return [{"event": e.event, "data": e.data} for e in events]
+    svc = CopilotChatService(db, copilot_client=copilot)
+    sid = PyUUID(session_id)
+    if svc.get_session(sid) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    async def generate() -> AsyncIterator[str]:
+        # Starlette cancels this generator when the client disconnects,
+        # which closes the upstream completion stream
+        async for event in svc.stream_chat(session_id=sid, message=request.message):
+            yield event.encode()
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/rag/retrieve", summary="Retrieve RAG context")
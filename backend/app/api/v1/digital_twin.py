@@ -9,6 +9,7 @@ from pydantic import BaseModel, Field
 from app.api.v1.deps import DB, CurrentOrganization
 from app.services.digital_twin import (
     ScenarioType,
+    SimulationResult,
     get_compliance_simulator,
     get_snapshot_manager,
 )
@@ -76,6 +77,14 @@ class RunSimulationRequest(BaseModel):
     baseline_snapshot_id: UUID | None = None
 
 
+class RunBatchSimulationRequest(BaseModel):
+    """Request to run several scenarios against one baseline."""
+
+    scenario_ids: list[UUID] = Field(..., min_length=1, max_length=200)
+    baseline_snapshot_id: UUID | None = None
+    max_workers: int | None = Field(default=None, ge=1, le=32)
+
+
 class SimulationResultResponse(BaseModel):
     """Simulation result response."""
 
@@ -94,6 +103,15 @@ class SimulationResultResponse(BaseModel):
     duration_ms: float
 
 
+class BatchSimulationResponse(BaseModel):
+    """Batch simulation results (completion order) with a side-by-side comparison."""
+
+    results: list[SimulationResultResponse]
+    best_scenario_id: str
+    worst_scenario_id: str
+    recommendation: str
+
+
 class CompareSnapshotsRequest(BaseModel):
     """Request to compare two snapshots."""
 
@@ -367,6 +385,40 @@ async def run_simulation(request: RunSimulationRequest):
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
+    return _to_result_response(result)
+
+
+@router.post("/simulate/batch", response_model=BatchSimulationResponse)
+async def run_batch_simulation(request: RunBatchSimulationRequest):
+    """Run many what-if scenarios against a single baseline.
+
+    The baseline is loaded once and scenarios are evaluated concurrently;
+    results are listed in the order they completed.
+    """
+    simulator = get_compliance_simulator()
+
+    try:
+        results = [
+            result
+            async for result in simulator.simulate_batch(
+                scenario_ids=request.scenario_ids,
+                baseline_snapshot_id=request.baseline_snapshot_id,
+                max_workers=request.max_workers,
+            )
+        ]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    comparison = await simulator.compare_scenarios([r.id for r in results])
+    return BatchSimulationResponse(
+        results=[_to_result_response(r) for r in results],
+        best_scenario_id=comparison.best_scenario_id,
+        worst_scenario_id=comparison.worst_scenario_id,
+        recommendation=comparison.recommendation,
+    )
+
+
+def _to_result_response(result: SimulationResult) -> SimulationResultResponse:
     return SimulationResultResponse(
         id=result.id,
         scenario_id=result.scenario_id,
@@ -4,10 +4,12 @@ from datetime import datetime
 from uuid import UUID
 
 import structlog
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import Response
 from pydantic import BaseModel, Field
 
 from app.api.v1.deps import DB, CopilotDep, CurrentOrganization, OrgMember
+from app.core.downloads import ranged_file_response
 from app.services.evidence_collector import (
     EvidenceCollectorService,
 )
@@ -227,8 +229,13 @@ async def collect_evidence(
     db: DB,
     copilot: CopilotDep,
     repository_id: UUID | None = None,
+    force: bool = False,
 ) -> PackageDetailSchema:
-    """Trigger evidence collection for an audit package."""
+    """Trigger evidence collection for an audit package.
+
+    Controls whose evidence from ``repository_id`` is still current are
+    skipped unless ``force`` is set.
+    """
     service = EvidenceCollectorService(db=db, copilot=copilot)
 
     # Verify package exists and belongs to org
@@ -249,6 +256,7 @@ async def collect_evidence(
     package = await service.collect_evidence(
         package_id=package_id,
         repository_id=repository_id,
+        force=force,
     )
 
     return _package_to_detail(package)
@@ -293,6 +301,55 @@ async def export_audit_package(
         ) from e
 
 
+@router.get(
+    "/packages/{package_id}/export/archive",
+    summary="Download audit package archive",
+    description=(
+        "Download the audit package as a ZIP archive with a Merkle-tree manifest. "
+        "Supports Range requests so interrupted downloads can be resumed."
+    ),
+    response_class=Response,
+)
+async def download_audit_package_archive(
+    package_id: UUID,
+    request: Request,
+    organization: CurrentOrganization,
+    db: DB,
+    copilot: CopilotDep,
+) -> Response:
+    """Stream the audit package archive."""
+    service = EvidenceCollectorService(db=db, copilot=copilot)
+
+    package = await service.get_package(package_id)
+    if not package:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audit package not found",
+        )
+
+    if package.organization_id != organization.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied",
+        )
+
+    try:
+        archive = await service.export_package_archive(package_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+    return ranged_file_response(
+        request,
+        archive.path,
+        media_type="application/zip",
+        filename=archive.filename,
+        etag=archive.etag,
+    )
+
+
 @router.get(
     "/frameworks",
     summary="Get supported frameworks",
@@ -210,7 +210,7 @@ async def analyze_document(
     """
     analyzer = get_analyzer(organization.id, request.regulations)
 
-    result = analyzer.analyze_document(
+    result = await analyzer.analyze_document_async(
         uri=request.uri,
         content=request.content,
         language=request.language,
@@ -596,7 +596,7 @@ async def ide_websocket(
             action = data.get("action")
 
             if action == "analyze":
-                result = analyzer.analyze_document(
+                result = await analyzer.analyze_document_async(
                     uri=data.get("uri", ""),
                     content=data.get("content", ""),
                     language=data.get("language"),
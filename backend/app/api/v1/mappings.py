@@ -3,11 +3,12 @@
 from datetime import UTC
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from app.api.v1.deps import DB, CurrentOrganization, OrgMember
+from app.core.pagination import Pagination, SortKey
 from app.models.codebase import CodebaseMapping, ComplianceStatus, Repository
 from app.models.customer_profile import CustomerProfile
 from app.schemas.codebase import CodebaseMappingRead
@@ -21,11 +22,10 @@ async def list_mappings(
     organization: CurrentOrganization,
     member: OrgMember,
     db: DB,
+    page: Pagination,
     repository_id: UUID | None = None,
     requirement_id: UUID | None = None,
     compliance_status: ComplianceStatus | None = None,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
 ) -> list[CodebaseMapping]:
     """List codebase mappings."""
     query = (
@@ -42,10 +42,13 @@ async def list_mappings(
     if compliance_status:
         query = query.where(CodebaseMapping.compliance_status == compliance_status)
 
-    query = query.order_by(CodebaseMapping.created_at.desc()).offset(skip).limit(limit)
-
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    result = await page.fetch(
+        db,
+        query,
+        [SortKey(CodebaseMapping.created_at), SortKey(CodebaseMapping.id)],
+        scope="mappings",
+    )
+    return result.items
 
 
 @router.get("/{mapping_id}", response_model=CodebaseMappingRead)
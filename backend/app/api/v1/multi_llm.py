@@ -586,6 +586,7 @@ class RoutingResponse(BaseModel):
     use_consensus: bool
     reason: str
     estimated_cost_usd: float
+    expected_latency_ms: float = 0.0
 
 
 class ComplexityCheckResponse(BaseModel):
@@ -603,15 +604,19 @@ async def smart_route_request(request: RoutingRequest, db: DB) -> RoutingRespons
 
     Routes simple queries to cheap models and critical queries to all providers.
     """
+    from app.services.multi_llm.consensus import get_provider_stats
     from app.services.multi_llm.router import route_request
 
     service = MultiLLMService(db=db)
     providers = await service.list_providers()
+    stats = get_provider_stats()
 
     decision = route_request(
         text=request.text,
         framework=request.framework,
         available_providers=providers,
+        latency_p95_ms=stats.latency_p95_ms(),
+        cost_per_1k=stats.cost_per_1k(),
     )
     return RoutingResponse(
         complexity=decision.complexity.value,
@@ -620,6 +625,7 @@ async def smart_route_request(request: RoutingRequest, db: DB) -> RoutingRespons
         use_consensus=decision.use_consensus,
         reason=decision.reason,
         estimated_cost_usd=round(decision.estimated_cost_usd, 6),
+        expected_latency_ms=round(decision.expected_latency_ms, 1),
     )
 
 
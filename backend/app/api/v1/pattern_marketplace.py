@@ -300,6 +300,33 @@ async def search_patterns(
     }
 
 
+@router.get("/patterns/facets", response_model=dict[str, dict[str, int]])
+async def get_pattern_facets(
+    db: DB,
+    query: str | None = Query(None),
+    category: str | None = Query(None),
+    pattern_type: str | None = Query(None),
+    regulations: str | None = Query(None),  # Comma-separated
+    languages: str | None = Query(None),  # Comma-separated
+    free_only: bool = Query(False),
+) -> dict[str, dict[str, int]]:
+    """Count matching patterns per category, type, license, regulation and language.
+
+    Each facet is counted without its own filter applied, so the counts
+    show what selecting another value would return.
+    """
+    service = get_pattern_marketplace_service(db=db)
+
+    return service.get_facet_counts(
+        query=query,
+        category=PatternCategory(category) if category else None,
+        pattern_type=PatternType(pattern_type) if pattern_type else None,
+        regulations=regulations.split(",") if regulations else None,
+        languages=languages.split(",") if languages else None,
+        free_only=free_only,
+    )
+
+
 @router.get("/patterns/featured", response_model=list[PatternResponse])
 async def get_featured_patterns(
     db: DB,
@@ -8,6 +8,7 @@ from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel, Field
 
 from app.api.v1.deps import DB, CurrentOrganization, OrgMember
+from app.core.pagination import Pagination, SortKey
 
 
 router = APIRouter(prefix="/pr-bot", tags=["PR Bot"])
@@ -101,8 +102,8 @@ async def analyze_pr(
 
     The analysis runs asynchronously. Use the task_id to check status.
     """
-    from app.services.pr_bot.queue import PRAnalysisTask
-    from app.workers.pr_bot_tasks import analyze_pr as analyze_pr_task
+    from app.services.pr_bot.queue import PRAnalysisJob
+    from app.workers.pr_bot_tasks import enqueue_analyses
 
     # Get GitHub token from organization settings
     github_token = (
@@ -114,8 +115,8 @@ async def analyze_pr(
             detail="GitHub access token not configured for organization",
         )
 
-    # Create task
-    task = PRAnalysisTask(
+    # Create job
+    job = PRAnalysisJob(
         owner=request.owner,
         repo=request.repo,
         pr_number=request.pr_number,
@@ -127,15 +128,11 @@ async def analyze_pr(
         auto_label=request.auto_label,
     )
 
-    # Queue for processing
-    analyze_pr_task.delay(
-        task_data=task.to_dict(),
-        access_token=github_token,
-        organization_id=str(organization.id),
-    )
+    # Queue for processing; the worker reads the token from the organization
+    [task_id] = await enqueue_analyses([job])
 
     return PRAnalysisResponse(
-        task_id=str(task.id),
+        task_id=task_id,
         status="queued",
         pr_number=request.pr_number,
         repo=request.repo,
@@ -264,8 +261,27 @@ async def get_task_status(
     """Get the status of an analysis task."""
     from celery.result import AsyncResult
 
+    from app.services.pr_bot.queue import PRTaskStatus, RedisPRAnalysisQueue
+    from app.services.pr_bot.service import get_pr_bot_service
     from app.workers import celery_app
 
+    # Analysis jobs live on the PR analysis queue; batch, re-analysis and
+    # fix-PR requests return Celery task ids
+    queue = get_pr_bot_service().queue
+    job = await queue.get_task(task_id) if isinstance(queue, RedisPRAnalysisQueue) else None
+    if job is not None and job.organization_id == organization.id:
+        ready = job.status in (
+            PRTaskStatus.COMPLETED,
+            PRTaskStatus.FAILED,
+            PRTaskStatus.CANCELLED,
+        )
+        response = {"task_id": task_id, "status": job.status.value, "ready": ready}
+        if job.status == PRTaskStatus.COMPLETED:
+            response["result"] = job.result
+        elif job.error_message:
+            response["error"] = job.error_message
+        return response
+
     result = AsyncResult(task_id, app=celery_app)
 
     response = {
@@ -406,8 +422,8 @@ async def get_pr_analysis_history(
     organization: CurrentOrganization,
     member: OrgMember,
     db: DB,
-    limit: int = Query(50, le=100),
-    offset: int = Query(0),
+    page: Pagination,
+    offset: int = Query(0, ge=0),
     repo: str | None = Query(None, description="Filter by repository"),
 ) -> dict[str, Any]:
     """Get history of PR analyses."""
@@ -415,19 +431,19 @@ async def get_pr_analysis_history(
 
     from app.models.audit import AuditEventType, AuditTrail
 
-    query = (
-        select(AuditTrail)
-        .where(
-            AuditTrail.organization_id == organization.id,
-            AuditTrail.event_type == AuditEventType.PR_ANALYZED,
-        )
-        .order_by(AuditTrail.created_at.desc())
-        .offset(offset)
-        .limit(limit)
+    query = select(AuditTrail).where(
+        AuditTrail.organization_id == organization.id,
+        AuditTrail.event_type == AuditEventType.PR_ANALYZED,
     )
 
-    result = await db.execute(query)
-    events = list(result.scalars().all())
+    result = await page.fetch(
+        db,
+        query,
+        [SortKey(AuditTrail.created_at), SortKey(AuditTrail.id)],
+        scope="pr_analysis_history",
+        skip=offset,
+    )
+    events = result.items
 
     history = []
     for event in events:
@@ -449,9 +465,10 @@ async def get_pr_analysis_history(
 
     return {
         "history": history,
-        "limit": limit,
+        "limit": page.limit,
         "offset": offset,
-        "total": len(history),
+        "total": result.total if result.total is not None else len(history),
+        "next_cursor": result.next_cursor,
     }
 
 
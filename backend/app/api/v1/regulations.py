@@ -2,11 +2,12 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, status
 from sqlalchemy import func, select
 from sqlalchemy.orm import selectinload
 
 from app.api.v1.deps import DB, OrgMember
+from app.core.pagination import Pagination, SortKey
 from app.models.regulation import (
     Jurisdiction,
     Regulation,
@@ -84,10 +85,9 @@ async def get_regulatory_source(
 @router.get("/", response_model=list[RegulationSummary])
 async def list_regulations(
     db: DB,
+    page: Pagination,
     jurisdiction: Jurisdiction | None = None,
     framework: RegulatoryFramework | None = None,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
 ) -> list[dict]:
     """List regulations with optional filters."""
     query = select(Regulation)
@@ -97,26 +97,31 @@ async def list_regulations(
     if framework:
         query = query.where(Regulation.framework == framework)
 
-    query = query.order_by(Regulation.effective_date.desc()).offset(skip).limit(limit)
-
-    result = await db.execute(query)
-    regulations = result.scalars().all()
+    result = await page.fetch(
+        db,
+        query,
+        [SortKey(Regulation.effective_date, nullable=True), SortKey(Regulation.id)],
+        scope="regulations",
+    )
+    regulations = result.items
 
-    # Get requirement counts
-    summaries = []
-    for reg in regulations:
+    # Requirement counts for the whole page in one grouped query
+    counts: dict = {}
+    if regulations:
         count_result = await db.execute(
-            select(func.count()).where(Requirement.regulation_id == reg.id)
+            select(Requirement.regulation_id, func.count())
+            .where(Requirement.regulation_id.in_([reg.id for reg in regulations]))
+            .group_by(Requirement.regulation_id)
         )
-        req_count = count_result.scalar() or 0
-        summaries.append(
-            {
-                **RegulationSummary.model_validate(reg).model_dump(),
-                "requirements_count": req_count,
-            }
-        )
-
-    return summaries
+        counts = dict(count_result.all())
+
+    return [
+        {
+            **RegulationSummary.model_validate(reg).model_dump(),
+            "requirements_count": counts.get(reg.id, 0),
+        }
+        for reg in regulations
+    ]
 
 
 @router.post("/", response_model=RegulationRead, status_code=status.HTTP_201_CREATED)
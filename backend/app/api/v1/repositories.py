@@ -2,11 +2,12 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from app.api.v1.deps import DB, CurrentOrganization, OrgAdmin, OrgMember
+from app.core.pagination import Pagination, SortKey
 from app.models.codebase import Repository
 from app.models.customer_profile import CustomerProfile
 from app.schemas.codebase import RepositoryCreate, RepositoryRead
@@ -20,9 +21,8 @@ async def list_repositories(
     organization: CurrentOrganization,
     member: OrgMember,
     db: DB,
+    page: Pagination,
     profile_id: UUID | None = None,
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(50, ge=1, le=100, description="Max records to return"),
 ) -> list[Repository]:
     """List repositories for the organization."""
     query = (
@@ -34,8 +34,13 @@ async def list_repositories(
     if profile_id:
         query = query.where(Repository.customer_profile_id == profile_id)
 
-    result = await db.execute(query.order_by(Repository.full_name).offset(skip).limit(limit))
-    return list(result.scalars().all())
+    result = await page.fetch(
+        db,
+        query,
+        [SortKey(Repository.full_name, descending=False), SortKey(Repository.id, descending=False)],
+        scope="repositories",
+    )
+    return result.items
 
 
 @router.post("/", response_model=RepositoryRead, status_code=status.HTTP_201_CREATED)
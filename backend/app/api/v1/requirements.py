@@ -3,10 +3,11 @@
 from datetime import UTC
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, status
 from sqlalchemy import select
 
 from app.api.v1.deps import DB, OrgMember
+from app.core.pagination import Pagination, SortKey
 from app.models.requirement import ObligationType, Requirement, RequirementCategory
 from app.schemas.requirement import RequirementCreate, RequirementRead
 
@@ -17,12 +18,11 @@ router = APIRouter()
 @router.get("/", response_model=list[RequirementRead])
 async def list_requirements(
     db: DB,
+    page: Pagination,
     regulation_id: UUID | None = None,
     category: RequirementCategory | None = None,
     obligation_type: ObligationType | None = None,
     human_reviewed: bool | None = None,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
 ) -> list[Requirement]:
     """List requirements with optional filters."""
     query = select(Requirement)
@@ -36,10 +36,13 @@ async def list_requirements(
     if human_reviewed is not None:
         query = query.where(Requirement.human_reviewed == human_reviewed)
 
-    query = query.order_by(Requirement.created_at.desc()).offset(skip).limit(limit)
-
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    result = await page.fetch(
+        db,
+        query,
+        [SortKey(Requirement.created_at), SortKey(Requirement.id)],
+        scope="requirements",
+    )
+    return result.items
 
 
 @router.post("/", response_model=RequirementRead, status_code=status.HTTP_201_CREATED)
@@ -8,6 +8,7 @@ from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel, Field
 
 from app.api.v1.deps import DB, CurrentOrganization, OrgMember
+from app.core.exceptions import ValidationError
 from app.services.risk_quantification import (
     get_risk_quantification_service,
 )
@@ -44,6 +45,20 @@ class AssessViolationRequest(BaseModel):
     mitigating_factors: list[str] | None = None
 
 
+class SimulateExposureRequest(BaseModel):
+    """Request to simulate the exposure distribution of a set of violations."""
+
+    violations: list[AssessViolationRequest] = Field(..., min_length=1)
+    iterations: int = Field(default=1_000_000, ge=1, le=10_000_000)
+    correlation: float | list[list[float]] = Field(
+        default=0.0,
+        description="Enforcement correlation: one coefficient for every pair of "
+        "violations, or a matrix in violation order",
+    )
+    confidence: float = Field(default=0.95, gt=0.0, lt=1.0)
+    seed: int | None = Field(default=None, ge=0, description="Seed for reproducible runs")
+
+
 class ViolationRiskResponse(BaseModel):
     """Response containing violation risk assessment."""
 
@@ -316,6 +331,44 @@ async def assess_violations_batch(
     return results
 
 
+@router.post("/exposure/simulate")
+async def simulate_exposure(
+    request: SimulateExposureRequest,
+    organization: CurrentOrganization,
+    member: OrgMember,
+    db: DB,
+) -> dict[str, Any]:
+    """Simulate the aggregate financial exposure of a set of violations.
+
+    Runs a seeded Monte Carlo simulation (1M iterations by default) and
+    returns the loss distribution with percentiles, VaR and CVaR.
+    """
+    service = get_risk_quantification_service(db=db, organization_id=organization.id)
+
+    for v in request.violations:
+        await service.assess_violation_risk(
+            rule_id=v.rule_id,
+            regulation=v.regulation,
+            severity=v.severity,
+            file_path=v.file_path or "",
+            aggravating_factors=v.aggravating_factors,
+            mitigating_factors=v.mitigating_factors,
+        )
+
+    try:
+        simulation = await service.simulate_exposure(
+            iterations=request.iterations,
+            correlation=request.correlation,
+            confidence=request.confidence,
+            seed=request.seed,
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.message
+        ) from e
+    return simulation.to_dict()
+
+
 @router.post("/repository-profile", response_model=RepositoryProfileResponse)
 async def generate_repository_profile(
     request: GenerateRepoProfileRequest,
@@ -4,15 +4,20 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
+import httpx
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from app.api.v1.deps import DB, CurrentOrganization, OrgMember
 from app.services.sbom import (
+    SBOMBatchItem,
+    SBOMDocument,
     SBOMFormat,
     get_sbom_analyzer,
     get_sbom_generator,
 )
+from app.services.sbom.exporter import media_type_for
 
 
 router = APIRouter()
@@ -29,8 +34,14 @@ class GenerateSBOMRequest(BaseModel):
     name: str = Field(description="Project/application name")
     version: str = Field(description="Project version")
     dependency_files: dict[str, str] = Field(
-        description="Dictionary of filename -> file content (e.g., {'package.json': '{...}'}"
+        default_factory=dict,
+        description="Dictionary of filename -> file content (e.g., {'package.json': '{...}'}",
     )
+    owner: str | None = Field(
+        default=None, description="GitHub owner to read dependency files from, with repo"
+    )
+    repo: str | None = Field(default=None, description="GitHub repository name")
+    ref: str = Field(default="HEAD", description="Git ref to read dependency files at")
     format: str = Field(
         default="cyclonedx-json",
         description="Output format: spdx-json, spdx-xml, cyclonedx-json, cyclonedx-xml",
@@ -44,6 +55,24 @@ class GenerateSBOMRequest(BaseModel):
     )
 
 
+class BatchSBOMRepository(BaseModel):
+    """One repository in a bulk SBOM request."""
+
+    name: str = Field(description="Project/application name")
+    version: str = Field(description="Project version")
+    dependency_files: dict[str, str] = Field(description="Dictionary of filename -> file content")
+    repository_id: str | None = Field(default=None, description="Optional repository ID")
+
+
+class GenerateSBOMBatchRequest(BaseModel):
+    """Request to generate SBOMs for many repositories."""
+
+    repositories: list[BatchSBOMRepository] = Field(min_length=1, max_length=5000)
+    format: str = Field(default="cyclonedx-json", description="Output format")
+    include_vulnerabilities: bool = Field(default=True)
+    include_licenses: bool = Field(default=True)
+
+
 class ComponentResponse(BaseModel):
     """SBOM component response."""
 
@@ -178,7 +207,9 @@ async def generate_sbom(
     - Known vulnerability detection
     - Compliance metadata
 
-    Supports SPDX and CycloneDX output formats.
+    Supports SPDX and CycloneDX output formats. With ``owner`` and ``repo``
+    the dependency files are read from GitHub at ``ref``; files passed in
+    ``dependency_files`` take precedence over fetched ones.
     """
     generator = get_sbom_generator()
 
@@ -189,17 +220,90 @@ async def generate_sbom(
 
     repo_id = UUID(request.repository_id) if request.repository_id else None
 
+    dependency_files = request.dependency_files
+    if request.owner and request.repo:
+        from app.services.github.client import GitHubClient
+
+        github_token = (
+            organization.settings.get("github_access_token") if organization.settings else None
+        )
+        try:
+            async with GitHubClient(access_token=github_token) as github:
+                fetched = await generator.fetch_dependency_files(
+                    github, request.owner, request.repo, request.ref
+                )
+        except httpx.HTTPError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to read dependency files: {e!s}",
+            ) from e
+        dependency_files = {**fetched, **dependency_files}
+    if not dependency_files:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Provide dependency_files, or owner and repo to read them from GitHub",
+        )
+
     sbom = await generator.generate_sbom(
         organization_id=organization.id,
         repository_id=repo_id,
         name=request.name,
         version=request.version,
-        dependency_files=request.dependency_files,
+        dependency_files=dependency_files,
+        format=format_enum,
+        include_vulnerabilities=request.include_vulnerabilities,
+        include_licenses=request.include_licenses,
+    )
+
+    return _to_sbom_response(sbom)
+
+
+@router.post("/generate/batch", response_model=list[SBOMResponse])
+async def generate_sbom_batch(
+    request: GenerateSBOMBatchRequest,
+    organization: CurrentOrganization,
+    member: OrgMember,
+    db: DB,
+) -> list[SBOMResponse]:
+    """Generate SBOMs for many repositories in one request.
+
+    Lockfiles shared between repositories are parsed once; results are
+    returned in request order.
+    """
+    generator = get_sbom_generator()
+
+    try:
+        format_enum = SBOMFormat(request.format)
+    except ValueError:
+        format_enum = SBOMFormat.CYCLONEDX_JSON
+
+    try:
+        items = [
+            SBOMBatchItem(
+                repository_id=UUID(repo.repository_id) if repo.repository_id else None,
+                name=repo.name,
+                version=repo.version,
+                dependency_files=repo.dependency_files,
+            )
+            for repo in request.repositories
+        ]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid repository ID format"
+        ) from e
+
+    sboms = await generator.generate_sbom_batch(
+        organization_id=organization.id,
+        repositories=items,
         format=format_enum,
         include_vulnerabilities=request.include_vulnerabilities,
         include_licenses=request.include_licenses,
     )
 
+    return [_to_sbom_response(sbom) for sbom in sboms]
+
+
+def _to_sbom_response(sbom: SBOMDocument) -> SBOMResponse:
     return SBOMResponse(
         id=str(sbom.id),
         name=sbom.name,
@@ -304,14 +408,17 @@ async def get_sbom(
 async def export_sbom(
     sbom_id: str,
     format: str = "cyclonedx-json",
+    gzip: bool = False,
     organization: CurrentOrganization = None,
     member: OrgMember = None,
     db: DB = None,
-) -> dict[str, Any]:
+) -> StreamingResponse:
     """Export SBOM in standard format (SPDX or CycloneDX).
 
     Returns the SBOM in the requested industry-standard format,
     suitable for submission to auditors or integration with other tools.
+    The document is streamed in chunks (JSON, or XML for ``cyclonedx-xml``);
+    pass ``gzip=true`` for a gzip-encoded response.
     """
     generator = get_sbom_generator()
 
@@ -325,13 +432,16 @@ async def export_sbom(
         ) from exc
 
     try:
-        return await generator.export_sbom(sbom_uuid, format_enum)
+        chunks = generator.stream_export(sbom_uuid, format_enum, gzip=gzip)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         ) from e
 
+    headers = {"Content-Encoding": "gzip"} if gzip else {}
+    return StreamingResponse(chunks, media_type=media_type_for(format_enum), headers=headers)
+
 
 @router.post("/analyze-compliance", response_model=ComplianceReportResponse)
 async def analyze_sbom_compliance(
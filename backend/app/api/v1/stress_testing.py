@@ -8,6 +8,7 @@ from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field
 
 from app.api.v1.deps import DB, CopilotDep
+from app.core.exceptions import ValidationError
 from app.services.stress_testing import (
     ScenarioType,
     SimulationRun,
@@ -47,8 +48,9 @@ class RunSimulationRequest(BaseModel):
     """Request to run a simulation."""
 
     scenario_id: str = Field(..., description="Scenario UUID")
-    iterations: int = Field(default=1000, ge=1)
+    iterations: int = Field(default=1000, ge=1, le=10_000_000)
     confidence: float = Field(default=0.95, ge=0.0, le=1.0)
+    seed: int | None = Field(default=None, ge=0, description="Seed for reproducible runs")
 
 
 class SimulationResultSchema(BaseModel):
@@ -62,6 +64,8 @@ class SimulationResultSchema(BaseModel):
     p99: float
     mean: float
     std_dev: float
+    value_at_risk: float
+    conditional_value_at_risk: float
     distribution: list[dict[str, Any]]
 
 
@@ -125,12 +129,17 @@ async def create_scenario(
 ) -> ScenarioSchema:
     """Create a new stress test scenario."""
     service = StressTestingService(db=db, copilot_client=copilot)
-    scenario = await service.create_scenario(
-        name=request.name,
-        scenario_type=ScenarioType(request.scenario_type),
-        description=request.description,
-        parameters=request.parameters,
-    )
+    try:
+        scenario = await service.create_scenario(
+            name=request.name,
+            scenario_type=ScenarioType(request.scenario_type),
+            description=request.description,
+            parameters=request.parameters,
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.message
+        ) from e
     return ScenarioSchema(
         id=str(scenario.id),
         name=scenario.name,
@@ -185,6 +194,7 @@ async def run_simulation(
         scenario_id=UUID(request.scenario_id),
         iterations=request.iterations,
         confidence=request.confidence,
+        seed=request.seed,
     )
     return _run_to_schema(run)
 
@@ -285,6 +295,8 @@ def _run_to_schema(run: SimulationRun) -> SimulationRunSchema:
                 p99=r.p99,
                 mean=r.mean,
                 std_dev=r.std_dev,
+                value_at_risk=r.value_at_risk,
+                conditional_value_at_risk=r.conditional_value_at_risk,
                 distribution=r.distribution,
             )
             for r in run.results
@@ -5,14 +5,16 @@ from datetime import UTC, datetime
 from uuid import UUID
 
 import structlog
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, status
 from pydantic import Field
 from sqlalchemy import select
 
 from app.api.v1.deps import DB, CurrentUser
-from app.models.production_features import WebhookIntegrationRecord
+from app.core.pagination import Pagination, SortKey
+from app.models.production_features import WebhookDeadLetterRecord, WebhookIntegrationRecord
 from app.schemas.base import BaseSchema, MessageResponse
 from app.services.webhooks.delivery import deliver
+from app.services.webhooks.subscriptions import get_subscription_cache
 
 
 logger = structlog.get_logger(__name__)
@@ -36,6 +38,9 @@ class WebhookCreateRequest(BaseSchema):
         description="Event types to subscribe to. Use '*' for all.",
     )
     target: str = Field("generic", pattern=r"^(generic|slack|teams)$")
+    batch_events: bool = Field(
+        False, description="Accept bursts of events coalesced into one batched payload."
+    )
 
 
 class WebhookRead(BaseSchema):
@@ -46,6 +51,7 @@ class WebhookRead(BaseSchema):
     url: str
     target: str
     event_types: list[str]
+    batch_events: bool = False
     active: bool
     delivery_count: int
     failure_count: int
@@ -58,6 +64,27 @@ class WebhookListResponse(BaseSchema):
 
     items: list[WebhookRead]
     total: int
+    next_cursor: str | None = None
+
+
+class DeadLetterRead(BaseSchema):
+    """A delivery that exhausted its retries."""
+
+    id: str
+    webhook_id: str
+    event_type: str
+    error: str
+    status_code: int
+    attempts: int
+    created_at: str
+
+
+class DeadLetterListResponse(BaseSchema):
+    """Pending dead letters."""
+
+    items: list[DeadLetterRead]
+    total: int
+    next_cursor: str | None = None
 
 
 # ---------------------------------------------------------------------------
@@ -75,12 +102,15 @@ async def register_webhook(body: WebhookCreateRequest, user: CurrentUser, db: DB
         url=body.url,
         target=body.target,
         event_types=body.event_types,
+        batch_events=body.batch_events,
         secret=secret,
         active=True,
     )
     db.add(record)
-    await db.flush()
+    await db.commit()
     await db.refresh(record)
+    # Only once committed, or another process may reload the old subscriptions
+    await get_subscription_cache().invalidate()
 
     logger.info("webhook.registered", id=str(record.id), url=body.url, user=user.email)
 
@@ -91,19 +121,20 @@ async def register_webhook(body: WebhookCreateRequest, user: CurrentUser, db: DB
 async def list_webhooks(
     user: CurrentUser,
     db: DB,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
+    page: Pagination,
 ) -> dict:
     """List registered outgoing webhooks."""
-    result = await db.execute(
-        select(WebhookIntegrationRecord)
-        .where(WebhookIntegrationRecord.active.is_(True))
-        .order_by(WebhookIntegrationRecord.created_at.desc())
-        .offset(skip)
-        .limit(limit)
+    result = await page.fetch(
+        db,
+        select(WebhookIntegrationRecord).where(WebhookIntegrationRecord.active.is_(True)),
+        [SortKey(WebhookIntegrationRecord.created_at), SortKey(WebhookIntegrationRecord.id)],
+        scope="webhooks",
     )
-    records = result.scalars().all()
-    return {"items": [_to_read(r) for r in records], "total": len(list(records))}
+    return {
+        "items": [_to_read(r) for r in result.items],
+        "total": result.total if result.total is not None else len(result.items),
+        "next_cursor": result.next_cursor,
+    }
 
 
 @router.delete("/{webhook_id}", response_model=MessageResponse)
@@ -117,7 +148,8 @@ async def deactivate_webhook(webhook_id: UUID, user: CurrentUser, db: DB) -> dic
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Webhook not found")
 
     record.active = False
-    await db.flush()
+    await db.commit()
+    await get_subscription_cache().invalidate()
     logger.info("webhook.deactivated", id=str(webhook_id), user=user.email)
     return {"message": "Webhook deactivated", "success": True}
 
@@ -160,6 +192,55 @@ async def test_webhook(webhook_id: UUID, user: CurrentUser, db: DB) -> dict:
     )
 
 
+@router.get("/dead-letters", response_model=DeadLetterListResponse)
+async def list_dead_letters(
+    user: CurrentUser,
+    db: DB,
+    page: Pagination,
+    webhook_id: UUID | None = None,
+) -> dict:
+    """List deliveries waiting in the dead-letter queue."""
+    query = select(WebhookDeadLetterRecord).where(WebhookDeadLetterRecord.replayed_at.is_(None))
+    if webhook_id:
+        query = query.where(WebhookDeadLetterRecord.webhook_id == webhook_id)
+    result = await page.fetch(
+        db,
+        query,
+        [
+            SortKey(WebhookDeadLetterRecord.created_at, descending=False),
+            SortKey(WebhookDeadLetterRecord.id, descending=False),
+        ],
+        scope="webhook_dead_letters",
+    )
+    records = result.items
+    return {
+        "items": [
+            {
+                "id": str(r.id),
+                "webhook_id": str(r.webhook_id),
+                "event_type": r.event_type or "",
+                "error": r.error or "",
+                "status_code": r.status_code or 0,
+                "attempts": r.attempts or 0,
+                "created_at": r.created_at.isoformat(),
+            }
+            for r in records
+        ],
+        "total": result.total if result.total is not None else len(records),
+        "next_cursor": result.next_cursor,
+    }
+
+
+@router.post("/dead-letters/replay", response_model=MessageResponse)
+async def replay_dead_letters(user: CurrentUser, webhook_id: UUID | None = None) -> dict:
+    """Queue redelivery of pending dead letters, optionally for one webhook."""
+    from app.workers.webhook_delivery_tasks import replay_dead_letters as replay_task
+
+    replay_task.delay(webhook_id=str(webhook_id) if webhook_id else None)
+    logger.info("webhook.dead_letters_replay_queued", webhook_id=str(webhook_id), user=user.email)
+    return {"message": "Dead-letter replay queued", "success": True}
+
+
 def _to_read(record: WebhookIntegrationRecord) -> dict:
     return {
         "id": str(record.id),
@@ -167,6 +248,7 @@ def _to_read(record: WebhookIntegrationRecord) -> dict:
         "url": record.url,
         "target": record.target,
         "event_types": record.event_types or [],
+        "batch_events": bool(record.batch_events),
         "active": record.active,
         "delivery_count": record.delivery_count or 0,
         "failure_count": record.failure_count or 0,
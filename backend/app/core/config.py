@@ -87,12 +87,40 @@ class Settings(BaseSettings):
 
     # Celery
     celery_broker_url: str | None = None
+    # "threads" lets tasks in one worker process share its event loop and pools
+    celery_worker_pool: str = "prefork"
+    celery_worker_concurrency: int = 4
+    worker_http_max_connections: int = 100
+    worker_http_max_keepalive: int = 20
+    # Shared pool for CPU-bound work in each process (CPU count when unset)
+    process_pool_workers: int | None = None
 
     @computed_field
     @property
     def celery_broker(self) -> str:
         return self.celery_broker_url or self.redis_url
 
+    # Repository ingestion (shallow checkouts for whole-repository analyses)
+    ingestion_workspace_dir: str | None = None
+    ingestion_max_repositories: int = 32
+    ingestion_clone_depth: int = 1
+    ingestion_lock_timeout_seconds: float = 300
+
+    # Exported evidence archives cached on disk (system temp dir when unset)
+    evidence_archive_dir: str | None = None
+    evidence_archive_max_files: int = 64
+    evidence_archive_ttl_seconds: float = 24 * 3600
+
+    # Audit packages kept in memory (least recently used and idle ones are dropped)
+    evidence_package_max_entries: int = 256
+    evidence_package_ttl_seconds: float = 24 * 3600
+
+    # Copilot chat RAG corpus index (persisted embeddings; in-memory only when unset)
+    copilot_corpus_index_dir: str | None = None
+
+    # Embedded full-text index used by the RAG pipeline when Elasticsearch is not configured
+    fulltext_index_dir: str | None = None
+
     # GitHub Copilot SDK
     copilot_api_key: str | None = None
     copilot_default_model: str = "claude-sonnet-4-20250514"
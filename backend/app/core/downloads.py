@@ -0,0 +1,94 @@
+"""Resumable file downloads with HTTP range support."""
+
+import asyncio
+import re
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single-range ``Range`` header into an inclusive byte span.
+
+    Returns ``None`` for headers this server ignores (multiple ranges or an
+    unknown unit) and raises ``ValueError`` when the range is unsatisfiable.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if match is None:
+        return None
+    start_text, end_text = match.groups()
+    if not start_text and not end_text:
+        return None
+    if not start_text:
+        # Suffix range: the last N bytes
+        length = int(end_text)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(0, size - length), size - 1
+    start = int(start_text)
+    end = min(int(end_text), size - 1) if end_text else size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+def ranged_file_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    filename: str,
+    etag: str,
+) -> Response:
+    """Stream ``path``, honouring ``Range`` and ``If-Range`` for resumed downloads."""
+    size = path.stat().st_size
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+
+    span = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range == etag):
+        try:
+            span = parse_range(range_header, size)
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{size}"},
+            )
+
+    if span is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        start, end = span
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        _read_span(path, start, end),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+async def _read_span(path: Path, start: int, end: int) -> AsyncIterator[bytes]:
+    with path.open("rb") as fh:
+        fh.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await asyncio.to_thread(fh.read, min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
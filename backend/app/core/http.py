@@ -0,0 +1,43 @@
+"""Process-wide shared HTTP connection pool.
+
+Long-lived processes (Celery workers) register one pooled transport here at
+startup; clients built per request or per task reuse its keep-alive
+connections instead of opening fresh ones. Outside such a process nothing is
+registered and callers fall back to a private client.
+"""
+
+from importlib.util import find_spec
+
+import httpx
+
+
+_shared_client: httpx.AsyncClient | None = None
+_shared_transport: httpx.AsyncHTTPTransport | None = None
+
+
+def http2_available() -> bool:
+    """Whether the optional ``h2`` package needed for HTTP/2 is installed."""
+    return find_spec("h2") is not None
+
+
+def set_shared_http(
+    client: httpx.AsyncClient | None, transport: httpx.AsyncHTTPTransport | None
+) -> None:
+    """Register (or with ``None``, clear) the shared client and transport."""
+    global _shared_client, _shared_transport
+    _shared_client = client
+    _shared_transport = transport
+
+
+def get_shared_http_client() -> httpx.AsyncClient | None:
+    """Shared client for plain requests, or ``None`` if none is registered."""
+    return _shared_client
+
+
+def get_shared_http_transport() -> httpx.AsyncHTTPTransport | None:
+    """Shared transport for clients that need their own base URL and headers.
+
+    Clients built on it must not be ``aclose()``d, since that would close
+    the pool for everyone else.
+    """
+    return _shared_transport
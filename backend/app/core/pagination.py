@@ -0,0 +1,351 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+Offset pagination makes the database walk and discard every skipped row,
+so paging through a large table costs O(n^2) overall. Keyset pagination
+instead remembers the sort key of the last row returned and asks for rows
+strictly after it, which an index on ``(filters..., sort key, id)`` answers
+directly no matter how deep the page is.
+
+Cursors are opaque to clients: a base64url JSON payload holding the scope
+(which endpoint/ordering it belongs to) and the last row's key values,
+followed by an HMAC-SHA256 signature derived from ``settings.secret_key``.
+Tampered cursors, or cursors replayed against another endpoint, are
+rejected with 400.
+
+Endpoints keep their ``skip`` parameter during the migration; when a
+``cursor`` is supplied it takes precedence. Every page advertises the next
+cursor both in a ``Link: <...>; rel="next"`` header and ``X-Next-Cursor``.
+Totals are opt-in via ``?count=exact`` or the much cheaper
+``?count=estimated`` (the PostgreSQL planner's row estimate) and are
+returned in ``X-Total-Count``.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from enum import Enum, StrEnum
+from typing import Annotated, Any
+from uuid import UUID
+
+import structlog
+from fastapi import Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import Select, and_, false, func, literal, or_, select, text, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+
+logger = structlog.get_logger(__name__)
+
+_SIGNATURE_BYTES = 16
+
+
+class CursorError(ValueError):
+    """Raised when a cursor is malformed, tampered with or out of scope."""
+
+
+class CountMode(StrEnum):
+    """How ``X-Total-Count`` is computed."""
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """One column of a keyset ordering.
+
+    ``nullable`` keys sort NULLs last in either direction; the keyset
+    predicate then treats NULL as greater than every value.
+    """
+
+    column: Any
+    descending: bool = True
+    nullable: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.column.key
+
+    def order_by(self) -> Any:
+        clause = self.column.desc() if self.descending else self.column.asc()
+        return clause.nulls_last() if self.nullable else clause
+
+
+@dataclass
+class KeysetPage:
+    """A page of rows plus the cursor for the following page."""
+
+    items: list[Any]
+    next_cursor: str | None = None
+    total: int | None = None
+    links: dict[str, str] = field(default_factory=dict)
+
+
+# ---------------------------------------------------------------------------
+# Cursor codec
+# ---------------------------------------------------------------------------
+
+
+def _signing_key() -> bytes:
+    return hashlib.sha256(b"pagination-cursor:" + settings.secret_key.encode()).digest()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _dump_value(value: Any) -> Any:
+    if value is None or isinstance(value, bool | int | float | str):
+        return value
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    if isinstance(value, Enum):
+        return _dump_value(value.value)
+    raise TypeError(f"Unsupported cursor value type: {type(value).__name__}")
+
+
+def _load_value(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    ((tag, raw),) = value.items()
+    if tag == "dt":
+        return datetime.fromisoformat(raw)
+    if tag == "d":
+        return date.fromisoformat(raw)
+    if tag == "u":
+        return UUID(raw)
+    raise CursorError(f"Unknown cursor value tag: {tag}")
+
+
+def encode_cursor(scope: str, values: Sequence[Any]) -> str:
+    """Serialize and sign the key values of the last row on a page."""
+    payload = json.dumps(
+        {"s": scope, "k": [_dump_value(v) for v in values]},
+        separators=(",", ":"),
+    ).encode()
+    signature = hmac.new(_signing_key(), payload, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+    return f"{_b64encode(payload)}.{_b64encode(signature)}"
+
+
+def decode_cursor(cursor: str, scope: str, arity: int) -> list[Any]:
+    """Verify a cursor and return its key values."""
+    try:
+        encoded_payload, encoded_signature = cursor.split(".", 1)
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except ValueError as e:
+        raise CursorError("Malformed cursor") from e
+
+    expected = hmac.new(_signing_key(), payload, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+    if not hmac.compare_digest(signature, expected):
+        raise CursorError("Invalid cursor signature")
+
+    try:
+        data = json.loads(payload)
+        values = [_load_value(v) for v in data["k"]]
+    except (ValueError, KeyError, TypeError) as e:
+        raise CursorError("Malformed cursor") from e
+    if data.get("s") != scope or len(values) != arity:
+        raise CursorError("Cursor does not belong to this listing")
+    return values
+
+
+# ---------------------------------------------------------------------------
+# Query helpers
+# ---------------------------------------------------------------------------
+
+
+def _after(key: SortKey, value: Any) -> Any:
+    """Rows that sort strictly after ``value`` on a single key."""
+    if value is None:
+        # NULLs sort last, so nothing non-NULL comes after them
+        return None
+    beyond = key.column < value if key.descending else key.column > value
+    return or_(beyond, key.column.is_(None)) if key.nullable else beyond
+
+
+def _equal(key: SortKey, value: Any) -> Any:
+    return key.column.is_(None) if value is None else key.column == value
+
+
+def keyset_predicate(keys: Sequence[SortKey], values: Sequence[Any]) -> Any:
+    """WHERE clause selecting rows after ``values`` in ``keys`` order.
+
+    Uniform, non-nullable orderings use a row comparison such as
+    ``(created_at, id) < (:v1, :v2)``, which PostgreSQL answers as a single
+    range scan on a matching composite index. Mixed directions and
+    NULLs-last keys fall back to ``k1 > v1 OR (k1 = v1 AND k2 > v2) OR ...``.
+    """
+    directions = {key.descending for key in keys}
+    if len(directions) == 1 and not any(key.nullable for key in keys):
+        row = tuple_(*(key.column for key in keys))
+        bound = tuple_(
+            *(literal(v, type_=k.column.type) for k, v in zip(keys, values, strict=True))
+        )
+        return row < bound if keys[0].descending else row > bound
+
+    clauses = []
+    for i, key in enumerate(keys):
+        step = _after(key, values[i])
+        if step is None:
+            continue
+        prefix = [_equal(k, v) for k, v in zip(keys[:i], values[:i], strict=True)]
+        clauses.append(and_(*prefix, step) if prefix else step)
+    return or_(*clauses) if clauses else false()
+
+
+def key_values(row: Any, keys: Sequence[SortKey]) -> list[Any]:
+    return [getattr(row, key.name) for key in keys]
+
+
+async def count_rows(db: AsyncSession, query: Select, mode: CountMode) -> int:
+    """Count rows matching ``query``, exactly or from planner estimates."""
+    unordered = query.order_by(None).limit(None).offset(None)
+    if mode == CountMode.ESTIMATED and db.bind.dialect.name == "postgresql":
+        # A failed EXPLAIN aborts the transaction on PostgreSQL; the savepoint
+        # keeps the session usable for the exact count below
+        try:
+            compiled = unordered.compile(
+                dialect=db.bind.dialect,
+                compile_kwargs={"literal_binds": True},
+            )
+            async with db.begin_nested():
+                result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+                plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except (SQLAlchemyError, NotImplementedError, KeyError, IndexError, TypeError) as e:
+            logger.debug("pagination.estimate_failed", error=str(e))
+    result = await db.execute(select(func.count()).select_from(unordered.subquery()))
+    return int(result.scalar() or 0)
+
+
+async def keyset_paginate(
+    db: AsyncSession,
+    query: Select,
+    keys: Sequence[SortKey],
+    *,
+    scope: str,
+    limit: int,
+    cursor: str | None = None,
+    skip: int = 0,
+) -> KeysetPage:
+    """Fetch one page of ``query`` ordered by ``keys``.
+
+    The last key must be unique (normally the primary key) so the ordering
+    is total. Without a cursor the page starts at ``skip`` for callers
+    still on offset pagination; the returned ``next_cursor`` lets them
+    switch to keyset paging from the next request on.
+    """
+    if cursor:
+        values = decode_cursor(cursor, scope, len(keys))
+        query = query.where(keyset_predicate(keys, values))
+    elif skip:
+        query = query.offset(skip)
+
+    query = query.order_by(*(key.order_by() for key in keys)).limit(limit + 1)
+    rows = list((await db.execute(query)).scalars().all())
+
+    next_cursor = None
+    if len(rows) > limit > 0:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(scope, key_values(rows[-1], keys))
+    return KeysetPage(items=rows, next_cursor=next_cursor)
+
+
+# ---------------------------------------------------------------------------
+# FastAPI integration
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class PageRequest:
+    """Paging parameters of a list request plus the response to decorate."""
+
+    request: Request
+    response: Response
+    skip: int = 0
+    limit: int = 50
+    cursor: str | None = None
+    count: CountMode | None = None
+
+    async def fetch(
+        self,
+        db: AsyncSession,
+        query: Select,
+        keys: Sequence[SortKey],
+        *,
+        scope: str,
+        skip: int | None = None,
+    ) -> KeysetPage:
+        """Paginate ``query`` and set ``Link``/``X-Next-Cursor``/``X-Total-Count``.
+
+        ``skip`` overrides the request's offset for endpoints whose legacy
+        parameter has another name.
+        """
+        try:
+            page = await keyset_paginate(
+                db,
+                query,
+                keys,
+                scope=scope,
+                limit=self.limit,
+                cursor=self.cursor,
+                skip=self.skip if skip is None else skip,
+            )
+        except CursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+        if self.count is not None:
+            page.total = await count_rows(db, query, self.count)
+            self.response.headers["X-Total-Count"] = str(page.total)
+            self.response.headers["X-Total-Count-Mode"] = self.count.value
+
+        if page.next_cursor:
+            url = self.request.url.remove_query_params(["skip", "offset", "cursor"])
+            page.links["next"] = str(url.include_query_params(cursor=page.next_cursor))
+            self.response.headers["X-Next-Cursor"] = page.next_cursor
+            self.response.headers["Link"] = ", ".join(
+                f'<{href}>; rel="{rel}"' for rel, href in page.links.items()
+            )
+        return page
+
+
+def get_page_request(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0, description="Number of records to skip (prefer cursor)"),
+    limit: int = Query(50, ge=1, le=100, description="Max records to return"),
+    cursor: str | None = Query(
+        None, description="Opaque cursor from a previous page's next_cursor or Link header"
+    ),
+    count: CountMode | None = Query(
+        None, description="Return X-Total-Count: 'exact' or planner 'estimated'"
+    ),
+) -> PageRequest:
+    return PageRequest(
+        request=request,
+        response=response,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        count=count,
+    )
+
+
+Pagination = Annotated[PageRequest, Depends(get_page_request)]
@@ -0,0 +1,87 @@
+"""Process-wide pool for CPU-bound work.
+
+Scenario batches, diff scanning and PDF page extraction hand CPU-bound work
+to worker processes. Services are mostly created per request, so a pool
+owned by a service would fork a fresh set of workers for every request and
+leak them. Instead every caller shares the one pool returned by
+``get_process_pool``. The pool is created on first use and shut down on
+exit by ``shutdown_process_pool``: from the API lifespan, on Celery worker
+shutdown, and otherwise at interpreter exit.
+
+Celery prefork children are daemonic, and ``multiprocessing`` refuses to
+start processes from a daemonic process. The pool lifts that flag while it
+starts workers. Its workers cannot outlive the task process: they exit when
+the pipe they read work from closes.
+"""
+
+import atexit
+import contextlib
+import multiprocessing
+import os
+import threading
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any
+
+import structlog
+
+from app.core.config import settings
+
+
+logger = structlog.get_logger()
+
+_pool: "SharedProcessPool | None" = None
+_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _children_allowed() -> Iterator[None]:
+    config = multiprocessing.current_process()._config
+    daemon = config.get("daemon")
+    if daemon:
+        config["daemon"] = False
+    try:
+        yield
+    finally:
+        if daemon:
+            config["daemon"] = daemon
+
+
+class SharedProcessPool(ProcessPoolExecutor):
+    """A ``ProcessPoolExecutor`` that may start workers from daemonic processes."""
+
+    def submit(self, fn: Any, /, *args: Any, **kwargs: Any) -> Future:
+        # Workers are started on demand from submit()
+        with _lock, _children_allowed():
+            return super().submit(fn, *args, **kwargs)
+
+
+def process_pool_size() -> int:
+    """Workers in the shared pool (``process_pool_workers``, else the CPU count)."""
+    return max(1, settings.process_pool_workers or os.cpu_count() or 1)
+
+
+def get_process_pool() -> ProcessPoolExecutor | None:
+    """The shared pool, or ``None`` when only one CPU is available."""
+    global _pool
+    if process_pool_size() <= 1:
+        return None
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = SharedProcessPool(max_workers=process_pool_size())
+                logger.info("process_pool.started", workers=process_pool_size())
+    return _pool
+
+
+def shutdown_process_pool(wait: bool = True) -> None:
+    """Shut the shared pool down; the next ``get_process_pool`` starts a new one."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+        logger.info("process_pool.stopped")
+
+
+atexit.register(shutdown_process_pool)
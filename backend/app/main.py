@@ -50,8 +50,14 @@ def _setup_opentelemetry(app: FastAPI) -> None:
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan events."""
     # Startup
+    from app.services.scoring.repository_scores import install_score_maintenance
+
+    install_score_maintenance()
     yield
     # Shutdown
+    from app.core.process_pool import shutdown_process_pool
+
+    shutdown_process_pool()
 
 
 def create_app() -> FastAPI:
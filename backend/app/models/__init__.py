@@ -50,6 +50,7 @@ from app.models.production_features import (
     OAuth2ClientRecord,
     RegPredictionRecord,
     RegulatorySignalRecord,
+    WebhookDeadLetterRecord,
     WebhookEventRecord,
     WebhookIntegrationRecord,
 )
@@ -165,6 +166,7 @@ __all__ = [
     "OAuth2ClientRecord",
     "RegPredictionRecord",
     "RegulatorySignalRecord",
+    "WebhookDeadLetterRecord",
     "WebhookEventRecord",
     "WebhookIntegrationRecord",
 ]
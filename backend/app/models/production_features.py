@@ -280,6 +280,22 @@ class WebhookIntegrationRecord(Base, UUIDMixin, TimestampMixin):
     delivery_count: Mapped[int] = mapped_column(Integer, default=0)
     failure_count: Mapped[int] = mapped_column(Integer, default=0)
     last_delivery_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Receiver accepts several events coalesced into one batched payload
+    batch_events: Mapped[bool] = mapped_column(Boolean, default=False)
+
+
+class WebhookDeadLetterRecord(Base, UUIDMixin, TimestampMixin):
+    """Webhook payload that exhausted its delivery attempts, kept for replay."""
+
+    __tablename__ = "webhook_dead_letters"
+
+    webhook_id: Mapped[uuid.UUID] = mapped_column(UUIDType, nullable=False, index=True)
+    event_type: Mapped[str] = mapped_column(String(100), default="")
+    payload: Mapped[dict] = mapped_column(JSONBType, default=dict)
+    error: Mapped[str] = mapped_column(Text, default="")
+    status_code: Mapped[int] = mapped_column(Integer, default=0)
+    attempts: Mapped[int] = mapped_column(Integer, default=1)
+    replayed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
 
 class AlertPolicyRecord(Base, UUIDMixin, TimestampMixin):
@@ -0,0 +1,20 @@
+"""Shared cache of static-analysis findings keyed by content and rule set."""
+
+from app.services.analysis_cache.cache import (
+    AnalysisCache,
+    Record,
+    decode_records,
+    encode_records,
+    get_analysis_cache,
+    ruleset_fingerprint,
+)
+
+
+__all__ = [
+    "AnalysisCache",
+    "Record",
+    "decode_records",
+    "encode_records",
+    "get_analysis_cache",
+    "ruleset_fingerprint",
+]
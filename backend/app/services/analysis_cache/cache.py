@@ -0,0 +1,211 @@
+"""Shared cache of static-analysis findings.
+
+PR diff scans, IDE diagnostics and IaC scans are pure functions of the
+scanned content and of the rules that ran over it, so their findings can be
+reused across PR re-pushes, rebases and IDE sessions. Entries are keyed by
+``kind:ruleset:sha256(content)``. Changing the enabled patterns (for
+example through ``add_custom_pattern``) changes the ruleset fingerprint, so
+old entries are simply no longer read and age out.
+
+Findings are stored as compact JSON arrays of primitives. A process-local
+LRU answers repeat lookups without a round trip, and Redis shares entries
+between API processes and Celery workers. Redis is optional: while it is
+unreachable the cache keeps working locally and retries after a pause.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+import structlog
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+
+logger = structlog.get_logger()
+
+Record = tuple[Any, ...]
+
+_REDIS_RETRY_SECONDS = 30.0
+_REDIS_ERRORS = (RedisError, OSError, TimeoutError)
+
+
+def ruleset_fingerprint(rules: Any) -> str:
+    """Short, stable hash of a JSON-able description of a rule set."""
+    payload = json.dumps(rules, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def encode_records(records: Sequence[Record]) -> bytes:
+    return json.dumps(list(records), separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def decode_records(data: bytes | str) -> tuple[Record, ...]:
+    return tuple(tuple(record) for record in json.loads(data))
+
+
+class AnalysisCache:
+    """Two-tier (local LRU, then Redis) cache of finding records."""
+
+    def __init__(
+        self,
+        max_entries: int = 8192,
+        ttl_seconds: int = 7 * 24 * 3600,
+        redis_url: str | None = None,
+        prefix: str = "complianceagent:analysis:",
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis_url = redis_url
+        self.prefix = prefix
+        self._local: OrderedDict[str, tuple[Record, ...]] = OrderedDict()
+        self._redis: Any = None
+        self._redis_loop: asyncio.AbstractEventLoop | None = None
+        self._closing: set[asyncio.Task] = set()
+        self._redis_retry_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(kind: str, ruleset: str, content: str) -> str:
+        digest = hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+        return f"{kind}:{ruleset}:{digest}"
+
+    # ------------------------------------------------------------------
+    # Local tier (usable from synchronous code)
+    # ------------------------------------------------------------------
+
+    def get_local(self, key: str) -> list[Record] | None:
+        records = self._local.get(key)
+        if records is None:
+            self.misses += 1
+            return None
+        self._local.move_to_end(key)
+        self.hits += 1
+        return list(records)
+
+    def put_local(self, key: str, records: Iterable[Record]) -> None:
+        self._local[key] = tuple(records)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Both tiers
+    # ------------------------------------------------------------------
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, list[Record]]:
+        """Records for every key found locally or in Redis."""
+        unique = list(dict.fromkeys(keys))
+        found: dict[str, list[Record]] = {}
+        missing: list[str] = []
+        for key in unique:
+            records = self._local.get(key)
+            if records is None:
+                missing.append(key)
+            else:
+                self._local.move_to_end(key)
+                found[key] = list(records)
+
+        client = self._client() if missing else None
+        if client is not None:
+            try:
+                values = await client.mget([self.prefix + key for key in missing])
+            except _REDIS_ERRORS as e:
+                self._redis_failed(e)
+                values = []
+            for key, value in zip(missing, values, strict=False):
+                if value is None:
+                    continue
+                try:
+                    records = decode_records(value)
+                except (ValueError, TypeError):
+                    continue
+                self.put_local(key, records)
+                found[key] = list(records)
+
+        self.hits += len(found)
+        self.misses += len(unique) - len(found)
+        return found
+
+    async def get(self, key: str) -> list[Record] | None:
+        return (await self.get_many([key])).get(key)
+
+    async def set_many(self, entries: Mapping[str, Sequence[Record]]) -> None:
+        for key, records in entries.items():
+            self.put_local(key, records)
+
+        client = self._client() if entries else None
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, records in entries.items():
+                pipe.set(self.prefix + key, encode_records(records), ex=self.ttl_seconds)
+            await pipe.execute()
+        except _REDIS_ERRORS as e:
+            self._redis_failed(e)
+
+    async def set(self, key: str, records: Sequence[Record]) -> None:
+        await self.set_many({key: records})
+
+    def _client(self) -> Any:
+        if not self.redis_url or time.monotonic() < self._redis_retry_at:
+            return None
+        from app.workers.runtime import get_worker_redis
+
+        # Celery tasks share the worker's pooled client on its persistent loop
+        shared = get_worker_redis()
+        if shared is not None:
+            return shared
+        loop = asyncio.get_running_loop()
+        if self._redis is None or self._redis_loop is not loop:
+            try:
+                import redis.asyncio as aioredis
+            except ImportError:
+                self.redis_url = None
+                return None
+            # A client is bound to the loop that created it
+            self._close_client()
+            self._redis = aioredis.from_url(
+                self.redis_url, socket_connect_timeout=0.5, socket_timeout=0.5
+            )
+            self._redis_loop = loop
+        return self._redis
+
+    def _close_client(self) -> None:
+        """Close the client this cache opened, on the loop it belongs to."""
+        client, loop = self._redis, self._redis_loop
+        self._redis = self._redis_loop = None
+        if client is None or loop is None or loop.is_closed():
+            return
+        if loop is asyncio.get_running_loop():
+            task = loop.create_task(client.aclose())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+    def _redis_failed(self, error: Exception) -> None:
+        logger.debug("analysis_cache.redis_unavailable", error=str(error))
+        self._close_client()
+        self._redis_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+
+_cache: AnalysisCache | None = None
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Get or create the process-wide analysis result cache."""
+    global _cache
+    if _cache is None:
+        _cache = AnalysisCache(redis_url=settings.redis_url)
+    return _cache
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import secrets
+from dataclasses import asdict
 from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
 
 import structlog
@@ -23,6 +25,17 @@ from app.services.audit_reports.models import (
     FrameworkDefinition,
     ReportFormat,
 )
+from app.services.evidence_archive import (
+    ArchiveEntry,
+    ArchiveResult,
+    get_archive_store,
+    json_entry,
+    write_archive,
+)
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
 
 logger = structlog.get_logger()
@@ -927,6 +940,72 @@ class AuditReportService:
             "gap_count": len(report.gaps),
         }
 
+    async def export_evidence_package_archive(self, report_id: UUID) -> ArchiveResult:
+        """Export a report's evidence package as a ZIP with a Merkle manifest."""
+        report = _reports.get(report_id)
+        if report is None:
+            raise ValueError("Report not found")
+
+        logger.info("audit_report.export_archive", report_id=str(report_id))
+
+        summary = {
+            "report_id": str(report.id),
+            "framework": report.framework.value,
+            "title": report.title,
+            "generated_at": report.generated_at.isoformat(),
+            "period_start": report.period_start.isoformat(),
+            "period_end": report.period_end.isoformat(),
+            "overall_status": report.overall_status.value,
+            "total_controls": report.evidence_summary.total_controls,
+            "compliant_controls": report.evidence_summary.compliant,
+            "coverage_pct": report.evidence_summary.coverage_pct,
+            "gap_count": len(report.gaps),
+        }
+        return await get_archive_store().get_or_build(
+            f"audit-report-{report.id}-{int(report.generated_at.timestamp())}",
+            lambda target: write_archive(target, self._archive_entries(report), summary),
+            filename=f"audit-report-{report.id}.zip",
+        )
+
+    def _archive_entries(self, report: AuditReport) -> Iterator[ArchiveEntry]:
+        yield json_entry(
+            "report.json",
+            {
+                "executive_summary": report.executive_summary,
+                "gaps": [asdict(gap) for gap in report.gaps],
+            },
+            report.generated_at,
+        )
+        for cr in report.control_results:
+            base = f"controls/{cr.control_id.replace('/', '_')}"
+            yield json_entry(
+                f"{base}/control.json",
+                {
+                    "control_id": cr.control_id,
+                    "control_name": cr.control_name,
+                    "category": cr.category,
+                    "status": cr.status.value,
+                    "findings": cr.findings,
+                    "remediation": cr.remediation,
+                },
+                cr.last_assessed,
+            )
+            for ev in cr.evidence:
+                yield json_entry(
+                    f"{base}/evidence/{ev.id}.json",
+                    {
+                        "evidence_id": str(ev.id),
+                        "type": ev.type.value,
+                        "title": ev.title,
+                        "description": ev.description,
+                        "source": ev.source,
+                        "url": ev.url,
+                        "collected_at": ev.collected_at.isoformat(),
+                        "verified": ev.verified,
+                    },
+                    ev.collected_at,
+                )
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
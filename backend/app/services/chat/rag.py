@@ -1,15 +1,41 @@
 """RAG Pipeline - Retrieval-Augmented Generation for compliance context."""
 
-from dataclasses import dataclass, field
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from typing import Any
 from uuid import UUID
 
 import structlog
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.services.fulltext import get_local_search_engine
 
 
 logger = structlog.get_logger()
 
+# Per-source deadlines for one retrieval; a source that misses it is skipped
+RETRIEVAL_SOURCE_TIMEOUTS: dict[str, float] = {
+    "regulations": 2.0,
+    "requirements": 2.0,
+    "codebase": 3.0,
+    "mappings": 2.0,
+    "vector": 3.0,
+}
+RETRIEVAL_CACHE_TTL_SECONDS = 30.0
+
+_SOURCE_ERRORS = (ConnectionError, KeyError, ValueError, RuntimeError, OSError, SQLAlchemyError)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Deadline of the source search running in the current task
+_source_timeout: ContextVar[asyncio.Timeout | None] = ContextVar("_source_timeout", default=None)
+
 
 class RAGSource(str, Enum):
     """Types of sources for RAG context."""
@@ -87,6 +113,46 @@ class RAGContext:
         ]
 
 
+class RetrievalCache:
+    """Short-lived cache of fused retrieval results.
+
+    Keyed by normalized query, organization, scope and the sources searched,
+    so follow-up turns that repeat a question skip every round-trip.
+    """
+
+    def __init__(self, ttl_seconds: float = RETRIEVAL_CACHE_TTL_SECONDS, max_entries: int = 512):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, list[RAGDocument]]] = OrderedDict()
+
+    def get(self, key: tuple) -> list[RAGDocument] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, documents = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        # Callers may rescore documents, so hand out copies
+        return [replace(doc) for doc in documents]
+
+    def put(self, key: tuple, documents: list[RAGDocument]) -> None:
+        self._entries[key] = (
+            time.monotonic() + self.ttl_seconds,
+            [replace(doc) for doc in documents],
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_retrieval_cache = RetrievalCache()
+
+
 class RAGPipeline:
     """Retrieval-Augmented Generation pipeline for compliance queries."""
 
@@ -95,10 +161,22 @@ class RAGPipeline:
         elasticsearch_client=None,
         db_session=None,
         embedding_fn=None,
+        retrieval_cache: RetrievalCache | None = None,
+        source_timeouts: dict[str, float] | None = None,
     ):
+        # Self-hosted deployments can point fulltext_index_dir at a local index
+        # that answers the same queries as the Elasticsearch cluster would
+        if elasticsearch_client is None and settings.fulltext_index_dir:
+            elasticsearch_client = get_local_search_engine()
         self.es = elasticsearch_client
         self.db = db_session
         self._embedding_fn = embedding_fn
+        self.cache = retrieval_cache if retrieval_cache is not None else _retrieval_cache
+        self.source_timeouts = {**RETRIEVAL_SOURCE_TIMEOUTS, **(source_timeouts or {})}
+        # One AsyncSession cannot run statements concurrently; DB-backed sources
+        # take turns while search-engine sources overlap with them
+        self._db_lock = asyncio.Lock()
+        self._statements: set[asyncio.Task] = set()
 
     async def retrieve(
         self,
@@ -115,42 +193,32 @@ class RAGPipeline:
         context.detected_intent = self._detect_intent(query)
         context.detected_entities = self._extract_entities(query)
 
-        # Retrieve from multiple sources based on intent
-        documents = []
-
-        # Always search regulations if relevant
-        if self._should_search_regulations(context):
-            reg_docs = await self._search_regulations(query, organization_id, regulations)
-            documents.extend(reg_docs)
+        searches = self._plan_searches(
+            query, organization_id, repository, regulations, max_documents, context
+        )
+        cache_key = (
+            _WHITESPACE_RE.sub(" ", query.strip().lower()),
+            str(organization_id),
+            repository,
+            tuple(sorted(regulations or ())),
+            tuple(searches),
+            max_documents,
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            context.documents = cached
+            logger.info("RAG retrieval served from cache", query=query[:100])
+            return context
 
-        # Search requirements
-        if self._should_search_requirements(context):
-            req_docs = await self._search_requirements(query, organization_id, regulations)
-            documents.extend(req_docs)
+        rankings, complete = await self._run_searches(searches)
 
-        # Search codebase if repository context
-        if repository and self._should_search_codebase(context):
-            code_docs = await self._search_codebase(query, organization_id, repository)
-            documents.extend(code_docs)
+        # Raw scores from ES, fixed DB scores and cosine similarity are not
+        # comparable, so merge the per-source rankings by rank instead
+        from app.services.chat.reranker import fuse_rankings
 
-        # Search mappings
-        if self._should_search_mappings(context):
-            mapping_docs = await self._search_mappings(query, organization_id, repository)
-            documents.extend(mapping_docs)
-
-        # Semantic vector search (pgvector) — supplements keyword search
-        if self.db and self._embedding_fn:
-            vector_docs = await self._vector_search(query, organization_id, max_documents)
-            # Merge vector results, deduplicating by id
-            seen_ids = {d.id for d in documents}
-            for doc in vector_docs:
-                if doc.id not in seen_ids:
-                    documents.append(doc)
-                    seen_ids.add(doc.id)
-
-        # Sort by relevance and limit
-        documents.sort(key=lambda d: d.relevance_score, reverse=True)
-        context.documents = documents[:max_documents]
+        context.documents = fuse_rankings(list(rankings.values()))[:max_documents]
+        if complete:
+            self.cache.put(cache_key, context.documents)
 
         logger.info(
             "RAG retrieval completed",
@@ -161,6 +229,100 @@ class RAGPipeline:
 
         return context
 
+    def _plan_searches(
+        self,
+        query: str,
+        organization_id: UUID,
+        repository: str | None,
+        regulations: list[str] | None,
+        max_documents: int,
+        context: RAGContext,
+    ) -> dict[str, Callable[[], Awaitable[list[RAGDocument]]]]:
+        """Select the sources to search for this query, in fusion order."""
+        searches: dict[str, Callable[[], Awaitable[list[RAGDocument]]]] = {}
+        if self._should_search_regulations(context):
+            searches["regulations"] = lambda: self._search_regulations(
+                query, organization_id, regulations
+            )
+        if self._should_search_requirements(context):
+            searches["requirements"] = lambda: self._search_requirements(
+                query, organization_id, regulations
+            )
+        if repository and self._should_search_codebase(context):
+            searches["codebase"] = lambda: self._search_codebase(query, organization_id, repository)
+        if self._should_search_mappings(context):
+            searches["mappings"] = lambda: self._search_mappings(query, organization_id, repository)
+        # Semantic vector search (pgvector) supplements keyword search
+        if self.db and self._embedding_fn:
+            searches["vector"] = lambda: self._vector_search(query, organization_id, max_documents)
+        return searches
+
+    async def _run_searches(
+        self,
+        searches: dict[str, Callable[[], Awaitable[list[RAGDocument]]]],
+    ) -> tuple[dict[str, list[RAGDocument]], bool]:
+        """Run source searches concurrently, each under its own timeout.
+
+        A source that fails or times out contributes nothing; the flag is
+        False in that case so partial results are not cached.
+        """
+
+        async def run(name: str, search: Callable[[], Awaitable[list[RAGDocument]]]):
+            try:
+                async with asyncio.timeout(self.source_timeouts.get(name, 2.0)) as timeout:
+                    _source_timeout.set(timeout)
+                    return await search()
+            except TimeoutError:
+                logger.warning("RAG source timed out", source=name)
+            except _SOURCE_ERRORS as e:
+                logger.warning("RAG source failed", source=name, error=str(e))
+            return None
+
+        results = await asyncio.gather(*(run(name, search) for name, search in searches.items()))
+        # Statements of timed-out sources still hold the session; the caller
+        # gets it back only once they are done
+        if self._statements:
+            await asyncio.gather(*self._statements, return_exceptions=True)
+        rankings = {
+            name: docs for name, docs in zip(searches, results, strict=True) if docs is not None
+        }
+        return rankings, len(rankings) == len(searches)
+
+    async def _execute(self, statement, params: dict[str, Any] | None = None):
+        """Run a statement on the shared session, one statement at a time.
+
+        Waiting for the session does not count against the source's timeout.
+        A source that times out stops waiting for its statement but does not
+        cancel it, since a statement cancelled mid-flight would leave the
+        request's session unusable.
+        """
+        acquired = asyncio.Event()
+
+        async def locked():
+            async with self._db_lock:
+                acquired.set()
+                return await self.db.execute(statement, params)
+
+        loop = asyncio.get_running_loop()
+        timeout = _source_timeout.get()
+        remaining = None
+        if timeout is not None and (when := timeout.when()) is not None:
+            remaining = when - loop.time()
+            timeout.reschedule(None)
+
+        task = asyncio.ensure_future(locked())
+        self._statements.add(task)
+        task.add_done_callback(self._statements.discard)
+        try:
+            await acquired.wait()
+        except asyncio.CancelledError:
+            if not acquired.is_set():
+                task.cancel()
+            raise
+        if remaining is not None:
+            timeout.reschedule(loop.time() + remaining)
+        return await asyncio.shield(task)
+
     def _detect_intent(self, query: str) -> str:
         """Detect the intent of the query."""
         query_lower = query.lower()
@@ -374,7 +536,7 @@ class RAGPipeline:
         if regulations:
             stmt = stmt.where(Regulation.framework.in_(regulations))
 
-        result = await self.db.execute(stmt)
+        result = await self._execute(stmt)
         regs = list(result.scalars().all())
 
         return [
@@ -416,7 +578,7 @@ class RAGPipeline:
                 .limit(5)
             )
 
-            result = await self.db.execute(stmt)
+            result = await self._execute(stmt)
             requirements = list(result.scalars().all())
 
             for req in requirements:
@@ -512,7 +674,7 @@ class RAGPipeline:
 
                 stmt = stmt.join(Repository).where(Repository.full_name == repository)
 
-            result = await self.db.execute(stmt)
+            result = await self._execute(stmt)
             mappings = list(result.scalars().all())
 
             for mapping in mappings:
@@ -615,7 +777,7 @@ class RAGPipeline:
                 LIMIT :limit
             """)
 
-            result = await self.db.execute(
+            result = await self._execute(
                 sql,
                 {
                     "embedding": str(query_embedding),
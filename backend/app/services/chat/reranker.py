@@ -63,32 +63,42 @@ def reciprocal_rank_fusion(
     where k is a constant (default 60) to prevent high-ranking items
     from dominating.
     """
-    scores: dict[str, RankedDocument] = {}
-
-    for rank, doc in enumerate(keyword_results):
-        if doc.id not in scores:
-            scores[doc.id] = RankedDocument(document=doc)
-        scores[doc.id].keyword_rank = rank
-        scores[doc.id].fused_score += keyword_weight / (k + rank)
-
-    for rank, doc in enumerate(vector_results):
-        if doc.id not in scores:
-            scores[doc.id] = RankedDocument(document=doc)
-        scores[doc.id].vector_rank = rank
-        scores[doc.id].fused_score += vector_weight / (k + rank)
-
-    ranked = sorted(scores.values(), key=lambda r: r.fused_score, reverse=True)
-
-    for item in ranked:
-        item.document.relevance_score = item.fused_score
+    fused = fuse_rankings([keyword_results, vector_results], [keyword_weight, vector_weight], k)
 
     logger.debug(
         "RRF merge completed",
         keyword_count=len(keyword_results),
         vector_count=len(vector_results),
-        merged_count=len(ranked),
+        merged_count=len(fused),
     )
 
+    return fused
+
+
+def fuse_rankings(
+    rankings: list[list[RAGDocument]],
+    weights: list[float] | None = None,
+    k: int = 60,
+) -> list[RAGDocument]:
+    """Weighted reciprocal rank fusion over any number of ranked lists.
+
+    Used directly when results come from several independent sources whose
+    raw scores are not comparable; ``reciprocal_rank_fusion`` is its
+    keyword + vector case. Documents are keyed by id; the fused score
+    replaces ``relevance_score``.
+    """
+    weights = weights or [1.0] * len(rankings)
+    scores: dict[str, RankedDocument] = {}
+
+    for ranking, weight in zip(rankings, weights, strict=True):
+        for rank, doc in enumerate(ranking):
+            if doc.id not in scores:
+                scores[doc.id] = RankedDocument(document=doc)
+            scores[doc.id].fused_score += weight / (k + rank)
+
+    ranked = sorted(scores.values(), key=lambda r: r.fused_score, reverse=True)
+    for item in ranked:
+        item.document.relevance_score = item.fused_score
     return [r.document for r in ranked]
 
 
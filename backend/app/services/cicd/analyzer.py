@@ -70,7 +70,7 @@ class CICDComplianceAnalyzer:
         issues = []
 
         # Run pattern-based analysis
-        result = self._ide_analyzer.analyze_document(
+        result = await self._ide_analyzer.analyze_document_async(
             uri=filepath,
             content=content,
             language=language,
@@ -1,5 +1,6 @@
 """Compliance Copilot Chat for non-technical users."""
 
+from app.services.copilot_chat.corpus_index import CorpusIndex, get_corpus_index
 from app.services.copilot_chat.models import (
     CannedQuery,
     ComplianceLocationResult,
@@ -15,8 +16,10 @@ __all__ = [
     "CannedQuery",
     "ComplianceLocationResult",
     "CopilotChatService",
+    "CorpusIndex",
     "PersonaView",
     "SimplifiedResponse",
     "UserPersona",
     "VisualType",
+    "get_corpus_index",
 ]
@@ -0,0 +1,454 @@
+"""Precomputed retrieval index over the copilot RAG corpus.
+
+Chunks are embedded once when they are added and their vectors live in a
+single contiguous float32 matrix, so a query is one matrix-vector product
+instead of a Python loop over every chunk. Large corpora are narrowed first
+with random-hyperplane LSH tables. Keyword relevance comes from a BM25
+inverted index over the same rows, and the two rankings are merged with the
+chat reranker's reciprocal rank fusion.
+
+Chunks are grouped by ``source_id`` so a changed regulation can be replaced
+in place without rebuilding the rest of the corpus (``update_source``, fed
+by the regulatory monitor).
+
+A saved index records the fingerprint of the seed corpus it was built from;
+when the seed changes (or the embedding width does) it is rebuilt instead
+of loaded.
+"""
+
+import hashlib
+import json
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import UUID
+
+import numpy as np
+import structlog
+
+from app.core.config import settings
+from app.services.chat.rag import RAGDocument, RAGSource
+from app.services.chat.reranker import reciprocal_rank_fusion
+from app.services.copilot_chat.models import RAGChunk
+
+
+logger = structlog.get_logger()
+
+EMBEDDING_DIM = 384
+# Below this many live rows an exact scan is cheaper than probing LSH tables
+EXACT_SEARCH_MAX_ROWS = 4096
+KEYWORD_BOOST = 0.05
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+@dataclass
+class ScoredChunk:
+    """A retrieved chunk with its similarity and keyword evidence."""
+
+    chunk: RAGChunk
+    similarity: float
+    matched_terms: int
+    fused_score: float = 0.0
+
+    @property
+    def relevance(self) -> float:
+        """Cosine similarity boosted by query-term overlap, capped at 1."""
+        return min(1.0, self.similarity + self.matched_terms * KEYWORD_BOOST)
+
+
+class BM25Index:
+    """In-memory BM25 inverted index keyed by matrix row."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self.lengths: dict[int, int] = {}
+        self._total_length = 0
+
+    def add(self, row: int, text: str) -> None:
+        terms = Counter(tokenize(text))
+        for term, tf in terms.items():
+            self.postings[term][row] = tf
+        length = sum(terms.values())
+        self.lengths[row] = length
+        self._total_length += length
+
+    def remove(self, row: int, text: str) -> None:
+        for term in set(tokenize(text)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(row, None)
+            if not posting:
+                del self.postings[term]
+        self._total_length -= self.lengths.pop(row, 0)
+
+    def search(self, terms: Iterable[str], limit: int) -> list[tuple[int, float]]:
+        """Top ``limit`` rows by BM25 score for the given query terms."""
+        n = len(self.lengths)
+        if n == 0:
+            return []
+        avgdl = self._total_length / n or 1.0
+        scores: dict[int, float] = defaultdict(float)
+        for term in set(terms):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for row, tf in posting.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[row] / avgdl)
+                scores[row] += idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
+
+    def matched_terms(self, row: int, terms: Iterable[str]) -> int:
+        return sum(1 for term in set(terms) if row in self.postings.get(term, ()))
+
+
+class _HyperplaneLSH:
+    """Random-hyperplane LSH tables over the rows of the embedding matrix."""
+
+    def __init__(self, dim: int, tables: int = 8, bits: int = 10, seed: int = 7):
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((tables, bits, dim)).astype(np.float32)
+        self._weights = (1 << np.arange(bits)).astype(np.int64)
+        self.buckets: list[dict[int, set[int]]] = [defaultdict(set) for _ in range(tables)]
+
+    def _keys(self, vector: np.ndarray) -> list[int]:
+        signs = (self.planes @ vector) > 0
+        return [int(k) for k in signs.astype(np.int64) @ self._weights]
+
+    def add(self, row: int, vector: np.ndarray) -> None:
+        for table, key in zip(self.buckets, self._keys(vector), strict=True):
+            table[key].add(row)
+
+    def remove(self, row: int, vector: np.ndarray) -> None:
+        for table, key in zip(self.buckets, self._keys(vector), strict=True):
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.discard(row)
+
+    def candidates(self, vector: np.ndarray) -> set[int]:
+        found: set[int] = set()
+        for table, key in zip(self.buckets, self._keys(vector), strict=True):
+            found |= table.get(key, set())
+        return found
+
+
+class CorpusIndex:
+    """Embedding matrix, ANN tables and BM25 index over the RAG corpus."""
+
+    def __init__(
+        self, dim: int = EMBEDDING_DIM, exact_search_max_rows: int = EXACT_SEARCH_MAX_ROWS
+    ):
+        self.dim = dim
+        self.exact_search_max_rows = exact_search_max_rows
+        self.version = 0
+        self.seed_fingerprint: str | None = None
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        self._chunks: list[RAGChunk | None] = []
+        self._rows_by_source: dict[str, list[int]] = defaultdict(list)
+        self._free_rows: list[int] = []
+        self._bm25 = BM25Index()
+        self._lsh = _HyperplaneLSH(dim)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return int(self._live.sum())
+
+    @property
+    def sources(self) -> set[str]:
+        return set(self._rows_by_source)
+
+    # ─── Updates ──────────────────────────────────────────────────────
+
+    def add(self, chunks: Iterable[RAGChunk]) -> int:
+        """Embed and index ``chunks``; returns how many were added."""
+        added = 0
+        with self._lock:
+            for chunk in chunks:
+                vector = self._vector(chunk)
+                row = self._allocate_row()
+                self._matrix[row] = vector
+                self._live[row] = True
+                self._chunks[row] = chunk
+                self._rows_by_source[chunk.source_id].append(row)
+                self._bm25.add(row, f"{chunk.title} {chunk.text}")
+                self._lsh.add(row, vector)
+                added += 1
+            if added:
+                self.version += 1
+        return added
+
+    def replace_source(self, source_id: str, chunks: Iterable[RAGChunk]) -> int:
+        """Swap the chunks of one source, e.g. after a regulation is amended.
+
+        Chunks whose text is unchanged keep their existing embedding.
+        """
+        incoming = list(chunks)
+        with self._lock:
+            previous = {
+                (c.title, c.text): c.embedding
+                for c in (self._chunks[r] for r in self._rows_by_source.get(source_id, []))
+                if c is not None
+            }
+            for chunk in incoming:
+                chunk.source_id = source_id
+                if chunk.embedding is None:
+                    chunk.embedding = previous.get((chunk.title, chunk.text))
+            self.remove_source(source_id)
+            return self.add(incoming)
+
+    def remove_source(self, source_id: str) -> int:
+        """Drop every chunk of ``source_id``; returns how many were removed."""
+        with self._lock:
+            rows = self._rows_by_source.pop(source_id, [])
+            for row in rows:
+                chunk = self._chunks[row]
+                if chunk is not None:
+                    self._bm25.remove(row, f"{chunk.title} {chunk.text}")
+                self._lsh.remove(row, self._matrix[row])
+                self._matrix[row] = 0.0
+                self._live[row] = False
+                self._chunks[row] = None
+                self._free_rows.append(row)
+            if rows:
+                self.version += 1
+            return len(rows)
+
+    def _vector(self, chunk: RAGChunk) -> np.ndarray:
+        if chunk.embedding is None or len(chunk.embedding) != self.dim:
+            chunk.compute_embedding()
+        vector = np.asarray(chunk.embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+        row = len(self._chunks)
+        if row >= self._matrix.shape[0]:
+            capacity = max(64, self._matrix.shape[0] * 2)
+            matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+            matrix[:row] = self._matrix[:row]
+            live = np.zeros(capacity, dtype=bool)
+            live[:row] = self._live[:row]
+            self._matrix, self._live = matrix, live
+        self._chunks.append(None)
+        return row
+
+    # ─── Search ───────────────────────────────────────────────────────
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        min_relevance: float | None = None,
+        candidates: int | None = None,
+    ) -> list[ScoredChunk]:
+        """Hybrid vector + BM25 search fused with reciprocal rank fusion.
+
+        Results keep the fused order; chunks whose boosted similarity is
+        below ``min_relevance`` are dropped before the top ``top_k`` are taken.
+        """
+        pool = candidates or max(top_k * 4, 20)
+        terms = tokenize(query)
+        query_vector = self._vector(RAGChunk(text=query))
+
+        with self._lock:
+            if not len(self):
+                return []
+            vector_hits = self._vector_search(query_vector, pool)
+            keyword_hits = self._bm25.search(terms, pool)
+            similarity = dict(vector_hits)
+            missing = [row for row, _ in keyword_hits if row not in similarity]
+            if missing:
+                rows = np.fromiter(missing, dtype=np.int64)
+                for row, score in zip(missing, self._matrix[rows] @ query_vector, strict=True):
+                    similarity[row] = float(score)
+
+            fused = reciprocal_rank_fusion(
+                keyword_results=[self._document(row) for row, _ in keyword_hits],
+                vector_results=[self._document(row) for row, _ in vector_hits],
+            )
+            results = []
+            for doc in fused:
+                row = int(doc.id)
+                scored = ScoredChunk(
+                    chunk=self._chunks[row],
+                    similarity=similarity[row],
+                    matched_terms=self._bm25.matched_terms(row, terms),
+                    fused_score=doc.relevance_score,
+                )
+                if min_relevance is None or scored.relevance >= min_relevance:
+                    results.append(scored)
+                    if len(results) == top_k:
+                        break
+        return results
+
+    def _vector_search(self, query_vector: np.ndarray, limit: int) -> list[tuple[int, float]]:
+        live_rows = len(self)
+        if live_rows > self.exact_search_max_rows:
+            rows = np.fromiter(self._lsh.candidates(query_vector), dtype=np.int64)
+            if len(rows) < limit:
+                rows = np.flatnonzero(self._live)
+        else:
+            rows = np.flatnonzero(self._live)
+        scores = self._matrix[rows] @ query_vector
+        if len(rows) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-scores[top])]
+        return [(int(rows[i]), float(scores[i])) for i in top]
+
+    def _document(self, row: int) -> RAGDocument:
+        chunk = self._chunks[row]
+        return RAGDocument(
+            id=str(row),
+            source=RAGSource.REGULATION,
+            title=chunk.title,
+            content=chunk.text,
+            section=chunk.section or None,
+        )
+
+    # ─── Persistence ──────────────────────────────────────────────────
+
+    def save(self, directory: Path | str, seed_fingerprint: str | None = None) -> None:
+        """Write live rows to ``directory`` so a restart skips re-embedding."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            rows = np.flatnonzero(self._live)
+            chunks = [self._chunks[row] for row in rows]
+            np.save(directory / "embeddings.npy", self._matrix[rows])
+            meta = [
+                {
+                    "id": str(c.id),
+                    "text": c.text,
+                    "source_type": c.source_type,
+                    "source_id": c.source_id,
+                    "title": c.title,
+                    "section": c.section,
+                    "metadata": c.metadata,
+                }
+                for c in chunks
+            ]
+        (directory / "chunks.json").write_text(json.dumps(meta, default=str))
+        (directory / "seed.json").write_text(json.dumps({"fingerprint": seed_fingerprint}))
+
+    @staticmethod
+    def saved_fingerprint(directory: Path | str) -> str | None:
+        """Seed fingerprint a saved index was built from, if recorded."""
+        try:
+            return json.loads((Path(directory) / "seed.json").read_text())["fingerprint"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @classmethod
+    def load(cls, directory: Path | str) -> "CorpusIndex":
+        directory = Path(directory)
+        matrix = np.load(directory / "embeddings.npy")
+        meta = json.loads((directory / "chunks.json").read_text())
+        index = cls(dim=matrix.shape[1])
+        index.add(
+            RAGChunk(
+                id=UUID(item["id"]),
+                text=item["text"],
+                source_type=item["source_type"],
+                source_id=item["source_id"],
+                title=item["title"],
+                section=item["section"],
+                metadata=item["metadata"],
+                embedding=vector.tolist(),
+            )
+            for item, vector in zip(meta, matrix, strict=True)
+        )
+        return index
+
+
+_index: CorpusIndex | None = None
+_index_lock = threading.Lock()
+
+
+def seed_fingerprint(chunks: Iterable[RAGChunk], dim: int = EMBEDDING_DIM) -> str:
+    """Hash of the chunk contents (and embedding width) an index is built from."""
+    digest = hashlib.sha256(str(dim).encode())
+    for chunk in chunks:
+        for part in (chunk.source_type, chunk.source_id, chunk.title, chunk.section, chunk.text):
+            digest.update(b"\x00" + (part or "").encode())
+    return digest.hexdigest()
+
+
+def get_corpus_index(seed: Callable[[], Iterable[RAGChunk]] | None = None) -> CorpusIndex:
+    """Get or create the process-wide corpus index.
+
+    On first use the index is loaded from ``copilot_corpus_index_dir`` when a
+    saved copy of the same seed exists, otherwise built from ``seed`` (and
+    saved there).
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = _open_index(seed)
+    return _index
+
+
+def update_source(
+    source_id: str,
+    chunks: Iterable[RAGChunk],
+    seed: Callable[[], Iterable[RAGChunk]] | None = None,
+) -> int:
+    """Replace one source in the process-wide index and in its saved copy.
+
+    The saved copy keeps the fingerprint of the seed it was built from, so
+    the next process to open it loads the update instead of rebuilding
+    from the seed. Returns how many chunks the source now has.
+    """
+    index = get_corpus_index(seed)
+    with index._lock:
+        added = index.replace_source(source_id, chunks)
+        if settings.copilot_corpus_index_dir:
+            index.save(settings.copilot_corpus_index_dir, index.seed_fingerprint)
+    logger.info("corpus_index.source_updated", source_id=source_id, chunks=added)
+    return added
+
+
+def _open_index(seed: Callable[[], Iterable[RAGChunk]] | None) -> CorpusIndex:
+    directory = (
+        Path(settings.copilot_corpus_index_dir) if settings.copilot_corpus_index_dir else None
+    )
+    chunks = list(seed()) if seed is not None else []
+    fingerprint = seed_fingerprint(chunks)
+    if directory is not None and (directory / "chunks.json").exists():
+        if CorpusIndex.saved_fingerprint(directory) != fingerprint:
+            logger.info("corpus_index.seed_changed", path=str(directory))
+        else:
+            try:
+                index = CorpusIndex.load(directory)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("corpus_index.load_failed", path=str(directory), error=str(e))
+            else:
+                logger.info("corpus_index.loaded", path=str(directory), chunks=len(index))
+                index.seed_fingerprint = fingerprint
+                return index
+
+    index = CorpusIndex()
+    index.seed_fingerprint = fingerprint
+    index.add(chunks)
+    if directory is not None:
+        index.save(directory, fingerprint)
+    logger.info("corpus_index.built", chunks=len(index))
+    return index
@@ -140,6 +140,18 @@ class SSEEvent:
     id: str = ""
     retry: int | None = None
 
+    def encode(self) -> str:
+        """Render the event in ``text/event-stream`` wire format."""
+        lines = []
+        if self.id:
+            lines.append(f"id: {self.id}")
+        if self.event:
+            lines.append(f"event: {self.event}")
+        if self.retry is not None:
+            lines.append(f"retry: {self.retry}")
+        lines.extend(f"data: {line}" for line in self.data.split("\n"))
+        return "\n".join(lines) + "\n\n"
+
 
 @dataclass
 class SimplifiedResponse:
@@ -1,22 +1,27 @@
 """Compliance Copilot Chat service for non-technical users.
 
 Production-grade with:
-- pgvector RAG pipeline for regulation corpus retrieval
+- Precomputed hybrid (vector + BM25) index for regulation corpus retrieval
 - Legal guardrails with disclaimer injection and hallucination detection
 - Citation linking to source regulations
-- Streaming SSE endpoint support
+- Token-level SSE streaming from the Copilot streaming API
 """
 
+import asyncio
 import json
-import math
 import re
 import time
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
-from uuid import UUID
+from typing import TYPE_CHECKING
+from uuid import UUID, uuid4
 
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.agents.copilot import CopilotMessage
+from app.core.exceptions import CopilotError
+from app.services.copilot_chat.corpus_index import CorpusIndex, get_corpus_index, update_source
 from app.services.copilot_chat.models import (
     CannedQuery,
     ChatMessage,
@@ -35,6 +40,11 @@ from app.services.copilot_chat.models import (
 )
 
 
+if TYPE_CHECKING:
+    from app.models.regulation import Regulation
+    from app.services.monitoring.crawler import CrawlerResult
+
+
 logger = structlog.get_logger()
 
 # Pre-built canned queries per persona
@@ -724,7 +734,8 @@ class CopilotChatService:
 
     # ─── RAG Pipeline ────────────────────────────────────────────────
 
-    def _build_rag_corpus(self) -> list[RAGChunk]:
+    @staticmethod
+    def _build_rag_corpus() -> list[RAGChunk]:
         """Build the RAG corpus from regulation text and codebase context."""
         corpus: list[RAGChunk] = []
 
@@ -746,27 +757,16 @@ class CopilotChatService:
         ]
 
         for title, source_type, source_id, text in regulation_chunks:
-            chunk = RAGChunk(
-                text=text,
-                source_type=source_type,
-                source_id=source_id,
-                title=title,
+            corpus.append(
+                RAGChunk(text=text, source_type=source_type, source_id=source_id, title=title)
             )
-            chunk.compute_embedding()
-            corpus.append(chunk)
 
         return corpus
 
-    def _cosine_similarity(self, a: list[float], b: list[float]) -> float:
-        """Compute cosine similarity between two embedding vectors."""
-        if not a or not b or len(a) != len(b):
-            return 0.0
-        dot = sum(x * y for x, y in zip(a, b, strict=True))
-        norm_a = math.sqrt(sum(x * x for x in a))
-        norm_b = math.sqrt(sum(x * x for x in b))
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return dot / (norm_a * norm_b)
+    @property
+    def corpus_index(self) -> CorpusIndex:
+        """Process-wide corpus index, embedded once from the regulation corpus."""
+        return get_corpus_index(seed=self._build_rag_corpus)
 
     async def retrieve_context(
         self,
@@ -774,52 +774,34 @@ class CopilotChatService:
         top_k: int = 5,
         min_relevance: float = 0.3,
     ) -> RAGContext:
-        """Retrieve relevant regulation chunks using semantic search."""
+        """Retrieve relevant regulation chunks using hybrid vector and BM25 search."""
         start = time.time()
-        corpus = self._build_rag_corpus()
-
-        # Compute query embedding
-        query_chunk = RAGChunk(text=query)
-        query_embedding = query_chunk.compute_embedding()
-
-        # Score all chunks
-        scored: list[tuple[RAGChunk, float]] = []
-        for chunk in corpus:
-            if chunk.embedding:
-                sim = self._cosine_similarity(query_embedding, chunk.embedding)
-                # Boost with keyword matching
-                query_words = set(query.lower().split())
-                chunk_words = set(chunk.text.lower().split())
-                keyword_overlap = len(query_words & chunk_words)
-                boosted_sim = min(1.0, sim + keyword_overlap * 0.05)
-                if boosted_sim >= min_relevance:
-                    scored.append((chunk, boosted_sim))
-
-        scored.sort(key=lambda x: x[1], reverse=True)
-        top_chunks = scored[:top_k]
+        top_chunks = self.corpus_index.search(query, top_k=top_k, min_relevance=min_relevance)
 
         # Build citations from retrieved chunks
         citations: list[Citation] = []
         chunks_data: list[dict] = []
-        for chunk, score in top_chunks:
+        for scored in top_chunks:
+            chunk = scored.chunk
+            score = round(scored.relevance, 3)
             citations.append(Citation(
                 source_type=chunk.source_type,
                 source_id=chunk.source_id,
                 title=chunk.title,
                 text_excerpt=chunk.text[:200],
-                relevance_score=round(score, 3),
+                relevance_score=score,
             ))
             chunks_data.append({
                 "title": chunk.title,
                 "text": chunk.text,
-                "relevance": round(score, 3),
+                "relevance": score,
             })
 
         retrieval_time = (time.time() - start) * 1000
         return RAGContext(
             chunks=chunks_data,
             citations=citations,
-            total_tokens=sum(len(c.text.split()) for c, _ in top_chunks),
+            total_tokens=sum(len(s.chunk.text.split()) for s in top_chunks),
             retrieval_time_ms=round(retrieval_time, 2),
         )
 
@@ -979,57 +961,143 @@ class CopilotChatService:
         self,
         session_id: UUID,
         message: str,
-    ) -> list[SSEEvent]:
-        """Stream a chat response as SSE events."""
-        # Get the full response first
-        response = await self.chat(session_id, message)
-
-        events: list[SSEEvent] = []
-
-        # Stream answer in chunks
-        words = response.answer.split()
-        chunk_size = 5
-        for i in range(0, len(words), chunk_size):
-            chunk = " ".join(words[i:i + chunk_size])
-            events.append(SSEEvent(
-                event="message",
-                data=json.dumps({"text": chunk, "index": i // chunk_size}),
-                id=f"{response.id}-{i}",
-            ))
+    ) -> AsyncIterator[SSEEvent]:
+        """Stream a chat response as SSE events while it is being generated.
+
+        Answer tokens are forwarded as ``message`` events as soon as the model
+        produces them. Retrieval runs alongside generation and its citations
+        are sent the moment they are available; guardrails are evaluated on
+        the finished answer. If the consumer stops iterating (the HTTP client
+        disconnected) the in-flight generation and retrieval are cancelled.
+        """
+        session = self._sessions.get(session_id)
+        if not session:
+            raise ValueError(f"Session not found: {session_id}")
 
-        # Stream citations
-        for citation in response.citations:
-            events.append(SSEEvent(
-                event="citation",
-                data=json.dumps({
-                    "title": citation.title,
-                    "source_type": citation.source_type,
-                    "relevance": citation.relevance_score,
-                }),
-            ))
+        session.messages.append(ChatMessage(role="user", content=message))
+        session.last_active = datetime.now(UTC)
+        prompt = self._build_persona_prompt(session.persona)
+        response_id = uuid4()
+        answer_parts: list[str] = []
+        queue: asyncio.Queue[SSEEvent | None] = asyncio.Queue()
+
+        async def produce_answer() -> None:
+            tokens = self._stream_answer(message, prompt, session.context_regulations)
+            async for token in tokens:
+                await queue.put(SSEEvent(
+                    event="message",
+                    data=json.dumps({"text": token, "index": len(answer_parts)}),
+                    id=f"{response_id}-{len(answer_parts)}",
+                ))
+                answer_parts.append(token)
+
+        async def produce_citations() -> RAGContext:
+            rag_context = await self.retrieve_context(message)
+            for citation in rag_context.citations:
+                await queue.put(SSEEvent(
+                    event="citation",
+                    data=json.dumps({
+                        "title": citation.title,
+                        "source_type": citation.source_type,
+                        "relevance": citation.relevance_score,
+                    }),
+                ))
+            return rag_context
+
+        tasks = [
+            asyncio.create_task(produce_answer()),
+            asyncio.create_task(produce_citations()),
+        ]
+        for task in tasks:
+            task.add_done_callback(lambda _: queue.put_nowait(None))
+        answer_task, retrieval_task = tasks
+
+        try:
+            finished = 0
+            while finished < len(tasks):
+                event = await queue.get()
+                if event is not None:
+                    yield event
+                    continue
+                finished += 1
+                failed = next(
+                    (t for t in tasks if t.done() and not t.cancelled() and t.exception()),
+                    None,
+                )
+                if failed is not None:
+                    logger.warning("Chat stream failed", error=str(failed.exception()))
+                    yield SSEEvent(
+                        event="error",
+                        data=json.dumps({"message": "Response generation failed"}),
+                    )
+                    return
 
-        # Stream guardrail info
-        if response.guardrail:
-            events.append(SSEEvent(
-                event="guardrail",
-                data=json.dumps({
-                    "action": response.guardrail.action.value,
-                    "confidence": response.guardrail.confidence_score,
-                    "disclaimers": response.guardrail.disclaimers,
-                }),
-            ))
+            answer_task.result()
+            rag_context = retrieval_task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
 
-        # Done event
-        events.append(SSEEvent(
-            event="done",
+        answer = "".join(answer_parts)
+        guardrail = self.evaluate_guardrails(answer, rag_context)
+        if guardrail.disclaimers:
+            suffix = "\n\n_" + guardrail.disclaimers[0] + "_"
+            answer += suffix
+            yield SSEEvent(
+                event="message",
+                data=json.dumps({"text": suffix, "index": len(answer_parts)}),
+                id=f"{response_id}-{len(answer_parts)}",
+            )
+            answer_parts.append(suffix)
+        yield SSEEvent(
+            event="guardrail",
             data=json.dumps({
-                "response_id": str(response.id),
-                "total_chunks": len(words) // chunk_size + 1,
-                "confidence": response.confidence,
+                "action": guardrail.action.value,
+                "confidence": guardrail.confidence_score,
+                "disclaimers": guardrail.disclaimers,
             }),
+        )
+
+        session.messages.append(ChatMessage(
+            role="assistant",
+            content=answer,
+            citations=rag_context.citations,
+            guardrail=guardrail,
         ))
+        yield SSEEvent(
+            event="done",
+            data=json.dumps({
+                "response_id": str(response_id),
+                "total_chunks": len(answer_parts),
+                "confidence": guardrail.confidence_score,
+            }),
+        )
 
-        return events
+    async def _stream_answer(
+        self,
+        question: str,
+        prompt: str,
+        regulations: list[str] | None,
+    ) -> AsyncIterator[str]:
+        """Yield answer tokens from the Copilot streaming API, or the fallback answer."""
+        if self.copilot is not None and hasattr(self.copilot, "chat_stream"):
+            context = f"Regulations in scope: {', '.join(regulations)}" if regulations else ""
+            messages = [CopilotMessage(role="user", content=f"{context}\n\nQuestion: {question}")]
+            started = False
+            try:
+                async with self.copilot:
+                    async for token in self.copilot.chat_stream(messages, system_message=prompt):
+                        started = True
+                        yield token
+                return
+            except CopilotError:
+                # Once tokens have reached the client the answer cannot be swapped out
+                if started:
+                    raise
+                logger.exception("AI answer streaming failed")
+
+        for word in re.findall(r"\S+\s*", self._generate_fallback_answer(question)):
+            yield word
 
     def get_session(self, session_id: UUID) -> ChatSession | None:
         """Get a chat session by ID."""
@@ -1111,3 +1179,43 @@ def _get_example_locations(regulation: str, article: str) -> list[ComplianceLoca
         return filtered if filtered else all_locations
 
     return all_locations
+
+
+def regulation_chunks(
+    source_id: str, name: str, content: str, html: bool | None = None
+) -> list[RAGChunk]:
+    """One RAG chunk per section of a crawled regulation."""
+    from app.services.monitoring.streaming import RegulatoryDocument
+
+    chunks: list[RAGChunk] = []
+    for section in RegulatoryDocument(content, html=html).sections(merge_parts=True):
+        text = " ".join(section.text.split())
+        if not text:
+            continue
+        title = f"{name} {section.kind.capitalize()} {section.number}" if section.number else name
+        chunks.append(
+            RAGChunk(
+                text=text,
+                source_type="regulation",
+                source_id=source_id,
+                title=title,
+                section=section.number or "",
+            )
+        )
+    return chunks
+
+
+async def index_regulation_change(regulation: "Regulation", result: "CrawlerResult") -> int:
+    """Monitoring change callback: re-index the sections of the changed source.
+
+    Every change of a source replaces that source's chunks, so the corpus
+    holds the latest crawl of each monitored source.
+    """
+    source = result.source
+    html = False if result.metadata.get("document_type") == "pdf" else None
+
+    def update() -> int:
+        chunks = regulation_chunks(str(source.id), source.name, result.content, html)
+        return update_source(str(source.id), chunks, seed=CopilotChatService._build_rag_corpus)
+
+    return await asyncio.to_thread(update)
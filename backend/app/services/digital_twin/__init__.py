@@ -31,6 +31,7 @@ from app.services.digital_twin.migration_planner import (
     get_migration_planner,
 )
 from app.services.digital_twin.models import (
+    BaselineContext,
     ComplianceSnapshot,
     ScenarioType,
     SimulationResult,
@@ -53,6 +54,7 @@ def get_compliance_simulator() -> ComplianceSimulator:
 
 
 __all__ = [
+    "BaselineContext",
     "BreachImpact",
     "BreachScenario",
     "CodeNode",
@@ -8,6 +8,8 @@ from uuid import UUID, uuid4
 
 import structlog
 
+from app.services.ingestion import Checkout, FileFilter
+
 
 logger = structlog.get_logger()
 
@@ -269,6 +271,10 @@ class CodebaseGraph:
         ]
 
 
+# Extensions the builder extracts structure or data-handling signals from
+SOURCE_EXTENSIONS = (".py", ".ts", ".tsx", ".js", ".jsx", ".java", ".go", ".rs", ".rb", ".sql")
+
+
 class CodebaseGraphBuilder:
     """Builds codebase graphs from source analysis."""
 
@@ -321,6 +327,23 @@ class CodebaseGraphBuilder:
 
         return graph
 
+    async def build_graph_from_checkout(
+        self,
+        repository_id: UUID,
+        organization_id: UUID,
+        checkout: Checkout,
+        file_filter: FileFilter | None = None,
+    ) -> CodebaseGraph:
+        """Build a codebase graph from every source file in a local checkout."""
+        file_filter = file_filter or FileFilter(extensions=SOURCE_EXTENSIONS)
+        files = await checkout.load_files(file_filter)
+        return await self.build_graph(
+            repository_id=repository_id,
+            organization_id=organization_id,
+            files=files,
+            commit_sha=checkout.commit_sha,
+        )
+
     async def _analyze_file(
         self,
         graph: CodebaseGraph,
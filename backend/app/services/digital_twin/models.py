@@ -94,6 +94,41 @@ class ComplianceSnapshot:
         return [i for i in self.issues if i.severity == "high"]
 
 
+@dataclass(frozen=True)
+class BaselineContext:
+    """Immutable, pre-indexed view of a baseline snapshot.
+
+    Built once per batch and shared by every scenario simulated against the
+    same baseline (and shipped once to each worker process), so scenarios
+    never re-fetch the snapshot or rescan its issue list.
+    """
+
+    snapshot_id: UUID
+    overall_score: float
+    compliance: dict[str, float]
+    issues: tuple[ComplianceIssue, ...]
+    issues_by_file: dict[str, tuple[ComplianceIssue, ...]]
+    issues_by_regulation: dict[str, tuple[ComplianceIssue, ...]]
+
+    @classmethod
+    def from_snapshot(cls, snapshot: ComplianceSnapshot) -> "BaselineContext":
+        by_file: dict[str, list[ComplianceIssue]] = {}
+        by_regulation: dict[str, list[ComplianceIssue]] = {}
+        for issue in snapshot.issues:
+            if issue.file_path is not None:
+                by_file.setdefault(issue.file_path, []).append(issue)
+            if issue.regulation:
+                by_regulation.setdefault(issue.regulation, []).append(issue)
+        return cls(
+            snapshot_id=snapshot.id,
+            overall_score=snapshot.overall_score,
+            compliance={reg.regulation: reg.score for reg in snapshot.regulations},
+            issues=tuple(snapshot.issues),
+            issues_by_file={k: tuple(v) for k, v in by_file.items()},
+            issues_by_regulation={k: tuple(v) for k, v in by_regulation.items()},
+        )
+
+
 @dataclass
 class ScenarioParameter:
     """A configurable parameter for scenario simulation."""
@@ -1,6 +1,10 @@
 """Compliance Simulator - What-if analysis for compliance changes."""
 
+import asyncio
+import dataclasses
 import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID
@@ -8,11 +12,12 @@ from uuid import UUID
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.process_pool import get_process_pool, process_pool_size
 from app.services.digital_twin.models import (
+    BaselineContext,
     BlastRadiusMap,
     BlastRadiusNode,
     ComplianceIssue,
-    ComplianceSnapshot,
     CostEstimate,
     ExecutiveDashboard,
     ScenarioComparison,
@@ -25,17 +30,31 @@ from app.services.digital_twin.snapshot import SnapshotManager, get_snapshot_man
 
 logger = structlog.get_logger()
 
+# Indexed baselines kept per simulator
+_BASELINE_CACHE_SIZE = 16
+
 
 class ComplianceSimulator:
     """Simulates compliance impact of proposed changes."""
 
+    # Batches smaller than this run inline: a scenario takes microseconds,
+    # so shipping it to a worker process costs more than evaluating it.
+    inline_batch_size = 1000
+
     def __init__(
-        self, db: AsyncSession | None = None, snapshot_manager: SnapshotManager | None = None
+        self,
+        db: AsyncSession | None = None,
+        snapshot_manager: SnapshotManager | None = None,
+        memo_size: int = 1024,
     ):
         self.db = db
         self.snapshot_manager = snapshot_manager or get_snapshot_manager()
         self._scenarios: dict[UUID, SimulationScenario] = {}
         self._results: dict[UUID, SimulationResult] = {}
+        self._baselines: OrderedDict[UUID, BaselineContext] = OrderedDict()
+        self._memo_size = memo_size
+        self._cost_cache: OrderedDict[tuple, CostEstimate] = OrderedDict()
+        self._blast_radius_cache: OrderedDict[tuple, BlastRadiusMap] = OrderedDict()
 
     async def create_scenario(
         self,
@@ -93,50 +112,145 @@ class ComplianceSimulator:
         Returns:
             SimulationResult with before/after comparison
         """
-        start_time = time.perf_counter()
-
         scenario = self._scenarios.get(scenario_id)
         if not scenario:
             raise ValueError(f"Scenario {scenario_id} not found")
 
-        # Get baseline snapshot
+        context = await self._load_baseline(baseline_snapshot_id, scenario.organization_id)
+        result = self._finalize(scenario, self._evaluate(scenario, context))
+
+        logger.info(
+            "Simulation completed",
+            scenario_id=str(scenario_id),
+            passed=result.passed,
+            score_delta=result.score_delta,
+            new_issues=len(result.new_issues),
+            duration_ms=result.duration_ms,
+        )
+
+        return result
+
+    async def simulate_batch(
+        self,
+        scenario_ids: list[UUID],
+        baseline_snapshot_id: UUID | None = None,
+        max_workers: int | None = None,
+    ) -> AsyncIterator[SimulationResult]:
+        """Run many scenarios against one baseline, yielding results as they complete.
+
+        The baseline is loaded and indexed once, then shared by every scenario.
+        Batches of at least ``inline_batch_size`` scenarios are split into one
+        chunk per worker and evaluated in the shared process pool, each chunk
+        carrying the baseline with it; smaller batches run inline. Cost
+        estimates and blast-radius maps are memoized, so scenarios with
+        identical change sets reuse them.
+
+        Args:
+            scenario_ids: Scenarios to simulate (all from the same organization)
+            baseline_snapshot_id: Baseline snapshot (uses latest if not provided)
+            max_workers: Worker processes to use at most (defaults to the pool
+                size; 1 runs inline)
+
+        Yields:
+            SimulationResult for each scenario, in completion order
+        """
+        scenarios = []
+        for scenario_id in scenario_ids:
+            scenario = self._scenarios.get(scenario_id)
+            if not scenario:
+                raise ValueError(f"Scenario {scenario_id} not found")
+            scenarios.append(scenario)
+        if not scenarios:
+            return
+
+        organizations = {s.organization_id for s in scenarios}
+        if baseline_snapshot_id is None and len(organizations) > 1:
+            msg = "Batch scenarios span organizations; pass an explicit baseline snapshot"
+            raise ValueError(msg)
+
+        context = await self._load_baseline(baseline_snapshot_id, scenarios[0].organization_id)
+        pool = get_process_pool() if len(scenarios) >= self.inline_batch_size else None
+        workers = min(max_workers or process_pool_size(), process_pool_size()) if pool else 1
+
+        logger.info(
+            "Running simulation batch",
+            scenarios=len(scenarios),
+            baseline_snapshot_id=str(context.snapshot_id),
+            workers=workers,
+        )
+
+        if pool is None or workers <= 1:
+            for scenario in scenarios:
+                yield self._finalize(scenario, self._evaluate(scenario, context))
+            return
+
+        loop = asyncio.get_running_loop()
+        by_id = {scenario.id: scenario for scenario in scenarios}
+        futures = [
+            loop.run_in_executor(pool, _evaluate_chunk, context, scenarios[i::workers])
+            for i in range(workers)
+        ]
+        try:
+            for next_done in asyncio.as_completed(futures):
+                for result in await next_done:
+                    yield self._finalize(by_id[result.scenario_id], result)
+        finally:
+            # The pool is shared; only drop this batch's queued chunks
+            for future in futures:
+                future.cancel()
+
+    async def _load_baseline(
+        self,
+        baseline_snapshot_id: UUID | None,
+        organization_id: UUID | None,
+    ) -> BaselineContext:
+        """Fetch a baseline snapshot and return its shared, indexed context."""
         baseline = None
         if baseline_snapshot_id:
             baseline = await self.snapshot_manager.get_snapshot(baseline_snapshot_id)
-        elif scenario.organization_id:
-            baseline = await self.snapshot_manager.get_latest_snapshot(scenario.organization_id)
+        elif organization_id:
+            baseline = await self.snapshot_manager.get_latest_snapshot(organization_id)
 
         if not baseline:
             raise ValueError("No baseline snapshot available")
 
-        # Create simulation result
-        result = SimulationResult(
-            scenario_id=scenario_id,
-            baseline_snapshot_id=baseline.id,
-            baseline_score=baseline.overall_score,
+        return self._memoized(
+            self._baselines,
+            baseline.id,
+            lambda: BaselineContext.from_snapshot(baseline),
+            max_size=_BASELINE_CACHE_SIZE,
         )
 
-        # Capture baseline compliance by regulation
-        for reg in baseline.regulations:
-            result.compliance_before[reg.regulation] = reg.score
+    def _evaluate(self, scenario: SimulationScenario, context: BaselineContext) -> SimulationResult:
+        """Apply a scenario to a baseline and score it.
+
+        Pure with respect to simulator state, so it can run in a worker process.
+        """
+        start_time = time.perf_counter()
+        result = SimulationResult(
+            scenario_id=scenario.id,
+            baseline_snapshot_id=context.snapshot_id,
+            baseline_score=context.overall_score,
+            compliance_before=dict(context.compliance),
+        )
 
         # Run simulation based on scenario type
         if scenario.scenario_type == ScenarioType.CODE_CHANGE:
-            await self._simulate_code_change(scenario, baseline, result)
+            self._simulate_code_change(scenario, context, result)
         elif scenario.scenario_type == ScenarioType.ARCHITECTURE_CHANGE:
-            await self._simulate_architecture_change(scenario, baseline, result)
+            self._simulate_architecture_change(scenario, context, result)
         elif scenario.scenario_type == ScenarioType.VENDOR_CHANGE:
-            await self._simulate_vendor_change(scenario, baseline, result)
+            self._simulate_vendor_change(scenario, context, result)
         elif scenario.scenario_type == ScenarioType.REGULATION_ADOPTION:
-            await self._simulate_regulation_adoption(scenario, baseline, result)
+            self._simulate_regulation_adoption(scenario, context, result)
         elif scenario.scenario_type == ScenarioType.DATA_FLOW_CHANGE:
-            await self._simulate_data_flow_change(scenario, baseline, result)
+            self._simulate_data_flow_change(scenario, context, result)
         elif scenario.scenario_type == ScenarioType.INFRASTRUCTURE_CHANGE:
-            await self._simulate_infrastructure_change(scenario, baseline, result)
+            self._simulate_infrastructure_change(scenario, context, result)
         elif scenario.scenario_type == ScenarioType.JURISDICTION_EXPANSION:
-            await self._simulate_jurisdiction_expansion(scenario, baseline, result)
+            self._simulate_jurisdiction_expansion(scenario, context, result)
         elif scenario.scenario_type == ScenarioType.MERGER_ACQUISITION:
-            await self._simulate_merger_acquisition(scenario, baseline, result)
+            self._simulate_merger_acquisition(scenario, context, result)
 
         # Calculate final metrics
         result.score_delta = result.simulated_score - result.baseline_score
@@ -145,35 +259,64 @@ class ComplianceSimulator:
 
         # Generate recommendations
         result.recommendations = self._generate_recommendations(scenario, result)
-
-        # Calculate cost/effort/timeline
-        result.cost_estimate = self._estimate_cost(scenario, result)
-
-        # Generate blast radius map
-        result.blast_radius = self._compute_blast_radius(scenario, result)
-
-        # Timing
-        result.completed_at = datetime.now(UTC)
         result.duration_ms = (time.perf_counter() - start_time) * 1000
 
-        # Store result
-        self._results[result.id] = result
+        return result
 
-        logger.info(
-            "Simulation completed",
-            scenario_id=str(scenario_id),
-            passed=result.passed,
-            score_delta=result.score_delta,
-            new_issues=len(result.new_issues),
-            duration_ms=result.duration_ms,
+    def _finalize(
+        self,
+        scenario: SimulationScenario,
+        result: SimulationResult,
+    ) -> SimulationResult:
+        """Attach memoized cost/blast radius, stamp timing and store the result."""
+        start_time = time.perf_counter()
+        result.cost_estimate = self._memoized(
+            self._cost_cache,
+            (
+                scenario.scenario_type,
+                len(result.new_issues),
+                result.new_critical_issues,
+            ),
+            lambda: self._estimate_cost(scenario, result),
         )
+        # Keyed on what the map is built from; the name is stamped on afterwards
+        blast_radius = self._memoized(
+            self._blast_radius_cache,
+            (
+                scenario.scenario_type,
+                tuple((i.regulation, i.severity, i.category) for i in result.new_issues),
+                tuple(scenario.new_components),
+            ),
+            lambda: self._compute_blast_radius(scenario, result),
+        )
+        result.blast_radius = _with_center(blast_radius, scenario.name)
 
+        result.completed_at = datetime.now(UTC)
+        result.duration_ms += (time.perf_counter() - start_time) * 1000
+        self._results[result.id] = result
         return result
 
-    async def _simulate_code_change(
+    def _memoized(
+        self,
+        cache: OrderedDict[Any, Any],
+        key: Any,
+        compute: Any,
+        max_size: int | None = None,
+    ) -> Any:
+        """LRU lookup for sub-results shared between scenarios (treat as read-only)."""
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        value = compute()
+        cache[key] = value
+        if len(cache) > (max_size or self._memo_size):
+            cache.popitem(last=False)
+        return value
+
+    def _simulate_code_change(
         self,
         scenario: SimulationScenario,
-        baseline: ComplianceSnapshot,
+        baseline: BaselineContext,
         result: SimulationResult,
     ) -> None:
         """Simulate impact of code changes."""
@@ -188,11 +331,10 @@ class ComplianceSimulator:
 
             # Check if changes resolve existing issues
             if change_type in {"modify", "delete"}:
-                for existing_issue in baseline.issues:
-                    if existing_issue.file_path == file_path:
-                        # Check if the issue's code pattern is no longer present
-                        if existing_issue.code not in content:
-                            result.resolved_issues.append(existing_issue)
+                for existing_issue in baseline.issues_by_file.get(file_path, ()):
+                    # Check if the issue's code pattern is no longer present
+                    if existing_issue.code not in content:
+                        result.resolved_issues.append(existing_issue)
 
             result.new_issues.extend(new_file_issues)
 
@@ -202,10 +344,10 @@ class ComplianceSimulator:
             baseline, result.new_issues, result.resolved_issues
         )
 
-    async def _simulate_architecture_change(
+    def _simulate_architecture_change(
         self,
         scenario: SimulationScenario,
-        baseline: ComplianceSnapshot,
+        baseline: BaselineContext,
         result: SimulationResult,
     ) -> None:
         """Simulate impact of architecture changes."""
@@ -258,10 +400,10 @@ class ComplianceSimulator:
             baseline, result.new_issues, result.resolved_issues
         )
 
-    async def _simulate_vendor_change(
+    def _simulate_vendor_change(
         self,
         scenario: SimulationScenario,
-        baseline: ComplianceSnapshot,
+        baseline: BaselineContext,
         result: SimulationResult,
     ) -> None:
         """Simulate impact of vendor/third-party changes."""
@@ -311,10 +453,10 @@ class ComplianceSimulator:
             baseline, result.new_issues, result.resolved_issues
         )
 
-    async def _simulate_regulation_adoption(
+    def _simulate_regulation_adoption(
         self,
         scenario: SimulationScenario,
-        baseline: ComplianceSnapshot,
+        baseline: BaselineContext,
         result: SimulationResult,
     ) -> None:
         """Simulate impact of adopting new regulations."""
@@ -340,18 +482,16 @@ class ComplianceSimulator:
         for reg in scenario.removed_regulations:
             result.compliance_after.pop(reg, None)
             # Removing a regulation may resolve some issues
-            for issue in baseline.issues:
-                if issue.regulation == reg:
-                    result.resolved_issues.append(issue)
+            result.resolved_issues.extend(baseline.issues_by_regulation.get(reg, ()))
 
         result.simulated_score = self._calculate_simulated_score(
             baseline, result.new_issues, result.resolved_issues
         )
 
-    async def _simulate_data_flow_change(
+    def _simulate_data_flow_change(
         self,
         scenario: SimulationScenario,
-        baseline: ComplianceSnapshot,
+        baseline: BaselineContext,
         result: SimulationResult,
     ) -> None:
         """Simulate impact of data flow changes."""
@@ -391,10 +531,10 @@ class ComplianceSimulator:
             baseline, result.new_issues, result.resolved_issues
         )
 
-    async def _simulate_infrastructure_change(
+    def _simulate_infrastructure_change(
         self,
         scenario: SimulationScenario,
-        baseline: ComplianceSnapshot,
+        baseline: BaselineContext,
         result: SimulationResult,
     ) -> None:
         """Simulate impact of infrastructure changes."""
@@ -470,7 +610,7 @@ class ComplianceSimulator:
 
     def _calculate_simulated_score(
         self,
-        baseline: ComplianceSnapshot,
+        baseline: BaselineContext,
         new_issues: list[ComplianceIssue],
         resolved_issues: list[ComplianceIssue],
     ) -> float:
@@ -554,10 +694,10 @@ class ComplianceSimulator:
 
     # ─── Jurisdiction Expansion / M&A ─────────────────────────────────
 
-    async def _simulate_jurisdiction_expansion(
+    def _simulate_jurisdiction_expansion(
         self,
         scenario: SimulationScenario,
-        baseline: ComplianceSnapshot,
+        baseline: BaselineContext,
         result: SimulationResult,
     ) -> None:
         """Simulate impact of expanding into new jurisdictions."""
@@ -598,10 +738,10 @@ class ComplianceSimulator:
             baseline, result.new_issues, result.resolved_issues
         )
 
-    async def _simulate_merger_acquisition(
+    def _simulate_merger_acquisition(
         self,
         scenario: SimulationScenario,
-        baseline: ComplianceSnapshot,
+        baseline: BaselineContext,
         result: SimulationResult,
     ) -> None:
         """Simulate compliance impact of a merger or acquisition."""
@@ -913,6 +1053,28 @@ class ComplianceSimulator:
         )
 
 
+def _with_center(blast_radius: BlastRadiusMap, center: str) -> BlastRadiusMap:
+    """A memoized blast-radius map, centred on the given scenario."""
+    if blast_radius.center == center:
+        return blast_radius
+    nodes = [
+        dataclasses.replace(node, name=center) if node.id == "origin" else node
+        for node in blast_radius.nodes
+    ]
+    return dataclasses.replace(blast_radius, center=center, nodes=nodes)
+
+
+# ─── Worker-process entry point ───────────────────────────────────────
+
+
+def _evaluate_chunk(
+    context: BaselineContext, scenarios: list[SimulationScenario]
+) -> list[SimulationResult]:
+    """Evaluate a chunk of scenarios against a baseline in a pool worker."""
+    simulator = ComplianceSimulator(snapshot_manager=SnapshotManager())
+    return [simulator._evaluate(scenario, context) for scenario in scenarios]
+
+
 # Global instance
 _simulator: ComplianceSimulator | None = None
 
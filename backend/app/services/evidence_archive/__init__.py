@@ -0,0 +1,34 @@
+"""Streaming, verifiable evidence package archives."""
+
+from app.services.evidence_archive.merkle import (
+    MerkleTree,
+    ProofStep,
+    leaf_hash,
+    verify_proof,
+)
+from app.services.evidence_archive.writer import (
+    MANIFEST_NAME,
+    ArchiveEntry,
+    ArchiveResult,
+    ArchiveStore,
+    bytes_entry,
+    get_archive_store,
+    json_entry,
+    write_archive,
+)
+
+
+__all__ = [
+    "MANIFEST_NAME",
+    "ArchiveEntry",
+    "ArchiveResult",
+    "ArchiveStore",
+    "MerkleTree",
+    "ProofStep",
+    "bytes_entry",
+    "get_archive_store",
+    "json_entry",
+    "leaf_hash",
+    "verify_proof",
+    "write_archive",
+]
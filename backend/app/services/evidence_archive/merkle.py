@@ -0,0 +1,72 @@
+"""Merkle tree over archive entries.
+
+Leaves commit to an entry's path and content digest, interior nodes to
+their two children (RFC 6962 style domain separation, so a leaf can never
+be passed off as a node). An unpaired node at the end of a level is
+promoted unchanged. With the manifest's leaf list an auditor can verify
+any subset of files without the rest of the archive, and a single file can
+be checked against the root with an inclusion proof.
+"""
+
+import hashlib
+from dataclasses import dataclass
+
+
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+
+def leaf_hash(path: str, content_sha256: str) -> bytes:
+    """Leaf for an entry whose content hashes to ``content_sha256`` (hex)."""
+    return hashlib.sha256(
+        _LEAF_PREFIX + path.encode() + b"\x00" + bytes.fromhex(content_sha256)
+    ).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(_NODE_PREFIX + left + right).digest()
+
+
+@dataclass(frozen=True)
+class ProofStep:
+    """Sibling hash and whether it sits to the left of the running hash."""
+
+    sibling: str
+    left: bool
+
+
+class MerkleTree:
+    """Binary Merkle tree built bottom-up from leaf hashes."""
+
+    def __init__(self, leaves: list[bytes]):
+        self.levels: list[list[bytes]] = [list(leaves)]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    @property
+    def root(self) -> str:
+        top = self.levels[-1]
+        return top[0].hex() if top else hashlib.sha256(b"").hexdigest()
+
+    def proof(self, index: int) -> list[ProofStep]:
+        """Inclusion proof for leaf ``index``."""
+        steps = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                steps.append(ProofStep(sibling=level[sibling].hex(), left=sibling < index))
+            index //= 2
+        return steps
+
+
+def verify_proof(leaf: bytes, proof: list[ProofStep], root: str) -> bool:
+    """Check that ``leaf`` is included in the tree with ``root``."""
+    running = leaf
+    for step in proof:
+        sibling = bytes.fromhex(step.sibling)
+        running = node_hash(sibling, running) if step.left else node_hash(running, sibling)
+    return running.hex() == root
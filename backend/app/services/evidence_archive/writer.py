@@ -0,0 +1,321 @@
+"""Streaming ZIP writer for evidence packages.
+
+Entries are pulled one at a time from an (async) iterable and their content
+is copied chunk by chunk into the archive on disk, so memory use does not
+grow with the number or size of evidence blobs. ``manifest.json`` is written
+last and lists every entry's path, size and SHA-256 together with the
+Merkle root over all of them.
+
+Timestamps come from the entries (never the clock), so the same content
+always produces the same bytes; the ETag is the SHA-256 of the file.
+Finished archives are cached on disk by ``ArchiveStore`` and evicted once
+they are older than its TTL or exceed its file budget, least recently
+served first.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zipfile
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import structlog
+
+from app.core.config import settings
+from app.services.evidence_archive.merkle import MerkleTree, leaf_hash
+
+
+logger = structlog.get_logger()
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = "complianceagent-evidence-package/1"
+CHUNK_SIZE = 64 * 1024
+
+# ZIP cannot represent timestamps before 1980
+_ZIP_EPOCH = datetime(1980, 1, 1, tzinfo=UTC)
+
+
+@dataclass(frozen=True)
+class ArchiveEntry:
+    """One file in the archive; ``chunks`` is called once to stream its content."""
+
+    path: str
+    chunks: Callable[[], AsyncIterator[bytes]]
+    modified_at: datetime | None = None
+    size: int | None = None
+
+
+def bytes_entry(path: str, data: bytes | str, modified_at: datetime | None = None) -> ArchiveEntry:
+    """Entry for content that is already in memory."""
+    payload = data.encode() if isinstance(data, str) else data
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for start in range(0, len(payload), CHUNK_SIZE):
+            yield payload[start : start + CHUNK_SIZE]
+
+    return ArchiveEntry(path=path, chunks=chunks, modified_at=modified_at, size=len(payload))
+
+
+def json_entry(path: str, obj: Any, modified_at: datetime | None = None) -> ArchiveEntry:
+    return bytes_entry(path, json.dumps(obj, indent=2, default=str), modified_at)
+
+
+@dataclass
+class ArchiveResult:
+    """A finished archive on disk."""
+
+    path: Path
+    size: int
+    merkle_root: str
+    entries: int
+    sha256: str
+    filename: str = ""
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.sha256}"'
+
+
+@dataclass
+class _ManifestEntry:
+    path: str
+    size: int
+    sha256: str
+    leaf: int
+
+
+@dataclass
+class _Manifest:
+    package: dict[str, Any]
+    entries: list[_ManifestEntry] = field(default_factory=list)
+    leaves: list[bytes] = field(default_factory=list)
+
+    def add(self, path: str, size: int, sha256: str) -> None:
+        self.entries.append(_ManifestEntry(path, size, sha256, leaf=len(self.leaves)))
+        self.leaves.append(leaf_hash(path, sha256))
+
+    def render(self, root: str) -> str:
+        return json.dumps(
+            {
+                "format": MANIFEST_FORMAT,
+                "package": self.package,
+                "merkle": {
+                    "algorithm": "sha256",
+                    "leaf": "sha256(0x00 || path || 0x00 || content_sha256)",
+                    "node": "sha256(0x01 || left || right); unpaired nodes are promoted",
+                    "root": root,
+                    "leaf_count": len(self.leaves),
+                },
+                "entries": [asdict(entry) for entry in self.entries],
+            },
+            indent=2,
+            default=str,
+        )
+
+
+async def write_archive(
+    target: Path,
+    entries: AsyncIterable[ArchiveEntry] | Iterable[ArchiveEntry],
+    package: dict[str, Any],
+) -> ArchiveResult:
+    """Write ``entries`` and a Merkle manifest to a ZIP file at ``target``.
+
+    Entries without ``modified_at`` are dated 1980-01-01 and the manifest
+    carries the latest entry date.
+    """
+    manifest = _Manifest(package=package)
+    latest = _ZIP_EPOCH
+
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+        async for entry in _aiter(entries):
+            modified_at = (entry.modified_at or _ZIP_EPOCH).astimezone(UTC)
+            latest = max(latest, modified_at)
+            info = _zip_info(entry.path, modified_at)
+            digest = hashlib.sha256()
+            size = 0
+            force_zip64 = entry.size is None or entry.size >= zipfile.ZIP64_LIMIT
+            with zf.open(info, "w", force_zip64=force_zip64) as out:
+                async for chunk in entry.chunks():
+                    digest.update(chunk)
+                    size += len(chunk)
+                    # Deflate runs off the event loop
+                    await asyncio.to_thread(out.write, chunk)
+            manifest.add(entry.path, size, digest.hexdigest())
+
+        tree = MerkleTree(manifest.leaves)
+        zf.writestr(_zip_info(MANIFEST_NAME, latest), manifest.render(tree.root))
+
+    result = ArchiveResult(
+        path=target,
+        size=target.stat().st_size,
+        merkle_root=tree.root,
+        entries=len(manifest.entries),
+        sha256=await asyncio.to_thread(_file_sha256, target),
+    )
+    logger.info(
+        "evidence_archive.written",
+        path=str(target),
+        entries=result.entries,
+        size=result.size,
+        merkle_root=result.merkle_root,
+    )
+    return result
+
+
+class ArchiveStore:
+    """Finished archives on local disk, keyed by package version.
+
+    Downloads are served from these files so range requests always see the
+    same bytes; a key is built at most once at a time per process. After
+    each build, archives not served for ``ttl_seconds`` are deleted, then
+    the least recently served beyond ``max_archives``.
+    """
+
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        max_archives: int = 64,
+        ttl_seconds: float = 24 * 3600,
+    ):
+        self.root = Path(root or Path(tempfile.gettempdir()) / "complianceagent-exports")
+        self.max_archives = max_archives
+        self.ttl_seconds = ttl_seconds
+        self._building: dict[str, asyncio.Future[ArchiveResult]] = {}
+
+    async def get_or_build(
+        self,
+        key: str,
+        build: Callable[[Path], Awaitable[ArchiveResult]],
+        filename: str | None = None,
+    ) -> ArchiveResult:
+        """Return the archive for ``key``, writing it with ``build`` if missing."""
+        archive = self.root / f"{key}.zip"
+        meta = self.root / f"{key}.json"
+        cached = self._load(archive, meta)
+        if cached is not None:
+            return cached
+
+        future = self._building.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._build(archive, meta, build, filename or archive.name)
+            )
+            self._building[key] = future
+            future.add_done_callback(lambda _: self._building.pop(key, None))
+        return await asyncio.shield(future)
+
+    def prune(self, keep: Path | None = None) -> int:
+        """Delete expired archives and the least recently served over budget."""
+        if not self.root.exists():
+            return 0
+        archives = []
+        for path in self.root.glob("*.zip"):
+            try:
+                archives.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        archives.sort(reverse=True)
+        expired = time.time() - self.ttl_seconds
+        removed = 0
+        for rank, (served_at, path) in enumerate(archives):
+            if path == keep or (rank < self.max_archives and served_at >= expired):
+                continue
+            path.unlink(missing_ok=True)
+            path.with_suffix(".json").unlink(missing_ok=True)
+            removed += 1
+        if removed:
+            logger.info("evidence_archive.pruned", removed=removed)
+        return removed
+
+    def _load(self, archive: Path, meta: Path) -> ArchiveResult | None:
+        try:
+            data = json.loads(meta.read_text())
+            # Served now: eviction is least recently served first
+            os.utime(archive)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if "sha256" not in data:
+            # Written before archives carried a content hash
+            return None
+        return ArchiveResult(path=archive, **data)
+
+    async def _build(
+        self,
+        archive: Path,
+        meta: Path,
+        build: Callable[[Path], Awaitable[ArchiveResult]],
+        filename: str,
+    ) -> ArchiveResult:
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Unique per writer so concurrent builders in other processes never interleave
+        partial = archive.with_name(f"{archive.name}.{uuid4().hex}.partial")
+        try:
+            result = await build(partial)
+            partial.replace(archive)
+        finally:
+            partial.unlink(missing_ok=True)
+        result.path = archive
+        result.filename = filename
+        meta.write_text(
+            json.dumps(
+                {
+                    "size": result.size,
+                    "merkle_root": result.merkle_root,
+                    "entries": result.entries,
+                    "sha256": result.sha256,
+                    "filename": result.filename,
+                }
+            )
+        )
+        await asyncio.to_thread(self.prune, archive)
+        return result
+
+
+async def _aiter(
+    entries: AsyncIterable[ArchiveEntry] | Iterable[ArchiveEntry],
+) -> AsyncIterator[ArchiveEntry]:
+    if isinstance(entries, AsyncIterable):
+        async for entry in entries:
+            yield entry
+    else:
+        for entry in entries:
+            yield entry
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _zip_info(path: str, modified_at: datetime) -> zipfile.ZipInfo:
+    moment = max(modified_at.astimezone(UTC), _ZIP_EPOCH)
+    info = zipfile.ZipInfo(path, date_time=moment.timetuple()[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+    return info
+
+
+_store: ArchiveStore | None = None
+
+
+def get_archive_store() -> ArchiveStore:
+    """Get or create the process-wide archive store."""
+    global _store
+    if _store is None:
+        _store = ArchiveStore(
+            root=settings.evidence_archive_dir,
+            max_archives=settings.evidence_archive_max_files,
+            ttl_seconds=settings.evidence_archive_ttl_seconds,
+        )
+    return _store
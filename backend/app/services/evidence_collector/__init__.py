@@ -9,12 +9,22 @@ from app.services.evidence_collector.models import (
     EvidenceSource,
     EvidenceType,
 )
+from app.services.evidence_collector.planner import (
+    CollectionPlan,
+    CollectionSchedule,
+    PackageStore,
+    SourceCache,
+    get_collection_schedule,
+    get_package_store,
+)
 from app.services.evidence_collector.service import EvidenceCollectorService
 
 
 __all__ = [
     "AuditPackage",
     "AuditPackageStatus",
+    "CollectionPlan",
+    "CollectionSchedule",
     "CollectionTask",
     "ControlEvidence",
     "ControlMapping",
@@ -22,4 +32,8 @@ __all__ = [
     "EvidenceItem",
     "EvidenceSource",
     "EvidenceType",
+    "PackageStore",
+    "SourceCache",
+    "get_collection_schedule",
+    "get_package_store",
 ]
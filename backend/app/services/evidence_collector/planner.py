@@ -0,0 +1,212 @@
+"""Collection planning for audit packages.
+
+A package usually spans hundreds of controls whose evidence is drawn from a
+handful of shared sources (code mappings, scans, logs). The planner picks
+the controls that are due for collection and the distinct source queries
+they need; ``SourceCache`` runs each of those queries at most once per
+package so every control reads the same prefetched result.
+
+Due dates are kept in the process-wide ``CollectionSchedule`` rather than
+on the request-scoped service, per package, repository and control: evidence
+collected from one repository says nothing about another. Packages
+themselves live in the process-wide ``PackageStore``, which keeps the most
+recently used ones and drops those left idle.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from app.core.config import settings
+from app.services.evidence_collector.models import (
+    CONTROL_FRAMEWORKS,
+    AuditPackage,
+    ControlEvidence,
+    ControlMapping,
+    EvidenceType,
+)
+
+
+# Evidence types whose collectors read control-independent source data
+SOURCE_QUERIES: dict[EvidenceType, str] = {
+    EvidenceType.CODE_ARTIFACT: "codebase_mappings",
+}
+
+
+type ScheduleKey = tuple[UUID, UUID | None, str, str]
+
+
+class CollectionSchedule:
+    """When each control of each package is next due, per repository."""
+
+    def __init__(self) -> None:
+        self._due: dict[ScheduleKey, datetime] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(
+        package_id: UUID, repository_id: UUID | None, control_evidence: ControlEvidence
+    ) -> ScheduleKey:
+        return (package_id, repository_id, control_evidence.framework, control_evidence.control_id)
+
+    def is_due(
+        self,
+        package_id: UUID,
+        repository_id: UUID | None,
+        control_evidence: ControlEvidence,
+        now: datetime | None = None,
+    ) -> bool:
+        """Whether a control was never collected for the repository or is stale."""
+        due = self._due.get(self._key(package_id, repository_id, control_evidence))
+        return due is None or due <= (now or datetime.now(UTC))
+
+    def set_due(
+        self,
+        package_id: UUID,
+        repository_id: UUID | None,
+        control_evidence: ControlEvidence,
+        due: datetime,
+    ) -> None:
+        with self._lock:
+            self._due[self._key(package_id, repository_id, control_evidence)] = due
+
+
+_schedule: CollectionSchedule | None = None
+
+
+def get_collection_schedule() -> CollectionSchedule:
+    """Get or create the process-wide collection schedule."""
+    global _schedule
+    if _schedule is None:
+        _schedule = CollectionSchedule()
+    return _schedule
+
+
+class PackageStore:
+    """Audit packages by id, bounded in count and dropped when left idle.
+
+    Packages outlive the request-scoped services that create and collect
+    them, so they are kept here. Reading or storing a package marks it as
+    used; the least recently used packages are evicted past
+    ``max_packages``, and packages unused for ``ttl_seconds`` expire.
+    """
+
+    def __init__(self, max_packages: int = 256, ttl_seconds: float = 24 * 3600) -> None:
+        self.max_packages = max_packages
+        self.ttl_seconds = ttl_seconds
+        self._packages: OrderedDict[UUID, tuple[AuditPackage, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        while self._packages:
+            package_id, (_, used_at) = next(iter(self._packages.items()))
+            if now - used_at < self.ttl_seconds:
+                break
+            del self._packages[package_id]
+
+    def get(self, package_id: UUID) -> AuditPackage | None:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._packages.get(package_id)
+            if entry is None:
+                return None
+            self._packages[package_id] = (entry[0], now)
+            self._packages.move_to_end(package_id)
+            return entry[0]
+
+    def put(self, package: AuditPackage) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._packages[package.id] = (package, now)
+            self._packages.move_to_end(package.id)
+            self._expire(now)
+            while len(self._packages) > self.max_packages:
+                self._packages.popitem(last=False)
+
+    def values(self) -> list[AuditPackage]:
+        with self._lock:
+            self._expire(time.monotonic())
+            return [package for package, _ in self._packages.values()]
+
+
+_package_store: PackageStore | None = None
+
+
+def get_package_store() -> PackageStore:
+    """Get or create the process-wide audit package store."""
+    global _package_store
+    if _package_store is None:
+        _package_store = PackageStore(
+            max_packages=settings.evidence_package_max_entries,
+            ttl_seconds=settings.evidence_package_ttl_seconds,
+        )
+    return _package_store
+
+
+@dataclass
+class CollectionPlan:
+    """Controls to (re)collect and the source queries they share."""
+
+    controls: list[tuple[ControlEvidence, ControlMapping]] = field(default_factory=list)
+    sources: set[str] = field(default_factory=set)
+    skipped: int = 0
+
+    @classmethod
+    def build(
+        cls,
+        package: AuditPackage,
+        repository_id: UUID | None = None,
+        force: bool = False,
+        now: datetime | None = None,
+        schedule: CollectionSchedule | None = None,
+    ) -> "CollectionPlan":
+        """Plan collection for ``package`` from ``repository_id``.
+
+        ``force`` ignores due dates.
+        """
+        now = now or datetime.now(UTC)
+        schedule = schedule or get_collection_schedule()
+        mappings = {
+            (mapping.framework, mapping.control_id): mapping
+            for framework in package.frameworks
+            for mapping in CONTROL_FRAMEWORKS.get(framework, [])
+        }
+
+        plan = cls()
+        for control_evidence in package.control_evidence:
+            mapping = mappings.get((control_evidence.framework, control_evidence.control_id))
+            if mapping is None:
+                continue
+            if not force and not schedule.is_due(package.id, repository_id, control_evidence, now):
+                plan.skipped += 1
+                continue
+            plan.controls.append((control_evidence, mapping))
+            plan.sources.update(
+                SOURCE_QUERIES[t] for t in mapping.required_evidence_types if t in SOURCE_QUERIES
+            )
+        return plan
+
+
+class SourceCache:
+    """Results of source queries, each executed at most once.
+
+    Concurrent callers asking for the same key share the in-flight query.
+    """
+
+    def __init__(self) -> None:
+        self._results: dict[Hashable, asyncio.Future[Any]] = {}
+        self.queries_run = 0
+
+    async def get[T](self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        future = self._results.get(key)
+        if future is None:
+            self.queries_run += 1
+            future = self._results[key] = asyncio.ensure_future(loader())
+        return await asyncio.shield(future)
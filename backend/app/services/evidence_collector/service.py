@@ -1,6 +1,8 @@
 """Automated evidence collection service."""
 
+import asyncio
 import hashlib
+from collections.abc import Iterator
 from datetime import UTC, datetime, timedelta
 from typing import Any
 from uuid import UUID
@@ -10,6 +12,14 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.codebase import CodebaseMapping, ComplianceStatus
+from app.services.evidence_archive import (
+    ArchiveEntry,
+    ArchiveResult,
+    bytes_entry,
+    get_archive_store,
+    json_entry,
+    write_archive,
+)
 from app.services.evidence_collector.models import (
     CONTROL_FRAMEWORKS,
     AuditPackage,
@@ -20,6 +30,14 @@ from app.services.evidence_collector.models import (
     EvidenceSource,
     EvidenceType,
 )
+from app.services.evidence_collector.planner import (
+    CollectionPlan,
+    CollectionSchedule,
+    PackageStore,
+    SourceCache,
+    get_collection_schedule,
+    get_package_store,
+)
 
 
 logger = structlog.get_logger()
@@ -28,10 +46,19 @@ logger = structlog.get_logger()
 class EvidenceCollectorService:
     """Service for automated compliance evidence collection."""
 
-    def __init__(self, db: AsyncSession, copilot: Any = None):
+    def __init__(
+        self,
+        db: AsyncSession,
+        copilot: Any = None,
+        max_concurrency: int = 16,
+        schedule: CollectionSchedule | None = None,
+        packages: PackageStore | None = None,
+    ):
         self.db = db
         self.copilot = copilot
-        self._packages: dict[UUID, AuditPackage] = {}
+        self.max_concurrency = max_concurrency
+        self._schedule = schedule or get_collection_schedule()
+        self._packages = packages if packages is not None else get_package_store()
         self._evidence_cache: dict[str, list[EvidenceItem]] = {}
 
     async def create_audit_package(
@@ -71,7 +98,7 @@ class EvidenceCollectorService:
                     total_controls += 1
 
         package.total_controls = total_controls
-        self._packages[package.id] = package
+        self._packages.put(package)
 
         logger.info(
             "audit_package_created",
@@ -86,21 +113,44 @@ class EvidenceCollectorService:
         self,
         package_id: UUID,
         repository_id: UUID | None = None,
+        force: bool = False,
     ) -> AuditPackage:
-        """Collect evidence for all controls in an audit package."""
+        """Collect evidence for the controls in an audit package.
+
+        Only controls that were never collected from ``repository_id`` or
+        are past their due date for it are refreshed unless ``force`` is set.
+        Shared source queries are prefetched once for the whole package and
+        controls are then collected concurrently.
+        """
         package = self._packages.get(package_id)
         if not package:
             raise ValueError(f"Audit package not found: {package_id}")
 
         package.status = AuditPackageStatus.COLLECTING
 
-        for control_evidence in package.control_evidence:
-            await self._collect_control_evidence(
-                package=package,
-                control_evidence=control_evidence,
-                repository_id=repository_id,
+        plan = CollectionPlan.build(package, repository_id, force=force, schedule=self._schedule)
+        sources = SourceCache()
+        # One session cannot run queries concurrently, so prefetch sequentially
+        for source in sorted(plan.sources):
+            await self._load_source(sources, source, repository_id)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _collect(control_evidence: ControlEvidence, mapping: ControlMapping) -> None:
+            async with semaphore:
+                await self._collect_control_evidence(
+                    package=package,
+                    control_evidence=control_evidence,
+                    repository_id=repository_id,
+                    mapping=mapping,
+                    sources=sources,
+                )
+            self._schedule.set_due(
+                package.id, repository_id, control_evidence, control_evidence.next_collection_due
             )
 
+        await asyncio.gather(*(_collect(ce, mapping) for ce, mapping in plan.controls))
+
         # Calculate coverage
         package.controls_with_evidence = sum(
             1 for ce in package.control_evidence if ce.status == "complete"
@@ -124,6 +174,9 @@ class EvidenceCollectorService:
         logger.info(
             "evidence_collection_complete",
             package_id=str(package_id),
+            collected=len(plan.controls),
+            skipped=plan.skipped,
+            source_queries=sources.queries_run,
             coverage=package.coverage_percentage,
             status=package.status.value,
         )
@@ -135,26 +188,32 @@ class EvidenceCollectorService:
         package: AuditPackage,
         control_evidence: ControlEvidence,
         repository_id: UUID | None = None,
+        mapping: ControlMapping | None = None,
+        sources: SourceCache | None = None,
     ) -> None:
         """Collect evidence for a specific control."""
         # Get control mapping
-        mapping = self._get_control_mapping(
+        mapping = mapping or self._get_control_mapping(
             control_evidence.framework,
             control_evidence.control_id,
         )
         if not mapping:
             return
 
-        evidence_items = []
-
-        for evidence_type in mapping.required_evidence_types:
-            items = await self._collect_evidence_type(
-                evidence_type=evidence_type,
-                control=mapping,
-                package=package,
-                repository_id=repository_id,
+        sources = sources or SourceCache()
+        collected = await asyncio.gather(
+            *(
+                self._collect_evidence_type(
+                    evidence_type=evidence_type,
+                    control=mapping,
+                    package=package,
+                    repository_id=repository_id,
+                    sources=sources,
+                )
+                for evidence_type in mapping.required_evidence_types
             )
-            evidence_items.extend(items)
+        )
+        evidence_items = [item for items in collected for item in items]
 
         control_evidence.evidence_items = evidence_items
         control_evidence.last_collected = datetime.now(UTC)
@@ -188,12 +247,15 @@ class EvidenceCollectorService:
         control: ControlMapping,
         package: AuditPackage,
         repository_id: UUID | None = None,
+        sources: SourceCache | None = None,
     ) -> list[EvidenceItem]:
         """Collect specific type of evidence."""
         items = []
 
         if evidence_type == EvidenceType.CODE_ARTIFACT:
-            items.extend(await self._collect_code_artifacts(control, repository_id, package))
+            items.extend(
+                await self._collect_code_artifacts(control, repository_id, package, sources)
+            )
         elif evidence_type == EvidenceType.CONFIGURATION:
             items.extend(await self._collect_configurations(control, repository_id, package))
         elif evidence_type == EvidenceType.COMMIT_HISTORY:
@@ -220,26 +282,15 @@ class EvidenceCollectorService:
         control: ControlMapping,
         repository_id: UUID | None,
         package: AuditPackage,
+        sources: SourceCache | None = None,
     ) -> list[EvidenceItem]:
         """Collect code artifacts as evidence."""
         items = []
 
-        # Query codebase mappings for relevant code
-        stmt = select(CodebaseMapping).where(
-            CodebaseMapping.compliance_status.in_(
-                [
-                    ComplianceStatus.COMPLIANT,
-                    ComplianceStatus.PARTIAL,
-                ]
-            )
+        mappings = await self._load_source(
+            sources or SourceCache(), "codebase_mappings", repository_id
         )
 
-        if repository_id:
-            stmt = stmt.where(CodebaseMapping.repository_id == repository_id)
-
-        result = await self.db.execute(stmt.limit(20))
-        mappings = result.scalars().all()
-
         for mapping in mappings:
             content = f"File: {mapping.file_path}\nLines: {mapping.start_line}-{mapping.end_line}"
             if mapping.code_snippet:
@@ -266,6 +317,35 @@ class EvidenceCollectorService:
 
         return items[:5]
 
+    async def _load_source(
+        self,
+        sources: SourceCache,
+        source: str,
+        repository_id: UUID | None,
+    ) -> Any:
+        """Result of a shared source query, run once per ``sources`` cache."""
+        loaders = {
+            "codebase_mappings": self._query_codebase_mappings,
+        }
+        return await sources.get((source, repository_id), lambda: loaders[source](repository_id))
+
+    async def _query_codebase_mappings(self, repository_id: UUID | None) -> list[CodebaseMapping]:
+        """Query codebase mappings for relevant code."""
+        stmt = select(CodebaseMapping).where(
+            CodebaseMapping.compliance_status.in_(
+                [
+                    ComplianceStatus.COMPLIANT,
+                    ComplianceStatus.PARTIAL,
+                ]
+            )
+        )
+
+        if repository_id:
+            stmt = stmt.where(CodebaseMapping.repository_id == repository_id)
+
+        result = await self.db.execute(stmt.limit(20))
+        return list(result.scalars().all())
+
     async def _collect_configurations(
         self,
         control: ControlMapping,
@@ -697,25 +777,7 @@ Certification Valid Until: {(datetime.now(UTC) + timedelta(days=365)).strftime("
         if package.status != AuditPackageStatus.READY:
             raise ValueError(f"Package not ready for export: {package.status.value}")
 
-        export_data = {
-            "package_id": str(package.id),
-            "organization_id": str(package.organization_id),
-            "name": package.name,
-            "description": package.description,
-            "frameworks": package.frameworks,
-            "audit_period": {
-                "start": package.audit_period_start.isoformat()
-                if package.audit_period_start
-                else None,
-                "end": package.audit_period_end.isoformat() if package.audit_period_end else None,
-            },
-            "coverage": {
-                "total_controls": package.total_controls,
-                "controls_with_evidence": package.controls_with_evidence,
-                "coverage_percentage": package.coverage_percentage,
-            },
-            "controls": [],
-        }
+        export_data = {**self._package_summary(package), "controls": []}
 
         for ce in package.control_evidence:
             control_data = {
@@ -752,6 +814,93 @@ Certification Valid Until: {(datetime.now(UTC) + timedelta(days=365)).strftime("
 
         return export_data
 
+    async def export_package_archive(self, package_id: UUID) -> ArchiveResult:
+        """Export an audit package as a ZIP archive with a Merkle manifest.
+
+        Evidence blobs are streamed into the archive one at a time and the
+        finished file is cached per package version, so repeated and
+        resumed downloads are served from disk.
+        """
+        package = self._packages.get(package_id)
+        if not package:
+            raise ValueError(f"Audit package not found: {package_id}")
+
+        if package.status not in (AuditPackageStatus.READY, AuditPackageStatus.EXPORTED):
+            raise ValueError(f"Package not ready for export: {package.status.value}")
+
+        version = int((package.completed_at or package.created_at).timestamp())
+        result = await get_archive_store().get_or_build(
+            f"evidence-package-{package.id}-{version}",
+            lambda target: write_archive(
+                target, self._archive_entries(package), self._package_summary(package)
+            ),
+            filename=f"audit-package-{package.id}.zip",
+        )
+
+        package.status = AuditPackageStatus.EXPORTED
+        package.exported_at = datetime.now(UTC)
+        package.export_format = "zip"
+
+        logger.info(
+            "audit_package_exported",
+            package_id=str(package_id),
+            format="zip",
+            size=result.size,
+            merkle_root=result.merkle_root,
+        )
+        return result
+
+    def _package_summary(self, package: AuditPackage) -> dict:
+        return {
+            "package_id": str(package.id),
+            "organization_id": str(package.organization_id),
+            "name": package.name,
+            "description": package.description,
+            "frameworks": package.frameworks,
+            "audit_period": {
+                "start": package.audit_period_start.isoformat()
+                if package.audit_period_start
+                else None,
+                "end": package.audit_period_end.isoformat() if package.audit_period_end else None,
+            },
+            "coverage": {
+                "total_controls": package.total_controls,
+                "controls_with_evidence": package.controls_with_evidence,
+                "coverage_percentage": package.coverage_percentage,
+            },
+        }
+
+    def _archive_entries(self, package: AuditPackage) -> Iterator[ArchiveEntry]:
+        """Archive entries for a package, produced lazily one control at a time."""
+        for ce in package.control_evidence:
+            base = f"controls/{ce.framework}/{ce.control_id.replace('/', '_')}"
+            yield json_entry(
+                f"{base}/control.json",
+                {
+                    "control_id": ce.control_id,
+                    "framework": ce.framework,
+                    "status": ce.status,
+                    "coverage_percentage": ce.coverage_percentage,
+                    "gaps": ce.gaps,
+                    "evidence": [
+                        {
+                            "id": str(item.id),
+                            "type": item.evidence_type.value,
+                            "source": item.source.value,
+                            "title": item.title,
+                            "collected_at": item.collected_at.isoformat(),
+                            "verification_status": item.verification_status,
+                            "content_hash": item.content_hash,
+                            "file": f"{base}/evidence/{item.id}.txt",
+                        }
+                        for item in ce.evidence_items
+                    ],
+                },
+                ce.last_collected,
+            )
+            for item in ce.evidence_items:
+                yield bytes_entry(f"{base}/evidence/{item.id}.txt", item.content, item.collected_at)
+
     async def get_package(self, package_id: UUID) -> AuditPackage | None:
         """Get audit package by ID."""
         return self._packages.get(package_id)
@@ -0,0 +1,30 @@
+"""Embedded full-text search: a local stand-in for Elasticsearch."""
+
+from app.services.fulltext.analysis import analyze, stem, tokenize
+from app.services.fulltext.engine import LocalSearchEngine, get_local_search_engine
+from app.services.fulltext.feeds import (
+    CODEBASE_FILES,
+    REGULATIONS,
+    codebase_file_document,
+    codebase_file_id,
+    regulation_document,
+    replace_documents,
+)
+from app.services.fulltext.index import FullTextIndex, SearchHit
+
+
+__all__ = [
+    "CODEBASE_FILES",
+    "REGULATIONS",
+    "FullTextIndex",
+    "LocalSearchEngine",
+    "SearchHit",
+    "analyze",
+    "codebase_file_document",
+    "codebase_file_id",
+    "get_local_search_engine",
+    "regulation_document",
+    "replace_documents",
+    "stem",
+    "tokenize",
+]
@@ -0,0 +1,177 @@
+"""Text analysis for the local full-text index.
+
+Legal prose and source code share one analyzer: identifiers are split on
+snake_case and camelCase boundaries (the whole identifier is kept as well),
+common English stopwords are dropped and the remaining words are reduced
+with the Porter stemmer, so "processing", "processed" and "processData" all
+meet at "process".
+"""
+
+import re
+from functools import lru_cache
+
+
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_IDENTIFIER_PART_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+# Includes the modal verbs that appear in nearly every obligation of a legal text
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "been", "but", "by", "for", "from",
+    "has", "have", "if", "in", "into", "is", "it", "its", "of", "on", "or", "such",
+    "that", "the", "their", "then", "there", "these", "they", "this", "to", "was",
+    "were", "will", "with", "shall", "may", "must",
+})  # fmt: skip
+
+
+def tokenize(text: str) -> list[str]:
+    """Split ``text`` into lowercase words and identifier parts."""
+    tokens: list[str] = []
+    for word in _WORD_RE.findall(text):
+        parts = _IDENTIFIER_PART_RE.findall(word)
+        if len(parts) > 1:
+            tokens.append(word.lower())
+        tokens.extend(part.lower() for part in parts)
+    return tokens
+
+
+def analyze(text: str) -> list[str]:
+    """Tokenize, drop stopwords and stem; the terms stored in and queried against the index."""
+    return [
+        stem(token)
+        for token in tokenize(text)
+        if token not in STOPWORDS and (len(token) > 1 or token.isdigit())
+    ]
+
+
+# ─── Porter stemmer ───────────────────────────────────────────────────
+
+_VOWELS = frozenset("aeiou")
+
+
+def _is_consonant(word: str, i: int) -> bool:
+    ch = word[i]
+    if ch in _VOWELS:
+        return False
+    if ch == "y":
+        return i == 0 or not _is_consonant(word, i - 1)
+    return True
+
+
+def _measure(stem_: str) -> int:
+    """Number of vowel-consonant sequences in ``stem_``."""
+    m = 0
+    prev_vowel = False
+    for i in range(len(stem_)):
+        vowel = not _is_consonant(stem_, i)
+        if prev_vowel and not vowel:
+            m += 1
+        prev_vowel = vowel
+    return m
+
+
+def _has_vowel(stem_: str) -> bool:
+    return any(not _is_consonant(stem_, i) for i in range(len(stem_)))
+
+
+def _double_consonant(word: str) -> bool:
+    return len(word) >= 2 and word[-1] == word[-2] and _is_consonant(word, len(word) - 1)
+
+
+def _cvc(word: str) -> bool:
+    if len(word) < 3:
+        return False
+    return (
+        _is_consonant(word, len(word) - 3)
+        and not _is_consonant(word, len(word) - 2)
+        and _is_consonant(word, len(word) - 1)
+        and word[-1] not in "wxy"
+    )
+
+
+def _replace(word: str, rules: list[tuple[str, str]], min_measure: int) -> str:
+    """Apply the longest matching suffix rule whose stem has measure > ``min_measure``."""
+    for suffix, replacement in rules:
+        if word.endswith(suffix):
+            stem_ = word[: -len(suffix)]
+            return stem_ + replacement if _measure(stem_) > min_measure else word
+    return word
+
+
+_STEP2 = sorted(
+    [
+        ("ational", "ate"), ("tional", "tion"), ("enci", "ence"), ("anci", "ance"),
+        ("izer", "ize"), ("bli", "ble"), ("alli", "al"), ("entli", "ent"), ("eli", "e"),
+        ("ousli", "ous"), ("ization", "ize"), ("ation", "ate"), ("ator", "ate"),
+        ("alism", "al"), ("iveness", "ive"), ("fulness", "ful"), ("ousness", "ous"),
+        ("aliti", "al"), ("iviti", "ive"), ("biliti", "ble"), ("logi", "log"),
+    ],
+    key=lambda rule: -len(rule[0]),
+)  # fmt: skip
+_STEP3 = sorted(
+    [
+        ("icate", "ic"), ("ative", ""), ("alize", "al"), ("iciti", "ic"),
+        ("ical", "ic"), ("ful", ""), ("ness", ""),
+    ],
+    key=lambda rule: -len(rule[0]),
+)  # fmt: skip
+_STEP4 = sorted(
+    [
+        "al", "ance", "ence", "er", "ic", "able", "ible", "ant", "ement", "ment",
+        "ent", "ion", "ou", "ism", "ate", "iti", "ous", "ive", "ize",
+    ],
+    key=lambda suffix: -len(suffix),
+)  # fmt: skip
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Reduce an English word to its Porter stem."""
+    if len(word) <= 2 or not word.isalpha():
+        return word
+
+    # Step 1a: plurals
+    if word.endswith(("sses", "ies")):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+
+    # Step 1b: -eed, -ed, -ing
+    if word.endswith("eed"):
+        if _measure(word[:-3]) > 0:
+            word = word[:-1]
+    else:
+        for suffix in ("ed", "ing"):
+            if word.endswith(suffix) and _has_vowel(word[: -len(suffix)]):
+                word = word[: -len(suffix)]
+                if word.endswith(("at", "bl", "iz")):
+                    word += "e"
+                elif _double_consonant(word) and word[-1] not in "lsz":
+                    word = word[:-1]
+                elif _measure(word) == 1 and _cvc(word):
+                    word += "e"
+                break
+
+    # Step 1c: y -> i
+    if word.endswith("y") and _has_vowel(word[:-1]):
+        word = word[:-1] + "i"
+
+    word = _replace(word, _STEP2, 0)
+    word = _replace(word, _STEP3, 0)
+
+    # Step 4: strip suffixes from long stems
+    for suffix in _STEP4:
+        if word.endswith(suffix):
+            stem_ = word[: -len(suffix)]
+            if _measure(stem_) > 1 and (suffix != "ion" or stem_.endswith(("s", "t"))):
+                word = stem_
+            break
+
+    # Step 5: tidy trailing e and double l
+    if word.endswith("e"):
+        stem_ = word[:-1]
+        m = _measure(stem_)
+        if m > 1 or (m == 1 and not _cvc(stem_)):
+            word = stem_
+    if word.endswith("ll") and _measure(word) > 1:
+        word = word[:-1]
+    return word
@@ -0,0 +1,209 @@
+"""Elasticsearch-compatible facade over local full-text indexes.
+
+``LocalSearchEngine`` implements the slice of the ``AsyncElasticsearch``
+client the RAG pipeline relies on (``search``, ``index``, ``delete``,
+``refresh``) so self-hosted and air-gapped deployments can run the same
+retrieval code without an Elasticsearch cluster. Supported query clauses
+are ``match_all``, ``match``, ``multi_match`` (with ``field^boost``),
+``term`` and ``terms``, combined through ``bool`` ``must``/``filter``;
+anything else raises ``ValueError``.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.services.fulltext.index import FullTextIndex, SearchHit
+
+
+Predicate = Callable[[dict[str, Any]], bool]
+
+
+class LocalSearchEngine:
+    """Named ``FullTextIndex`` instances stored under one directory."""
+
+    def __init__(self, root: Path | str | None = None):
+        self.root = Path(root) if root is not None else None
+        self._indexes: dict[str, FullTextIndex] = {}
+
+    def get_index(self, name: str) -> FullTextIndex:
+        index = self._indexes.get(name)
+        if index is None:
+            path = self.root / name if self.root is not None else None
+            index = self._indexes[name] = FullTextIndex(path)
+        return index
+
+    async def index(
+        self,
+        index: str,
+        id: str,
+        document: dict[str, Any],
+        refresh: bool = False,
+    ) -> dict[str, Any]:
+        target = self.get_index(index)
+        replaced = await asyncio.to_thread(target.add, str(id), document)
+        if refresh:
+            await asyncio.to_thread(target.flush)
+        return {"_index": index, "_id": str(id), "result": "updated" if replaced else "created"}
+
+    async def delete(
+        self,
+        index: str,
+        id: str,
+        refresh: bool = False,
+    ) -> dict[str, Any]:
+        target = self.get_index(index)
+        deleted = await asyncio.to_thread(target.delete, str(id))
+        if refresh:
+            await asyncio.to_thread(target.flush)
+        return {"_index": index, "_id": str(id), "result": "deleted" if deleted else "not_found"}
+
+    async def refresh(self, index: str | None = None) -> None:
+        """Persist buffered documents (all indexes when ``index`` is None)."""
+        targets = [self.get_index(index)] if index else list(self._indexes.values())
+        for target in targets:
+            await asyncio.to_thread(target.flush)
+
+    async def search(
+        self,
+        index: str,
+        body: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        body = {**(body or {}), **kwargs}
+        size = int(body.get("size", 10))
+        text, fields, filters = compile_query(body.get("query") or {"match_all": {}})
+        predicate = _all_of(filters)
+        target = self.get_index(index)
+
+        start = time.perf_counter()
+        if text is None:
+            hits = await asyncio.to_thread(_first_documents, target, size, predicate)
+        else:
+            hits = await asyncio.to_thread(target.search, text, fields, size, predicate)
+        took = int((time.perf_counter() - start) * 1000)
+
+        return {
+            "took": took,
+            "hits": {
+                "total": {"value": len(hits), "relation": "gte"},
+                "max_score": hits[0].score if hits else None,
+                "hits": [
+                    {"_index": index, "_id": hit.id, "_score": hit.score, "_source": hit.source}
+                    for hit in hits
+                ],
+            },
+        }
+
+    async def close(self) -> None:
+        for target in self._indexes.values():
+            await asyncio.to_thread(target.flush)
+            await asyncio.to_thread(target.close)
+
+
+def _first_documents(
+    target: FullTextIndex, size: int, predicate: Predicate | None
+) -> list[SearchHit]:
+    """The first ``size`` documents matching ``predicate``, unscored."""
+    matching = (
+        SearchHit(id=doc_id, score=1.0, source=source)
+        for doc_id, source in target.iter_documents()
+        if predicate is None or predicate(source)
+    )
+    return list(islice(matching, size))
+
+
+def compile_query(query: dict[str, Any]) -> tuple[str | None, dict[str, float], list[Predicate]]:
+    """Translate a query DSL clause into ``(text, field boosts, filters)``.
+
+    ``text`` is None for queries that only filter.
+    """
+    text: str | None = None
+    fields: dict[str, float] = {}
+    filters: list[Predicate] = []
+
+    def scoring(clause_text: str, clause_fields: dict[str, float]) -> None:
+        nonlocal text, fields
+        if text is not None:
+            raise ValueError("Only one scoring clause is supported")
+        text, fields = clause_text, clause_fields
+
+    def visit(clause: dict[str, Any], filter_context: bool) -> None:
+        if len(clause) != 1:
+            raise ValueError(f"Expected a single query clause, got {sorted(clause)}")
+        ((kind, spec),) = clause.items()
+        if kind == "bool":
+            for sub in _as_list(spec.get("must")):
+                visit(sub, filter_context)
+            for sub in _as_list(spec.get("filter")):
+                visit(sub, True)
+            unsupported = set(spec) - {"must", "filter"}
+            if unsupported:
+                raise ValueError(f"Unsupported bool clauses: {sorted(unsupported)}")
+        elif kind == "match_all":
+            return
+        elif kind == "multi_match":
+            scoring(spec["query"], dict(_parse_field(f) for f in spec.get("fields", [])))
+        elif kind == "match":
+            ((field, value),) = spec.items()
+            scoring(value["query"] if isinstance(value, dict) else value, {field: 1.0})
+        elif kind == "term":
+            ((field, value),) = spec.items()
+            expected = value["value"] if isinstance(value, dict) else value
+            filters.append(_field_in(field, {expected}))
+        elif kind == "terms":
+            ((field, values),) = spec.items()
+            filters.append(_field_in(field, set(values)))
+        else:
+            raise ValueError(f"Unsupported query clause: {kind}")
+        if filter_context and kind in {"match", "multi_match"}:
+            raise ValueError("Scoring clauses are not supported in filter context")
+
+    visit(query, False)
+    return text, fields, filters
+
+
+def _parse_field(spec: str) -> tuple[str, float]:
+    name, _, boost = spec.partition("^")
+    return name, float(boost) if boost else 1.0
+
+
+def _as_list(value: Any) -> list[dict[str, Any]]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _field_in(field: str, allowed: set[Any]) -> Predicate:
+    def matches(source: dict[str, Any]) -> bool:
+        value: Any = source
+        for part in field.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        if isinstance(value, list):
+            return any(item in allowed for item in value)
+        return value in allowed
+
+    return matches
+
+
+def _all_of(filters: list[Predicate]) -> Predicate | None:
+    if not filters:
+        return None
+    if len(filters) == 1:
+        return filters[0]
+    return lambda source: all(f(source) for f in filters)
+
+
+_engine: LocalSearchEngine | None = None
+
+
+def get_local_search_engine() -> LocalSearchEngine:
+    """Get or create the process-wide local search engine."""
+    global _engine
+    if _engine is None:
+        _engine = LocalSearchEngine(settings.fulltext_index_dir)
+    return _engine
@@ -0,0 +1,82 @@
+"""Documents kept in the local full-text indexes.
+
+The RAG pipeline queries two indexes: ``regulations`` (``name``,
+``description``, ``content``, ``framework``) and ``codebase_files``
+(``path``, ``repository``, ``content``, ``language``). Regulations are synced
+from the database by the ``reindex_regulations`` task; a repository's files
+are synced from its checkout every time it is analyzed.
+"""
+
+from collections.abc import Callable
+from pathlib import PurePosixPath
+from typing import Any
+
+from app.models.regulation import Regulation
+from app.services.fulltext.index import FullTextIndex
+
+
+REGULATIONS = "regulations"
+CODEBASE_FILES = "codebase_files"
+
+_LANGUAGES = {
+    ".py": "python",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".java": "java",
+    ".go": "go",
+    ".rs": "rust",
+    ".rb": "ruby",
+    ".sql": "sql",
+}
+
+
+def regulation_document(regulation: Regulation) -> dict[str, Any]:
+    """``regulations`` document; ``requirements`` must be loaded."""
+    framework = regulation.framework
+    return {
+        "name": regulation.name,
+        "description": regulation.content_summary or "",
+        "content": "\n\n".join(
+            f"{r.reference_id} {r.title}\n{r.description}" for r in regulation.requirements
+        ),
+        "framework": getattr(framework, "value", framework),
+    }
+
+
+def codebase_file_document(repository: str, path: str, content: str) -> dict[str, Any]:
+    """``codebase_files`` document for one file of ``repository`` (``owner/name``)."""
+    return {
+        "path": path,
+        "repository": repository,
+        "content": content,
+        "language": _LANGUAGES.get(PurePosixPath(path).suffix, "unknown"),
+    }
+
+
+def codebase_file_id(repository: str, path: str) -> str:
+    return f"{repository}:{path}"
+
+
+def replace_documents(
+    index: FullTextIndex,
+    documents: dict[str, dict[str, Any]],
+    scope: Callable[[dict[str, Any]], bool] | None = None,
+) -> int:
+    """Make the documents of ``index`` in ``scope`` exactly ``documents``.
+
+    Unchanged documents are left alone and everything is committed as one
+    batch. Returns how many documents were added or deleted.
+    """
+    changed = 0
+    with index.writing():
+        for doc_id, source in index.iter_documents():
+            if doc_id not in documents and (scope is None or scope(source)):
+                index.delete(doc_id)
+                changed += 1
+        for doc_id, document in documents.items():
+            if index.get(doc_id) != document:
+                index.add(doc_id, document)
+                changed += 1
+    return changed
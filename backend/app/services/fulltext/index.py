@@ -0,0 +1,553 @@
+"""Segmented on-disk inverted index with BM25F scoring.
+
+New documents are buffered in memory and written out as immutable segments
+(a varint-compressed postings file plus a JSON lexicon and stored documents)
+every ``flush_docs`` documents or on ``flush()``. Deletes are tombstones
+recorded in ``meta.json``, which is rewritten atomically on every flush and
+acts as the commit point; once there are more than ``max_segments``
+segments they are merged into one and tombstoned documents are dropped.
+
+A persistent index may be shared by several processes (API and workers).
+Writes run in a ``writing()`` batch that holds an exclusive ``flock`` on the
+directory, starts from the latest commit and is committed when it ends, so
+segments written by different processes never collide. Readers pick up new
+commits under a shared lock. An in-memory index keeps documents added since
+the last flush in its buffer.
+
+Every string field of a document is indexed, with per-field term
+frequencies, so field boosts are applied at query time (BM25F). Top-k
+queries use MaxScore: query terms whose combined score bound cannot lift a
+document into the current top k only get probed for documents that the
+other terms already matched.
+"""
+
+import fcntl
+import heapq
+import json
+import math
+import mmap
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from app.services.fulltext.analysis import analyze
+from app.services.fulltext.postings import Posting, decode_postings, encode_postings
+
+
+logger = structlog.get_logger()
+
+SEGMENT_FLUSH_DOCS = 1000
+MAX_SEGMENTS = 8
+K1 = 1.2
+B = 0.75
+
+_META = "meta.json"
+_WRITE_LOCK = "write.lock"
+_END = 1 << 62
+
+
+@dataclass
+class SearchHit:
+    """One scored document."""
+
+    id: str
+    score: float
+    source: dict[str, Any]
+
+
+@dataclass
+class _Doc:
+    id: str
+    lengths: dict[int, int]
+    source: dict[str, Any]
+
+
+class _Segment:
+    """Immutable postings for a contiguous range of document numbers."""
+
+    def __init__(
+        self,
+        name: str,
+        lexicon: dict[str, tuple[int, int]],
+        data: bytes | mmap.mmap,
+        docnos: list[int],
+    ):
+        self.name = name
+        self.lexicon = lexicon
+        self.data = data
+        self.docnos = docnos
+
+    def postings(self, term: str) -> tuple[list[int], list[tuple[tuple[int, int], ...]]]:
+        entry = self.lexicon.get(term)
+        if entry is None:
+            return [], []
+        offset, length = entry
+        return decode_postings(memoryview(self.data)[offset : offset + length])
+
+    def close(self) -> None:
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+
+class _Cursor:
+    __slots__ = ("docnos", "idf", "payloads", "pos", "upper_bound")
+
+    def __init__(self, docnos: list[int], payloads: list, idf: float):
+        self.docnos = docnos
+        self.payloads = payloads
+        self.idf = idf
+        self.upper_bound = idf * (K1 + 1)
+        self.pos = 0
+
+    def doc(self) -> int:
+        return self.docnos[self.pos] if self.pos < len(self.docnos) else _END
+
+    def seek(self, docno: int) -> None:
+        self.pos = bisect_left(self.docnos, docno, self.pos)
+
+
+class FullTextIndex:
+    """Inverted index over JSON documents; persistent when ``path`` is given."""
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        flush_docs: int = SEGMENT_FLUSH_DOCS,
+        max_segments: int = MAX_SEGMENTS,
+    ):
+        self.path = Path(path) if path is not None else None
+        self.flush_docs = flush_docs
+        self.max_segments = max_segments
+        self._lock = threading.RLock()
+        self._writers = 0
+        self._stamp: tuple[int, int, int] | None = None
+        self._segments: list[_Segment] = []
+        self._reset()
+        self.refresh()
+
+    def _reset(self) -> None:
+        for segment in self._segments:
+            segment.close()
+        self.fields: list[str] = []
+        self._field_ids: dict[str, int] = {}
+        self._docs: dict[int, _Doc] = {}
+        self._ids: dict[str, int] = {}
+        self._deleted: set[int] = set()
+        self._segments = []
+        self._buffer: dict[str, list[Posting]] = defaultdict(list)
+        self._buffer_docnos: list[int] = []
+        self._field_totals: dict[int, int] = defaultdict(int)
+        self._next_docno = 0
+        self._next_segment = 0
+        self._dirty = False
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._ids)
+
+    def __contains__(self, doc_id: str) -> bool:
+        self.refresh()
+        return doc_id in self._ids
+
+    def get(self, doc_id: str) -> dict[str, Any] | None:
+        self.refresh()
+        with self._lock:
+            docno = self._ids.get(doc_id)
+            return None if docno is None else self._docs[docno].source
+
+    # ─── Cross-process coordination ───────────────────────────────────
+
+    @contextmanager
+    def _file_lock(self, operation: int) -> Iterator[None]:
+        assert self.path is not None
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Closing the file releases the lock
+        with (self.path / _WRITE_LOCK).open("a") as lock_file:
+            fcntl.flock(lock_file.fileno(), operation)
+            yield
+
+    def _meta_stamp(self) -> tuple[int, int, int] | None:
+        try:
+            stat = (self.path / _META).stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _sync(self) -> None:
+        """Reload from disk if another process committed since we last looked."""
+        stamp = self._meta_stamp()
+        if stamp == self._stamp:
+            return
+        self._reset()
+        if stamp is not None:
+            self._load()
+        self._stamp = stamp
+
+    def refresh(self) -> None:
+        """Pick up commits made by other processes."""
+        if self.path is None:
+            return
+        with self._lock:
+            if self._writers or self._meta_stamp() == self._stamp:
+                return
+            with self._file_lock(fcntl.LOCK_SH):
+                self._sync()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """Batch writes into one commit.
+
+        For a persistent index the batch holds the directory's write lock,
+        starts from the latest commit and is flushed when it ends. Batches
+        nest; only the outermost one commits.
+        """
+        with self._lock:
+            if self._writers or self.path is None:
+                self._writers += 1
+                try:
+                    yield
+                finally:
+                    self._writers -= 1
+                return
+            with self._file_lock(fcntl.LOCK_EX):
+                self._sync()
+                self._writers = 1
+                try:
+                    yield
+                    self._flush()
+                except BaseException:
+                    # Memory may be ahead of the last commit; reload next time
+                    self._stamp = None
+                    raise
+                finally:
+                    self._writers = 0
+                self._stamp = self._meta_stamp()
+
+    # ─── Writes ───────────────────────────────────────────────────────
+
+    def add(self, doc_id: str, source: dict[str, Any]) -> bool:
+        """Index ``source`` under ``doc_id``; returns True if it replaced a document."""
+        with self.writing():
+            replaced = self.delete(doc_id)
+            docno = self._next_docno
+            self._next_docno += 1
+
+            lengths: dict[int, int] = {}
+            frequencies: dict[str, dict[int, int]] = defaultdict(dict)
+            for name, text in _text_fields(source):
+                field_id = self._field_id(name)
+                terms = analyze(text)
+                lengths[field_id] = lengths.get(field_id, 0) + len(terms)
+                for term in terms:
+                    per_field = frequencies[term]
+                    per_field[field_id] = per_field.get(field_id, 0) + 1
+            for term, per_field in frequencies.items():
+                self._buffer[term].append((docno, tuple(sorted(per_field.items()))))
+
+            self._docs[docno] = _Doc(doc_id, lengths, source)
+            self._ids[doc_id] = docno
+            self._buffer_docnos.append(docno)
+            for field_id, length in lengths.items():
+                self._field_totals[field_id] += length
+            if len(self._buffer_docnos) >= self.flush_docs:
+                self.flush()
+            return replaced
+
+    def delete(self, doc_id: str) -> bool:
+        """Tombstone ``doc_id``; returns False if it was not indexed."""
+        with self.writing():
+            docno = self._ids.pop(doc_id, None)
+            if docno is None:
+                return False
+            self._deleted.add(docno)
+            self._dirty = True
+            for field_id, length in self._docs[docno].lengths.items():
+                self._field_totals[field_id] -= length
+            return True
+
+    def flush(self) -> None:
+        """Write buffered documents to a new segment and commit deletes."""
+        with self.writing():
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer_docnos and not self._dirty:
+            return
+        if self._buffer_docnos:
+            segment = self._write_segment(self._buffer, self._buffer_docnos)
+            self._segments.append(segment)
+            self._buffer = defaultdict(list)
+            self._buffer_docnos = []
+        if len(self._segments) > self.max_segments:
+            self.merge()
+        else:
+            self._commit()
+
+    def merge(self) -> None:
+        """Merge every segment into one, dropping tombstoned documents."""
+        with self.writing():
+            if not self._segments:
+                return
+            merged: dict[str, list[Posting]] = defaultdict(list)
+            terms = sorted({term for segment in self._segments for term in segment.lexicon})
+            for segment in self._segments:
+                for term in terms:
+                    docnos, payloads = segment.postings(term)
+                    merged[term].extend(
+                        (docno, payload)
+                        for docno, payload in zip(docnos, payloads, strict=True)
+                        if docno not in self._deleted
+                    )
+            live = [
+                docno
+                for segment in self._segments
+                for docno in segment.docnos
+                if docno not in self._deleted
+            ]
+            old = self._segments
+            self._segments = [self._write_segment(merged, live)]
+
+            buffered = set(self._buffer_docnos)
+            for docno in self._deleted - buffered:
+                self._docs.pop(docno, None)
+            self._deleted &= buffered
+            self._commit()
+            for segment in old:
+                segment.close()
+                if self.path is not None:
+                    (self.path / f"{segment.name}.post").unlink(missing_ok=True)
+                    (self.path / f"{segment.name}.json").unlink(missing_ok=True)
+            logger.debug("fulltext.merged", segments=len(old), documents=len(live))
+
+    def _field_id(self, name: str) -> int:
+        field_id = self._field_ids.get(name)
+        if field_id is None:
+            field_id = self._field_ids[name] = len(self.fields)
+            self.fields.append(name)
+        return field_id
+
+    def _write_segment(self, postings: dict[str, list[Posting]], docnos: list[int]) -> _Segment:
+        name = f"seg-{self._next_segment:06d}"
+        self._next_segment += 1
+        data = bytearray()
+        lexicon: dict[str, tuple[int, int]] = {}
+        for term in sorted(postings):
+            if not postings[term]:
+                continue
+            block = encode_postings(postings[term])
+            lexicon[term] = (len(data), len(block))
+            data += block
+
+        if self.path is None:
+            return _Segment(name, lexicon, bytes(data), list(docnos))
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        post_path = self.path / f"{name}.post"
+        post_path.write_bytes(data)
+        docs = [
+            {
+                "docno": docno,
+                "id": self._docs[docno].id,
+                "lengths": self._docs[docno].lengths,
+                "source": self._docs[docno].source,
+            }
+            for docno in docnos
+        ]
+        (self.path / f"{name}.json").write_text(json.dumps({"lexicon": lexicon, "docs": docs}))
+        return _Segment(name, lexicon, _map(post_path), list(docnos))
+
+    def _commit(self) -> None:
+        self._dirty = False
+        if self.path is None:
+            return
+        meta = {
+            "fields": self.fields,
+            "segments": [segment.name for segment in self._segments],
+            "next_docno": self._next_docno,
+            "next_segment": self._next_segment,
+            "deleted": sorted(d for d in self._deleted if d not in set(self._buffer_docnos)),
+        }
+        tmp = self.path / f"{_META}.tmp"
+        tmp.write_text(json.dumps(meta))
+        tmp.replace(self.path / _META)
+
+    def _load(self) -> None:
+        meta = json.loads((self.path / _META).read_text())
+        self.fields = list(meta["fields"])
+        self._field_ids = {name: i for i, name in enumerate(self.fields)}
+        self._next_docno = meta["next_docno"]
+        self._next_segment = meta["next_segment"]
+        self._deleted = set(meta["deleted"])
+        for name in meta["segments"]:
+            stored = json.loads((self.path / f"{name}.json").read_text())
+            lexicon = {term: (entry[0], entry[1]) for term, entry in stored["lexicon"].items()}
+            docnos = []
+            for doc in stored["docs"]:
+                docno = doc["docno"]
+                lengths = {int(k): v for k, v in doc["lengths"].items()}
+                self._docs[docno] = _Doc(doc["id"], lengths, doc["source"])
+                docnos.append(docno)
+                if docno not in self._deleted:
+                    self._ids[doc["id"]] = docno
+                    for field_id, length in lengths.items():
+                        self._field_totals[field_id] += length
+            self._segments.append(_Segment(name, lexicon, _map(self.path / f"{name}.post"), docnos))
+
+    # ─── Queries ──────────────────────────────────────────────────────
+
+    def search(
+        self,
+        query: str,
+        fields: dict[str, float],
+        size: int = 10,
+        predicate: Callable[[dict[str, Any]], bool] | None = None,
+    ) -> list[SearchHit]:
+        """Top ``size`` documents for ``query`` under BM25F with per-field ``fields`` boosts."""
+        terms = list(dict.fromkeys(analyze(query)))
+        self.refresh()
+        with self._lock:
+            weights = {self._field_ids[n]: w for n, w in fields.items() if n in self._field_ids}
+            if not terms or not weights or not self._ids or size <= 0:
+                return []
+            n_docs = len(self._ids)
+            avg_lengths = {
+                field_id: max(self._field_totals[field_id] / n_docs, 1.0) for field_id in weights
+            }
+            cursors = []
+            for term in terms:
+                docnos, payloads = self._postings(term, weights)
+                if docnos:
+                    idf = math.log(1 + (n_docs - len(docnos) + 0.5) / (len(docnos) + 0.5))
+                    cursors.append(_Cursor(docnos, payloads, idf))
+            top = self._max_score(cursors, weights, avg_lengths, size, predicate)
+            return [
+                SearchHit(id=self._docs[docno].id, score=score, source=self._docs[docno].source)
+                for score, docno in top
+            ]
+
+    def iter_documents(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        self.refresh()
+        with self._lock:
+            items = [(doc_id, self._docs[docno].source) for doc_id, docno in self._ids.items()]
+        yield from items
+
+    def _postings(
+        self, term: str, weights: dict[int, float]
+    ) -> tuple[list[int], list[tuple[tuple[int, int], ...]]]:
+        """Live postings for ``term`` restricted to the queried fields, in docno order."""
+        docnos: list[int] = []
+        payloads: list[tuple[tuple[int, int], ...]] = []
+        sources = [segment.postings(term) for segment in self._segments]
+        buffered = self._buffer.get(term)
+        if buffered:
+            sources.append(([d for d, _ in buffered], [p for _, p in buffered]))
+        for seg_docnos, seg_payloads in sources:
+            for docno, payload in zip(seg_docnos, seg_payloads, strict=True):
+                if docno in self._deleted:
+                    continue
+                if any(field_id in weights for field_id, _ in payload):
+                    docnos.append(docno)
+                    payloads.append(payload)
+        return docnos, payloads
+
+    def _max_score(
+        self,
+        cursors: list[_Cursor],
+        weights: dict[int, float],
+        avg_lengths: dict[int, float],
+        size: int,
+        predicate: Callable[[dict[str, Any]], bool] | None,
+    ) -> list[tuple[float, int]]:
+        cursors.sort(key=lambda c: c.upper_bound)
+        bounds = list(_cumulative(c.upper_bound for c in cursors))
+        heap: list[tuple[float, int]] = []
+        threshold = 0.0
+        essential = 0
+
+        def score(cursor: _Cursor, lengths: dict[int, int]) -> float:
+            tf = 0.0
+            for field_id, freq in cursor.payloads[cursor.pos]:
+                weight = weights.get(field_id)
+                if weight:
+                    norm = 1 - B + B * lengths.get(field_id, 0) / avg_lengths[field_id]
+                    tf += weight * freq / norm
+            return cursor.idf * tf * (K1 + 1) / (K1 + tf)
+
+        while True:
+            # Terms whose bounds sum to at most the threshold cannot qualify a document alone
+            while essential < len(cursors) and bounds[essential] <= threshold:
+                essential += 1
+            if essential == len(cursors):
+                break
+            docno = min(c.doc() for c in cursors[essential:])
+            if docno == _END:
+                break
+
+            doc = self._docs[docno]
+            if predicate is not None and not predicate(doc.source):
+                for cursor in cursors[essential:]:
+                    if cursor.doc() == docno:
+                        cursor.pos += 1
+                continue
+
+            total = 0.0
+            for cursor in cursors[essential:]:
+                if cursor.doc() == docno:
+                    total += score(cursor, doc.lengths)
+                    cursor.pos += 1
+            for j in range(essential - 1, -1, -1):
+                if total + bounds[j] <= threshold:
+                    break
+                cursor = cursors[j]
+                cursor.seek(docno)
+                if cursor.doc() == docno:
+                    total += score(cursor, doc.lengths)
+
+            if len(heap) < size:
+                heapq.heappush(heap, (total, -docno))
+                if len(heap) == size:
+                    threshold = heap[0][0]
+            elif total > heap[0][0]:
+                heapq.heapreplace(heap, (total, -docno))
+                threshold = heap[0][0]
+
+        return [(total, -neg) for total, neg in sorted(heap, reverse=True)]
+
+    def close(self) -> None:
+        with self._lock:
+            for segment in self._segments:
+                segment.close()
+
+
+def _cumulative(values: Iterator[float]) -> Iterator[float]:
+    total = 0.0
+    for value in values:
+        total += value
+        yield total
+
+
+def _text_fields(source: dict[str, Any], prefix: str = "") -> Iterator[tuple[str, str]]:
+    for key, value in source.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, str):
+            yield name, value
+        elif isinstance(value, list):
+            text = " ".join(item for item in value if isinstance(item, str))
+            if text:
+                yield name, text
+        elif isinstance(value, dict):
+            yield from _text_fields(value, f"{name}.")
+
+
+def _map(path: Path) -> bytes | mmap.mmap:
+    if path.stat().st_size == 0:
+        return b""
+    with path.open("rb") as fh:
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
@@ -0,0 +1,62 @@
+"""Compressed posting lists.
+
+A posting list is a run of entries ordered by document number. Each entry
+is stored as varints: the gap to the previous document number, the number
+of fields the term occurs in, then ``(field id, term frequency)`` pairs.
+Gaps and frequencies are small, so most values fit in a single byte.
+"""
+
+from collections.abc import Iterable
+
+
+Posting = tuple[int, tuple[tuple[int, int], ...]]
+
+
+def write_varint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def encode_postings(postings: Iterable[Posting]) -> bytes:
+    """Encode ``(docno, ((field, tf), ...))`` entries in increasing docno order."""
+    out = bytearray()
+    previous = 0
+    for docno, fields in postings:
+        write_varint(docno - previous, out)
+        previous = docno
+        write_varint(len(fields), out)
+        for field_id, tf in fields:
+            write_varint(field_id, out)
+            write_varint(tf, out)
+    return bytes(out)
+
+
+def decode_postings(
+    data: bytes | memoryview,
+) -> tuple[list[int], list[tuple[tuple[int, int], ...]]]:
+    """Decode a posting list into parallel docno and field-frequency lists."""
+    docnos: list[int] = []
+    payloads: list[tuple[tuple[int, int], ...]] = []
+    pos = 0
+    end = len(data)
+    docno = 0
+
+    def varint() -> int:
+        nonlocal pos
+        value = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    while pos < end:
+        docno += varint()
+        count = varint()
+        docnos.append(docno)
+        payloads.append(tuple((varint(), varint()) for _ in range(count)))
+    return docnos, payloads
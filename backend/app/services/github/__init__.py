@@ -1,5 +1,6 @@
 """GitHub integration services."""
 
+from app.services.github.cache import BlobCache, RateLimitBudget, get_blob_cache
 from app.services.github.client import (
     GitHubAppClient,
     GitHubClient,
@@ -10,9 +11,12 @@ from app.services.github.client import (
 
 
 __all__ = [
+    "BlobCache",
     "GitHubAppClient",
     "GitHubClient",
     "GitHubFile",
     "GitHubPR",
+    "RateLimitBudget",
+    "get_blob_cache",
     "get_github_client",
 ]
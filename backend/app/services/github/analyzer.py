@@ -7,6 +7,7 @@ import structlog
 
 from app.models.codebase import Repository
 from app.services.github.client import GitHubClient, get_github_client
+from app.services.ingestion import Checkout, FileFilter, IngestionRun, github_clone_url
 
 
 logger = structlog.get_logger()
@@ -55,28 +56,47 @@ class RepositoryAnalyzer:
         "retention": ["retention", "expire", "ttl", "archive"],
     }
 
-    def __init__(self, github_client: GitHubClient):
+    def __init__(self, github_client: GitHubClient | None = None):
         self.github = github_client
 
-    async def analyze(self, repository: Repository) -> dict[str, Any]:
-        """Perform full analysis of a repository."""
+    async def analyze(
+        self,
+        repository: Repository,
+        checkout: Checkout | None = None,
+    ) -> dict[str, Any]:
+        """Perform full analysis of a repository.
+
+        With a local ``checkout`` the tree and every relevant file are read
+        from disk and the REST API is not used at all; otherwise they are
+        sampled through the REST API. ``file_samples`` holds the contents
+        that were read, by path.
+        """
         logger.info(f"Analyzing repository: {repository.full_name}")
 
         owner, repo = repository.full_name.split("/")
 
-        repo_info = await self.github.get_repository(owner, repo)
-        tree = await self.github.get_repository_tree(owner, repo)
+        if checkout is not None:
+            tree = checkout.tree()
+        else:
+            repo_info = await self.github.get_repository(owner, repo)
+            tree = await self.github.get_repository_tree(owner, repo)
         structure = self._analyze_structure(tree)
         relevant_files = self._identify_relevant_files(tree)
         languages = self._extract_languages(tree)
 
-        file_samples = {}
-        for file_info in relevant_files[:20]:
-            try:
-                file = await self.github.get_file_content(owner, repo, file_info["path"])
-                file_samples[file.path] = file.content
-            except (OSError, ValueError) as e:
-                logger.warning(f"Could not fetch {file_info['path']}: {e}")
+        if checkout is not None:
+            file_samples = await checkout.load_files(
+                FileFilter(), paths=[f["path"] for f in relevant_files]
+            )
+            repo_info = {
+                "default_branch": repository.default_branch,
+                "language": languages[0] if languages else None,
+                # Kilobytes, like the REST API
+                "size": sum(entry.size for entry in checkout.files) // 1024,
+            }
+        else:
+            fetched = await self.github.get_files(owner, repo, relevant_files[:20])
+            file_samples = {path: file.content for path, file in fetched.items()}
 
         keyword_findings = self._analyze_content(file_samples)
 
@@ -92,6 +112,7 @@ class RepositoryAnalyzer:
             "file_count": len(tree),
             "relevant_files": relevant_files,
             "keyword_findings": keyword_findings,
+            "file_samples": file_samples,
             "analyzed_at": datetime.now(UTC).isoformat(),
         }
 
@@ -207,8 +228,23 @@ class RepositoryAnalyzer:
         return findings
 
 
-async def analyze_repository(repository: Repository, access_token: str) -> dict[str, Any]:
-    """Convenience function to analyze a repository."""
+def repository_clone_url(repository: Repository) -> str:
+    """URL a repository is checked out from (its ``clone_url``, else GitHub)."""
+    return repository.clone_url or github_clone_url(repository.full_name)
+
+
+async def analyze_repository(
+    repository: Repository,
+    access_token: str,
+    run: IngestionRun | None = None,
+) -> dict[str, Any]:
+    """Convenience function to analyze a repository.
+
+    Pass the pipeline's ``run`` to analyze its shared local checkout.
+    """
+    if run is not None:
+        checkout = await run.checkout(repository_clone_url(repository))
+        return await RepositoryAnalyzer().analyze(repository, checkout=checkout)
     client = await get_github_client(access_token)
     async with client:
         analyzer = RepositoryAnalyzer(client)
@@ -0,0 +1,209 @@
+"""Process-wide caches and rate-limit accounting for GitHub API access.
+
+- ``BlobCache`` holds decoded file contents keyed by git blob SHA. Blob
+  SHAs are content addresses, so an entry never goes stale and is shared
+  by repository analysis, PR review and SBOM generation alike.
+- ``ETagCache`` remembers the validator and body of JSON responses so
+  repeat reads are sent as conditional requests; a ``304 Not Modified``
+  does not count against the rate limit.
+- ``RateLimitBudget`` tracks ``X-RateLimit-*`` headers per token and caps
+  in-flight requests to what the remaining budget allows. Budgets of the
+  least recently used tokens are dropped beyond ``_MAX_BUDGETS``.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+# Tokens whose rate-limit budgets are tracked at once
+_MAX_BUDGETS = 256
+
+
+class BlobCache:
+    """LRU of blob SHA → decoded content, bounded by total size in bytes."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sha: str) -> str | None:
+        content = self._entries.get(sha)
+        if content is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(sha)
+        self.hits += 1
+        return content
+
+    def put(self, sha: str, content: str) -> None:
+        size = len(content)
+        if size > self.max_bytes:
+            return
+        if sha in self._entries:
+            self._entries.move_to_end(sha)
+            return
+        self._entries[sha] = content
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def __contains__(self, sha: str) -> bool:
+        return sha in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Validator and body of a previously fetched JSON response."""
+
+    etag: str
+    body: Any
+    next_url: str | None = None
+
+
+class ETagCache:
+    """LRU of request key → ``CachedResponse`` for conditional GETs."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+
+    @staticmethod
+    def key(url: str, params: Mapping[str, Any] | None = None) -> str:
+        if not params:
+            return url
+        query = "&".join(f"{k}={params[k]}" for k in sorted(params))
+        return f"{url}?{query}"
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class RateLimitBudget:
+    """Concurrency limit derived from the remaining GitHub rate limit.
+
+    Up to ``max_concurrency`` requests run at once while the budget is
+    healthy. As ``X-RateLimit-Remaining`` approaches ``reserve`` the limit
+    shrinks, and once it is reached requests are serialized and wait (at
+    most ``max_wait_seconds``) for the window to reset.
+    """
+
+    def __init__(self, max_concurrency: int = 16, reserve: int = 50, max_wait_seconds: float = 60):
+        self.max_concurrency = max_concurrency
+        self.reserve = reserve
+        self.max_wait_seconds = max_wait_seconds
+        self.remaining: int | None = None
+        self.reset_at: float | None = None
+        self._in_flight = 0
+        self._cond: asyncio.Condition | None = None
+        self._cond_loop: asyncio.AbstractEventLoop | None = None
+
+    def limit(self) -> int:
+        if self.remaining is None:
+            return self.max_concurrency
+        return max(1, min(self.max_concurrency, self.remaining - self.reserve))
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None:
+            try:
+                self.remaining = int(remaining)
+            except ValueError:
+                return
+        if reset is not None:
+            with suppress(ValueError):
+                self.reset_at = float(reset)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self._in_flight < self.limit())
+            self._in_flight += 1
+        try:
+            await self._wait_for_reset()
+            yield
+        finally:
+            async with cond:
+                self._in_flight -= 1
+                cond.notify_all()
+
+    async def _wait_for_reset(self) -> None:
+        if self.remaining is None or self.remaining > self.reserve or self.reset_at is None:
+            return
+        delay = min(self.reset_at - time.time(), self.max_wait_seconds)
+        if delay > 0:
+            logger.warning(
+                "github.rate_limit_low",
+                remaining=self.remaining,
+                wait_seconds=round(delay, 1),
+            )
+            await asyncio.sleep(delay)
+
+    def _condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._cond_loop is not loop:
+            self._cond = asyncio.Condition()
+            self._cond_loop = loop
+        return self._cond
+
+
+_blob_cache: BlobCache | None = None
+_etag_cache: ETagCache | None = None
+_budgets: OrderedDict[str, RateLimitBudget] = OrderedDict()
+
+
+def get_blob_cache() -> BlobCache:
+    """Get or create the process-wide blob cache."""
+    global _blob_cache
+    if _blob_cache is None:
+        _blob_cache = BlobCache()
+    return _blob_cache
+
+
+def get_etag_cache() -> ETagCache:
+    """Get or create the process-wide conditional-request cache."""
+    global _etag_cache
+    if _etag_cache is None:
+        _etag_cache = ETagCache()
+    return _etag_cache
+
+
+def get_rate_limit_budget(access_token: str | None) -> RateLimitBudget:
+    """Budget shared by every client using ``access_token``."""
+    key = hashlib.sha256(access_token.encode()).hexdigest() if access_token else "anonymous"
+    budget = _budgets.get(key)
+    if budget is None:
+        budget = _budgets[key] = RateLimitBudget()
+        # Clients already holding an evicted budget keep using it
+        while len(_budgets) > _MAX_BUDGETS:
+            _budgets.popitem(last=False)
+    else:
+        _budgets.move_to_end(key)
+    return budget
@@ -1,15 +1,47 @@
 """GitHub integration for repository access and PR creation."""
 
+import asyncio
 import base64
+import weakref
 from dataclasses import dataclass
 from typing import Any
 
 import httpx
 import structlog
 
+from app.core.http import get_shared_http_transport, http2_available
+from app.services.github.cache import (
+    CachedResponse,
+    get_blob_cache,
+    get_etag_cache,
+    get_rate_limit_budget,
+)
+
 
 logger = structlog.get_logger()
 
+_PAGE_SIZE = 100
+
+# Keep-alive (and, with h2 installed, HTTP/2) pools for GitHub, one per event
+# loop, used when no worker-wide transport is registered.
+_transports: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _github_transport() -> httpx.AsyncHTTPTransport:
+    shared = get_shared_http_transport()
+    if shared is not None:
+        return shared
+    loop = asyncio.get_running_loop()
+    transport = _transports.get(loop)
+    if transport is None:
+        transport = _transports[loop] = httpx.AsyncHTTPTransport(
+            http2=http2_available(),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+    return transport
+
 
 @dataclass
 class GitHubFile:
@@ -35,6 +67,7 @@ class GitHubPR:
     head_sha: str
     base_branch: str
     head_branch: str
+    base_sha: str = ""
 
 
 class GitHubClient:
@@ -48,6 +81,8 @@ class GitHubClient:
         self.access_token = access_token
         self.base_url = base_url
         self._client: httpx.AsyncClient | None = None
+        self._blobs = get_blob_cache()
+        self._etags = get_etag_cache()
 
     async def __aenter__(self):
         headers = {
@@ -57,22 +92,61 @@ class GitHubClient:
         if self.access_token:
             headers["Authorization"] = f"Bearer {self.access_token}"
 
+        self._budget = get_rate_limit_budget(self.access_token)
+        # The pooled transport outlives this client, so it is never closed here
         self._client = httpx.AsyncClient(
             base_url=self.base_url,
             headers=headers,
             timeout=30.0,
+            transport=_github_transport(),
         )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._client:
-            await self._client.aclose()
+        self._client = None
+
+    async def _get_json(
+        self, url: str, params: dict[str, Any] | None = None
+    ) -> tuple[Any, str | None]:
+        """Conditional GET returning the JSON body and the ``next`` page URL.
+
+        A cached ETag is sent as ``If-None-Match``; on ``304`` the cached
+        body is reused without spending rate limit.
+        """
+        key = self._etags.key(f"{self.base_url}{url}" if url.startswith("/") else url, params)
+        cached = self._etags.get(key)
+        headers = {"If-None-Match": cached.etag} if cached else None
+
+        async with self._budget.slot():
+            response = await self._client.get(url, params=params, headers=headers)
+        self._budget.update(response.headers)
+
+        if response.status_code == 304 and cached is not None:
+            return cached.body, cached.next_url
+        response.raise_for_status()
+        body = response.json()
+        next_url = response.links.get("next", {}).get("url")
+        if etag := response.headers.get("ETag"):
+            self._etags.put(key, CachedResponse(etag, body, next_url))
+        return body, next_url
+
+    async def get_paginated(
+        self, url: str, params: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
+        """GET every page of a list endpoint by following ``Link: rel="next"``."""
+        items: list[dict[str, Any]] = []
+        next_url: str | None = url
+        page_params: dict[str, Any] | None = {"per_page": _PAGE_SIZE, **(params or {})}
+        while next_url:
+            page, next_url = await self._get_json(next_url, page_params)
+            items.extend(page)
+            page_params = None  # the next link carries the query string
+        return items
 
     async def get_repository(self, owner: str, repo: str) -> dict[str, Any]:
         """Get repository information."""
-        response = await self._client.get(f"/repos/{owner}/{repo}")
-        response.raise_for_status()
-        return response.json()
+        body, _ = await self._get_json(f"/repos/{owner}/{repo}")
+        return body
 
     async def get_repository_tree(
         self,
@@ -83,12 +157,7 @@ class GitHubClient:
     ) -> list[dict[str, Any]]:
         """Get repository file tree."""
         params = {"recursive": "1"} if recursive else {}
-        response = await self._client.get(
-            f"/repos/{owner}/{repo}/git/trees/{tree_sha}",
-            params=params,
-        )
-        response.raise_for_status()
-        data = response.json()
+        data, _ = await self._get_json(f"/repos/{owner}/{repo}/git/trees/{tree_sha}", params)
         return data.get("tree", [])
 
     async def get_file_content(
@@ -97,18 +166,24 @@ class GitHubClient:
         repo: str,
         path: str,
         ref: str = "HEAD",
+        sha: str | None = None,
     ) -> GitHubFile:
-        """Get file content from repository."""
-        response = await self._client.get(
-            f"/repos/{owner}/{repo}/contents/{path}",
-            params={"ref": ref},
-        )
-        response.raise_for_status()
-        data = response.json()
+        """Get file content from repository.
+
+        When the caller already knows the blob ``sha`` (from a tree or PR
+        file listing) a cached copy is returned without any request.
+        """
+        if sha is not None:
+            cached = self._blobs.get(sha)
+            if cached is not None:
+                return GitHubFile(path=path, content=cached, sha=sha, size=len(cached))
+
+        data, _ = await self._get_json(f"/repos/{owner}/{repo}/contents/{path}", {"ref": ref})
 
         content = ""
         if data.get("encoding") == "base64" and data.get("content"):
             content = base64.b64decode(data["content"]).decode("utf-8")
+        self._blobs.put(data["sha"], content)
 
         return GitHubFile(
             path=data["path"],
@@ -118,6 +193,46 @@ class GitHubClient:
             encoding=data.get("encoding", "base64"),
         )
 
+    async def get_blob(self, owner: str, repo: str, sha: str, path: str = "") -> GitHubFile:
+        """Get a file by git blob SHA, downloading it at most once per process."""
+        content = self._blobs.get(sha)
+        if content is None:
+            async with self._budget.slot():
+                response = await self._client.get(f"/repos/{owner}/{repo}/git/blobs/{sha}")
+            self._budget.update(response.headers)
+            response.raise_for_status()
+            data = response.json()
+            raw = data.get("content") or ""
+            if data.get("encoding") == "base64":
+                content = base64.b64decode(raw).decode("utf-8")
+            else:
+                content = raw
+            self._blobs.put(sha, content)
+        return GitHubFile(path=path, content=content, sha=sha, size=len(content))
+
+    async def get_files(
+        self,
+        owner: str,
+        repo: str,
+        entries: list[dict[str, Any]],
+    ) -> dict[str, GitHubFile]:
+        """Fetch many files concurrently from tree entries (``path`` + ``sha``).
+
+        Cached blobs are served locally; the rest are downloaded in parallel
+        within the token's rate-limit budget. Files that cannot be fetched
+        or decoded are logged and left out.
+        """
+
+        async def fetch(entry: dict[str, Any]) -> GitHubFile | None:
+            try:
+                return await self.get_blob(owner, repo, entry["sha"], entry["path"])
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning(f"Could not fetch {entry['path']}: {e}")
+                return None
+
+        results = await asyncio.gather(*(fetch(entry) for entry in entries))
+        return {file.path: file for file in results if file is not None}
+
     async def get_directory_contents(
         self,
         owner: str,
@@ -126,12 +241,8 @@ class GitHubClient:
         ref: str = "HEAD",
     ) -> list[dict[str, Any]]:
         """Get directory contents."""
-        response = await self._client.get(
-            f"/repos/{owner}/{repo}/contents/{path}",
-            params={"ref": ref},
-        )
-        response.raise_for_status()
-        return response.json()
+        body, _ = await self._get_json(f"/repos/{owner}/{repo}/contents/{path}", {"ref": ref})
+        return body
 
     async def create_branch(
         self,
@@ -220,6 +331,7 @@ class GitHubClient:
             head_sha=data["head"]["sha"],
             base_branch=data["base"]["ref"],
             head_branch=data["head"]["ref"],
+            base_sha=data["base"].get("sha", ""),
         )
 
     async def add_labels_to_pr(
@@ -244,9 +356,7 @@ class GitHubClient:
         pr_number: int,
     ) -> GitHubPR:
         """Get pull request details."""
-        response = await self._client.get(f"/repos/{owner}/{repo}/pulls/{pr_number}")
-        response.raise_for_status()
-        data = response.json()
+        data, _ = await self._get_json(f"/repos/{owner}/{repo}/pulls/{pr_number}")
 
         return GitHubPR(
             number=data["number"],
@@ -258,8 +368,18 @@ class GitHubClient:
             head_sha=data["head"]["sha"],
             base_branch=data["base"]["ref"],
             head_branch=data["head"]["ref"],
+            base_sha=data["base"].get("sha", ""),
         )
 
+    async def get_pull_request_files(
+        self,
+        owner: str,
+        repo: str,
+        pr_number: int,
+    ) -> list[dict[str, Any]]:
+        """Get every file changed in a pull request (all pages)."""
+        return await self.get_paginated(f"/repos/{owner}/{repo}/pulls/{pr_number}/files")
+
     async def search_code(
         self,
         query: str,
@@ -1,12 +1,19 @@
 """Multi-Cloud IaC Compliance Scanner Service."""
 
 import re
+from dataclasses import asdict
 from datetime import UTC, datetime
 from uuid import UUID
 
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.services.analysis_cache import (
+    AnalysisCache,
+    Record,
+    get_analysis_cache,
+    ruleset_fingerprint,
+)
 from app.services.iac_scanner.models import (
     CloudProvider,
     ComplianceRule,
@@ -19,10 +26,14 @@ from app.services.iac_scanner.models import (
     ScanSummary,
     ViolationSeverity,
 )
+from app.services.ingestion import Checkout, FileFilter
 
 
 logger = structlog.get_logger()
 
+# Bump when the rule check logic changes so cached scan results are not reused
+_CHECKS_VERSION = 1
+
 # Built-in compliance rules (20+ rules)
 COMPLIANCE_RULES: list[ComplianceRule] = [
     # --- S3 / Storage ---
@@ -523,42 +534,75 @@ COMPLIANCE_RULES: list[ComplianceRule] = [
 ]
 
 
+IAC_EXTENSIONS = (".tf", ".yaml", ".yml", ".json", ".template")
+
+
+def detect_iac_platform(path: str, content: str) -> IaCPlatform | None:
+    """Infer the IaC platform of a file from its extension and content."""
+    if path.endswith(".tf"):
+        return IaCPlatform.TERRAFORM
+    if "AWSTemplateFormatVersion" in content or "AWS::" in content:
+        return IaCPlatform.CLOUDFORMATION
+    if re.search(r"^apiVersion:", content, re.MULTILINE) and re.search(
+        r"^kind:", content, re.MULTILINE
+    ):
+        return IaCPlatform.KUBERNETES
+    return None
+
+
 class IaCScannerService:
     """Service for scanning IaC files for compliance violations."""
 
-    def __init__(self, db: AsyncSession, copilot_client: object | None = None):
+    def __init__(
+        self,
+        db: AsyncSession,
+        copilot_client: object | None = None,
+        result_cache: AnalysisCache | None = None,
+    ):
         self.db = db
         self.copilot_client = copilot_client
         self._scan_results: list[IaCScanResult] = []
         self._rules = list(COMPLIANCE_RULES)
+        self._result_cache = result_cache if result_cache is not None else get_analysis_cache()
 
     async def scan_repository(
         self,
         org_id: str,
         repo_url: str,
         config: ScanConfiguration | None = None,
+        checkout: Checkout | None = None,
     ) -> IaCScanResult:
-        """Scan a repository's IaC files for compliance violations."""
+        """Scan a repository's IaC files for compliance violations.
+
+        With a ``checkout`` every IaC file in the working tree is scanned;
+        without one, a representative file set is simulated.
+        """
         start = datetime.now(UTC)
         config = config or ScanConfiguration()
 
         all_violations: list[IaCViolation] = []
         files_scanned = 0
 
-        # Simulate repository file discovery and scanning
-        sample_files = {
-            IaCPlatform.TERRAFORM: ["main.tf", "variables.tf", "modules/vpc/main.tf"],
-            IaCPlatform.CLOUDFORMATION: ["template.yaml", "stack.json"],
-            IaCPlatform.KUBERNETES: ["deployment.yaml", "service.yaml", "ingress.yaml"],
-        }
-
-        for platform in config.platforms:
-            files = sample_files.get(platform, [])
-            for filename in files:
-                files_scanned += 1
-                violations = await self.scan_file("", platform, filename)
-                filtered = self._apply_config_filters(violations, config)
-                all_violations.extend(filtered)
+        if checkout is not None:
+            iac_files = await self._discover_iac_files(checkout, config.platforms)
+        else:
+            # Simulate repository file discovery and scanning
+            sample_files = {
+                IaCPlatform.TERRAFORM: ["main.tf", "variables.tf", "modules/vpc/main.tf"],
+                IaCPlatform.CLOUDFORMATION: ["template.yaml", "stack.json"],
+                IaCPlatform.KUBERNETES: ["deployment.yaml", "service.yaml", "ingress.yaml"],
+            }
+            iac_files = [
+                (platform, filename, "")
+                for platform in config.platforms
+                for filename in sample_files.get(platform, [])
+            ]
+
+        for platform, filename, content in iac_files:
+            files_scanned += 1
+            violations = await self.scan_file(content, platform, filename)
+            filtered = self._apply_config_filters(violations, config)
+            all_violations.extend(filtered)
 
         duration_ms = int((datetime.now(UTC) - start).total_seconds() * 1000)
         summary = self._build_summary(all_violations, files_scanned)
@@ -584,6 +628,20 @@ class IaCScannerService:
         )
         return result
 
+    async def _discover_iac_files(
+        self,
+        checkout: Checkout,
+        platforms: list[IaCPlatform],
+    ) -> list[tuple[IaCPlatform, str, str]]:
+        """Classify the IaC files of a checkout by platform."""
+        contents = await checkout.load_files(FileFilter(extensions=IAC_EXTENSIONS))
+        discovered = []
+        for path, content in contents.items():
+            platform = detect_iac_platform(path, content)
+            if platform is not None and platform in platforms:
+                discovered.append((platform, path, content))
+        return discovered
+
     async def scan_file(
         self,
         content: str,
@@ -602,7 +660,63 @@ class IaCScannerService:
             logger.warning("Unsupported platform for scanning", platform=platform.value)
             return []
 
-        return await scanner(content, filename)
+        # Findings depend only on the content and the platform's enabled rules
+        rules = [asdict(r) for r in self._rules if r.platform == platform and r.enabled]
+        key = self._result_cache.key(
+            f"iac:{platform.value}",
+            ruleset_fingerprint([_CHECKS_VERSION, rules]),
+            content,
+        )
+        records = await self._result_cache.get(key)
+        if records is not None:
+            return [self._violation_from_record(record, filename) for record in records]
+
+        violations = await scanner(content, filename)
+        await self._result_cache.set(key, [self._violation_record(v) for v in violations])
+        return violations
+
+    @staticmethod
+    def _violation_record(violation: IaCViolation) -> Record:
+        return (
+            violation.rule_id,
+            violation.severity.value,
+            violation.resource_type.value,
+            violation.resource_name,
+            violation.line_number,
+            violation.description,
+            violation.regulation,
+            violation.article,
+            violation.fix_suggestion,
+            violation.auto_fixable,
+        )
+
+    @staticmethod
+    def _violation_from_record(record: Record, filename: str) -> IaCViolation:
+        (
+            rule_id,
+            severity,
+            resource_type,
+            resource_name,
+            line_number,
+            description,
+            regulation,
+            article,
+            fix_suggestion,
+            auto_fixable,
+        ) = record
+        return IaCViolation(
+            rule_id=rule_id,
+            severity=ViolationSeverity(severity),
+            resource_type=ResourceType(resource_type),
+            resource_name=resource_name,
+            file_path=filename,
+            line_number=line_number,
+            description=description,
+            regulation=regulation,
+            article=article,
+            fix_suggestion=fix_suggestion,
+            auto_fixable=auto_fixable,
+        )
 
     async def scan_terraform(self, content: str, filename: str) -> list[IaCViolation]:
         """Scan Terraform HCL content for compliance violations."""
@@ -6,6 +6,12 @@ from typing import Any
 
 import structlog
 
+from app.services.analysis_cache import (
+    AnalysisCache,
+    Record,
+    get_analysis_cache,
+    ruleset_fingerprint,
+)
 from app.services.ide.diagnostic import (
     COMPLIANCE_PATTERNS,
     CodeAction,
@@ -20,6 +26,16 @@ from app.services.ide.diagnostic import (
 
 logger = structlog.get_logger()
 
+# Bump when the language-specific checks change so cached results are not reused
+_ANALYZER_VERSION = 1
+
+_SEVERITY_ORDER = [
+    DiagnosticSeverity.ERROR,
+    DiagnosticSeverity.WARNING,
+    DiagnosticSeverity.INFORMATION,
+    DiagnosticSeverity.HINT,
+]
+
 
 class IDEComplianceAnalyzer:
     """Analyzes code for compliance issues in real-time."""
@@ -29,6 +45,7 @@ class IDEComplianceAnalyzer:
         enabled_regulations: list[str] | None = None,
         custom_patterns: dict[str, dict] | None = None,
         severity_threshold: DiagnosticSeverity = DiagnosticSeverity.HINT,
+        result_cache: AnalysisCache | None = None,
     ):
         self.enabled_regulations = enabled_regulations or [
             "GDPR",
@@ -40,11 +57,13 @@ class IDEComplianceAnalyzer:
         self.custom_patterns = custom_patterns or {}
         self.severity_threshold = severity_threshold
         self._compiled_patterns: dict[str, re.Pattern] = {}
+        self._result_cache = result_cache if result_cache is not None else get_analysis_cache()
         self._compile_patterns()
 
     def _compile_patterns(self) -> None:
         """Pre-compile regex patterns for performance."""
         all_patterns = {**COMPLIANCE_PATTERNS, **self.custom_patterns}
+        self._compiled_patterns = {}
         for name, config in all_patterns.items():
             if config.get("regulation") in self.enabled_regulations or not config.get("regulation"):
                 try:
@@ -54,6 +73,11 @@ class IDEComplianceAnalyzer:
                 except re.error as e:
                     logger.warning(f"Invalid pattern {name}: {e}")
 
+        # Cached diagnostics are only reused while the same patterns run
+        self._ruleset = ruleset_fingerprint(
+            [_ANALYZER_VERSION, [[name, all_patterns[name]] for name in self._compiled_patterns]]
+        )
+
     def analyze_document(
         self,
         uri: str,
@@ -73,32 +97,106 @@ class IDEComplianceAnalyzer:
             DiagnosticResult with all found compliance issues
         """
         start_time = time.perf_counter()
-        diagnostics: list[ComplianceDiagnostic] = []
-        lines = content.split("\n")
+        if not language:
+            language = self._detect_language(uri)
+
+        # Synchronous callers use the in-process tier only
+        key = self._result_cache.key(f"ide:{language}", self._ruleset, content)
+        records = self._result_cache.get_local(key)
+        if records is None:
+            records = self._diagnose(content, language)
+            self._result_cache.put_local(key, records)
+        return self._build_result(uri, version, content, records, start_time)
+
+    async def analyze_document_async(
+        self,
+        uri: str,
+        content: str,
+        language: str | None = None,
+        version: int | None = None,
+    ) -> DiagnosticResult:
+        """Analyze a document, sharing cached results with other processes.
 
-        # Detect language from URI if not provided
+        Same as ``analyze_document`` but also consults the shared (Redis)
+        tier of the result cache, so a file already analyzed by another
+        API worker or CI run is not analyzed again.
+        """
+        start_time = time.perf_counter()
         if not language:
             language = self._detect_language(uri)
 
-        # Run pattern-based analysis
-        pattern_diagnostics = self._analyze_patterns(content, lines)
-        diagnostics.extend(pattern_diagnostics)
+        key = self._result_cache.key(f"ide:{language}", self._ruleset, content)
+        records = await self._result_cache.get(key)
+        if records is None:
+            records = self._diagnose(content, language)
+            await self._result_cache.set(key, records)
+        return self._build_result(uri, version, content, records, start_time)
 
-        # Run language-specific analysis
-        lang_diagnostics = self._analyze_language_specific(content, lines, language)
-        diagnostics.extend(lang_diagnostics)
+    def _diagnose(self, content: str, language: str) -> list[Record]:
+        """Run every check over ``content`` and return cacheable records."""
+        lines = content.split("\n")
+        diagnostics = self._analyze_patterns(content, lines)
+        diagnostics.extend(self._analyze_language_specific(content, lines, language))
+        return [
+            (
+                d.range.start.line,
+                d.range.start.character,
+                d.range.end.line,
+                d.range.end.character,
+                d.message,
+                d.severity.value,
+                d.code,
+                d.category.value if d.category else None,
+                d.regulation,
+                d.article_reference,
+                d.data,
+            )
+            for d in diagnostics
+        ]
 
-        # Filter by severity threshold
-        severity_order = [
-            DiagnosticSeverity.ERROR,
-            DiagnosticSeverity.WARNING,
-            DiagnosticSeverity.INFORMATION,
-            DiagnosticSeverity.HINT,
+    def _build_result(
+        self,
+        uri: str,
+        version: int | None,
+        content: str,
+        records: list[Record],
+        start_time: float,
+    ) -> DiagnosticResult:
+        diagnostics = [
+            ComplianceDiagnostic(
+                range=Range(
+                    start=Position(line=start_line, character=start_col),
+                    end=Position(line=end_line, character=end_col),
+                ),
+                message=message,
+                severity=DiagnosticSeverity(severity),
+                code=code,
+                category=DiagnosticCategory(category) if category else None,
+                regulation=regulation,
+                article_reference=article_reference,
+                data=dict(data),
+            )
+            for (
+                start_line,
+                start_col,
+                end_line,
+                end_col,
+                message,
+                severity,
+                code,
+                category,
+                regulation,
+                article_reference,
+                data,
+            ) in records
         ]
-        threshold_idx = severity_order.index(self.severity_threshold)
-        diagnostics = [d for d in diagnostics if severity_order.index(d.severity) <= threshold_idx]
+
+        # Filter by severity threshold
+        threshold_idx = _SEVERITY_ORDER.index(self.severity_threshold)
+        diagnostics = [d for d in diagnostics if _SEVERITY_ORDER.index(d.severity) <= threshold_idx]
 
         # Add code actions for fixable issues
+        lines = content.split("\n")
         for diagnostic in diagnostics:
             diagnostic.code_actions = self._generate_code_actions(diagnostic, content, lines)
 
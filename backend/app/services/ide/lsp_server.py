@@ -349,7 +349,7 @@ class ComplianceLSPServer:
 
         if uri in self.documents:
             doc = self.documents[uri]
-            result = self.analyzer.analyze_document(
+            result = await self.analyzer.analyze_document_async(
                 uri=uri,
                 content=doc.text,
                 language=doc.language_id,
@@ -416,7 +416,7 @@ class ComplianceLSPServer:
             )
 
         doc = self.documents[uri]
-        result = self.analyzer.analyze_document(
+        result = await self.analyzer.analyze_document_async(
             uri=uri,
             content=doc.text,
             language=doc.language_id,
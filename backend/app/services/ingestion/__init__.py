@@ -0,0 +1,21 @@
+"""Bulk repository ingestion from shallow local checkouts."""
+
+from app.services.ingestion.files import FileFilter, SourceFile
+from app.services.ingestion.workspace import (
+    Checkout,
+    IngestionRun,
+    RepositoryWorkspace,
+    get_repository_workspace,
+    github_clone_url,
+)
+
+
+__all__ = [
+    "Checkout",
+    "FileFilter",
+    "IngestionRun",
+    "RepositoryWorkspace",
+    "SourceFile",
+    "get_repository_workspace",
+    "github_clone_url",
+]
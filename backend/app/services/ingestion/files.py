@@ -0,0 +1,104 @@
+"""Streaming access to the files of a local checkout."""
+
+import mmap
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+
+
+# Git treats a file as binary when a NUL byte appears in its first 8000 bytes
+BINARY_SNIFF_BYTES = 8000
+# Files at least this large are read through a memory map
+MMAP_THRESHOLD = 64 * 1024
+
+DEFAULT_EXCLUDES = (
+    "node_modules/*",
+    "*/node_modules/*",
+    "vendor/*",
+    "*/vendor/*",
+    "dist/*",
+    "build/*",
+    "*.min.js",
+    "*.map",
+)
+
+
+@dataclass(frozen=True)
+class FileFilter:
+    """Selects which files of a checkout are yielded.
+
+    ``include`` and ``exclude`` are ``fnmatch`` patterns matched against the
+    repository-relative path (``*`` also matches ``/``). An empty
+    ``include`` or ``extensions`` accepts everything.
+    """
+
+    include: tuple[str, ...] = ()
+    exclude: tuple[str, ...] = DEFAULT_EXCLUDES
+    extensions: tuple[str, ...] = ()
+    max_size: int | None = 1024 * 1024
+
+    def matches(self, path: str, size: int) -> bool:
+        if self.max_size is not None and size > self.max_size:
+            return False
+        if self.extensions and not path.endswith(self.extensions):
+            return False
+        if self.include and not any(fnmatch(path, pattern) for pattern in self.include):
+            return False
+        return not any(fnmatch(path, pattern) for pattern in self.exclude)
+
+
+@dataclass(frozen=True)
+class SourceFile:
+    """A tracked file in a checkout, read lazily from disk."""
+
+    path: str
+    size: int
+    sha: str
+    root: Path
+
+    @property
+    def local_path(self) -> Path:
+        return self.root / self.path
+
+    def read_bytes(self) -> bytes:
+        return self.local_path.read_bytes()
+
+    def is_binary(self) -> bool:
+        with self.local_path.open("rb") as fh:
+            return b"\0" in fh.read(BINARY_SNIFF_BYTES)
+
+    def read_text(self) -> str | None:
+        """Decode the file as UTF-8, or ``None`` for binary/undecodable files.
+
+        Large files are decoded straight from a memory map instead of being
+        copied into an intermediate buffer first.
+        """
+        if self.size == 0:
+            return ""
+        with self.local_path.open("rb") as fh:
+            if self.size < MMAP_THRESHOLD:
+                data = fh.read()
+                if b"\0" in data[:BINARY_SNIFF_BYTES]:
+                    return None
+                return _decode(data)
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if mapped.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1:
+                    return None
+                return _decode(mapped)
+
+
+def iter_files(
+    entries: Iterable[SourceFile], file_filter: FileFilter | None = None
+) -> Iterator[SourceFile]:
+    """Yield the entries accepted by ``file_filter`` (all entries if ``None``)."""
+    for entry in entries:
+        if file_filter is None or file_filter.matches(entry.path, entry.size):
+            yield entry
+
+
+def _decode(data: bytes | mmap.mmap) -> str | None:
+    try:
+        return str(data, "utf-8")
+    except UnicodeDecodeError:
+        return None
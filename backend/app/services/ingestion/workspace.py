@@ -0,0 +1,329 @@
+"""Managed local checkouts of remote repositories.
+
+Whole-repository analyses read files from a shallow git checkout instead of
+fetching them one by one over the REST API:
+
+- ``RepositoryWorkspace`` keeps one working tree per (url, ref) under a
+  cache directory. The first use is a ``--depth`` fetch; later uses fetch
+  only the objects that changed and update the tree in place. Least
+  recently used checkouts are pruned past ``max_repositories``.
+- ``Checkout`` lists tracked files (with blob SHAs and sizes) from the git
+  index and streams them through ``FileFilter``.
+- ``IngestionRun`` shares checkouts between every analyzer in one pipeline
+  run and holds them locked until the run ends, so another run cannot
+  move the tree underneath it. A run waiting for that lock gives up after
+  ``lock_timeout_seconds``.
+"""
+
+import asyncio
+import base64
+import fcntl
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import AsyncIterator, Iterable, Iterator
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Self
+
+import structlog
+
+from app.core.config import settings
+from app.core.exceptions import RepositoryError
+from app.services.ingestion.files import FileFilter, SourceFile, iter_files
+
+
+logger = structlog.get_logger()
+
+_SYMLINK_MODE = "120000"
+_LOCK_POLL_SECONDS = 0.25
+
+
+def github_clone_url(full_name: str) -> str:
+    """HTTPS clone URL for an ``owner/repo`` on GitHub."""
+    return f"https://github.com/{full_name}.git"
+
+
+@dataclass
+class Checkout:
+    """Working tree of one repository at one commit."""
+
+    url: str
+    ref: str
+    path: Path
+    commit_sha: str
+    files: list[SourceFile]
+    _texts: dict[str, str | None] = field(default_factory=dict, repr=False)
+
+    def iter_files(self, file_filter: FileFilter | None = None) -> Iterator[SourceFile]:
+        """Stream tracked files accepted by ``file_filter`` (default ``FileFilter()``)."""
+        return iter_files(self.files, file_filter or FileFilter())
+
+    def read_files(
+        self,
+        file_filter: FileFilter | None = None,
+        paths: Iterable[str] | None = None,
+    ) -> dict[str, str]:
+        """Decoded text of the matching files; binary files are skipped.
+
+        ``paths`` further restricts the result to those exact paths.
+        Contents are memoized on the checkout, so analyzers sharing it in
+        one run read each file from disk once.
+        """
+        wanted = set(paths) if paths is not None else None
+        contents: dict[str, str] = {}
+        for entry in self.iter_files(file_filter):
+            if wanted is not None and entry.path not in wanted:
+                continue
+            if entry.path not in self._texts:
+                self._texts[entry.path] = entry.read_text()
+            text = self._texts[entry.path]
+            if text is not None:
+                contents[entry.path] = text
+        return contents
+
+    async def load_files(
+        self,
+        file_filter: FileFilter | None = None,
+        paths: Iterable[str] | None = None,
+    ) -> dict[str, str]:
+        """``read_files`` off the event loop."""
+        return await asyncio.to_thread(self.read_files, file_filter, paths)
+
+    def tree(self) -> list[dict[str, Any]]:
+        """Entries shaped like the GitHub git-trees API (blobs, then trees)."""
+        items: list[dict[str, Any]] = []
+        directories: set[str] = set()
+        for entry in self.files:
+            items.append({"path": entry.path, "type": "blob", "sha": entry.sha, "size": entry.size})
+            parent = entry.path.rpartition("/")[0]
+            while parent and parent not in directories:
+                directories.add(parent)
+                parent = parent.rpartition("/")[0]
+        items.extend({"path": path, "type": "tree"} for path in sorted(directories))
+        return items
+
+
+class RepositoryWorkspace:
+    """Cache directory of shallow checkouts, shared across processes."""
+
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        max_repositories: int = 32,
+        depth: int = 1,
+        timeout_seconds: float = 600,
+        lock_timeout_seconds: float = 300,
+    ):
+        self.root = Path(root or Path(tempfile.gettempdir()) / "complianceagent-workspaces")
+        self.max_repositories = max_repositories
+        self.depth = depth
+        self.timeout_seconds = timeout_seconds
+        self.lock_timeout_seconds = lock_timeout_seconds
+
+    @asynccontextmanager
+    async def checkout(
+        self,
+        url: str,
+        ref: str = "HEAD",
+        access_token: str | None = None,
+    ) -> AsyncIterator[Checkout]:
+        """Fetch ``ref`` of ``url`` and hold the checkout for the block.
+
+        The working tree is locked exclusively (across processes) while the
+        block runs. A concurrent user of the same (url, ref) waits for it, at
+        most ``lock_timeout_seconds``, then raises ``RepositoryError``.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        key = hashlib.sha256(f"{url}#{ref}".encode()).hexdigest()[:24]
+        directory = self.root / key
+        lock_file = (self.root / f"{key}.lock").open("a")
+        try:
+            await self._lock(lock_file, url, ref)
+            yield await self._sync(directory, url, ref, access_token)
+        finally:
+            lock_file.close()
+            await asyncio.to_thread(self.prune)
+
+    async def _lock(self, lock_file: Any, url: str, ref: str) -> None:
+        deadline = time.monotonic() + self.lock_timeout_seconds
+        while True:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise RepositoryError(
+                        "Checkout is in use by another run",
+                        details={"url": url, "ref": ref},
+                    ) from None
+                await asyncio.sleep(_LOCK_POLL_SECONDS)
+
+    def prune(self) -> int:
+        """Remove the least recently used unlocked checkouts over the limit."""
+        if not self.root.exists():
+            return 0
+        checkouts = sorted(
+            (path for path in self.root.iterdir() if path.is_dir()),
+            key=lambda path: path.stat().st_mtime,
+        )
+        removed = 0
+        for directory in checkouts[: max(0, len(checkouts) - self.max_repositories)]:
+            with (self.root / f"{directory.name}.lock").open("a") as lock_file:
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                shutil.rmtree(directory, ignore_errors=True)
+                removed += 1
+        if removed:
+            logger.info("workspace.pruned", removed=removed, root=str(self.root))
+        return removed
+
+    async def _sync(
+        self,
+        directory: Path,
+        url: str,
+        ref: str,
+        access_token: str | None,
+    ) -> Checkout:
+        incremental = (directory / ".git").is_dir()
+        if not incremental:
+            directory.mkdir(parents=True, exist_ok=True)
+            await self._git(directory, "init", "--quiet")
+
+        await self._git(
+            directory,
+            "fetch",
+            "--quiet",
+            "--no-tags",
+            f"--depth={self.depth}",
+            url,
+            ref,
+            access_token=access_token,
+        )
+        await self._git(directory, "checkout", "--quiet", "--force", "--detach", "FETCH_HEAD")
+        await self._git(directory, "clean", "-ffdxq")
+        commit_sha = (await self._git(directory, "rev-parse", "HEAD")).strip()
+        listing = await self._git(directory, "ls-tree", "-r", "-l", "-z", "HEAD")
+        directory.touch()
+
+        files = list(_parse_ls_tree(listing, directory))
+        logger.info(
+            "workspace.checked_out",
+            url=url,
+            ref=ref,
+            commit=commit_sha,
+            files=len(files),
+            incremental=incremental,
+        )
+        return Checkout(url=url, ref=ref, path=directory, commit_sha=commit_sha, files=files)
+
+    async def _git(self, cwd: Path, *args: str, access_token: str | None = None) -> str:
+        env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+        if access_token:
+            # Passed through the environment so it never appears in argv or .git/config
+            credentials = base64.b64encode(f"x-access-token:{access_token}".encode()).decode()
+            env |= {
+                "GIT_CONFIG_COUNT": "1",
+                "GIT_CONFIG_KEY_0": "http.extraHeader",
+                "GIT_CONFIG_VALUE_0": f"Authorization: Basic {credentials}",
+            }
+
+        process = await asyncio.create_subprocess_exec(
+            "git",
+            *args,
+            cwd=cwd,
+            env=env,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(), timeout=self.timeout_seconds
+            )
+        except TimeoutError:
+            process.kill()
+            await process.wait()
+            raise RepositoryError(f"git {args[0]} timed out", details={"cwd": str(cwd)}) from None
+
+        if process.returncode != 0:
+            raise RepositoryError(
+                f"git {args[0]} failed",
+                details={"cwd": str(cwd), "stderr": stderr.decode(errors="replace")[-2000:]},
+            )
+        return stdout.decode(errors="surrogateescape")
+
+
+def _parse_ls_tree(listing: str, root: Path) -> Iterator[SourceFile]:
+    """Parse ``git ls-tree -r -l -z`` output into regular-file entries."""
+    for record in listing.split("\0"):
+        if not record:
+            continue
+        meta, _, path = record.partition("\t")
+        mode, kind, sha, size = meta.split()
+        # Submodules have no content here and symlinks may point outside the tree
+        if kind != "blob" or mode == _SYMLINK_MODE:
+            continue
+        yield SourceFile(path=path, size=int(size), sha=sha, root=root)
+
+
+class IngestionRun:
+    """Checkouts shared by every analyzer taking part in one pipeline run.
+
+    Usage::
+
+        async with IngestionRun(access_token=token) as run:
+            checkout = await run.checkout(github_clone_url("acme/api"))
+            graph = await builder.build_graph_from_checkout(repo_id, org_id, checkout)
+            sbom_files = await sbom.dependency_files_from_checkout(checkout)
+    """
+
+    def __init__(
+        self,
+        workspace: RepositoryWorkspace | None = None,
+        access_token: str | None = None,
+    ):
+        self.workspace = workspace or get_repository_workspace()
+        self.access_token = access_token
+        self._stack = AsyncExitStack()
+        self._checkouts: dict[tuple[str, str], asyncio.Future[Checkout]] = {}
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._checkouts.clear()
+        await self._stack.aclose()
+
+    async def checkout(self, url: str, ref: str = "HEAD") -> Checkout:
+        """Check out ``ref`` of ``url`` once per run; later callers share it."""
+        key = (url, ref)
+        future = self._checkouts.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._stack.enter_async_context(
+                    self.workspace.checkout(url, ref, self.access_token)
+                )
+            )
+            self._checkouts[key] = future
+        return await asyncio.shield(future)
+
+
+_workspace: RepositoryWorkspace | None = None
+
+
+def get_repository_workspace() -> RepositoryWorkspace:
+    """Get or create the process-wide repository workspace."""
+    global _workspace
+    if _workspace is None:
+        _workspace = RepositoryWorkspace(
+            root=settings.ingestion_workspace_dir,
+            max_repositories=settings.ingestion_max_repositories,
+            depth=settings.ingestion_clone_depth,
+            lock_timeout_seconds=settings.ingestion_lock_timeout_seconds,
+        )
+    return _workspace
@@ -85,6 +85,7 @@ from app.services.monitoring.pci_dss_sources import (
     get_pci_dss_source_definitions,
     initialize_pci_dss_sources,
 )
+from app.services.monitoring.pdf import PDFExtractor, PDFPage, get_pdf_extractor
 from app.services.monitoring.service import MonitoringService
 
 # Asia-Pacific sources
@@ -106,6 +107,15 @@ from app.services.monitoring.sox_sources import (
     get_sox_source_definitions,
     initialize_sox_sources,
 )
+from app.services.monitoring.streaming import (
+    ExtractionRule,
+    RegulatoryDocument,
+    Section,
+    SectionSegmenter,
+    extract,
+    iter_text_blocks,
+    register_extractor,
+)
 
 
 __all__ = [
@@ -123,6 +133,7 @@ __all__ = [
     "ESGSourceMonitor",
     "EUAIActParser",
     "EUAIActSourceMonitor",
+    "ExtractionRule",
     "GDPRParser",
     "GDPRSourceMonitor",
     "HIPAAParser",
@@ -141,14 +152,20 @@ __all__ = [
     "NIS2SourceMonitor",
     "PCIDSSParser",
     "PCIDSSSourceMonitor",
+    "PDFExtractor",
+    "PDFPage",
     "RegulatoryCrawler",
+    "RegulatoryDocument",
     "SOC2Parser",
     "SOC2SourceMonitor",
     "SOXParser",
     "SOXSourceMonitor",
+    "Section",
+    "SectionSegmenter",
     "SingaporePDPAParser",
     "SingaporePDPASourceMonitor",
     "SourceBackpressure",
+    "extract",
     "get_ai_safety_source_definitions",
     "get_ccpa_source_definitions",
     "get_china_pipl_source_definitions",
@@ -162,6 +179,7 @@ __all__ = [
     "get_korea_pipa_source_definitions",
     "get_nis2_source_definitions",
     "get_pci_dss_source_definitions",
+    "get_pdf_extractor",
     "get_singapore_pdpa_source_definitions",
     "get_soc2_source_definitions",
     "get_sox_source_definitions",
@@ -181,4 +199,6 @@ __all__ = [
     "initialize_singapore_pdpa_sources",
     "initialize_soc2_sources",
     "initialize_sox_sources",
+    "iter_text_blocks",
+    "register_extractor",
 ]
@@ -1,13 +1,23 @@
 """CCPA (California Consumer Privacy Act) regulatory source."""
 
 import re
+from collections.abc import Iterator
 from typing import Any
 
 import structlog
-from bs4 import BeautifulSoup
 
 from app.models.regulation import Jurisdiction, RegulatoryFramework, RegulatorySource
 from app.services.monitoring.crawler import RegulatoryCrawler
+from app.services.monitoring.streaming import (
+    ExtractionRule,
+    Heading,
+    RegulatoryDocument,
+    Section,
+    SectionSegmenter,
+    Source,
+    collect_obligations,
+    register_extractor,
+)
 
 
 logger = structlog.get_logger()
@@ -138,44 +148,43 @@ CCPA_REQUIREMENTS = [
 ]
 
 
+# Civil Code section headers ("1798.100.", "§ 1798.105")
+_SECTION_HEADING = re.compile(r"(?:Section\s+|§\s*)?(\d{4}\.\d+)\b\.?", re.IGNORECASE)
+CCPA_HEADINGS = (Heading("section", _SECTION_HEADING),)
+_SEGMENTER = SectionSegmenter(CCPA_HEADINGS, anchor=None)
+
+
+def _section_record(section: Section) -> dict[str, Any]:
+    """A Civil Code section as ``{"number", "content"}``, without its header."""
+    lines = section.lines
+    if section.part == 0 and lines:
+        first = lines[0].lstrip()
+        match = _SECTION_HEADING.match(first)
+        if match:
+            rest = first[match.end() :].strip()
+            lines = [rest, *lines[1:]] if rest else lines[1:]
+    return {"number": section.number, "content": "\n".join(lines)}
+
+
 class CCPAParser:
     """Parser for CCPA-related documents."""
 
     def __init__(self):
         self.section_pattern = re.compile(r"Section\s+(\d+\.\d+)", re.IGNORECASE)
 
-    def parse_california_legislature(self, content: str) -> dict[str, Any]:
+    def parse_california_legislature(self, content: Source) -> dict[str, Any]:
         """Parse California Legislature CCPA document."""
-        soup = BeautifulSoup(content, "lxml")
-
-        result = {
+        return {
             "title": "California Consumer Privacy Act",
-            "sections": [],
+            "sections": list(self.iter_sections(content)),
             "requirements": [],
         }
 
-        # Extract sections
-        for section in soup.find_all("div", class_="law-section"):
-            section_num = ""
-            section_content = ""
-
-            header = section.find("div", class_="law-section-header")
-            if header:
-                section_num = header.get_text(strip=True)
-
-            body = section.find("div", class_="law-section-body")
-            if body:
-                section_content = body.get_text(separator="\n", strip=True)
-
-            if section_num:
-                result["sections"].append(
-                    {
-                        "number": section_num,
-                        "content": section_content,
-                    }
-                )
-
-        return result
+    def iter_sections(self, content: Source) -> Iterator[dict[str, Any]]:
+        """Stream the Civil Code sections of a CCPA document."""
+        document = RegulatoryDocument(content, segmenter=_SEGMENTER)
+        for section in document.sections("section", merge_parts=True):
+            yield _section_record(section)
 
     def extract_requirements_from_section(
         self,
@@ -244,14 +253,11 @@ class CCPASourceMonitor:
         content: str,
     ) -> list[dict[str, Any]]:
         """Extract all requirements from CCPA content."""
-        parsed = self.parser.parse_california_legislature(content)
-        all_requirements = []
-
-        for section in parsed.get("sections", []):
-            requirements = self.parser.extract_requirements_from_section(section)
-            all_requirements.extend(requirements)
-
-        return all_requirements
+        return [
+            requirement
+            for section in self.parser.iter_sections(content)
+            for requirement in self.parser.extract_requirements_from_section(section)
+        ]
 
 
 # CCPA Sections for test compatibility
@@ -267,6 +273,17 @@ CCPA_SECTIONS = {
 }
 
 
+_rule_parser = CCPAParser()
+register_extractor(
+    ExtractionRule(
+        "ccpa",
+        lambda section: _rule_parser.extract_requirements_from_section(_section_record(section)),
+        kinds=frozenset({"section"}),
+        headings=CCPA_HEADINGS,
+    )
+)
+
+
 def get_ccpa_source_definitions() -> list[dict[str, Any]]:
     """Get predefined CCPA source definitions."""
     return CCPA_SOURCES
@@ -295,20 +312,17 @@ async def initialize_ccpa_sources(db) -> list[RegulatorySource]:
     return sources
 
 
-def parse_ccpa_text(content: str) -> dict[str, Any]:
-    """Parse CCPA legislative text to extract requirements."""
-    requirements = []
+_SECTION_REFERENCE = re.compile(r"Section (\d+\.\d+)", re.IGNORECASE)
 
-    # CCPA-specific parsing logic
-    import re
 
-    # Find section references
-    sections = re.findall(r"Section (\d+\.\d+)", content, re.IGNORECASE)
+def parse_ccpa_text(content: Source) -> dict[str, Any]:
+    """Parse CCPA legislative text to extract requirements."""
+    requirements = []
 
-    # Find "shall" obligations (California legal language)
-    obligations = re.findall(r"(?:shall|must|required to)\s+([^.]+\.)", content, re.IGNORECASE)
+    # Section references and "shall" obligations (California legal language)
+    obligations, sections = collect_obligations(content, _SECTION_REFERENCE, limit=20)
 
-    for i, obligation in enumerate(obligations[:20]):  # Limit to first 20
+    for i, obligation in enumerate(obligations):
         requirements.append(
             {
                 "id": f"ccpa-{i + 1}",
@@ -323,5 +337,5 @@ def parse_ccpa_text(content: str) -> dict[str, Any]:
         "framework": "ccpa",
         "jurisdiction": "US-CA",
         "requirements": requirements,
-        "sections_found": list(set(sections)),
+        "sections_found": sections,
     }
@@ -1,6 +1,7 @@
 """China Personal Information Protection Law (PIPL) regulatory source implementations."""
 
 import re
+from collections.abc import Iterator
 from typing import Any
 
 import structlog
@@ -8,6 +9,14 @@ from bs4 import BeautifulSoup
 
 from app.models.regulation import Jurisdiction, RegulatoryFramework, RegulatorySource
 from app.services.monitoring.crawler import RegulatoryCrawler
+from app.services.monitoring.streaming import (
+    ExtractionRule,
+    RegulatoryDocument,
+    Section,
+    Source,
+    extract,
+    register_extractor,
+)
 
 
 logger = structlog.get_logger()
@@ -110,10 +119,9 @@ class ChinaPIPLParser:
         self.article_pattern_cn = re.compile(r"第(\d+)条")
         self.chapter_pattern = re.compile(r"Chapter\s+(\d+)|第(\d+)章", re.IGNORECASE)
 
-    def parse_pipl_statute(self, content: str) -> dict[str, Any]:
+    def parse_pipl_statute(self, content: Source) -> dict[str, Any]:
         """Parse PIPL statute content."""
-        soup = BeautifulSoup(content, "lxml")
-
+        document = RegulatoryDocument(content)
         result = {
             "title": "Personal Information Protection Law of the People's Republic of China",
             "jurisdiction": "China",
@@ -123,55 +131,32 @@ class ChinaPIPLParser:
             "last_updated": None,
         }
 
-        # Extract title
-        title_elem = soup.find("h1") or soup.find("title")
-        if title_elem:
-            title_text = title_elem.get_text(strip=True)
-            if "个人信息" in title_text or "Personal Information" in title_text:
-                result["title"] = title_text
-
-        # Extract articles
-        text_content = soup.get_text(separator="\n")
-        current_article = None
-        current_content = []
-
-        for line in text_content.split("\n"):
-            # Check for article match (English or Chinese)
-            article_match = self.article_pattern_en.search(line)
-            chinese_match = self.article_pattern_cn.search(line)
-
-            if article_match or chinese_match:
-                # Save previous article
-                if current_article:
-                    article_info = PIPL_ARTICLES.get(current_article, {})
-                    result["articles"].append(
-                        {
-                            "number": current_article,
-                            "title": article_info.get("title", ""),
-                            "type": article_info.get("type", "general"),
-                            "content": "\n".join(current_content),
-                        }
-                    )
-
-                current_article = (article_match or chinese_match).group(1)
-                current_content = [line]
-            elif current_article:
-                current_content.append(line)
-
-        # Save last article
-        if current_article:
-            article_info = PIPL_ARTICLES.get(current_article, {})
-            result["articles"].append(
-                {
-                    "number": current_article,
-                    "title": article_info.get("title", ""),
-                    "type": article_info.get("type", "general"),
-                    "content": "\n".join(current_content),
-                }
-            )
+        for section in document.sections("chapter", "article", merge_parts=True):
+            if section.kind == "chapter":
+                result["chapters"].append({"number": section.number, "heading": section.heading})
+            else:
+                result["articles"].append(self._article_from_section(section))
+
+        title_text = document.first("h1", "title")
+        if title_text and ("个人信息" in title_text or "Personal Information" in title_text):
+            result["title"] = title_text
 
         return result
 
+    def iter_articles(self, content: Source) -> Iterator[dict[str, Any]]:
+        """Stream the articles of a PIPL statute without holding the document."""
+        for section in RegulatoryDocument(content).sections("article"):
+            yield self._article_from_section(section)
+
+    def _article_from_section(self, section: Section) -> dict[str, Any]:
+        info = PIPL_ARTICLES.get(section.number, {})
+        return {
+            "number": section.number,
+            "title": info.get("title", ""),
+            "type": info.get("type", "general"),
+            "content": section.text,
+        }
+
     def parse_cac_updates(self, content: str) -> list[dict[str, Any]]:
         """Parse CAC updates and announcements."""
         soup = BeautifulSoup(content, "lxml")
@@ -300,14 +285,19 @@ class ChinaPIPLSourceMonitor:
         content: str,
     ) -> list[dict[str, Any]]:
         """Extract all requirements from PIPL content."""
-        parsed = self.parser.parse_pipl_statute(content)
-        all_requirements = []
-
-        for article in parsed.get("articles", []):
-            requirements = self.parser.extract_requirements_from_article(article)
-            all_requirements.extend(requirements)
-
-        return all_requirements
+        return [requirement for _, requirement in extract(content, ["china_pipl"])]
+
+
+_rule_parser = ChinaPIPLParser()
+register_extractor(
+    ExtractionRule(
+        "china_pipl",
+        lambda section: _rule_parser.extract_requirements_from_article(
+            _rule_parser._article_from_section(section)
+        ),
+        kinds=frozenset({"article"}),
+    )
+)
 
 
 def get_china_pipl_source_definitions() -> list[dict[str, Any]]:
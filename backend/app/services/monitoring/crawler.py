@@ -1,6 +1,8 @@
 """Web crawler for regulatory sources."""
 
+import asyncio
 import hashlib
+import io
 from datetime import UTC, datetime
 from typing import Any
 from urllib.parse import urljoin
@@ -11,6 +13,7 @@ from playwright.async_api import Browser, Page, async_playwright
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.models.regulation import RegulatorySource
+from app.services.monitoring.pdf import get_pdf_extractor, is_pdf
 
 
 class CrawlerResult:
@@ -98,6 +101,9 @@ class RegulatoryCrawler:
             )
 
         response.raise_for_status()
+        if is_pdf(response.content, response.headers.get("Content-Type")):
+            return await self._pdf_result(source, response)
+
         content = response.text
         content_hash = self._compute_hash(content)
 
@@ -118,6 +124,47 @@ class RegulatoryCrawler:
             },
         )
 
+    async def _pdf_result(
+        self, source: RegulatorySource, response: httpx.Response
+    ) -> CrawlerResult:
+        """Extract the text of a PDF response page by page, off the event loop.
+
+        Pages are written out and hashed as they are extracted rather than
+        collected first.
+        """
+        max_pages = source.parser_config.get("max_pdf_pages")
+
+        def extract() -> tuple[str, str, int]:
+            # Same digest as _compute_hash over the joined text
+            content, digest = io.StringIO(), hashlib.sha256()
+            pages, hashed = 0, False
+            for page in get_pdf_extractor().iter_pages(response.content, max_pages):
+                text = page.text
+                if pages:
+                    content.write("\n")
+                content.write(text)
+                pages += 1
+                if words := " ".join(text.split()):
+                    digest.update(f" {words}".encode() if hashed else words.encode())
+                    hashed = True
+            return content.getvalue(), digest.hexdigest(), pages
+
+        content, content_hash, page_count = await asyncio.to_thread(extract)
+
+        return CrawlerResult(
+            source=source,
+            content=content,
+            content_hash=content_hash,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            metadata={
+                "status_code": response.status_code,
+                "content_type": response.headers.get("Content-Type"),
+                "document_type": "pdf",
+                "page_count": page_count,
+            },
+        )
+
     async def _crawl_with_browser(self, source: RegulatorySource) -> CrawlerResult:
         """Crawl using headless browser for JavaScript-heavy sites."""
         page: Page = await self.browser.new_page()
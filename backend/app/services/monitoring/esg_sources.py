@@ -1,6 +1,7 @@
 """ESG & Sustainability regulatory source implementations."""
 
 import re
+from collections.abc import Iterator
 from typing import Any
 
 import structlog
@@ -8,6 +9,12 @@ from bs4 import BeautifulSoup
 
 from app.models.regulation import Jurisdiction, RegulatoryFramework, RegulatorySource
 from app.services.monitoring.crawler import RegulatoryCrawler
+from app.services.monitoring.streaming import (
+    ExtractionRule,
+    RegulatoryDocument,
+    Source,
+    register_extractor,
+)
 
 
 logger = structlog.get_logger()
@@ -203,10 +210,9 @@ class ESGParser:
         self.esrs_pattern = re.compile(r"ESRS\s+([A-Z]\d+)", re.IGNORECASE)
         self.scope_pattern = re.compile(r"Scope\s+(\d+)", re.IGNORECASE)
 
-    def parse_csrd_directive(self, content: str) -> dict[str, Any]:
+    def parse_csrd_directive(self, content: Source) -> dict[str, Any]:
         """Parse CSRD directive content."""
-        soup = BeautifulSoup(content, "lxml")
-
+        document = RegulatoryDocument(content)
         result = {
             "title": "Corporate Sustainability Reporting Directive (CSRD)",
             "jurisdiction": "EU",
@@ -216,37 +222,20 @@ class ESGParser:
             "last_updated": None,
         }
 
-        # Extract title
-        title_elem = soup.find("p", class_="oj-doc-ti") or soup.find("title")
-        if title_elem:
-            result["title"] = title_elem.get_text(strip=True)
-
-        # Extract articles
-        for article in soup.find_all("div", class_="eli-subdivision"):
-            article_id = article.get("id", "")
-            if article_id.startswith("art_"):
-                article_num = article_id.replace("art_", "")
-                article_title = ""
-                article_content = ""
-
-                title_elem = article.find("p", class_="oj-ti-art")
-                if title_elem:
-                    article_title = title_elem.get_text(strip=True)
-
-                content_elem = article.find("div", class_="eli-subdivision")
-                if content_elem:
-                    article_content = content_elem.get_text(separator="\n", strip=True)
-
-                result["articles"].append(
-                    {
-                        "number": article_num,
-                        "title": article_title,
-                        "content": article_content,
-                    }
-                )
+        result["articles"] = list(self.iter_articles(document))
+        title = document.first(".oj-doc-ti", "title")
+        if title:
+            result["title"] = title
 
         return result
 
+    def iter_articles(self, content: Source | RegulatoryDocument) -> Iterator[dict[str, Any]]:
+        """Stream the ``art_N`` articles of a EUR-Lex CSRD document."""
+        if not isinstance(content, RegulatoryDocument):
+            content = RegulatoryDocument(content)
+        for section in content.sections("article", merge_parts=True):
+            yield section.as_article()
+
     def parse_esrs_standard(self, content: str) -> dict[str, Any]:
         """Parse European Sustainability Reporting Standard."""
         soup = BeautifulSoup(content, "lxml")
@@ -435,6 +424,16 @@ class ESGSourceMonitor:
         return all_requirements
 
 
+_rule_parser = ESGParser()
+register_extractor(
+    ExtractionRule(
+        "csrd",
+        lambda section: _rule_parser.extract_requirements_from_csrd(section.as_article()),
+        kinds=frozenset({"article"}),
+    )
+)
+
+
 def get_esg_source_definitions() -> list[dict[str, Any]]:
     """Get predefined ESG source definitions."""
     return ESG_SOURCES
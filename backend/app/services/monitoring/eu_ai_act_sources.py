@@ -1,13 +1,22 @@
 """EU AI Act regulatory sources."""
 
 import re
+from collections.abc import Iterator
 from typing import Any
 
 import structlog
-from bs4 import BeautifulSoup
 
 from app.models.regulation import Jurisdiction, RegulatoryFramework, RegulatorySource
 from app.services.monitoring.crawler import RegulatoryCrawler
+from app.services.monitoring.streaming import (
+    OBLIGATION_PATTERN,
+    ExtractionRule,
+    RegulatoryDocument,
+    Source,
+    collect_obligations,
+    extract,
+    register_extractor,
+)
 
 
 logger = structlog.get_logger()
@@ -306,47 +315,29 @@ class EUAIActParser:
     def __init__(self):
         self.article_pattern = re.compile(r"Article\s+(\d+)", re.IGNORECASE)
 
-    def parse_eur_lex(self, content: str) -> dict[str, Any]:
+    def parse_eur_lex(self, content: Source) -> dict[str, Any]:
         """Parse EUR-Lex EU AI Act document."""
-        soup = BeautifulSoup(content, "lxml")
-
+        document = RegulatoryDocument(content)
         result = {
             "title": "",
             "articles": [],
             "recitals": [],
         }
 
-        # Extract title
-        title_elem = soup.find("p", class_="oj-doc-ti")
-        if title_elem:
-            result["title"] = title_elem.get_text(strip=True)
-
-        # Extract articles
-        for article in soup.find_all("div", class_="eli-subdivision"):
-            article_id = article.get("id", "")
-            if article_id.startswith("art_"):
-                article_num = article_id.replace("art_", "")
-                article_title = ""
-                article_content = ""
-
-                title_elem = article.find("p", class_="oj-ti-art")
-                if title_elem:
-                    article_title = title_elem.get_text(strip=True)
-
-                content_elem = article.find("div", class_="eli-subdivision")
-                if content_elem:
-                    article_content = content_elem.get_text(separator="\n", strip=True)
-
-                result["articles"].append(
-                    {
-                        "number": article_num,
-                        "title": article_title,
-                        "content": article_content,
-                    }
-                )
+        result["articles"] = list(self.iter_articles(document))
+        title = document.first(".oj-doc-ti")
+        if title:
+            result["title"] = title
 
         return result
 
+    def iter_articles(self, content: Source | RegulatoryDocument) -> Iterator[dict[str, Any]]:
+        """Stream the ``art_N`` articles of a EUR-Lex EU AI Act document."""
+        if not isinstance(content, RegulatoryDocument):
+            content = RegulatoryDocument(content)
+        for section in content.sections("article", merge_parts=True):
+            yield section.as_article()
+
     def extract_requirements_from_article(
         self,
         article: dict[str, Any],
@@ -413,14 +404,17 @@ class EUAIActSourceMonitor:
         content: str,
     ) -> list[dict[str, Any]]:
         """Extract all requirements from EU AI Act content."""
-        parsed = self.parser.parse_eur_lex(content)
-        all_requirements = []
+        return [requirement for _, requirement in extract(content, ["eu_ai_act"])]
 
-        for article in parsed.get("articles", []):
-            requirements = self.parser.extract_requirements_from_article(article)
-            all_requirements.extend(requirements)
 
-        return all_requirements
+_rule_parser = EUAIActParser()
+register_extractor(
+    ExtractionRule(
+        "eu_ai_act",
+        lambda section: _rule_parser.extract_requirements_from_article(section.as_article()),
+        kinds=frozenset({"article"}),
+    )
+)
 
 
 def get_eu_ai_act_source_definitions() -> list[dict[str, Any]]:
@@ -451,28 +445,26 @@ async def initialize_eu_ai_act_sources(db) -> list[RegulatorySource]:
     return sources
 
 
-def parse_eu_ai_act_text(content: str) -> dict[str, Any]:
-    """Parse EU AI Act text to extract requirements."""
-    requirements = []
-
-    import re
+_ARTICLE_REFERENCE = re.compile(r"Article\s+(\d+)")
+_PROVIDER_OBLIGATION = re.compile(
+    r"provider[s]?\s+(?:of\s+(?:high-risk|general-purpose)\s+AI\s+systems?\s+)?(?:shall|must)\s+([^.]+\.)",
+    re.IGNORECASE,
+)
 
-    # Find article references
-    articles = re.findall(r"Article\s+(\d+)", content)
 
-    # Find shall/must obligations
-    obligations = re.findall(r"(?:shall|must|required to)\s+([^.]+\.)", content, re.IGNORECASE)
+def parse_eu_ai_act_text(content: Source) -> dict[str, Any]:
+    """Parse EU AI Act text to extract requirements."""
+    requirements = []
 
-    # Find provider obligations
-    provider_obligations = re.findall(
-        r"provider[s]?\s+(?:of\s+(?:high-risk|general-purpose)\s+AI\s+systems?\s+)?(?:shall|must)\s+([^.]+\.)",
+    # Shall/must and provider obligations, section by section
+    all_obligations, articles = collect_obligations(
         content,
-        re.IGNORECASE,
+        _ARTICLE_REFERENCE,
+        limit=30,
+        patterns=(OBLIGATION_PATTERN, _PROVIDER_OBLIGATION),
     )
 
-    all_obligations = obligations + provider_obligations
-
-    for i, obligation in enumerate(all_obligations[:30]):
+    for i, obligation in enumerate(all_obligations):
         requirements.append(
             {
                 "id": f"eu-ai-act-{i + 1}",
@@ -487,7 +479,7 @@ def parse_eu_ai_act_text(content: str) -> dict[str, Any]:
         "framework": "eu_ai_act",
         "jurisdiction": "EU",
         "requirements": requirements,
-        "articles_found": list(set(articles)),
+        "articles_found": articles,
     }
 
 
@@ -1,6 +1,7 @@
 """GDPR regulatory source implementations."""
 
 import re
+from collections.abc import Iterator
 from typing import Any
 
 import structlog
@@ -8,6 +9,13 @@ from bs4 import BeautifulSoup
 
 from app.models.regulation import Jurisdiction, RegulatoryFramework, RegulatorySource
 from app.services.monitoring.crawler import RegulatoryCrawler
+from app.services.monitoring.streaming import (
+    ExtractionRule,
+    RegulatoryDocument,
+    Source,
+    extract,
+    register_extractor,
+)
 
 
 logger = structlog.get_logger()
@@ -67,10 +75,9 @@ class GDPRParser:
         self.article_pattern = re.compile(r"Article\s+(\d+)", re.IGNORECASE)
         self.recital_pattern = re.compile(r"\((\d+)\)", re.IGNORECASE)
 
-    def parse_eur_lex(self, content: str) -> dict[str, Any]:
+    def parse_eur_lex(self, content: Source) -> dict[str, Any]:
         """Parse EUR-Lex GDPR document."""
-        soup = BeautifulSoup(content, "lxml")
-
+        document = RegulatoryDocument(content)
         result = {
             "title": "",
             "articles": [],
@@ -79,37 +86,20 @@ class GDPRParser:
             "last_updated": None,
         }
 
-        # Extract title
-        title_elem = soup.find("p", class_="oj-doc-ti")
-        if title_elem:
-            result["title"] = title_elem.get_text(strip=True)
-
-        # Extract articles
-        for article in soup.find_all("div", class_="eli-subdivision"):
-            article_id = article.get("id", "")
-            if article_id.startswith("art_"):
-                article_num = article_id.replace("art_", "")
-                article_title = ""
-                article_content = ""
-
-                title_elem = article.find("p", class_="oj-ti-art")
-                if title_elem:
-                    article_title = title_elem.get_text(strip=True)
-
-                content_elem = article.find("div", class_="eli-subdivision")
-                if content_elem:
-                    article_content = content_elem.get_text(separator="\n", strip=True)
-
-                result["articles"].append(
-                    {
-                        "number": article_num,
-                        "title": article_title,
-                        "content": article_content,
-                    }
-                )
+        result["articles"] = list(self.iter_articles(document))
+        title = document.first(".oj-doc-ti")
+        if title:
+            result["title"] = title
 
         return result
 
+    def iter_articles(self, content: Source | RegulatoryDocument) -> Iterator[dict[str, Any]]:
+        """Stream the ``art_N`` articles of a EUR-Lex GDPR document."""
+        if not isinstance(content, RegulatoryDocument):
+            content = RegulatoryDocument(content)
+        for section in content.sections("article", merge_parts=True):
+            yield section.as_article()
+
     def parse_edpb_guidelines(self, content: str) -> list[dict[str, Any]]:
         """Parse EDPB guidelines listing."""
         soup = BeautifulSoup(content, "lxml")
@@ -217,14 +207,7 @@ class GDPRSourceMonitor:
         content: str,
     ) -> list[dict[str, Any]]:
         """Extract all requirements from GDPR content."""
-        parsed = self.parser.parse_eur_lex(content)
-        all_requirements = []
-
-        for article in parsed.get("articles", []):
-            requirements = self.parser.extract_requirements_from_article(article)
-            all_requirements.extend(requirements)
-
-        return all_requirements
+        return [requirement for _, requirement in extract(content, ["gdpr"])]
 
 
 # GDPR Articles for test compatibility
@@ -252,6 +235,16 @@ GDPR_ARTICLES = {
 }
 
 
+_rule_parser = GDPRParser()
+register_extractor(
+    ExtractionRule(
+        "gdpr",
+        lambda section: _rule_parser.extract_requirements_from_article(section.as_article()),
+        kinds=frozenset({"article"}),
+    )
+)
+
+
 def get_gdpr_source_definitions() -> list[dict[str, Any]]:
     """Get predefined GDPR source definitions."""
     return GDPR_SOURCES
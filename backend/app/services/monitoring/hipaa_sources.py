@@ -8,6 +8,7 @@ from bs4 import BeautifulSoup
 
 from app.models.regulation import Jurisdiction, RegulatoryFramework, RegulatorySource
 from app.services.monitoring.crawler import RegulatoryCrawler
+from app.services.monitoring.streaming import Source, collect_obligations
 
 
 logger = structlog.get_logger()
@@ -440,19 +441,17 @@ async def initialize_hipaa_sources(db) -> list[RegulatorySource]:
     return sources
 
 
-def parse_hipaa_text(content: str) -> dict[str, Any]:
-    """Parse HIPAA regulatory text to extract requirements."""
-    requirements = []
+_CFR_REFERENCE = re.compile(r"§?\s*164\.(\d+)")
 
-    import re
 
-    # Find CFR references (45 CFR Part 164)
-    cfr_refs = re.findall(r"§?\s*164\.(\d+)", content)
+def parse_hipaa_text(content: Source) -> dict[str, Any]:
+    """Parse HIPAA regulatory text to extract requirements."""
+    requirements = []
 
-    # Find shall/must obligations
-    obligations = re.findall(r"(?:shall|must|required to)\s+([^.]+\.)", content, re.IGNORECASE)
+    # CFR references (45 CFR Part 164) and shall/must obligations
+    obligations, cfr_refs = collect_obligations(content, _CFR_REFERENCE, limit=20)
 
-    for i, obligation in enumerate(obligations[:20]):
+    for i, obligation in enumerate(obligations):
         requirements.append(
             {
                 "id": f"hipaa-{i + 1}",
@@ -467,5 +466,5 @@ def parse_hipaa_text(content: str) -> dict[str, Any]:
         "framework": "hipaa",
         "jurisdiction": "US-Federal",
         "requirements": requirements,
-        "cfr_sections": list(set(cfr_refs)),
+        "cfr_sections": cfr_refs,
     }
@@ -1,6 +1,7 @@
 """India Digital Personal Data Protection Act (DPDP) regulatory source implementations."""
 
 import re
+from collections.abc import Iterator
 from typing import Any
 
 import structlog
@@ -8,6 +9,14 @@ from bs4 import BeautifulSoup
 
 from app.models.regulation import Jurisdiction, RegulatoryFramework, RegulatorySource
 from app.services.monitoring.crawler import RegulatoryCrawler
+from app.services.monitoring.streaming import (
+    ExtractionRule,
+    RegulatoryDocument,
+    Section,
+    Source,
+    extract,
+    register_extractor,
+)
 
 
 logger = structlog.get_logger()
@@ -87,10 +96,9 @@ class IndiaDPDPParser:
         self.section_pattern = re.compile(r"Section\s+(\d+)", re.IGNORECASE)
         self.chapter_pattern = re.compile(r"Chapter\s+([IVXLC]+)", re.IGNORECASE)
 
-    def parse_dpdp_act(self, content: str) -> dict[str, Any]:
+    def parse_dpdp_act(self, content: Source) -> dict[str, Any]:
         """Parse DPDP Act content."""
-        soup = BeautifulSoup(content, "lxml")
-
+        document = RegulatoryDocument(content)
         result = {
             "title": "Digital Personal Data Protection Act, 2023",
             "jurisdiction": "India",
@@ -100,45 +108,28 @@ class IndiaDPDPParser:
             "last_updated": None,
         }
 
-        # Extract sections from content
-        text_content = soup.get_text(separator="\n")
-        current_section = None
-        current_content = []
-
-        for line in text_content.split("\n"):
-            section_match = self.section_pattern.search(line)
-            if section_match:
-                # Save previous section
-                if current_section:
-                    section_info = DPDP_SECTIONS.get(current_section, {})
-                    result["sections"].append(
-                        {
-                            "number": current_section,
-                            "title": section_info.get("title", ""),
-                            "type": section_info.get("type", "general"),
-                            "content": "\n".join(current_content),
-                        }
-                    )
-
-                current_section = section_match.group(1)
-                current_content = [line]
-            elif current_section:
-                current_content.append(line)
-
-        # Save last section
-        if current_section:
-            section_info = DPDP_SECTIONS.get(current_section, {})
-            result["sections"].append(
-                {
-                    "number": current_section,
-                    "title": section_info.get("title", ""),
-                    "type": section_info.get("type", "general"),
-                    "content": "\n".join(current_content),
-                }
-            )
+        for section in document.sections("chapter", "section", merge_parts=True):
+            if section.kind == "chapter":
+                result["chapters"].append({"number": section.number, "heading": section.heading})
+            else:
+                result["sections"].append(self._section_from_section(section))
 
         return result
 
+    def iter_sections(self, content: Source) -> Iterator[dict[str, Any]]:
+        """Stream the sections of a DPDP Act without holding the document."""
+        for section in RegulatoryDocument(content).sections("section"):
+            yield self._section_from_section(section)
+
+    def _section_from_section(self, section: Section) -> dict[str, Any]:
+        info = DPDP_SECTIONS.get(section.number, {})
+        return {
+            "number": section.number,
+            "title": info.get("title", ""),
+            "type": info.get("type", "general"),
+            "content": section.text,
+        }
+
     def parse_meity_updates(self, content: str) -> list[dict[str, Any]]:
         """Parse MeitY updates and announcements."""
         soup = BeautifulSoup(content, "lxml")
@@ -264,14 +255,19 @@ class IndiaDPDPSourceMonitor:
         content: str,
     ) -> list[dict[str, Any]]:
         """Extract all requirements from DPDP content."""
-        parsed = self.parser.parse_dpdp_act(content)
-        all_requirements = []
-
-        for section in parsed.get("sections", []):
-            requirements = self.parser.extract_requirements_from_section(section)
-            all_requirements.extend(requirements)
-
-        return all_requirements
+        return [requirement for _, requirement in extract(content, ["india_dpdp"])]
+
+
+_rule_parser = IndiaDPDPParser()
+register_extractor(
+    ExtractionRule(
+        "india_dpdp",
+        lambda section: _rule_parser.extract_requirements_from_section(
+            _rule_parser._section_from_section(section)
+        ),
+        kinds=frozenset({"section"}),
+    )
+)
 
 
 def get_india_dpdp_source_definitions() -> list[dict[str, Any]]:
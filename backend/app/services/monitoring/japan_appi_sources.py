@@ -1,6 +1,7 @@
 """Japan Act on Protection of Personal Information (APPI) regulatory source implementations."""
 
 import re
+from collections.abc import Iterator
 from typing import Any
 
 import structlog
@@ -8,6 +9,14 @@ from bs4 import BeautifulSoup
 
 from app.models.regulation import Jurisdiction, RegulatoryFramework, RegulatorySource
 from app.services.monitoring.crawler import RegulatoryCrawler
+from app.services.monitoring.streaming import (
+    ExtractionRule,
+    RegulatoryDocument,
+    Section,
+    Source,
+    extract,
+    register_extractor,
+)
 
 
 logger = structlog.get_logger()
@@ -97,10 +106,9 @@ class JapanAPPIParser:
         self.article_pattern_jp = re.compile(r"第(\d+)条")
         self.chapter_pattern = re.compile(r"Chapter\s+(\d+)|第(\d+)章", re.IGNORECASE)
 
-    def parse_appi_statute(self, content: str) -> dict[str, Any]:
+    def parse_appi_statute(self, content: Source) -> dict[str, Any]:
         """Parse APPI statute content."""
-        soup = BeautifulSoup(content, "lxml")
-
+        document = RegulatoryDocument(content)
         result = {
             "title": "Act on the Protection of Personal Information",
             "jurisdiction": "Japan",
@@ -110,55 +118,32 @@ class JapanAPPIParser:
             "last_updated": None,
         }
 
-        # Extract title if available
-        title_elem = soup.find("h1") or soup.find("title")
-        if title_elem:
-            title_text = title_elem.get_text(strip=True)
-            if "個人情報" in title_text or "Personal Information" in title_text:
-                result["title"] = title_text
-
-        # Extract articles
-        text_content = soup.get_text(separator="\n")
-        current_article = None
-        current_content = []
-
-        for line in text_content.split("\n"):
-            # Check for article match (English or Japanese)
-            article_match = self.article_pattern_en.search(line) or self.article_pattern_jp.search(
-                line
-            )
-            if article_match:
-                # Save previous article
-                if current_article:
-                    article_info = APPI_ARTICLES.get(current_article, {})
-                    result["articles"].append(
-                        {
-                            "number": current_article,
-                            "title": article_info.get("title", ""),
-                            "type": article_info.get("type", "general"),
-                            "content": "\n".join(current_content),
-                        }
-                    )
-
-                current_article = article_match.group(1)
-                current_content = [line]
-            elif current_article:
-                current_content.append(line)
-
-        # Save last article
-        if current_article:
-            article_info = APPI_ARTICLES.get(current_article, {})
-            result["articles"].append(
-                {
-                    "number": current_article,
-                    "title": article_info.get("title", ""),
-                    "type": article_info.get("type", "general"),
-                    "content": "\n".join(current_content),
-                }
-            )
+        for section in document.sections("chapter", "article", merge_parts=True):
+            if section.kind == "chapter":
+                result["chapters"].append({"number": section.number, "heading": section.heading})
+            else:
+                result["articles"].append(self._article_from_section(section))
+
+        title_text = document.first("h1", "title")
+        if title_text and ("個人情報" in title_text or "Personal Information" in title_text):
+            result["title"] = title_text
 
         return result
 
+    def iter_articles(self, content: Source) -> Iterator[dict[str, Any]]:
+        """Stream the articles of a APPI statute without holding the document."""
+        for section in RegulatoryDocument(content).sections("article"):
+            yield self._article_from_section(section)
+
+    def _article_from_section(self, section: Section) -> dict[str, Any]:
+        info = APPI_ARTICLES.get(section.number, {})
+        return {
+            "number": section.number,
+            "title": info.get("title", ""),
+            "type": info.get("type", "general"),
+            "content": section.text,
+        }
+
     def parse_ppc_guidelines(self, content: str) -> list[dict[str, Any]]:
         """Parse PPC guidelines listing."""
         soup = BeautifulSoup(content, "lxml")
@@ -284,14 +269,19 @@ class JapanAPPISourceMonitor:
         content: str,
     ) -> list[dict[str, Any]]:
         """Extract all requirements from APPI content."""
-        parsed = self.parser.parse_appi_statute(content)
-        all_requirements = []
-
-        for article in parsed.get("articles", []):
-            requirements = self.parser.extract_requirements_from_article(article)
-            all_requirements.extend(requirements)
-
-        return all_requirements
+        return [requirement for _, requirement in extract(content, ["japan_appi"])]
+
+
+_rule_parser = JapanAPPIParser()
+register_extractor(
+    ExtractionRule(
+        "japan_appi",
+        lambda section: _rule_parser.extract_requirements_from_article(
+            _rule_parser._article_from_section(section)
+        ),
+        kinds=frozenset({"article"}),
+    )
+)
 
 
 def get_japan_appi_source_definitions() -> list[dict[str, Any]]:
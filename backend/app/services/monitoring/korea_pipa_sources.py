@@ -1,6 +1,7 @@
 """South Korea Personal Information Protection Act (PIPA) regulatory source implementations."""
 
 import re
+from collections.abc import Iterator
 from typing import Any
 
 import structlog
@@ -8,6 +9,14 @@ from bs4 import BeautifulSoup
 
 from app.models.regulation import Jurisdiction, RegulatoryFramework, RegulatorySource
 from app.services.monitoring.crawler import RegulatoryCrawler
+from app.services.monitoring.streaming import (
+    ExtractionRule,
+    RegulatoryDocument,
+    Section,
+    Source,
+    extract,
+    register_extractor,
+)
 
 
 logger = structlog.get_logger()
@@ -99,10 +108,9 @@ class KoreaPIPAParser:
         self.korean_article_pattern = re.compile(r"제(\d+)조(?:의(\d+))?")
         self.chapter_pattern = re.compile(r"Chapter\s+(\d+)|제(\d+)장", re.IGNORECASE)
 
-    def parse_pipa_statute(self, content: str) -> dict[str, Any]:
+    def parse_pipa_statute(self, content: Source) -> dict[str, Any]:
         """Parse PIPA statute content."""
-        soup = BeautifulSoup(content, "lxml")
-
+        document = RegulatoryDocument(content)
         result = {
             "title": "Personal Information Protection Act",
             "jurisdiction": "South Korea",
@@ -112,62 +120,32 @@ class KoreaPIPAParser:
             "last_updated": None,
         }
 
-        # Extract title
-        title_elem = soup.find("h1") or soup.find("title")
-        if title_elem:
-            title_text = title_elem.get_text(strip=True)
-            if "Personal Information" in title_text or "개인정보" in title_text:
-                result["title"] = title_text
-
-        # Extract articles
-        text_content = soup.get_text(separator="\n")
-        current_article = None
-        current_content = []
-
-        for line in text_content.split("\n"):
-            # Check for article match
-            article_match = self.article_pattern.search(line)
-            korean_match = self.korean_article_pattern.search(line)
-
-            if article_match or korean_match:
-                # Save previous article
-                if current_article:
-                    article_info = PIPA_ARTICLES.get(current_article, {})
-                    result["articles"].append(
-                        {
-                            "number": current_article,
-                            "title": article_info.get("title", ""),
-                            "type": article_info.get("type", "general"),
-                            "content": "\n".join(current_content),
-                        }
-                    )
-
-                if article_match:
-                    current_article = article_match.group(1)
-                else:
-                    # Convert Korean format to standard format
-                    main = korean_match.group(1)
-                    sub = korean_match.group(2)
-                    current_article = f"{main}-{sub}" if sub else main
-
-                current_content = [line]
-            elif current_article:
-                current_content.append(line)
-
-        # Save last article
-        if current_article:
-            article_info = PIPA_ARTICLES.get(current_article, {})
-            result["articles"].append(
-                {
-                    "number": current_article,
-                    "title": article_info.get("title", ""),
-                    "type": article_info.get("type", "general"),
-                    "content": "\n".join(current_content),
-                }
-            )
+        for section in document.sections("chapter", "article", merge_parts=True):
+            if section.kind == "chapter":
+                result["chapters"].append({"number": section.number, "heading": section.heading})
+            else:
+                result["articles"].append(self._article_from_section(section))
+
+        title_text = document.first("h1", "title")
+        if title_text and ("Personal Information" in title_text or "개인정보" in title_text):
+            result["title"] = title_text
 
         return result
 
+    def iter_articles(self, content: Source) -> Iterator[dict[str, Any]]:
+        """Stream the articles of a PIPA statute without holding the document."""
+        for section in RegulatoryDocument(content).sections("article"):
+            yield self._article_from_section(section)
+
+    def _article_from_section(self, section: Section) -> dict[str, Any]:
+        info = PIPA_ARTICLES.get(section.number, {})
+        return {
+            "number": section.number,
+            "title": info.get("title", ""),
+            "type": info.get("type", "general"),
+            "content": section.text,
+        }
+
     def parse_pipc_guidelines(self, content: str) -> list[dict[str, Any]]:
         """Parse PIPC guidelines listing."""
         soup = BeautifulSoup(content, "lxml")
@@ -295,14 +273,19 @@ class KoreaPIPASourceMonitor:
         content: str,
     ) -> list[dict[str, Any]]:
         """Extract all requirements from PIPA content."""
-        parsed = self.parser.parse_pipa_statute(content)
-        all_requirements = []
-
-        for article in parsed.get("articles", []):
-            requirements = self.parser.extract_requirements_from_article(article)
-            all_requirements.extend(requirements)
-
-        return all_requirements
+        return [requirement for _, requirement in extract(content, ["korea_pipa"])]
+
+
+_rule_parser = KoreaPIPAParser()
+register_extractor(
+    ExtractionRule(
+        "korea_pipa",
+        lambda section: _rule_parser.extract_requirements_from_article(
+            _rule_parser._article_from_section(section)
+        ),
+        kinds=frozenset({"article"}),
+    )
+)
 
 
 def get_korea_pipa_source_definitions() -> list[dict[str, Any]]:
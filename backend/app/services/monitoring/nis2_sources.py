@@ -1,6 +1,7 @@
 """NIS2 Directive regulatory source implementations."""
 
 import re
+from collections.abc import Iterator
 from typing import Any
 
 import structlog
@@ -8,6 +9,10 @@ from bs4 import BeautifulSoup
 
 from app.models.regulation import Jurisdiction, RegulatoryFramework, RegulatorySource
 from app.services.monitoring.crawler import RegulatoryCrawler
+from app.services.monitoring.streaming import (
+    RegulatoryDocument,
+    Source,
+)
 
 
 logger = structlog.get_logger()
@@ -225,47 +230,29 @@ class NIS2Parser:
     def __init__(self):
         self.article_pattern = re.compile(r"Article\s+(\d+)", re.IGNORECASE)
 
-    def parse_eur_lex(self, content: str) -> dict[str, Any]:
+    def parse_eur_lex(self, content: Source) -> dict[str, Any]:
         """Parse EUR-Lex NIS2 document."""
-        soup = BeautifulSoup(content, "lxml")
-
+        document = RegulatoryDocument(content)
         result = {
             "title": "",
             "articles": [],
             "annexes": [],
         }
 
-        # Extract title
-        title_elem = soup.find("p", class_="oj-doc-ti")
-        if title_elem:
-            result["title"] = title_elem.get_text(strip=True)
-
-        # Extract articles
-        for article in soup.find_all("div", class_="eli-subdivision"):
-            article_id = article.get("id", "")
-            if article_id.startswith("art_"):
-                article_num = article_id.replace("art_", "")
-                article_title = ""
-                article_content = ""
-
-                title_elem = article.find("p", class_="oj-ti-art")
-                if title_elem:
-                    article_title = title_elem.get_text(strip=True)
-
-                content_elem = article.find("div", class_="eli-subdivision")
-                if content_elem:
-                    article_content = content_elem.get_text(separator="\n", strip=True)
-
-                result["articles"].append(
-                    {
-                        "number": article_num,
-                        "title": article_title,
-                        "content": article_content,
-                    }
-                )
+        result["articles"] = list(self.iter_articles(document))
+        title = document.first(".oj-doc-ti")
+        if title:
+            result["title"] = title
 
         return result
 
+    def iter_articles(self, content: Source | RegulatoryDocument) -> Iterator[dict[str, Any]]:
+        """Stream the ``art_N`` articles of a EUR-Lex NIS2 document."""
+        if not isinstance(content, RegulatoryDocument):
+            content = RegulatoryDocument(content)
+        for section in content.sections("article", merge_parts=True):
+            yield section.as_article()
+
     def parse_enisa_guidance(self, content: str) -> list[dict[str, Any]]:
         """Parse ENISA NIS2 guidance page."""
         soup = BeautifulSoup(content, "lxml")
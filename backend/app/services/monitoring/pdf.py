@@ -0,0 +1,369 @@
+"""Page-parallel PDF text extraction for regulatory documents.
+
+Official journals, gazettes and consultation papers are often published
+only as PDFs. ``RegulatoryCrawler`` already collects their links, and this
+module turns them into page text that feeds the streaming section
+segmenter (``RegulatoryDocument(extractor.iter_text(pdf), html=False)``).
+
+Parsing and text decoding are done by pypdf, which reads files on disk in
+place and loads pages lazily. On top of it this module:
+
+- rebuilds lines in reading order (top to bottom, then left to right),
+  since a content stream may draw its text in any order
+- caches each page's lines under a hash of its content stream and fonts,
+  so a re-crawl of a republished journal only extracts the pages that
+  actually changed
+- hands the pages of long documents to the shared process pool in batches
+
+Only text is extracted, so scanned PDFs yield empty pages.
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, NamedTuple
+
+import structlog
+from pypdf import PageObject, PdfReader
+from pypdf.errors import PyPdfError
+from pypdf.generic import ArrayObject, DictionaryObject, StreamObject
+
+from app.core.exceptions import SourceParseError
+from app.core.process_pool import get_process_pool, process_pool_size
+from app.services.analysis_cache import AnalysisCache, get_analysis_cache
+
+
+logger = structlog.get_logger()
+
+# Bump when extraction output changes so cached pages are not reused
+EXTRACTOR_VERSION = 2
+
+# Documents with fewer pages are extracted inline; above this the process
+# pool pays for itself. Workers reopen the file once per batch.
+_PARALLEL_PAGES = 8
+_BATCH_PAGES = 16
+
+PDF_CONTENT_TYPES = frozenset(
+    {"application/pdf", "application/x-pdf", "application/octet-stream", "binary/octet-stream"}
+)
+
+# Entries that change how an object is stored or drawn, not the text it yields
+_STORAGE_KEYS = frozenset({"/Length", "/Filter", "/DecodeParms", "/Parent"})
+_FONT_PROGRAMS = frozenset({"/FontFile", "/FontFile2", "/FontFile3"})
+_MAX_DEPTH = 8
+
+PDFSource = bytes | bytearray | memoryview | str | os.PathLike | IO[bytes]
+
+
+# ----------------------------------------------------------------------
+# Page text
+# ----------------------------------------------------------------------
+
+
+class PageLine(NamedTuple):
+    """One line of page text and where it starts."""
+
+    x: float
+    y: float
+    text: str
+
+
+class _Run(NamedTuple):
+    y: float
+    x: float
+    size: float
+    text: str
+
+
+def _runs(page: PageObject) -> list[_Run]:
+    """Runs of text as pypdf emits them, each with the point it starts at."""
+    runs: list[_Run] = []
+    pieces: list[str] = []
+    start: tuple[float, float, float] | None = None
+
+    def close() -> None:
+        nonlocal start
+        text = "".join(pieces)
+        if start is not None and text.strip():
+            runs.append(_Run(start[1], start[0], start[2], text))
+        pieces.clear()
+        start = None
+
+    def visit(text: str, cm: list[float], tm: list[float], font: Any, size: float) -> None:
+        nonlocal start
+        for i, piece in enumerate(text.split("\n")):
+            if i:
+                close()
+            if not piece:
+                continue
+            if start is None:
+                e, f = tm[4], tm[5]
+                x = e * cm[0] + f * cm[2] + cm[4]
+                y = e * cm[1] + f * cm[3] + cm[5]
+                start = (x, y, abs(size * (tm[3] * cm[3] or tm[0] * cm[0])))
+            pieces.append(piece)
+
+    page.extract_text(visitor_text=visit)
+    close()
+    return runs
+
+
+def _layout(runs: list[_Run]) -> list[PageLine]:
+    """Group runs into lines, top to bottom, left to right."""
+    lines: list[list[_Run]] = []
+    for run in sorted(runs, key=lambda run: -run.y):
+        current = lines[-1] if lines else None
+        if current and abs(current[0].y - run.y) <= max(current[0].size, 1.0) * 0.5:
+            current.append(run)
+        else:
+            lines.append([run])
+
+    result: list[PageLine] = []
+    for line in lines:
+        line.sort(key=lambda run: run.x)
+        text = " ".join(" ".join(run.text for run in line).split())
+        if text:
+            result.append(PageLine(round(line[0].x, 2), round(line[0].y, 2), text))
+    return result
+
+
+def extract_page(page: PageObject) -> list[PageLine]:
+    """Lines of text drawn on one page."""
+    return _layout(_runs(page))
+
+
+def _fingerprint(value: Any, digest: Any, depth: int = 0) -> None:
+    value = value.get_object() if value is not None else None
+    if depth > _MAX_DEPTH:
+        return
+    if isinstance(value, StreamObject):
+        digest.update(value.get_data())
+    if isinstance(value, DictionaryObject):
+        for key in sorted(value):
+            if key in _STORAGE_KEYS or key in _FONT_PROGRAMS:
+                continue
+            digest.update(key.encode())
+            _fingerprint(value[key], digest, depth + 1)
+    elif isinstance(value, ArrayObject):
+        digest.update(b"[")
+        for item in value:
+            _fingerprint(item, digest, depth + 1)
+        digest.update(b"]")
+    else:
+        digest.update(repr(value).encode())
+
+
+def page_digest(page: PageObject) -> str:
+    """Hash of what a page's text depends on: its content and its fonts."""
+    digest = hashlib.sha256()
+    contents = page.get_contents()
+    if contents is not None:
+        digest.update(contents.get_data())
+    resources = page.get("/Resources")
+    fonts = resources.get_object().get("/Font") if resources is not None else None
+    _fingerprint(fonts, digest)
+    return digest.hexdigest()
+
+
+def _extract_pages(path: str, numbers: list[int]) -> list[list[PageLine]]:
+    """Lines of the given pages of the PDF at ``path``; runs in the process pool."""
+    reader = PdfReader(path)
+    return [extract_page(reader.pages[number - 1]) for number in numbers]
+
+
+# ----------------------------------------------------------------------
+# Extractor
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class PDFPage:
+    """Text of one PDF page."""
+
+    number: int
+    lines: list[PageLine] = field(default_factory=list)
+    digest: str = ""
+
+    @property
+    def text(self) -> str:
+        return "\n".join(line.text for line in self.lines)
+
+
+@dataclass
+class _Pending:
+    number: int
+    digest: str
+    key: str
+    lines: Any = None
+    future: Future | None = None
+    index: int = 0
+    fresh: bool = False
+
+
+def is_pdf(data: bytes, content_type: str | None = None) -> bool:
+    """Whether ``data`` is a PDF file, given the Content-Type it was served with.
+
+    The file must start with the ``%PDF-`` header, and a Content-Type, when
+    there is one, must be a PDF or generic binary type.
+    """
+    if data[:5] != b"%PDF-":
+        return False
+    if content_type is None:
+        return True
+    return content_type.split(";", 1)[0].strip().lower() in PDF_CONTENT_TYPES
+
+
+@contextmanager
+def _open(source: PDFSource) -> Iterator[tuple[IO[bytes], str | None]]:
+    """A seekable stream over ``source``, and its path when it is a file on disk."""
+    if isinstance(source, bytes | bytearray | memoryview):
+        yield io.BytesIO(source), None
+        return
+    if isinstance(source, str | os.PathLike):
+        with Path(source).open("rb") as file:
+            yield file, os.fspath(source)
+        return
+    name = getattr(source, "name", None)
+    if isinstance(name, str) and source.seekable() and Path(name).is_file():
+        yield source, name
+        return
+    yield io.BytesIO(source.read()), None
+
+
+@contextmanager
+def _on_disk(stream: IO[bytes], path: str | None) -> Iterator[str]:
+    """A path pool workers can open; in-memory documents are spilled to a file."""
+    if path is not None:
+        yield path
+        return
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as spill:
+        stream.seek(0)
+        shutil.copyfileobj(stream, spill)
+        spill.flush()
+        yield spill.name
+
+
+class PDFExtractor:
+    """Streams page text out of PDFs, extracting pages across processes."""
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        result_cache: AnalysisCache | None = None,
+        max_pages: int = 2_000,
+    ):
+        self.workers = workers or process_pool_size()
+        self.max_pages = max_pages
+        self._cache = result_cache if result_cache is not None else get_analysis_cache()
+
+    def iter_pages(self, source: PDFSource, max_pages: int | None = None) -> Iterator[PDFPage]:
+        """Pages of ``source`` in order, at most ``max_pages`` of them.
+
+        Pages are read lazily and yielded as soon as they and every page
+        before them are extracted, so a consumer that stops early stops
+        the read.
+        """
+        limit = max_pages or self.max_pages
+        with _open(source) as (stream, path):
+            header = stream.read(5)
+            stream.seek(-len(header), io.SEEK_CUR)
+            if not is_pdf(header):
+                raise SourceParseError("Not a PDF document")
+            try:
+                reader = PdfReader(stream)
+                total = len(reader.pages)
+            except PyPdfError as e:
+                raise SourceParseError(f"Unreadable PDF document: {e}") from e
+            if total > limit:
+                logger.info("pdf.page_limit_reached", max_pages=limit, pages=total)
+            count = min(total, limit)
+
+            pool = get_process_pool() if self.workers > 1 and count >= _PARALLEL_PAGES else None
+            if pool is None:
+                yield from self._pages(reader, count, None, None)
+                return
+            with _on_disk(stream, path) as worker_path:
+                yield from self._pages(reader, count, pool, worker_path)
+
+    def _pages(
+        self, reader: PdfReader, count: int, pool: Executor | None, path: str | None
+    ) -> Iterator[PDFPage]:
+        in_flight: deque[_Pending] = deque()
+        batch: list[_Pending] = []
+
+        def submit() -> None:
+            future = pool.submit(_extract_pages, path, [pending.number for pending in batch])
+            for index, pending in enumerate(batch):
+                pending.future, pending.index = future, index
+            batch.clear()
+
+        try:
+            for number in range(1, count + 1):
+                page = reader.pages[number - 1]
+                digest = page_digest(page)
+                key = f"pdf:v{EXTRACTOR_VERSION}:{digest}"
+                pending = _Pending(number, digest, key, self._cache.get_local(key))
+                in_flight.append(pending)
+                if pending.lines is None:
+                    pending.fresh = True
+                    if pool is None:
+                        pending.lines = extract_page(page)
+                    else:
+                        batch.append(pending)
+                        if len(batch) == _BATCH_PAGES:
+                            submit()
+                # Keep every worker busy without buffering the whole document
+                while in_flight and self._ready(in_flight[0], len(in_flight)):
+                    yield self._finish(in_flight.popleft())
+
+            if batch:
+                submit()
+            while in_flight:
+                yield self._finish(in_flight.popleft())
+        finally:
+            for pending in in_flight:
+                if pending.future is not None:
+                    pending.future.cancel()
+
+    def _ready(self, pending: _Pending, in_flight: int) -> bool:
+        if pending.lines is not None:
+            return True
+        if pending.future is None:
+            return False
+        return pending.future.done() or in_flight > self.workers * _BATCH_PAGES * 2
+
+    def _finish(self, pending: _Pending) -> PDFPage:
+        lines = pending.lines
+        if lines is None:
+            lines = pending.future.result()[pending.index]
+        if pending.fresh:
+            self._cache.put_local(pending.key, lines)
+        return PDFPage(pending.number, [PageLine(*line) for line in lines], pending.digest)
+
+    def iter_text(self, source: PDFSource, max_pages: int | None = None) -> Iterator[str]:
+        """Newline-terminated page texts, a ``Source`` for ``RegulatoryDocument``."""
+        for page in self.iter_pages(source, max_pages):
+            if page.lines:
+                yield page.text + "\n"
+
+    def extract_text(self, source: PDFSource, max_pages: int | None = None) -> str:
+        return "".join(self.iter_text(source, max_pages))
+
+
+_extractor: PDFExtractor | None = None
+
+
+def get_pdf_extractor() -> PDFExtractor:
+    """Get or create the process-wide PDF extractor."""
+    global _extractor
+    if _extractor is None:
+        _extractor = PDFExtractor()
+    return _extractor
@@ -0,0 +1,552 @@
+"""Streaming, sectioned parsing of regulatory documents.
+
+Statutes and directives are long (EUR-Lex acts and PDF exports run to
+hundreds of pages), while every framework parser only needs one article or
+section at a time. This module reads a document once, in bounded chunks,
+and hands parsers a stream of sections:
+
+1. ``iter_text_blocks`` decodes bytes, files or strings incrementally and,
+   for HTML, feeds the stdlib ``HTMLParser`` chunk by chunk, emitting one
+   ``TextBlock`` per line of block-level text.
+2. ``SectionSegmenter`` groups blocks into ``Section`` objects. EUR-Lex
+   style ``id="art_N"`` anchors win when present; otherwise a line that
+   starts with an article, section or chapter heading (English, Chinese,
+   Japanese or Korean forms) opens a new section. Unusually long sections
+   are emitted in parts so memory stays bounded by ``max_chars``.
+3. Framework extractors are registered as ``ExtractionRule`` objects and
+   ``extract`` runs any number of them over a single pass of the section
+   stream. Adding a framework adds a rule, not another pass over the text.
+
+Everything is a generator: only the current chunk and the current section
+are held in memory, and consumers that stop early stop the read.
+"""
+
+import codecs
+import re
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from itertools import chain
+from typing import IO, Any, NamedTuple
+
+
+CHUNK_SIZE = 64 * 1024
+
+Source = str | bytes | IO[str] | IO[bytes] | Iterable[str] | Iterable[bytes]
+
+_BLOCK_TAGS = frozenset(
+    {
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "br",
+        "caption",
+        "dd",
+        "div",
+        "dl",
+        "dt",
+        "figcaption",
+        "footer",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hr",
+        "li",
+        "main",
+        "nav",
+        "ol",
+        "p",
+        "pre",
+        "section",
+        "table",
+        "td",
+        "th",
+        "title",
+        "tr",
+        "ul",
+    }
+)
+_SKIP_TAGS = frozenset({"script", "style", "noscript", "template"})
+_VOID_TAGS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+
+
+class TextBlock(NamedTuple):
+    """One line of document text and the markup it sits in."""
+
+    text: str
+    tag: str | None = None  # innermost enclosing element
+    classes: frozenset[str] = frozenset()  # classes of that element
+    anchors: tuple[str, ...] = ()  # ids of all open ancestors, outermost first
+
+
+class _BlockParser(HTMLParser):
+    """Incremental HTML-to-text converter that preserves block boundaries."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._stack: list[tuple[str, str | None, frozenset[str]]] = []
+        self._skipping = 0
+        self._text: list[str] = []
+        self.blocks: list[TextBlock] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _BLOCK_TAGS:
+            self._flush()
+        if tag in _VOID_TAGS:
+            return
+        attributes = dict(attrs)
+        classes = frozenset((attributes.get("class") or "").split())
+        self._stack.append((tag, attributes.get("id"), classes))
+        if tag in _SKIP_TAGS:
+            self._skipping += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _BLOCK_TAGS:
+            self._flush()
+        # Tolerate unclosed children (``<p>`` without ``</p>``) and strays
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth][0] == tag:
+                for closed, _, _ in self._stack[depth:]:
+                    if closed in _SKIP_TAGS:
+                        self._skipping -= 1
+                del self._stack[depth:]
+                break
+
+    def handle_data(self, data: str) -> None:
+        if not self._skipping:
+            self._text.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+    def _flush(self) -> None:
+        if not self._text:
+            return
+        text = "".join(self._text)
+        self._text.clear()
+        if self._stack:
+            tag, _, classes = self._stack[-1]
+        else:
+            tag, classes = None, frozenset()
+        anchors = tuple(element_id for _, element_id, _ in self._stack if element_id)
+        for line in text.splitlines():
+            line = " ".join(line.split())
+            if line:
+                self.blocks.append(TextBlock(line, tag, classes, anchors))
+
+
+def _iter_chunks(source: Source, chunk_size: int, encoding: str) -> Iterator[str]:
+    """Decoded text of ``source`` in chunks of roughly ``chunk_size``."""
+    if isinstance(source, str):
+        for start in range(0, len(source), chunk_size):
+            yield source[start : start + chunk_size]
+        return
+
+    if isinstance(source, bytes | bytearray | memoryview):
+        view = memoryview(source)
+        raw: Iterable[Any] = (
+            view[start : start + chunk_size] for start in range(0, len(view), chunk_size)
+        )
+    elif hasattr(source, "read"):
+        raw = iter(lambda: source.read(chunk_size), source.read(0))
+    else:
+        raw = source
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in raw:
+        text = chunk if isinstance(chunk, str) else decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_text_blocks(
+    source: Source,
+    *,
+    html: bool | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> Iterator[TextBlock]:
+    """Stream the non-empty text lines of ``source``.
+
+    ``source`` may be a string, bytes, a text or binary file object, or an
+    iterable of string or byte chunks (an HTTP body, PDF pages). HTML is
+    detected from the first non-blank character unless ``html`` is given.
+    """
+    chunks = _iter_chunks(source, chunk_size, encoding)
+    head: list[str] = []
+    if html is None:
+        for chunk in chunks:
+            head.append(chunk)
+            stripped = chunk.lstrip()
+            if stripped:
+                html = stripped.startswith("<")
+                break
+    chunks = chain(head, chunks)
+
+    if html:
+        parser = _BlockParser()
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from parser.blocks
+            parser.blocks.clear()
+        parser.close()
+        yield from parser.blocks
+        return
+
+    pending = ""
+    for chunk in chunks:
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            line = line.rstrip("\r")
+            if line.strip():
+                yield TextBlock(line)
+    if pending.strip():
+        yield TextBlock(pending.rstrip("\r"))
+
+
+def _join_groups(match: re.Match) -> str:
+    return "-".join(group for group in match.groups() if group)
+
+
+@dataclass(frozen=True)
+class Heading:
+    """A line prefix that opens a new section of ``kind``."""
+
+    kind: str
+    pattern: re.Pattern
+    number: Callable[[re.Match], str] = _join_groups
+
+
+DEFAULT_HEADINGS: tuple[Heading, ...] = (
+    Heading(
+        "chapter",
+        re.compile(r"(?:Chapter|Part)\s+([IVXLC]+|\d+)\b|第(\d+)章|제(\d+)장", re.IGNORECASE),
+    ),
+    Heading(
+        "article",
+        re.compile(
+            r"Article\s+(\d+(?:-\d+)?[a-z]?)\b|第(\d+)条|제(\d+)조(?:의(\d+))?", re.IGNORECASE
+        ),
+    ),
+    Heading("section", re.compile(r"(?:Section|§)\s*(\d+(?:\.\d+)*[A-Z]?)\b", re.IGNORECASE)),
+)
+
+EUR_LEX_ANCHOR = re.compile(r"art_(\d+[a-z]?)$")
+EUR_LEX_HEADING_CLASSES = frozenset({"oj-ti-art", "oj-sti-art"})
+
+_SENTENCE_END = (".", ";", ":", "。", "．")
+
+
+@dataclass
+class Section:
+    """A contiguous run of document lines under one heading."""
+
+    kind: str  # "preamble", "chapter", "article", "section", "other"
+    number: str | None = None
+    heading: str = ""
+    chapter: str | None = None
+    title: str = ""
+    lines: list[str] = field(default_factory=list)
+    part: int = 0  # > 0 for the continuation of an oversized section
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    def as_article(self) -> dict[str, Any]:
+        return {"number": self.number, "title": self.title, "content": self.text}
+
+
+class SectionSegmenter:
+    """Groups a stream of text blocks into sections."""
+
+    def __init__(
+        self,
+        headings: Iterable[Heading] = DEFAULT_HEADINGS,
+        *,
+        anchor: re.Pattern | None = EUR_LEX_ANCHOR,
+        heading_classes: frozenset[str] = EUR_LEX_HEADING_CLASSES,
+        max_chars: int = 100_000,
+    ):
+        self.headings = tuple(headings)
+        self.anchor = anchor
+        self.heading_classes = heading_classes
+        self.max_chars = max_chars
+
+    def segment(self, blocks: Iterable[TextBlock]) -> Iterator[Section]:
+        current = Section("preamble")
+        current_anchor: str | None = None
+        chapter: str | None = None
+        size = 0
+
+        for block in blocks:
+            anchor = self._anchor_of(block)
+            if anchor != current_anchor:
+                if _has_content(current):
+                    yield current
+                if anchor is None:
+                    current = Section("other", chapter=chapter)
+                else:
+                    current = Section("article", self._anchor_number(anchor), chapter=chapter)
+                current_anchor, size = anchor, 0
+
+            if anchor is not None:
+                if block.classes & self.heading_classes:
+                    # Article number and subtitle lines, kept out of the content
+                    if not current.title:
+                        current.title = current.heading = block.text
+                    continue
+            else:
+                heading = self._heading_of(block.text)
+                if heading is not None:
+                    if _has_content(current):
+                        yield current
+                    kind, number = heading
+                    if kind == "chapter":
+                        chapter = number
+                    current = Section(kind, number, block.text, chapter=chapter)
+                    size = 0
+
+            current.lines.append(block.text)
+            size += len(block.text) + 1
+            if size >= self.max_chars and (
+                block.text.endswith(_SENTENCE_END) or size >= 4 * self.max_chars
+            ):
+                yield current
+                current = Section(
+                    current.kind,
+                    current.number,
+                    current.heading,
+                    chapter=current.chapter,
+                    title=current.title,
+                    part=current.part + 1,
+                )
+                size = 0
+
+        if _has_content(current):
+            yield current
+
+    def _anchor_of(self, block: TextBlock) -> str | None:
+        if self.anchor is None:
+            return None
+        for element_id in reversed(block.anchors):
+            if self.anchor.match(element_id):
+                return element_id
+        return None
+
+    def _anchor_number(self, element_id: str) -> str:
+        match = self.anchor.match(element_id)
+        return _join_groups(match) if match and match.groups() else element_id
+
+    def _heading_of(self, text: str) -> tuple[str, str] | None:
+        line = text.lstrip()
+        for heading in self.headings:
+            match = heading.pattern.match(line)
+            if match:
+                return heading.kind, heading.number(match)
+        return None
+
+
+def _has_content(section: Section) -> bool:
+    if section.lines:
+        return True
+    # A heading or anchor with nothing under it still marks a section
+    return section.part == 0 and section.kind not in {"preamble", "other"}
+
+
+_DEFAULT_SEGMENTER = SectionSegmenter()
+
+
+class RegulatoryDocument:
+    """A regulatory document read as a stream of sections.
+
+    ``first`` answers "the first text seen in element ``tag``" (or
+    ``.class``) for the part of the document read so far, which covers
+    titles without a second pass.
+    """
+
+    def __init__(
+        self,
+        source: Source,
+        *,
+        segmenter: SectionSegmenter | None = None,
+        html: bool | None = None,
+    ):
+        self.source = source
+        self.segmenter = segmenter or _DEFAULT_SEGMENTER
+        self.html = html
+        self._first: dict[str, str] = {}
+
+    def blocks(self) -> Iterator[TextBlock]:
+        for block in iter_text_blocks(self.source, html=self.html):
+            if block.tag is not None:
+                self._first.setdefault(block.tag, block.text)
+                for css_class in block.classes:
+                    self._first.setdefault(f".{css_class}", block.text)
+            yield block
+
+    def sections(self, *kinds: str, merge_parts: bool = False) -> Iterator[Section]:
+        """Sections of the document, optionally only those of ``kinds``.
+
+        With ``merge_parts`` the parts of an oversized section are joined
+        back into one, for callers that keep whole sections anyway.
+        """
+        previous: Section | None = None
+        for section in self.segmenter.segment(self.blocks()):
+            if kinds and section.kind not in kinds:
+                continue
+            if not merge_parts:
+                yield section
+            elif previous is not None and section.part:
+                previous.lines.extend(section.lines)
+            else:
+                if previous is not None:
+                    yield previous
+                previous = section
+        if previous is not None:
+            yield previous
+
+    def first(self, *selectors: str) -> str | None:
+        """First text of the earliest matching selector (``"h1"``, ``".oj-doc-ti"``)."""
+        for selector in selectors:
+            if selector in self._first:
+                return self._first[selector]
+        return None
+
+
+OBLIGATION_PATTERN = re.compile(r"(?:shall|must|required to)\s+([^.]+\.)", re.IGNORECASE)
+
+
+def collect_obligations(
+    source: Source,
+    references: re.Pattern,
+    *,
+    limit: int,
+    patterns: Sequence[re.Pattern] = (OBLIGATION_PATTERN,),
+) -> tuple[list[str], list[str]]:
+    """First ``limit`` obligation clauses and all distinct references, in one pass.
+
+    Obligations are matched within a section, so a clause never runs across
+    a heading.
+    """
+    obligations: list[str] = []
+    found: set[str] = set()
+    for section in RegulatoryDocument(source).sections():
+        text = section.text
+        found.update(references.findall(text))
+        for pattern in patterns:
+            if len(obligations) >= limit:
+                break
+            for match in pattern.finditer(text):
+                obligations.append(match.group(1))
+                if len(obligations) >= limit:
+                    break
+    return obligations, list(found)
+
+
+# ---------------------------------------------------------------------------
+# Per-framework extraction rules
+# ---------------------------------------------------------------------------
+
+Extractor = Callable[[Section], Iterable[dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class ExtractionRule:
+    """Turns sections of the given kinds into framework records.
+
+    ``headings`` are heading forms the framework's documents use beyond
+    ``DEFAULT_HEADINGS``; ``extract`` segments with the headings of every
+    active rule.
+    """
+
+    framework: str
+    extract: Extractor
+    kinds: frozenset[str] = frozenset({"article", "section"})
+    limit: int | None = None
+    headings: tuple[Heading, ...] = ()
+
+
+_RULES: dict[str, ExtractionRule] = {}
+
+
+def register_extractor(rule: ExtractionRule) -> ExtractionRule:
+    """Register (or replace) the extraction rule of ``rule.framework``."""
+    _RULES[rule.framework] = rule
+    return rule
+
+
+def get_extractor(framework: str) -> ExtractionRule:
+    try:
+        return _RULES[framework]
+    except KeyError:
+        raise KeyError(f"No extraction rule registered for {framework!r}") from None
+
+
+def registered_frameworks() -> list[str]:
+    return sorted(_RULES)
+
+
+def extract(
+    source: Source | RegulatoryDocument,
+    frameworks: Iterable[str] | None = None,
+    *,
+    rules: Iterable[ExtractionRule] = (),
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Run extraction rules over one pass of ``source``.
+
+    Yields ``(framework, record)`` pairs as sections are read. Rules with a
+    ``limit`` retire once they reach it, and reading stops when every rule
+    has retired. A ``RegulatoryDocument`` keeps its own segmenter; other
+    sources are segmented with the default headings plus the rules' own.
+    """
+    active = [get_extractor(name) for name in (frameworks or [])] + list(rules)
+    if frameworks is None and not active:
+        active = list(_RULES.values())
+    counts = dict.fromkeys((rule.framework for rule in active), 0)
+    if isinstance(source, RegulatoryDocument):
+        document = source
+    else:
+        headings = tuple(dict.fromkeys(chain(DEFAULT_HEADINGS, *(r.headings for r in active))))
+        segmenter = SectionSegmenter(headings) if len(headings) > len(DEFAULT_HEADINGS) else None
+        document = RegulatoryDocument(source, segmenter=segmenter)
+
+    for section in document.sections():
+        for rule in list(active):
+            if section.kind not in rule.kinds:
+                continue
+            for record in rule.extract(section):
+                yield rule.framework, record
+                counts[rule.framework] += 1
+                if rule.limit is not None and counts[rule.framework] >= rule.limit:
+                    active.remove(rule)
+                    break
+        if not active:
+            return
@@ -1,5 +1,10 @@
 """Multi-LLM regulatory parsing engine service."""
 
+from app.services.multi_llm.consensus import (
+    ConsensusExecutor,
+    ProviderStats,
+    get_provider_stats,
+)
 from app.services.multi_llm.models import (
     ConsensusResult,
     ConsensusStrategy,
@@ -21,6 +26,7 @@ from app.services.multi_llm.service import MultiLLMService
 
 
 __all__ = [
+    "ConsensusExecutor",
     "ConsensusResult",
     "ConsensusStrategy",
     "CostOptimizationRecommendation",
@@ -37,4 +43,6 @@ __all__ = [
     "ProviderConfig",
     "ProviderHealthMetrics",
     "ProviderResult",
+    "ProviderStats",
+    "get_provider_stats",
 ]
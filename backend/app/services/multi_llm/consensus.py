@@ -0,0 +1,267 @@
+"""Early-terminating consensus across LLM providers.
+
+``parse_regulation`` used to wait for every enabled provider, so each
+consensus cost the latency of the slowest one. ``ConsensusExecutor``
+starts only as many providers as the strategy needs and stops as soon
+as enough of them agree:
+
+- The providers expected to be fastest are started first, one per vote
+  the strategy needs (``MultiLLMConfig.min_providers``; every provider
+  for ``UNANIMOUS``).
+- A provider still running past its own p95 latency is hedged: the next
+  provider is started next to it and whichever answers first counts.
+  Providers without enough history are hedged straight away, which on a
+  cold start means all of them run in parallel as before.
+- A failed provider, or a quorum that disagrees, starts another one.
+- Once the quorum agrees, stragglers are cancelled.
+
+``ProviderStats`` keeps the per-provider latency and spend this relies
+on for the whole process, since services are created per request. The
+same figures feed ``route_request``.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+
+import structlog
+
+from app.services.multi_llm.models import (
+    ConsensusStrategy,
+    LLMProvider,
+    ProviderConfig,
+    ProviderResult,
+)
+from app.services.multi_llm.router import _COST_PER_1K
+
+
+logger = structlog.get_logger()
+
+# Latency samples kept per provider, and needed before trusting a percentile
+_WINDOW = 500
+_MIN_SAMPLES = 10
+
+
+def action_agreement(action_sets: Sequence[frozenset[str]]) -> float:
+    """Mean pairwise Jaccard similarity of the providers' obligation actions."""
+    if len(action_sets) < 2:
+        return 1.0
+    total = 0.0
+    comparisons = 0
+    for i, actions_i in enumerate(action_sets):
+        for actions_j in action_sets[i + 1 :]:
+            union = len(actions_i | actions_j)
+            total += len(actions_i & actions_j) / union if union else 1.0
+            comparisons += 1
+    return total / comparisons
+
+
+def obligation_actions(result: ProviderResult) -> frozenset[str]:
+    return frozenset(o.get("action", "") for o in result.obligations)
+
+
+@dataclass
+class ProviderUsage:
+    """Running latency and spend of one provider."""
+
+    latencies_ms: deque[float] = field(default_factory=lambda: deque(maxlen=_WINDOW))
+    requests: int = 0
+    errors: int = 0
+    cancelled: int = 0
+    tokens: int = 0
+    useful_tokens: int = 0
+    cost_usd: float = 0.0
+
+    def percentile(self, fraction: float) -> float | None:
+        if len(self.latencies_ms) < _MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class ProviderStats:
+    """Process-wide latency and cost tracking per provider."""
+
+    def __init__(self) -> None:
+        self._usage: dict[str, ProviderUsage] = {}
+
+    def usage(self, provider: LLMProvider) -> ProviderUsage:
+        return self._usage.setdefault(provider.value, ProviderUsage())
+
+    def record(
+        self,
+        provider: LLMProvider,
+        latency_ms: float | None,
+        tokens: int,
+        *,
+        error: bool = False,
+        cancelled: bool = False,
+    ) -> None:
+        """Record one request.
+
+        Only completed requests add a latency sample. Failed and cancelled
+        requests end early for reasons unrelated to how fast the provider
+        answers, so they count towards requests and spend but not latency.
+        """
+        usage = self.usage(provider)
+        usage.requests += 1
+        usage.tokens += tokens
+        usage.cost_usd += tokens / 1000 * _COST_PER_1K.get(provider, 0.002)
+        if error:
+            usage.errors += 1
+        elif cancelled:
+            usage.cancelled += 1
+        else:
+            usage.useful_tokens += tokens
+            if latency_ms is not None:
+                usage.latencies_ms.append(latency_ms)
+
+    def p95_ms(self, provider: LLMProvider) -> float | None:
+        return self.usage(provider).percentile(0.95)
+
+    def p50_ms(self, provider: LLMProvider) -> float | None:
+        return self.usage(provider).percentile(0.5)
+
+    def latency_p95_ms(self) -> dict[str, float]:
+        """p95 latency by provider, for providers with enough history."""
+        return {
+            name: p95
+            for name, usage in self._usage.items()
+            if (p95 := usage.percentile(0.95)) is not None
+        }
+
+    def cost_per_1k(self) -> dict[str, float]:
+        """Spend per 1k tokens of answers actually used, by provider.
+
+        Failed and cancelled requests are paid for too, so a provider that
+        often fails or loses the race costs more than its list price.
+        """
+        return {
+            name: usage.cost_usd * 1000 / usage.useful_tokens
+            for name, usage in self._usage.items()
+            if usage.requests >= _MIN_SAMPLES and usage.useful_tokens
+        }
+
+    def rank(self, providers: Sequence[ProviderConfig]) -> list[ProviderConfig]:
+        """Providers by expected latency, fastest first, then by cost.
+
+        Providers without history go last, in configured order.
+        """
+
+        def key(config: ProviderConfig) -> tuple[float, float]:
+            p50 = self.p50_ms(config.provider)
+            return (p50 if p50 is not None else math.inf, _COST_PER_1K.get(config.provider, 0.01))
+
+        return sorted(providers, key=key)
+
+
+_stats: ProviderStats | None = None
+
+
+def get_provider_stats() -> ProviderStats:
+    """Get or create the process-wide provider statistics."""
+    global _stats
+    if _stats is None:
+        _stats = ProviderStats()
+    return _stats
+
+
+def quorum_size(strategy: ConsensusStrategy, min_providers: int, available: int) -> int:
+    """Successful answers needed before ``strategy`` can stop early."""
+    if strategy == ConsensusStrategy.UNANIMOUS:
+        return available
+    return max(1, min(min_providers, available))
+
+
+class ConsensusExecutor:
+    """Runs providers until a quorum agrees, hedging and cancelling the rest."""
+
+    def __init__(
+        self,
+        run: Callable[[ProviderConfig], Awaitable[ProviderResult]],
+        stats: ProviderStats,
+        *,
+        quorum: int,
+        agreement_target: float,
+    ):
+        self._run = run
+        self._stats = stats
+        self.quorum = quorum
+        self.agreement_target = agreement_target
+
+    async def run(self, providers: Sequence[ProviderConfig]) -> list[ProviderResult]:
+        """Results of the providers that answered, in completion order."""
+        backups = deque(self._stats.rank(providers))
+        pending: dict[asyncio.Task[ProviderResult], ProviderConfig] = {}
+        deadlines: dict[asyncio.Task[ProviderResult], float] = {}
+        results: list[ProviderResult] = []
+        successful: list[ProviderResult] = []
+        action_sets: list[frozenset[str]] = []
+        needed = self.quorum
+
+        def launch() -> None:
+            config = backups.popleft()
+            task = asyncio.ensure_future(self._run(config))
+            pending[task] = config
+            # Without enough history there is no p95 to wait for
+            p95 = self._stats.p95_ms(config.provider)
+            deadlines[task] = time.monotonic() + (p95 or 0.0) / 1000
+
+        try:
+            while backups and len(pending) < needed:
+                launch()
+
+            while pending:
+                timeout = None
+                if backups and deadlines:
+                    timeout = max(0.0, min(deadlines.values()) - time.monotonic())
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    slowest = min(deadlines, key=deadlines.__getitem__)
+                    del deadlines[slowest]
+                    logger.info(
+                        "Hedging slow provider",
+                        provider=pending[slowest].provider.value,
+                        backup=backups[0].provider.value,
+                    )
+                    launch()
+                    continue
+
+                for task in done:
+                    config = pending.pop(task)
+                    deadlines.pop(task, None)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = ProviderResult(
+                            provider=config.provider, model_name=config.model_name, error=str(e)
+                        )
+                    results.append(result)
+                    if result.error is None:
+                        successful.append(result)
+                        action_sets.append(obligation_actions(result))
+
+                if len(successful) >= self.quorum:
+                    if action_agreement(action_sets) >= self.agreement_target:
+                        break
+                    # A split quorum needs another vote
+                    needed = len(successful) + 1
+                while backups and len(successful) + len(pending) < needed:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                logger.info(
+                    "Cancelled straggling providers",
+                    providers=[config.provider.value for config in pending.values()],
+                )
+
+        return results
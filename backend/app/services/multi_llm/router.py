@@ -5,6 +5,7 @@ complexity, cost, and historical accuracy — avoiding expensive models
 for simple tasks and escalating to premium models for complex ones.
 """
 
+import math
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -35,6 +36,7 @@ class RoutingDecision:
     reason: str = ""
     use_consensus: bool = False
     estimated_cost_usd: float = 0.0
+    expected_latency_ms: float = 0.0
 
 
 # Heuristic thresholds for text complexity
@@ -105,6 +107,8 @@ def route_request(
     framework: str = "",
     available_providers: list[ProviderConfig] | None = None,
     accuracy_history: dict[str, float] | None = None,
+    latency_p95_ms: dict[str, float] | None = None,
+    cost_per_1k: dict[str, float] | None = None,
 ) -> RoutingDecision:
     """Determine optimal provider routing for a regulatory parsing request.
 
@@ -112,6 +116,11 @@ def route_request(
     - **Moderate** → primary reliable provider (Copilot or OpenAI)
     - **Complex** → consensus of 2+ providers
     - **Critical** → consensus of ALL providers
+
+    ``latency_p95_ms`` and ``cost_per_1k`` are observed figures by provider
+    (see ``ProviderStats``). Observed cost replaces the list price, and
+    consensus partners are picked by latency, since a consensus finishes
+    when its second-fastest provider answers.
     """
     complexity = classify_complexity(text, framework)
     providers = available_providers or []
@@ -120,16 +129,26 @@ def route_request(
     if not enabled:
         return RoutingDecision(reason="No providers available")
 
+    observed_cost = cost_per_1k or {}
+    latency = latency_p95_ms or {}
+
+    def rate(provider: LLMProvider, default: float = 0.002) -> float:
+        return observed_cost.get(provider.value, _COST_PER_1K.get(provider, default))
+
+    def p95(provider: LLMProvider) -> float:
+        return latency.get(provider.value, math.inf)
+
     # Sort by cost (cheapest first)
-    sorted_by_cost = sorted(enabled, key=lambda p: _COST_PER_1K.get(p.provider, 0.01))
+    sorted_by_cost = sorted(enabled, key=lambda p: rate(p.provider, 0.01))
 
-    # Sort by accuracy (best first, if history available)
+    # Sort by accuracy (best first, if history available), faster first on ties
     accuracy = accuracy_history or {}
     sorted_by_accuracy = sorted(
         enabled,
-        key=lambda p: accuracy.get(p.provider.value, 0.8),
-        reverse=True,
+        key=lambda p: (-accuracy.get(p.provider.value, 0.8), p95(p.provider)),
     )
+    # Fastest first; providers without history keep their configured order
+    sorted_by_latency = sorted(enabled, key=lambda p: p95(p.provider))
 
     tokens_estimate = len(text.split()) * 1.3
     decision = RoutingDecision(complexity=complexity)
@@ -139,42 +158,41 @@ def route_request(
         decision.primary_provider = primary.provider
         decision.reason = f"Simple text ({len(text)} chars) → cheapest provider"
         decision.use_consensus = False
-        decision.estimated_cost_usd = (
-            tokens_estimate / 1000 * _COST_PER_1K.get(primary.provider, 0.002)
-        )
+        decision.estimated_cost_usd = tokens_estimate / 1000 * rate(primary.provider)
 
     elif complexity == QueryComplexity.MODERATE:
         primary = sorted_by_accuracy[0] if sorted_by_accuracy else sorted_by_cost[0]
         decision.primary_provider = primary.provider
         decision.reason = f"Moderate text → most accurate provider ({primary.provider.value})"
         decision.use_consensus = False
-        decision.estimated_cost_usd = (
-            tokens_estimate / 1000 * _COST_PER_1K.get(primary.provider, 0.002)
-        )
+        decision.estimated_cost_usd = tokens_estimate / 1000 * rate(primary.provider)
 
     elif complexity == QueryComplexity.COMPLEX:
         primary = sorted_by_accuracy[0] if sorted_by_accuracy else enabled[0]
-        secondaries = [p.provider for p in enabled if p.provider != primary.provider][:1]
+        secondaries = [p.provider for p in sorted_by_latency if p.provider != primary.provider][:1]
         decision.primary_provider = primary.provider
         decision.secondary_providers = secondaries
         decision.use_consensus = True
         decision.reason = f"Complex text → consensus of {1 + len(secondaries)} providers"
-        total_cost = sum(
-            tokens_estimate / 1000 * _COST_PER_1K.get(p, 0.002)
-            for p in [primary.provider, *secondaries]
-        )
+        total_cost = sum(tokens_estimate / 1000 * rate(p) for p in [primary.provider, *secondaries])
         decision.estimated_cost_usd = total_cost
 
     else:  # CRITICAL
         decision.primary_provider = enabled[0].provider
-        decision.secondary_providers = [p.provider for p in enabled[1:]]
+        decision.secondary_providers = [
+            p.provider for p in sorted_by_latency if p is not enabled[0]
+        ]
         decision.use_consensus = True
         decision.reason = f"Critical text → all {len(enabled)} providers for maximum accuracy"
-        total_cost = sum(
-            tokens_estimate / 1000 * _COST_PER_1K.get(p.provider, 0.002) for p in enabled
-        )
+        total_cost = sum(tokens_estimate / 1000 * rate(p.provider) for p in enabled)
         decision.estimated_cost_usd = total_cost
 
+    # A single provider takes its own time; a consensus stops once two agree
+    chosen = sorted(p95(p) for p in [decision.primary_provider, *decision.secondary_providers])
+    expected = chosen[1] if decision.use_consensus and len(chosen) > 1 else chosen[0]
+    if expected != math.inf:
+        decision.expected_latency_ms = expected
+
     logger.info(
         "Request routed",
         complexity=complexity.value,
@@ -10,6 +10,13 @@ from uuid import UUID
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.services.multi_llm.consensus import (
+    ConsensusExecutor,
+    action_agreement,
+    get_provider_stats,
+    obligation_actions,
+    quorum_size,
+)
 from app.services.multi_llm.models import (
     ConsensusResult,
     ConsensusStrategy,
@@ -58,6 +65,7 @@ class MultiLLMService:
         self._token_usage: dict[str, int] = {}
         self._escalations: dict[UUID, EscalationTicket] = {}
         self._failover_events: list[FailoverEvent] = []
+        self._stats = get_provider_stats()
 
     async def parse_regulation(
         self,
@@ -80,17 +88,16 @@ class MultiLLMService:
             result.status = ParseStatus.FAILED
             return result
 
-        # Run all providers in parallel
-        provider_results = await asyncio.gather(
-            *[self._run_provider(provider, text, framework) for provider in enabled_providers],
-            return_exceptions=True,
+        # Run providers until enough of them agree for the strategy
+        executor = ConsensusExecutor(
+            lambda provider: self._run_provider(provider, text, framework),
+            self._stats,
+            quorum=quorum_size(
+                effective_strategy, self.config.min_providers, len(enabled_providers)
+            ),
+            agreement_target=1 - self.config.divergence_threshold,
         )
-
-        for pr in provider_results:
-            if isinstance(pr, ProviderResult):
-                result.provider_results.append(pr)
-            elif isinstance(pr, Exception):
-                result.provider_results.append(ProviderResult(error=str(pr)))
+        result.provider_results = await executor.run(enabled_providers)
 
         successful = [pr for pr in result.provider_results if pr.error is None]
 
@@ -406,28 +413,29 @@ class MultiLLMService:
         )
 
         try:
-            if config.provider == LLMProvider.COPILOT and self.copilot:
-                ai_result = await self.copilot.analyze_legal_text(text)
-                result.obligations = ai_result.get("requirements", [])
-                result.entities = self._extract_entities(ai_result)
-                result.confidence = self._avg_confidence(ai_result)
-                result.raw_response = ai_result
-            elif config.provider in (LLMProvider.OPENAI, LLMProvider.ANTHROPIC):
-                ai_result = await self._call_external_llm(config, text, framework)
-                result.obligations = ai_result.get("requirements", [])
-                result.entities = self._extract_entities(ai_result)
-                result.confidence = self._avg_confidence(ai_result)
-                result.raw_response = ai_result
-            elif config.provider == LLMProvider.LOCAL:
-                # Local model: pass through Copilot client if available, else skip
-                if self.copilot:
+            async with asyncio.timeout(config.timeout_seconds):
+                if config.provider == LLMProvider.COPILOT and self.copilot:
                     ai_result = await self.copilot.analyze_legal_text(text)
                     result.obligations = ai_result.get("requirements", [])
                     result.entities = self._extract_entities(ai_result)
-                    result.confidence = self._avg_confidence(ai_result) * 0.9
+                    result.confidence = self._avg_confidence(ai_result)
                     result.raw_response = ai_result
-                else:
-                    result.error = "Local model not configured"
+                elif config.provider in (LLMProvider.OPENAI, LLMProvider.ANTHROPIC):
+                    ai_result = await self._call_external_llm(config, text, framework)
+                    result.obligations = ai_result.get("requirements", [])
+                    result.entities = self._extract_entities(ai_result)
+                    result.confidence = self._avg_confidence(ai_result)
+                    result.raw_response = ai_result
+                elif config.provider == LLMProvider.LOCAL:
+                    # Local model: pass through Copilot client if available, else skip
+                    if self.copilot:
+                        ai_result = await self.copilot.analyze_legal_text(text)
+                        result.obligations = ai_result.get("requirements", [])
+                        result.entities = self._extract_entities(ai_result)
+                        result.confidence = self._avg_confidence(ai_result) * 0.9
+                        result.raw_response = ai_result
+                    else:
+                        result.error = "Local model not configured"
         except (json.JSONDecodeError, KeyError, ValueError, OSError) as e:
             result.error = str(e)
             logger.exception("Provider failed", provider=config.provider.value)
@@ -449,8 +457,19 @@ class MultiLLMService:
                 failed_provider=config.provider.value,
                 failover_provider=failover_target,
             )
+        except asyncio.CancelledError:
+            # Cancelled as a straggler once the others agreed
+            self._stats.record(config.provider, None, len(text.split()) * 2, cancelled=True)
+            raise
 
         result.latency_ms = (time.monotonic() - start) * 1000
+        failed = result.error is not None
+        self._stats.record(
+            config.provider,
+            None if failed else result.latency_ms,
+            len(text.split()) * 2,
+            error=failed,
+        )
 
         # Track metrics
         key = config.provider.value
@@ -595,22 +614,7 @@ class MultiLLMService:
         if len(providers) < 2:
             return 1.0
 
-        # Compare obligation actions pairwise
-        agreements = 0
-        comparisons = 0
-        for i in range(len(providers)):
-            for j in range(i + 1, len(providers)):
-                actions_i = {o.get("action", "") for o in providers[i].obligations}
-                actions_j = {o.get("action", "") for o in providers[j].obligations}
-                if actions_i or actions_j:
-                    union = actions_i | actions_j
-                    intersection = actions_i & actions_j
-                    agreements += len(intersection) / len(union) if union else 1.0
-                else:
-                    agreements += 1.0
-                comparisons += 1
-
-        return agreements / comparisons if comparisons > 0 else 1.0
+        return action_agreement([obligation_actions(p) for p in providers])
 
     def _deduplicate_obligations(self, obligations: list[dict]) -> list[dict]:
         """Remove duplicate obligations based on action key."""
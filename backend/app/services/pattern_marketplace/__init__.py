@@ -13,6 +13,7 @@ from app.services.pattern_marketplace.models import (
     PublisherProfile,
     PublishStatus,
 )
+from app.services.pattern_marketplace.search_index import PatternSearchIndex
 from app.services.pattern_marketplace.service import (
     PatternMarketplaceService,
     get_pattern_marketplace_service,
@@ -28,6 +29,7 @@ __all__ = [
     "PatternMarketplaceService",
     "PatternPurchase",
     "PatternRating",
+    "PatternSearchIndex",
     "PatternType",
     "PatternVersion",
     "PublishStatus",
@@ -0,0 +1,411 @@
+"""In-memory search index for the pattern marketplace.
+
+Every indexed pattern gets a small integer document id, and each posting
+list (a token, or a facet value such as ``category=data_privacy``) is a
+Python ``int`` used as a bitset over those ids. Filtering is a handful of
+``&``/``|`` operations instead of a scan over every pattern, and a facet
+count is ``(matches & posting).bit_count()``.
+
+Text search tokenizes name, description and tags. A query term matches the
+indexed tokens it equals or prefixes; terms of ``min_typo_length`` or more
+characters that match nothing fall back to tokens within one edit (insert,
+delete, substitute or transpose), looked up through a deletion-neighbourhood
+map rather than by comparing against the whole vocabulary.
+
+Results are ordered from per-key sort orders that are kept sorted as
+patterns change. Broad result sets walk the order until the page is full;
+narrow ones select the top ``offset + limit`` matches with a heap.
+"""
+
+import heapq
+import re
+from bisect import bisect_left, insort
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any
+from uuid import UUID
+
+from app.services.pattern_marketplace.models import CompliancePattern
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Facet fields and how to read their values from a pattern
+_FACETS: dict[str, Callable[[CompliancePattern], Iterable[Hashable]]] = {
+    "status": lambda p: (p.status,),
+    "category": lambda p: (p.category,),
+    "pattern_type": lambda p: (p.pattern_type,),
+    "license_type": lambda p: (p.license_type,),
+    "regulations": lambda p: p.regulations,
+    "languages": lambda p: p.languages,
+}
+
+# Fields reported by facet_counts by default
+FACET_FIELDS = ("category", "pattern_type", "license_type", "regulations", "languages")
+
+# Ascending sort keys; negated so the largest value comes first
+_SORT_KEYS: dict[str, Callable[[CompliancePattern], float]] = {
+    "downloads": lambda p: -p.downloads,
+    "rating": lambda p: -p.avg_rating,
+    "newest": lambda p: -(p.published_at or p.created_at).timestamp(),
+}
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased alphanumeric tokens of ``text``."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _deletions(token: str) -> set[str]:
+    return {token[:i] + token[i + 1 :] for i in range(len(token))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Whether ``a`` and ``b`` differ by at most one edit or adjacent swap."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diffs = [i for i, (x, y) in enumerate(zip(a, b, strict=True)) if x != y]
+        if len(diffs) <= 1:
+            return True
+        i, j = diffs[0], diffs[-1]
+        return len(diffs) == 2 and j == i + 1 and a[i] == b[j] and a[j] == b[i]
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    i = 0
+    while i < len(shorter) and shorter[i] == longer[i]:
+        i += 1
+    return shorter[i:] == longer[i + 1 :]
+
+
+def _bitset(docs: Iterable[int]) -> int:
+    """Build a bitset in one pass rather than one big-int copy per member."""
+    data = bytearray()
+    for doc in docs:
+        byte = doc >> 3
+        if byte >= len(data):
+            data.extend(bytes(byte + 1 - len(data)))
+        data[byte] |= 1 << (doc & 7)
+    return int.from_bytes(data, "little")
+
+
+def _members(bits: int) -> Iterator[int]:
+    """Document ids set in ``bits``, ascending."""
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    for offset, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            yield offset * 8 + low.bit_length() - 1
+            byte ^= low
+
+
+@dataclass(frozen=True)
+class _Entry:
+    """What a document currently contributes to the index."""
+
+    tokens: frozenset[str] = frozenset()
+    facets: frozenset[tuple[str, Hashable]] = frozenset()
+    sort_keys: dict[str, float] = field(default_factory=dict)
+
+
+_EMPTY = _Entry()
+
+
+class PatternSearchIndex:
+    """Inverted index, facet bitsets and sort orders over marketplace patterns.
+
+    ``add`` indexes a pattern or refreshes an indexed one; call it after any
+    change to a pattern's text, facets, downloads, rating or status. Only the
+    postings that actually changed are touched. Use ``add_many`` for initial
+    loads.
+    """
+
+    def __init__(self, min_typo_length: int = 4):
+        self.min_typo_length = min_typo_length
+
+        self._doc_ids: dict[UUID, int] = {}
+        self._patterns: list[CompliancePattern | None] = []
+        self._entries: dict[int, _Entry] = {}
+        self._live = 0
+
+        self._tokens: dict[str, int] = {}
+        self._vocabulary: list[str] = []
+        self._deletes: dict[str, set[str]] = {}
+        self._facets: dict[str, dict[Hashable, int]] = {name: {} for name in _FACETS}
+        self._orders: dict[str, list[tuple[float, int]]] = {name: [] for name in _SORT_KEYS}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, pattern_id: object) -> bool:
+        return pattern_id in self._doc_ids
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def add(self, pattern: CompliancePattern) -> None:
+        """Index ``pattern``, or refresh its entry if already indexed."""
+        doc = self._doc_ids.get(pattern.id)
+        if doc is None:
+            doc = len(self._patterns)
+            self._doc_ids[pattern.id] = doc
+            self._patterns.append(pattern)
+            self._live |= 1 << doc
+        else:
+            self._patterns[doc] = pattern
+        self._apply(doc, self._entries.get(doc, _EMPTY), self._entry_for(pattern))
+
+    update = add
+
+    def add_many(self, patterns: Iterable[CompliancePattern]) -> None:
+        """Index a batch, building each new posting once instead of bit by bit."""
+        new_docs: list[int] = []
+        tokens: dict[str, list[int]] = {}
+        facets: dict[tuple[str, Hashable], list[int]] = {}
+        for pattern in patterns:
+            if pattern.id in self._doc_ids:
+                self.add(pattern)
+                continue
+            doc = len(self._patterns)
+            self._doc_ids[pattern.id] = doc
+            self._patterns.append(pattern)
+            entry = self._entries[doc] = self._entry_for(pattern)
+            new_docs.append(doc)
+            for token in entry.tokens:
+                tokens.setdefault(token, []).append(doc)
+            for facet in entry.facets:
+                facets.setdefault(facet, []).append(doc)
+            for name, order in self._orders.items():
+                order.append((entry.sort_keys[name], doc))
+
+        if not new_docs:
+            return
+        self._live |= _bitset(new_docs)
+        for token, docs in tokens.items():
+            self._post_token(token, _bitset(docs))
+        for (name, value), docs in facets.items():
+            postings = self._facets[name]
+            postings[value] = postings.get(value, 0) | _bitset(docs)
+        for order in self._orders.values():
+            order.sort()
+
+    def remove(self, pattern_id: UUID) -> None:
+        """Drop a pattern from the index."""
+        doc = self._doc_ids.pop(pattern_id, None)
+        if doc is None:
+            return
+        self._apply(doc, self._entries[doc], _EMPTY)
+        self._patterns[doc] = None
+        self._live &= ~(1 << doc)
+
+    def _entry_for(self, pattern: CompliancePattern) -> _Entry:
+        text = " ".join([pattern.name, pattern.description, *pattern.tags])
+        return _Entry(
+            tokens=frozenset(tokenize(text)),
+            facets=frozenset(
+                (name, value) for name, values in _FACETS.items() for value in values(pattern)
+            ),
+            sort_keys={name: key(pattern) for name, key in _SORT_KEYS.items()},
+        )
+
+    def _apply(self, doc: int, old: _Entry, new: _Entry) -> None:
+        bit = 1 << doc
+        for token in old.tokens - new.tokens:
+            self._unpost_token(token, bit)
+        for token in new.tokens - old.tokens:
+            self._post_token(token, bit)
+
+        for name, value in old.facets - new.facets:
+            postings = self._facets[name]
+            postings[value] &= ~bit
+            if not postings[value]:
+                del postings[value]
+        for name, value in new.facets - old.facets:
+            postings = self._facets[name]
+            postings[value] = postings.get(value, 0) | bit
+
+        for name, order in self._orders.items():
+            old_key, new_key = old.sort_keys.get(name), new.sort_keys.get(name)
+            if old_key == new_key:
+                continue
+            if old_key is not None:
+                del order[bisect_left(order, (old_key, doc))]
+            if new_key is not None:
+                insort(order, (new_key, doc))
+
+        if new is _EMPTY:
+            del self._entries[doc]
+        else:
+            self._entries[doc] = new
+
+    def _post_token(self, token: str, bits: int) -> None:
+        if token not in self._tokens:
+            self._tokens[token] = 0
+            insort(self._vocabulary, token)
+            if len(token) >= self.min_typo_length:
+                for variant in _deletions(token):
+                    self._deletes.setdefault(variant, set()).add(token)
+        self._tokens[token] |= bits
+
+    def _unpost_token(self, token: str, bit: int) -> None:
+        remaining = self._tokens[token] & ~bit
+        if remaining:
+            self._tokens[token] = remaining
+            return
+        del self._tokens[token]
+        del self._vocabulary[bisect_left(self._vocabulary, token)]
+        if len(token) >= self.min_typo_length:
+            for variant in _deletions(token):
+                neighbours = self._deletes[variant]
+                neighbours.discard(token)
+                if not neighbours:
+                    del self._deletes[variant]
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def match(
+        self,
+        query: str | None = None,
+        filters: Mapping[str, Iterable[Any]] | None = None,
+    ) -> int:
+        """Bitset of patterns matching every query term and every filter.
+
+        ``filters`` maps a facet field to accepted values; a pattern matches
+        a field if it has any of them.
+        """
+        bits = self._live
+        for name, values in (filters or {}).items():
+            bits &= self._facet_bits(name, values)
+        if query and bits:
+            bits &= self._text_bits(query)
+        return bits
+
+    def _facet_bits(self, name: str, values: Iterable[Any]) -> int:
+        postings = self._facets[name]
+        bits = 0
+        for value in values:
+            bits |= postings.get(value, 0)
+        return bits
+
+    def _text_bits(self, query: str) -> int:
+        bits = self._live
+        for term in tokenize(query):
+            bits &= self._term_bits(term)
+            if not bits:
+                break
+        return bits
+
+    def _term_bits(self, term: str) -> int:
+        bits = 0
+        i = bisect_left(self._vocabulary, term)
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(term):
+            bits |= self._tokens[self._vocabulary[i]]
+            i += 1
+        if bits or len(term) < self.min_typo_length:
+            return bits
+        for token in self._typo_candidates(term):
+            bits |= self._tokens[token]
+        return bits
+
+    def _typo_candidates(self, term: str) -> set[str]:
+        # Tokens sharing a one-character deletion with the term cover every
+        # single insert, delete, substitution and adjacent swap, plus a few
+        # two-edit pairs that the final check removes.
+        candidates = set(self._deletes.get(term, ()))
+        for variant in _deletions(term):
+            if variant in self._tokens:
+                candidates.add(variant)
+            candidates |= self._deletes.get(variant, set())
+        return {token for token in candidates if _within_one_edit(term, token)}
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    def top(
+        self,
+        bits: int,
+        sort_by: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> list[CompliancePattern]:
+        """Page ``[offset, offset + limit)`` of the matches in ``sort_by`` order.
+
+        Unknown or missing ``sort_by`` keeps insertion order. Ties fall back
+        to insertion order too.
+        """
+        wanted = offset + limit
+        if limit <= 0 or not bits:
+            return []
+
+        order = self._orders.get(sort_by or "")
+        if order is None:
+            docs: Iterable[int] = islice(_members(bits), offset, wanted)
+        else:
+            count = bits.bit_count()
+            # Walking the order visits about wanted * n / count entries;
+            # the heap pays for every match. Walk when that is cheaper.
+            if wanted * len(order) <= count * count:
+                data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+                docs = islice(
+                    (
+                        doc
+                        for _, doc in order
+                        if doc >> 3 < len(data) and data[doc >> 3] >> (doc & 7) & 1
+                    ),
+                    offset,
+                    wanted,
+                )
+            else:
+                entries = self._entries
+                ranked = heapq.nsmallest(
+                    wanted,
+                    _members(bits),
+                    key=lambda doc: (entries[doc].sort_keys[sort_by], doc),
+                )
+                docs = ranked[offset:]
+        return [self._patterns[doc] for doc in docs]
+
+    def search(
+        self,
+        query: str | None = None,
+        filters: Mapping[str, Iterable[Any]] | None = None,
+        sort_by: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[list[CompliancePattern], int]:
+        """Matching patterns for one page plus the total match count."""
+        bits = self.match(query, filters)
+        return self.top(bits, sort_by, limit, offset), bits.bit_count()
+
+    def facet_counts(
+        self,
+        query: str | None = None,
+        filters: Mapping[str, Iterable[Any]] | None = None,
+        fields: Iterable[str] = FACET_FIELDS,
+    ) -> dict[str, dict[Any, int]]:
+        """Number of matching patterns per value of each facet field.
+
+        Each field is counted under the query and the *other* fields'
+        filters, so choosing one category still reports how many patterns
+        the sibling categories would return.
+        """
+        filters = filters or {}
+        base = self.match(query)
+        selected = {name: self._facet_bits(name, values) for name, values in filters.items()}
+
+        counts: dict[str, dict[Any, int]] = {}
+        for name in fields:
+            bits = base
+            for other, other_bits in selected.items():
+                if other != name:
+                    bits &= other_bits
+            counts[name] = {
+                value: n
+                for value, posting in self._facets[name].items()
+                if (n := (bits & posting).bit_count())
+            }
+        return counts
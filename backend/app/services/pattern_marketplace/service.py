@@ -21,6 +21,7 @@ from app.services.pattern_marketplace.models import (
     PublisherProfile,
     PublishStatus,
 )
+from app.services.pattern_marketplace.search_index import PatternSearchIndex
 
 
 logger = structlog.get_logger()
@@ -43,6 +44,7 @@ class PatternMarketplaceService:
         self._ratings: dict[UUID, list[PatternRating]] = {}
         self._publishers: dict[UUID, PublisherProfile] = {}
         self._purchases: dict[UUID, PatternPurchase] = {}
+        self._index = PatternSearchIndex()
 
         # Initialize with some sample patterns
         self._init_sample_patterns()
@@ -321,6 +323,7 @@ def modify_financial_record(record_id: str, changes: dict, user: User) -> Record
 
         for pattern in samples:
             self._patterns[pattern.id] = pattern
+        self._index.add_many(samples)
 
     # ========================================================================
     # Pattern Discovery
@@ -340,51 +343,57 @@ def modify_financial_record(record_id: str, changes: dict, user: User) -> Record
         offset: int = 0,
     ) -> tuple[list[CompliancePattern], int]:
         """Search and filter patterns in the marketplace."""
-        patterns = [p for p in self._patterns.values() if p.status == PublishStatus.PUBLISHED]
-
-        # Apply filters
-        if query:
-            query_lower = query.lower()
-            patterns = [
-                p
-                for p in patterns
-                if query_lower in p.name.lower()
-                or query_lower in p.description.lower()
-                or any(query_lower in tag for tag in p.tags)
-            ]
+        filters = self._search_filters(
+            category, pattern_type, regulations, languages, license_types, free_only
+        )
+        return self._index.search(
+            query, filters=filters, sort_by=sort_by, limit=limit, offset=offset
+        )
 
-        if category:
-            patterns = [p for p in patterns if p.category == category]
+    def get_facet_counts(
+        self,
+        query: str | None = None,
+        category: PatternCategory | None = None,
+        pattern_type: PatternType | None = None,
+        regulations: list[str] | None = None,
+        languages: list[str] | None = None,
+        license_types: list[LicenseType] | None = None,
+        free_only: bool = False,
+    ) -> dict[str, dict[str, int]]:
+        """Count published patterns per category, type, license, regulation and language."""
+        filters = self._search_filters(
+            category, pattern_type, regulations, languages, license_types, free_only
+        )
+        counts = self._index.facet_counts(query, filters=filters)
+        return {
+            name: {getattr(value, "value", value): n for value, n in values.items()}
+            for name, values in counts.items()
+        }
 
+    @staticmethod
+    def _search_filters(
+        category: PatternCategory | None,
+        pattern_type: PatternType | None,
+        regulations: list[str] | None,
+        languages: list[str] | None,
+        license_types: list[LicenseType] | None,
+        free_only: bool,
+    ) -> dict[str, list[Any]]:
+        filters: dict[str, list[Any]] = {"status": [PublishStatus.PUBLISHED]}
+        if category:
+            filters["category"] = [category]
         if pattern_type:
-            patterns = [p for p in patterns if p.pattern_type == pattern_type]
-
+            filters["pattern_type"] = [pattern_type]
         if regulations:
-            patterns = [p for p in patterns if any(r in p.regulations for r in regulations)]
-
+            filters["regulations"] = regulations
         if languages:
-            patterns = [p for p in patterns if any(lang in p.languages for lang in languages)]
-
+            filters["languages"] = languages
         if license_types:
-            patterns = [p for p in patterns if p.license_type in license_types]
-
+            filters["license_type"] = license_types
         if free_only:
-            patterns = [p for p in patterns if p.license_type == LicenseType.FREE]
-
-        total = len(patterns)
-
-        # Sort
-        if sort_by == "downloads":
-            patterns.sort(key=lambda p: p.downloads, reverse=True)
-        elif sort_by == "rating":
-            patterns.sort(key=lambda p: p.avg_rating, reverse=True)
-        elif sort_by == "newest":
-            patterns.sort(key=lambda p: p.published_at or p.created_at, reverse=True)
-
-        # Paginate
-        patterns = patterns[offset : offset + limit]
-
-        return patterns, total
+            allowed = filters.get("license_type", [LicenseType.FREE])
+            filters["license_type"] = [t for t in allowed if t == LicenseType.FREE]
+        return filters
 
     def get_pattern(self, pattern_id: UUID) -> CompliancePattern | None:
         """Get a pattern by ID."""
@@ -410,11 +419,9 @@ def modify_financial_record(record_id: str, changes: dict, user: User) -> Record
 
     def get_patterns_by_regulation(self, regulation: str) -> list[CompliancePattern]:
         """Get all patterns for a specific regulation."""
-        return [
-            p
-            for p in self._patterns.values()
-            if p.status == PublishStatus.PUBLISHED and regulation in p.regulations
-        ]
+        filters = {"status": [PublishStatus.PUBLISHED], "regulations": [regulation]}
+        patterns, _ = self._index.search(filters=filters, limit=len(self._index))
+        return patterns
 
     # ========================================================================
     # Pattern Publishing
@@ -462,6 +469,7 @@ def modify_financial_record(record_id: str, changes: dict, user: User) -> Record
         )
 
         self._patterns[pattern.id] = pattern
+        self._index.add(pattern)
 
         logger.info(
             "Pattern created",
@@ -498,6 +506,7 @@ def modify_financial_record(record_id: str, changes: dict, user: User) -> Record
                 setattr(pattern, key, value)
 
         pattern.updated_at = datetime.now(UTC)
+        self._index.update(pattern)
         return pattern
 
     def publish_pattern(self, pattern_id: UUID) -> CompliancePattern | None:
@@ -511,6 +520,7 @@ def modify_financial_record(record_id: str, changes: dict, user: User) -> Record
             # For now, auto-publish
             pattern.status = PublishStatus.PUBLISHED
             pattern.published_at = datetime.now(UTC)
+            self._index.update(pattern)
 
             logger.info(
                 "Pattern published",
@@ -569,6 +579,7 @@ def modify_financial_record(record_id: str, changes: dict, user: User) -> Record
         )
 
         self._patterns[forked.id] = forked
+        self._index.add(forked)
         original.fork_count += 1
 
         return forked
@@ -627,6 +638,7 @@ def modify_financial_record(record_id: str, changes: dict, user: User) -> Record
         self._installations[installation.id] = installation
         pattern.downloads += 1
         pattern.active_users += 1
+        self._index.update(pattern)
 
         logger.info(
             "Pattern installed",
@@ -711,6 +723,7 @@ def modify_financial_record(record_id: str, changes: dict, user: User) -> Record
         all_ratings = self._ratings[pattern_id]
         pattern.avg_rating = sum(r.rating for r in all_ratings) / len(all_ratings)
         pattern.rating_count = len(all_ratings)
+        self._index.update(pattern)
 
         return pattern_rating
 
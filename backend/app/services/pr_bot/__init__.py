@@ -6,7 +6,13 @@ from typing import Any
 from app.services.pr_bot.checks import CheckConclusion, ChecksService
 from app.services.pr_bot.comments import CommentGenerator
 from app.services.pr_bot.labels import ComplianceLabel, LabelService
-from app.services.pr_bot.queue import PRAnalysisQueue, PRAnalysisTask, TaskStatus
+from app.services.pr_bot.queue import (
+    PRAnalysisJob,
+    PRAnalysisQueue,
+    PRAnalysisTask,
+    RedisPRAnalysisQueue,
+    TaskStatus,
+)
 
 
 @dataclass
@@ -139,10 +145,12 @@ __all__ = [
     "CommentGenerator",
     "ComplianceLabel",
     "LabelService",
+    "PRAnalysisJob",
     "PRAnalysisQueue",
     "PRAnalysisTask",
     "PRBot",
     "PRBotConfig",
     "PRBotResult",
+    "RedisPRAnalysisQueue",
     "TaskStatus",
 ]
@@ -10,10 +10,10 @@ import structlog
 
 from app.agents.copilot import CopilotClient
 from app.services.github.client import GitHubClient
-from app.services.pr_bot.checks import CheckConclusion, CheckOutput, ChecksService
+from app.services.pr_bot.checks import CheckConclusion, CheckOutput, GitHubChecksService
 from app.services.pr_bot.comments import CommentService, CommentSeverity
-from app.services.pr_bot.labels import LabelService
-from app.services.pr_bot.queue import PRAnalysisTask
+from app.services.pr_bot.labels import GitHubLabelService
+from app.services.pr_bot.queue import PRAnalysisJob
 from app.services.pr_review.analyzer import PRAnalyzer
 from app.services.pr_review.autofix import AutoFixGenerator
 from app.services.pr_review.reviewer import PRReviewer
@@ -138,9 +138,9 @@ class PRBot:
         self.github = github_client
 
         # Initialize services
-        self.checks_service = ChecksService(github_client)
+        self.checks_service = GitHubChecksService(github_client)
         self.comment_service = CommentService(github_client)
-        self.label_service = LabelService(github_client)
+        self.label_service = GitHubLabelService(github_client)
         self.analyzer = PRAnalyzer(enabled_regulations=self.config.enabled_regulations)
         self.reviewer = PRReviewer(
             copilot_client=copilot_client,
@@ -150,7 +150,7 @@ class PRBot:
 
     async def process_task(
         self,
-        task: PRAnalysisTask,
+        task: PRAnalysisJob,
         access_token: str,
     ) -> PRBotResult:
         """Process a PR analysis task through the full pipeline."""
@@ -401,7 +401,7 @@ class PRBot:
         event_data: dict[str, Any],
         access_token: str,
         organization_id: UUID | None = None,
-    ) -> PRAnalysisTask:
+    ) -> PRAnalysisJob:
         """Handle a GitHub PR webhook event and create analysis task."""
         action = event_data.get("action")
         pr = event_data.get("pull_request", {})
@@ -413,7 +413,7 @@ class PRBot:
 
         owner, repo_name = repo.get("full_name", "/").split("/")
 
-        task = PRAnalysisTask(
+        task = PRAnalysisJob(
             owner=owner,
             repo=repo_name,
             pr_number=pr.get("number"),
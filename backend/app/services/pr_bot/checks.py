@@ -76,7 +76,7 @@ class CheckRun:
     output: CheckOutput | None = None
 
 
-class ChecksService:
+class GitHubChecksService:
     """Service for managing GitHub Check runs for compliance gates."""
 
     CHECK_NAME = "ComplianceAgent"
@@ -372,7 +372,7 @@ class ChecksService:
 # ---------------------------------------------------------------------------
 
 
-class ChecksService:  # noqa: F811 - intentional redefinition for test compat
+class ChecksService:
     """Checks service (test-compatible interface)."""
 
     def __init__(self) -> None:
@@ -13,7 +13,7 @@ from app.services.github.client import GitHubClient
 logger = structlog.get_logger()
 
 
-class ComplianceLabel(str, Enum):
+class PRLabel(str, Enum):
     """Standard compliance labels for PRs."""
 
     # Status labels
@@ -52,88 +52,88 @@ class LabelDefinition:
 
 
 # Predefined label configurations
-LABEL_DEFINITIONS: dict[ComplianceLabel, LabelDefinition] = {
-    ComplianceLabel.COMPLIANT: LabelDefinition(
+LABEL_DEFINITIONS: dict[PRLabel, LabelDefinition] = {
+    PRLabel.COMPLIANT: LabelDefinition(
         name="compliance:passed",
         color="0E8A16",  # Green
         description="All compliance checks passed",
     ),
-    ComplianceLabel.NON_COMPLIANT: LabelDefinition(
+    PRLabel.NON_COMPLIANT: LabelDefinition(
         name="compliance:failed",
         color="D93F0B",  # Red
         description="Compliance issues detected that must be resolved",
     ),
-    ComplianceLabel.NEEDS_REVIEW: LabelDefinition(
+    PRLabel.NEEDS_REVIEW: LabelDefinition(
         name="compliance:needs-review",
         color="FBCA04",  # Yellow
         description="Compliance review pending or requires manual verification",
     ),
-    ComplianceLabel.IN_PROGRESS: LabelDefinition(
+    PRLabel.IN_PROGRESS: LabelDefinition(
         name="compliance:in-progress",
         color="1D76DB",  # Blue
         description="Compliance analysis is running",
     ),
-    ComplianceLabel.CRITICAL_ISSUES: LabelDefinition(
+    PRLabel.CRITICAL_ISSUES: LabelDefinition(
         name="compliance:critical",
         color="B60205",  # Dark red
         description="Critical compliance violations detected",
     ),
-    ComplianceLabel.HIGH_ISSUES: LabelDefinition(
+    PRLabel.HIGH_ISSUES: LabelDefinition(
         name="compliance:high",
         color="D93F0B",  # Orange-red
         description="High severity compliance issues",
     ),
-    ComplianceLabel.MEDIUM_ISSUES: LabelDefinition(
+    PRLabel.MEDIUM_ISSUES: LabelDefinition(
         name="compliance:medium",
         color="FBCA04",  # Yellow
         description="Medium severity compliance issues",
     ),
-    ComplianceLabel.LOW_ISSUES: LabelDefinition(
+    PRLabel.LOW_ISSUES: LabelDefinition(
         name="compliance:low",
         color="0E8A16",  # Green
         description="Low severity compliance issues",
     ),
-    ComplianceLabel.GDPR: LabelDefinition(
+    PRLabel.GDPR: LabelDefinition(
         name="regulation:gdpr",
         color="5319E7",  # Purple
         description="GDPR-related changes",
     ),
-    ComplianceLabel.HIPAA: LabelDefinition(
+    PRLabel.HIPAA: LabelDefinition(
         name="regulation:hipaa",
         color="5319E7",
         description="HIPAA-related changes",
     ),
-    ComplianceLabel.PCI_DSS: LabelDefinition(
+    PRLabel.PCI_DSS: LabelDefinition(
         name="regulation:pci-dss",
         color="5319E7",
         description="PCI-DSS-related changes",
     ),
-    ComplianceLabel.EU_AI_ACT: LabelDefinition(
+    PRLabel.EU_AI_ACT: LabelDefinition(
         name="regulation:eu-ai-act",
         color="5319E7",
         description="EU AI Act-related changes",
     ),
-    ComplianceLabel.SOX: LabelDefinition(
+    PRLabel.SOX: LabelDefinition(
         name="regulation:sox",
         color="5319E7",
         description="SOX-related changes",
     ),
-    ComplianceLabel.CCPA: LabelDefinition(
+    PRLabel.CCPA: LabelDefinition(
         name="regulation:ccpa",
         color="5319E7",
         description="CCPA-related changes",
     ),
-    ComplianceLabel.AUTO_FIX_AVAILABLE: LabelDefinition(
+    PRLabel.AUTO_FIX_AVAILABLE: LabelDefinition(
         name="compliance:auto-fix-available",
         color="84B6EB",  # Light blue
         description="Automated fix is available for this PR",
     ),
-    ComplianceLabel.MANUAL_REVIEW_REQUIRED: LabelDefinition(
+    PRLabel.MANUAL_REVIEW_REQUIRED: LabelDefinition(
         name="compliance:manual-review-required",
         color="E99695",  # Light red
         description="Manual compliance review required",
     ),
-    ComplianceLabel.SECURITY_RISK: LabelDefinition(
+    PRLabel.SECURITY_RISK: LabelDefinition(
         name="compliance:security-risk",
         color="B60205",  # Dark red
         description="Security vulnerability detected",
@@ -141,7 +141,7 @@ LABEL_DEFINITIONS: dict[ComplianceLabel, LabelDefinition] = {
 }
 
 
-class LabelService:
+class GitHubLabelService:
     """Service for managing compliance labels on PRs."""
 
     def __init__(self, github_client: GitHubClient | None = None):
@@ -213,11 +213,11 @@ class LabelService:
         labels: list[str] = []
 
         if not violations:
-            labels.append(ComplianceLabel.COMPLIANT.value)
+            labels.append(PRLabel.COMPLIANT.value)
             return labels
 
         # Add status label
-        labels.append(ComplianceLabel.NON_COMPLIANT.value)
+        labels.append(PRLabel.NON_COMPLIANT.value)
 
         # Count by severity
         critical_count = sum(1 for v in violations if v.get("severity") == "critical")
@@ -226,12 +226,12 @@ class LabelService:
 
         # Add severity labels
         if critical_count > 0:
-            labels.append(ComplianceLabel.CRITICAL_ISSUES.value)
-            labels.append(ComplianceLabel.SECURITY_RISK.value)
+            labels.append(PRLabel.CRITICAL_ISSUES.value)
+            labels.append(PRLabel.SECURITY_RISK.value)
         if high_count > 0:
-            labels.append(ComplianceLabel.HIGH_ISSUES.value)
+            labels.append(PRLabel.HIGH_ISSUES.value)
         if medium_count > 0 and critical_count == 0 and high_count == 0:
-            labels.append(ComplianceLabel.MEDIUM_ISSUES.value)
+            labels.append(PRLabel.MEDIUM_ISSUES.value)
 
         # Add regulation labels
         regulations_found: set[str] = set()
@@ -241,12 +241,12 @@ class LabelService:
                 regulations_found.add(reg.upper())
 
         regulation_label_map = {
-            "GDPR": ComplianceLabel.GDPR.value,
-            "HIPAA": ComplianceLabel.HIPAA.value,
-            "PCI-DSS": ComplianceLabel.PCI_DSS.value,
-            "EU AI ACT": ComplianceLabel.EU_AI_ACT.value,
-            "SOX": ComplianceLabel.SOX.value,
-            "CCPA": ComplianceLabel.CCPA.value,
+            "GDPR": PRLabel.GDPR.value,
+            "HIPAA": PRLabel.HIPAA.value,
+            "PCI-DSS": PRLabel.PCI_DSS.value,
+            "EU AI ACT": PRLabel.EU_AI_ACT.value,
+            "SOX": PRLabel.SOX.value,
+            "CCPA": PRLabel.CCPA.value,
         }
 
         for reg in regulations_found:
@@ -255,10 +255,10 @@ class LabelService:
 
         # Add action labels
         if has_auto_fixes:
-            labels.append(ComplianceLabel.AUTO_FIX_AVAILABLE.value)
+            labels.append(PRLabel.AUTO_FIX_AVAILABLE.value)
 
         if critical_count > 0 or high_count > 0:
-            labels.append(ComplianceLabel.MANUAL_REVIEW_REQUIRED.value)
+            labels.append(PRLabel.MANUAL_REVIEW_REQUIRED.value)
 
         return labels
 
@@ -325,7 +325,7 @@ class LabelService:
             owner=owner,
             repo=repo,
             pr_number=pr_number,
-            labels=[ComplianceLabel.IN_PROGRESS.value],
+            labels=[PRLabel.IN_PROGRESS.value],
             access_token=access_token,
             remove_existing_compliance_labels=True,
         )
@@ -342,7 +342,7 @@ class LabelService:
 
         async with client:
             response = await client._client.delete(
-                f"/repos/{owner}/{repo}/issues/{pr_number}/labels/{ComplianceLabel.IN_PROGRESS.value}",
+                f"/repos/{owner}/{repo}/issues/{pr_number}/labels/{PRLabel.IN_PROGRESS.value}",
             )
             return response.status_code in (200, 204)
 
@@ -373,7 +373,7 @@ class ComplianceLabel(str, Enum):
     COMPLIANCE_MEDIUM = "compliance:medium"
 
 
-class LabelService:  # noqa: F811 - intentional redefinition for test compat
+class LabelService:
     """Label service (test-compatible interface)."""
 
     def __init__(self) -> None:
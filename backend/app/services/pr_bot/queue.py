@@ -1,5 +1,7 @@
 """PR Analysis Queue - Manages async PR review tasks."""
 
+import json
+import time
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import Enum
@@ -32,8 +34,8 @@ class PRTaskPriority(int, Enum):
 
 
 @dataclass
-class PRAnalysisTask:
-    """A task to analyze a PR for compliance."""
+class PRAnalysisJob:
+    """A queued request to analyze one PR head for compliance."""
 
     id: UUID = field(default_factory=uuid4)
     owner: str = ""
@@ -63,6 +65,15 @@ class PRAnalysisTask:
     retry_count: int = 0
     max_retries: int = 3
 
+    # Delivery state, set by RedisPRAnalysisQueue.dequeue
+    lease_token: str | None = None
+    superseded_by: str | None = None
+
+    @property
+    def pr_key(self) -> str:
+        """Identity of the pull request, shared by every push to it."""
+        return f"{self.owner}/{self.repo}#{self.pr_number}"
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for serialization."""
         return {
@@ -90,7 +101,7 @@ class PRAnalysisTask:
         }
 
     @classmethod
-    def from_dict(cls, data: dict[str, Any]) -> "PRAnalysisTask":
+    def from_dict(cls, data: dict[str, Any]) -> "PRAnalysisJob":
         """Create from dictionary."""
         return cls(
             id=UUID(data["id"]) if data.get("id") else uuid4(),
@@ -123,95 +134,376 @@ class PRAnalysisTask:
         )
 
 
-class PRAnalysisQueue:
-    """Queue manager for PR analysis tasks using Redis."""
-
-    QUEUE_KEY = "complianceagent:pr_analysis:queue"
-    TASK_KEY_PREFIX = "complianceagent:pr_analysis:task:"
-    PROCESSING_SET = "complianceagent:pr_analysis:processing"
-
-    def __init__(self, redis_client=None):
+# ---------------------------------------------------------------------------
+# Redis queue engine
+# ---------------------------------------------------------------------------
+#
+# Every key shares the ``{pr_analysis}`` hash tag, so they all hash to one
+# cluster slot. Layout under the prefix:
+#
+#   task:<id>         HASH  data (job JSON), org, head_sha, score, status,
+#                           attempts, max_attempts, lease, superseded_by, ...
+#   queue:<org>       ZSET  pending task ids, score = priority band + enqueue ms
+#   orgs              LIST  round-robin rotation of orgs with pending work
+#   orgs:active       SET   members of ``orgs`` (keeps the rotation unique)
+#   pr:<owner/repo#n> STR   newest live task id for the PR
+#   leases            ZSET  in-progress task ids by lease deadline (ms)
+#
+# Scripts receive every key the client can name in KEYS, which is also what
+# a cluster client routes the call by. Only keys of tasks and org queues
+# whose ids are read inside the script (the task a new push supersedes, the
+# orgs in the rotation, reaped leases) are built there, from the prefix.
+
+_REQUEUE_LUA = """
+local function schedule(queue, orgs, active, org, score, id)
+  redis.call('ZADD', queue, score, id)
+  if redis.call('SADD', active, org) == 1 then
+    redis.call('RPUSH', orgs, org)
+  end
+end
+
+local function reap(p, leases, orgs, active, now, limit)
+  local expired = redis.call('ZRANGEBYSCORE', leases, '-inf', now, 'LIMIT', 0, limit)
+  for _, id in ipairs(expired) do
+    redis.call('ZREM', leases, id)
+    local key = p .. 'task:' .. id
+    local t = redis.call('HMGET', key, 'status', 'attempts', 'max_attempts', 'org', 'score',
+      'superseded_by')
+    if t[1] == 'in_progress' then
+      if t[6] then
+        redis.call('HSET', key, 'status', 'cancelled', 'lease', '')
+      elseif tonumber(t[2]) >= tonumber(t[3]) then
+        redis.call('HSET', key, 'status', 'failed', 'lease', '', 'error', 'lease expired')
+      else
+        redis.call('HSET', key, 'status', 'pending', 'lease', '')
+        schedule(p .. 'queue:' .. t[4], orgs, active, t[4], t[5], id)
+      end
+    end
+  end
+  return #expired
+end
+"""
+
+# KEYS: task, pr index, org queue, orgs, orgs:active
+_ENQUEUE_LUA = (
+    _REQUEUE_LUA
+    + """
+local key, index = KEYS[1], KEYS[2]
+local p, id, org, sha = ARGV[1], ARGV[2], ARGV[3], ARGV[4]
+local outcome = 'queued'
+local previous = redis.call('GET', index)
+if previous then
+  local pkey = p .. 'task:' .. previous
+  local state = redis.call('HMGET', pkey, 'status', 'head_sha', 'org')
+  if state[1] == 'pending' or state[1] == 'in_progress' then
+    if state[2] == sha then
+      return {previous, 'duplicate'}
+    end
+    if state[1] == 'pending' then
+      redis.call('ZREM', p .. 'queue:' .. state[3], previous)
+      redis.call('HSET', pkey, 'status', 'cancelled', 'superseded_by', id)
+    else
+      -- The running worker learns on its next heartbeat
+      redis.call('HSET', pkey, 'superseded_by', id)
+    end
+    outcome = 'superseded'
+  end
+end
+redis.call('HSET', key, 'data', ARGV[7], 'org', org, 'head_sha', sha,
+  'score', ARGV[5], 'status', 'pending', 'attempts', 0, 'max_attempts', ARGV[8],
+  'enqueued_ms', ARGV[6])
+redis.call('EXPIRE', key, ARGV[9])
+redis.call('SET', index, id, 'EX', ARGV[9])
+schedule(KEYS[3], KEYS[4], KEYS[5], org, ARGV[5], id)
+return {id, outcome}
+"""
+)
+
+# KEYS: orgs, orgs:active, leases
+_DEQUEUE_LUA = (
+    _REQUEUE_LUA
+    + """
+local orgs, active, leases = KEYS[1], KEYS[2], KEYS[3]
+local p, now, lease_ms, token = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3]), ARGV[4]
+reap(p, leases, orgs, active, now, tonumber(ARGV[5]))
+for _ = 1, redis.call('LLEN', orgs) do
+  local org = redis.call('LMOVE', orgs, orgs, 'LEFT', 'RIGHT')
+  local queue = p .. 'queue:' .. org
+  local popped = redis.call('ZPOPMIN', queue)
+  if redis.call('ZCARD', queue) == 0 then
+    redis.call('LREM', orgs, 0, org)
+    redis.call('SREM', active, org)
+  end
+  if #popped > 0 then
+    local id = popped[1]
+    local key = p .. 'task:' .. id
+    if redis.call('EXISTS', key) == 1 then
+      redis.call('HSET', key, 'status', 'in_progress', 'lease', token, 'started_ms', now)
+      local attempts = redis.call('HINCRBY', key, 'attempts', 1)
+      redis.call('ZADD', leases, now + lease_ms, id)
+      return {id, redis.call('HGET', key, 'data'), attempts}
+    end
+  end
+end
+return false
+"""
+)
+
+# KEYS: task, leases, org queue, orgs, orgs:active, pr index
+_ACK_LUA = (
+    _REQUEUE_LUA
+    + """
+local key, leases, index = KEYS[1], KEYS[2], KEYS[6]
+local id, token, outcome, payload = ARGV[1], ARGV[2], ARGV[3], ARGV[4]
+if token == '' or redis.call('HGET', key, 'lease') ~= token then
+  return 0
+end
+redis.call('ZREM', leases, id)
+local t = redis.call('HMGET', key, 'org', 'superseded_by')
+if outcome == 'retry' then
+  if t[2] then
+    outcome = 'cancelled'
+  else
+    redis.call('HSET', key, 'status', 'pending', 'lease', '', 'error', payload, 'score', ARGV[6])
+    schedule(KEYS[3], KEYS[4], KEYS[5], t[1], ARGV[6], id)
+    return 1
+  end
+end
+local field = outcome == 'completed' and 'result' or 'error'
+redis.call('HSET', key, 'status', outcome, 'lease', '', field, payload, 'completed_ms', ARGV[7])
+redis.call('EXPIRE', key, ARGV[5])
+if redis.call('GET', index) == id then
+  redis.call('DEL', index)
+end
+return 1
+"""
+)
+
+# KEYS: task, leases
+_HEARTBEAT_LUA = """
+local key, leases = KEYS[1], KEYS[2]
+local id, token, deadline = ARGV[1], ARGV[2], ARGV[3]
+local t = redis.call('HMGET', key, 'lease', 'superseded_by')
+if token == '' or t[1] ~= token then
+  return 0
+end
+if t[2] then
+  return -1
+end
+redis.call('ZADD', leases, 'XX', deadline, id)
+return 1
+"""
+
+# KEYS: pr index
+_CANCEL_LUA = """
+local index, p = KEYS[1], ARGV[1]
+local id = redis.call('GET', index)
+if not id then
+  return 0
+end
+redis.call('DEL', index)
+local key = p .. 'task:' .. id
+local state = redis.call('HMGET', key, 'status', 'org')
+if state[1] == 'pending' then
+  redis.call('ZREM', p .. 'queue:' .. state[2], id)
+  redis.call('HSET', key, 'status', 'cancelled')
+  return 1
+end
+if state[1] == 'in_progress' then
+  redis.call('HSET', key, 'superseded_by', 'cancelled')
+  return 1
+end
+return 0
+"""
+
+# KEYS: leases, orgs, orgs:active
+_REAP_LUA = (
+    _REQUEUE_LUA
+    + """
+return reap(ARGV[1], KEYS[1], KEYS[2], KEYS[3], tonumber(ARGV[2]), tonumber(ARGV[3]))
+"""
+)
+
+_NO_ORG = "_"
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+class RedisPRAnalysisQueue:
+    """Reliable PR analysis queue on Redis.
+
+    Each state transition is one Lua script, so the queue is never seen
+    half-updated and a worker crash cannot lose a task:
+
+    - ``dequeue`` pops round-robin across organizations (one busy org
+      cannot starve the rest), then by priority and age within an org, and
+      leases the task for ``lease_seconds``.
+    - Leases that expire without ``complete``/``fail`` are re-delivered,
+      both by ``requeue_expired`` and inline at the start of each dequeue,
+      until ``max_retries`` deliveries have been made.
+    - A per-PR index makes a push of a new ``head_sha`` supersede the
+      pending task for that PR in O(1); pushing the same SHA again is a
+      no-op. A superseded in-progress task is told so by ``heartbeat`` and
+      is not retried.
+
+    ``complete``, ``fail`` and ``heartbeat`` only act while the caller
+    still holds the lease, so a worker whose lease expired cannot clobber
+    the re-delivered attempt.
+    """
+
+    KEY_PREFIX = "complianceagent:{pr_analysis}:"
+    PENDING_TTL_SECONDS = 86400 * 7
+    COMPLETED_TTL_SECONDS = 86400
+    FAILED_TTL_SECONDS = 86400 * 7
+    REAP_BATCH = 100
+
+    def __init__(self, redis_client: Any, lease_seconds: float = 300.0):
         self.redis = redis_client
-        self._local_queue: list[PRAnalysisTask] = []  # Fallback for testing
-
-    async def enqueue(self, task: PRAnalysisTask) -> str:
-        """Add a task to the queue."""
-        task_id = str(task.id)
-
-        if self.redis:
-            import json
-
-            # Store task data
-            await self.redis.set(
-                f"{self.TASK_KEY_PREFIX}{task_id}",
+        self.lease_seconds = lease_seconds
+        self._enqueue_script = redis_client.register_script(_ENQUEUE_LUA)
+        self._dequeue_script = redis_client.register_script(_DEQUEUE_LUA)
+        self._ack_script = redis_client.register_script(_ACK_LUA)
+        self._heartbeat_script = redis_client.register_script(_HEARTBEAT_LUA)
+        self._cancel_script = redis_client.register_script(_CANCEL_LUA)
+        self._reap_script = redis_client.register_script(_REAP_LUA)
+
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time.time() * 1000)
+
+    @staticmethod
+    def queue_score(priority: PRTaskPriority, enqueued_ms: int) -> int:
+        """Sort key within an org queue: higher priority first, then oldest."""
+        return (PRTaskPriority.CRITICAL.value - priority.value) * 10**13 + enqueued_ms
+
+    def _key(self, name: str) -> str:
+        return f"{self.KEY_PREFIX}{name}"
+
+    @staticmethod
+    def _org(task: PRAnalysisJob) -> str:
+        return str(task.organization_id) if task.organization_id else _NO_ORG
+
+    def _schedule_keys(self, task: PRAnalysisJob) -> list[str]:
+        """Keys a script needs to put ``task`` back in its org's queue."""
+        return [
+            self._key(f"queue:{self._org(task)}"),
+            self._key("orgs"),
+            self._key("orgs:active"),
+        ]
+
+    def _enqueue_call(self, task: PRAnalysisJob) -> dict[str, list[Any]]:
+        now = self._now_ms()
+        return {
+            "keys": [
+                self._key(f"task:{task.id}"),
+                self._key(f"pr:{task.pr_key}"),
+                *self._schedule_keys(task),
+            ],
+            "args": [
+                self.KEY_PREFIX,
+                str(task.id),
+                self._org(task),
+                task.head_sha,
+                self.queue_score(task.priority, now),
+                now,
                 json.dumps(task.to_dict()),
-                ex=86400 * 7,  # 7 day TTL
-            )
-            # Add to priority queue (sorted set by priority + timestamp)
-            score = task.priority.value * 1_000_000_000 + int(task.created_at.timestamp())
-            await self.redis.zadd(self.QUEUE_KEY, {task_id: score})
-        else:
-            self._local_queue.append(task)
+                task.max_retries,
+                self.PENDING_TTL_SECONDS,
+            ],
+        }
 
+    async def enqueue(self, task: PRAnalysisJob) -> str:
+        """Queue ``task``, superseding any older pending push to the same PR.
+
+        Returns the id of the live task, which is the existing task's id
+        when the same ``head_sha`` is already queued or running.
+        """
+        task_id, outcome = await self._enqueue_script(**self._enqueue_call(task))
+        task_id, outcome = _text(task_id), _text(outcome)
         logger.info(
             "PR analysis task enqueued",
             task_id=task_id,
+            outcome=outcome,
             repo=f"{task.owner}/{task.repo}",
             pr_number=task.pr_number,
         )
         return task_id
 
-    async def dequeue(self) -> PRAnalysisTask | None:
-        """Get the next task from the queue."""
-        if self.redis:
-            import json
-
-            # Get highest priority task
-            result = await self.redis.zpopmax(self.QUEUE_KEY)
-            if not result:
-                return None
-
-            task_id = result[0][0]
-            task_data = await self.redis.get(f"{self.TASK_KEY_PREFIX}{task_id}")
-            if not task_data:
-                return None
-
-            task = PRAnalysisTask.from_dict(json.loads(task_data))
-            task.status = PRTaskStatus.IN_PROGRESS
-            task.started_at = datetime.now(UTC)
-
-            # Mark as processing
-            await self.redis.sadd(self.PROCESSING_SET, task_id)
-            await self.redis.set(
-                f"{self.TASK_KEY_PREFIX}{task_id}",
-                json.dumps(task.to_dict()),
-            )
-            return task
-        if not self._local_queue:
+    async def enqueue_many(self, tasks: list[PRAnalysisJob]) -> list[str]:
+        """Queue several tasks in one pipelined round-trip."""
+        if not tasks:
+            return []
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for task in tasks:
+                await self._enqueue_script(**self._enqueue_call(task), client=pipe)
+            replies = await pipe.execute()
+        return [_text(task_id) for task_id, _outcome in replies]
+
+    async def dequeue(self) -> PRAnalysisJob | None:
+        """Lease the next task, or return None when every org queue is empty."""
+        token = uuid4().hex
+        now = self._now_ms()
+        reply = await self._dequeue_script(
+            keys=[self._key("orgs"), self._key("orgs:active"), self._key("leases")],
+            args=[self.KEY_PREFIX, now, int(self.lease_seconds * 1000), token, self.REAP_BATCH],
+        )
+        if not reply:
             return None
-        # Sort by priority
-        self._local_queue.sort(key=lambda t: t.priority.value, reverse=True)
-        task = self._local_queue.pop(0)
+
+        _task_id, data, attempts = reply
+        task = PRAnalysisJob.from_dict(json.loads(_text(data)))
         task.status = PRTaskStatus.IN_PROGRESS
-        task.started_at = datetime.now(UTC)
+        task.started_at = datetime.fromtimestamp(now / 1000, UTC)
+        task.retry_count = int(attempts) - 1
+        task.lease_token = token
         return task
 
-    async def complete(self, task: PRAnalysisTask, result: dict[str, Any]) -> None:
-        """Mark a task as completed."""
+    async def heartbeat(self, task: PRAnalysisJob) -> bool:
+        """Extend the lease on ``task``.
+
+        Returns False when the lease was lost or a newer push superseded
+        the task, in which case the worker should stop and drop its result.
+        """
+        deadline = self._now_ms() + int(self.lease_seconds * 1000)
+        reply = await self._heartbeat_script(
+            keys=[self._key(f"task:{task.id}"), self._key("leases")],
+            args=[str(task.id), task.lease_token or "", deadline],
+        )
+        return int(reply) == 1
+
+    async def _ack(self, task: PRAnalysisJob, outcome: str, payload: str, ttl: int) -> bool:
+        now = self._now_ms()
+        reply = await self._ack_script(
+            keys=[
+                self._key(f"task:{task.id}"),
+                self._key("leases"),
+                *self._schedule_keys(task),
+                self._key(f"pr:{task.pr_key}"),
+            ],
+            args=[
+                str(task.id),
+                task.lease_token or "",
+                outcome,
+                payload,
+                ttl,
+                self.queue_score(PRTaskPriority.LOW, now),
+                now,
+            ],
+        )
+        acknowledged = int(reply) == 1
+        if not acknowledged:
+            logger.warning("PR analysis task lease lost", task_id=str(task.id), outcome=outcome)
+        task.lease_token = None
+        return acknowledged
+
+    async def complete(self, task: PRAnalysisJob, result: dict[str, Any]) -> None:
+        """Mark a leased task as completed."""
         task.status = PRTaskStatus.COMPLETED
         task.completed_at = datetime.now(UTC)
         task.result = result
-
-        if self.redis:
-            import json
-
-            task_id = str(task.id)
-            await self.redis.set(
-                f"{self.TASK_KEY_PREFIX}{task_id}",
-                json.dumps(task.to_dict()),
-                ex=86400,  # 1 day TTL for completed tasks
-            )
-            await self.redis.srem(self.PROCESSING_SET, task_id)
+        await self._ack(task, "completed", json.dumps(result), self.COMPLETED_TTL_SECONDS)
 
         logger.info(
             "PR analysis task completed",
@@ -220,16 +512,16 @@ class PRAnalysisQueue:
             pr_number=task.pr_number,
         )
 
-    async def fail(self, task: PRAnalysisTask, error: str) -> bool:
-        """Mark a task as failed. Returns True if should retry."""
+    async def fail(self, task: PRAnalysisJob, error: str) -> bool:
+        """Mark a leased task as failed. Returns True if it will be retried."""
         task.retry_count += 1
         task.error_message = error
 
         if task.retry_count < task.max_retries:
-            # Re-queue for retry with lower priority
+            # Retry at low priority so fresh work goes first
             task.status = PRTaskStatus.PENDING
             task.priority = PRTaskPriority.LOW
-            await self.enqueue(task)
+            await self._ack(task, "retry", error, self.PENDING_TTL_SECONDS)
             logger.warning(
                 "PR analysis task failed, will retry",
                 task_id=str(task.id),
@@ -240,18 +532,7 @@ class PRAnalysisQueue:
 
         task.status = PRTaskStatus.FAILED
         task.completed_at = datetime.now(UTC)
-
-        if self.redis:
-            import json
-
-            task_id = str(task.id)
-            await self.redis.set(
-                f"{self.TASK_KEY_PREFIX}{task_id}",
-                json.dumps(task.to_dict()),
-                ex=86400 * 7,
-            )
-            await self.redis.srem(self.PROCESSING_SET, task_id)
-
+        await self._ack(task, "failed", error, self.FAILED_TTL_SECONDS)
         logger.error(
             "PR analysis task failed permanently",
             task_id=str(task.id),
@@ -259,53 +540,45 @@ class PRAnalysisQueue:
         )
         return False
 
-    async def get_task(self, task_id: str) -> PRAnalysisTask | None:
+    async def requeue_expired(self) -> int:
+        """Re-deliver tasks whose lease expired. Returns the number reaped."""
+        reply = await self._reap_script(
+            keys=[self._key("leases"), self._key("orgs"), self._key("orgs:active")],
+            args=[self.KEY_PREFIX, self._now_ms(), self.REAP_BATCH],
+        )
+        return int(reply)
+
+    async def get_task(self, task_id: str) -> PRAnalysisJob | None:
         """Get a task by ID."""
-        if self.redis:
-            import json
-
-            task_data = await self.redis.get(f"{self.TASK_KEY_PREFIX}{task_id}")
-            if task_data:
-                return PRAnalysisTask.from_dict(json.loads(task_data))
-        else:
-            for task in self._local_queue:
-                if str(task.id) == task_id:
-                    return task
-        return None
+        fields = await self.redis.hgetall(self._key(f"task:{task_id}"))
+        if not fields:
+            return None
+        fields = {_text(k): _text(v) for k, v in fields.items()}
+        task = PRAnalysisJob.from_dict(json.loads(fields["data"]))
+        task.status = PRTaskStatus(fields.get("status", "pending"))
+        task.retry_count = max(int(fields.get("attempts", 0)) - 1, 0)
+        task.superseded_by = fields.get("superseded_by")
+        if "result" in fields:
+            task.result = json.loads(fields["result"])
+        if fields.get("error"):
+            task.error_message = fields["error"]
+        return task
 
     async def get_queue_size(self) -> int:
-        """Get number of pending tasks."""
-        if self.redis:
-            return await self.redis.zcard(self.QUEUE_KEY)
-        return len(self._local_queue)
+        """Get number of pending tasks across all organizations."""
+        orgs = await self.redis.smembers(self._key("orgs:active"))
+        if not orgs:
+            return 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for org in orgs:
+                pipe.zcard(self._key(f"queue:{_text(org)}"))
+            return sum(await pipe.execute())
 
     async def cancel_for_pr(self, owner: str, repo: str, pr_number: int) -> int:
-        """Cancel all pending tasks for a specific PR."""
-        cancelled = 0
-        if self.redis:
-            import json
-
-            # Get all pending task IDs
-            task_ids = await self.redis.zrange(self.QUEUE_KEY, 0, -1)
-            for task_id in task_ids:
-                task_data = await self.redis.get(f"{self.TASK_KEY_PREFIX}{task_id}")
-                if task_data:
-                    task = PRAnalysisTask.from_dict(json.loads(task_data))
-                    if task.owner == owner and task.repo == repo and task.pr_number == pr_number:
-                        await self.redis.zrem(self.QUEUE_KEY, task_id)
-                        task.status = PRTaskStatus.CANCELLED
-                        await self.redis.set(
-                            f"{self.TASK_KEY_PREFIX}{task_id}",
-                            json.dumps(task.to_dict()),
-                        )
-                        cancelled += 1
-        else:
-            self._local_queue = [
-                t
-                for t in self._local_queue
-                if not (t.owner == owner and t.repo == repo and t.pr_number == pr_number)
-            ]
-        return cancelled
+        """Cancel the live task for a PR. Returns the number cancelled (0 or 1)."""
+        pr_key = PRAnalysisJob(owner=owner, repo=repo, pr_number=pr_number).pr_key
+        reply = await self._cancel_script(keys=[self._key(f"pr:{pr_key}")], args=[self.KEY_PREFIX])
+        return int(reply)
 
 
 # ---------------------------------------------------------------------------
@@ -339,7 +612,7 @@ class PRAnalysisTask:
     created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
 
 
-class PRAnalysisQueue:  # noqa: F811 - intentional redefinition for test compat
+class PRAnalysisQueue:
     """In-memory queue for PR analysis tasks (test-compatible interface)."""
 
     def __init__(self) -> None:
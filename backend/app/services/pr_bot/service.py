@@ -7,16 +7,26 @@ from typing import Any
 
 import structlog
 
+from app.core.config import settings
 from app.services.pr_bot.bot import PRBot, PRBotConfig, PRBotResult
-from app.services.pr_bot.checks import CheckConclusion, CheckOutput, ChecksService, CheckStatus
+from app.services.pr_bot.checks import (
+    CheckConclusion,
+    CheckOutput,
+    CheckStatus,
+    GitHubChecksService,
+)
 from app.services.pr_bot.comments import CommentService, CommentSeverity
-from app.services.pr_bot.labels import ComplianceLabel, LabelService
+from app.services.pr_bot.labels import ComplianceLabel, GitHubLabelService
 from app.services.pr_bot.policy_gates import (
     PolicyEvaluationSummary,
     PolicyGateService,
     get_policy_gate_service,
 )
-from app.services.pr_bot.queue import PRAnalysisQueue, PRAnalysisTask
+from app.services.pr_bot.queue import (
+    PRAnalysisJob,
+    PRAnalysisQueue,
+    RedisPRAnalysisQueue,
+)
 
 
 logger = structlog.get_logger(__name__)
@@ -26,7 +36,7 @@ __all__ = [
     "CheckStatus",
     "CommentSeverity",
     "ComplianceLabel",
-    "PRAnalysisTask",
+    "PRAnalysisJob",
     "PRBot",
     "PRBotConfig",
     "PRBotResult",
@@ -40,10 +50,10 @@ class PRBotService:
     """Facade over PR-bot sub-modules: bot, checks, comments, labels, queue, and policy gates."""
 
     bot: PRBot = field(default_factory=PRBot)
-    checks_service: ChecksService = field(default_factory=ChecksService)
+    checks_service: GitHubChecksService = field(default_factory=GitHubChecksService)
     comment_service: CommentService = field(default_factory=CommentService)
-    label_service: LabelService = field(default_factory=LabelService)
-    queue: PRAnalysisQueue = field(default_factory=PRAnalysisQueue)
+    label_service: GitHubLabelService = field(default_factory=GitHubLabelService)
+    queue: PRAnalysisQueue | RedisPRAnalysisQueue = field(default_factory=PRAnalysisQueue)
     gate_service: PolicyGateService = field(default_factory=get_policy_gate_service)
 
     # ------------------------------------------------------------------
@@ -77,7 +87,7 @@ class PRBotService:
 
     async def process_task(
         self,
-        task: PRAnalysisTask,
+        task: PRAnalysisJob,
         access_token: str,
     ) -> PRBotResult:
         """Process a queued PR analysis task end-to-end."""
@@ -151,9 +161,14 @@ class PRBotService:
     # Queue helpers
     # ------------------------------------------------------------------
 
-    async def enqueue(self, task: PRAnalysisTask) -> str:
-        """Add a PR analysis task to the processing queue."""
-        return await self.queue.enqueue(task)
+    async def enqueue(self, job: PRAnalysisJob) -> str:
+        """Add a PR analysis job to the processing queue.
+
+        Returns the id of the live job, which on the Redis queue is the
+        already queued job's id when the same head was pushed before.
+        """
+        job_id = await self.queue.enqueue(job)
+        return job_id or str(job.id)
 
     async def get_queue_size(self) -> int:
         return await self.queue.get_queue_size()
@@ -162,10 +177,22 @@ class PRBotService:
 _service: PRBotService | None = None
 
 
+def _analysis_queue() -> PRAnalysisQueue | RedisPRAnalysisQueue:
+    """The Redis-backed queue when Redis is configured, else the in-memory one."""
+    if settings.redis_url:
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            logger.warning("pr_bot_queue_in_memory", reason="redis not installed")
+        else:
+            return RedisPRAnalysisQueue(aioredis.from_url(settings.redis_url))
+    return PRAnalysisQueue()
+
+
 def get_pr_bot_service() -> PRBotService:
     """Return the global PRBotService singleton."""
     global _service
     if _service is None:
-        _service = PRBotService()
+        _service = PRBotService(queue=_analysis_queue())
         logger.info("pr_bot_service_initialized")
     return _service
@@ -1,5 +1,6 @@
 """PR Analyzer - Phase 1: Analyzes PR diffs for compliance-relevant code changes."""
 
+import asyncio
 import re
 import time
 from typing import Any
@@ -7,7 +8,19 @@ from uuid import uuid4
 
 import structlog
 
+from app.core.process_pool import get_process_pool, process_pool_size
+from app.services.analysis_cache import AnalysisCache, get_analysis_cache, ruleset_fingerprint
 from app.services.github.client import GitHubClient
+from app.services.pr_review.diff_scan import (
+    SCANNER_VERSION,
+    DiffScanner,
+    PatternMatch,
+    PatternSpec,
+    added_lines,
+    from_records,
+    scan_patches,
+    to_records,
+)
 from app.services.pr_review.models import (
     ComplianceViolation,
     FileDiff,
@@ -18,6 +31,10 @@ from app.services.pr_review.models import (
 
 logger = structlog.get_logger()
 
+# PRs with fewer added lines are scanned inline; above this the process
+# pool start-up and pickling pay for themselves
+_PARALLEL_SCAN_LINES = 5_000
+
 
 # Compliance-relevant patterns to detect in code changes
 COMPLIANCE_PATTERNS = {
@@ -158,6 +175,8 @@ class PRAnalyzer:
         github_client: GitHubClient | None = None,
         enabled_regulations: list[str] | None = None,
         custom_patterns: dict[str, dict] | None = None,
+        scan_workers: int | None = None,
+        result_cache: AnalysisCache | None = None,
     ):
         self.github_client = github_client
         self.enabled_regulations = enabled_regulations or [
@@ -170,11 +189,14 @@ class PRAnalyzer:
         ]
         self.custom_patterns = custom_patterns or {}
         self._compiled_patterns: dict[str, tuple[re.Pattern, dict]] = {}
+        self._scan_workers = scan_workers or process_pool_size()
+        self._result_cache = result_cache if result_cache is not None else get_analysis_cache()
         self._compile_patterns()
 
     def _compile_patterns(self) -> None:
         """Pre-compile regex patterns for performance."""
         all_patterns = {**COMPLIANCE_PATTERNS, **self.custom_patterns}
+        self._compiled_patterns = {}
         for name, config in all_patterns.items():
             regulation = config.get("regulation")
             if regulation is None or regulation in self.enabled_regulations:
@@ -184,6 +206,16 @@ class PRAnalyzer:
                 except re.error as e:
                     logger.warning(f"Invalid pattern {name}: {e}")
 
+        self._scanner = DiffScanner(
+            {name: compiled for name, (compiled, _) in self._compiled_patterns.items()}
+        )
+        self._pattern_specs: PatternSpec = tuple(
+            (name, compiled.pattern, compiled.flags)
+            for name, (compiled, _) in self._compiled_patterns.items()
+        )
+        # Cached findings are only reused while the same patterns run
+        self._ruleset = ruleset_fingerprint([SCANNER_VERSION, self._pattern_specs])
+
     async def analyze_pr(
         self,
         owner: str,
@@ -206,24 +238,14 @@ class PRAnalyzer:
 
         async with GitHubClient(access_token=access_token) as client:
             # Get PR details
-            pr_data = await self._get_pr_details(client, owner, repo, pr_number)
+            pr = await client.get_pull_request(owner, repo, pr_number)
             files = await self._get_pr_files(client, owner, repo, pr_number)
 
-            violations: list[ComplianceViolation] = []
-            file_diffs: list[FileDiff] = []
-            total_additions = 0
-            total_deletions = 0
-
-            for file_data in files:
-                file_diff = self._parse_file_diff(file_data)
-                file_diffs.append(file_diff)
-                total_additions += file_diff.additions
-                total_deletions += file_diff.deletions
-
-                # Analyze file if it has a patch (changes)
-                if file_diff.patch:
-                    file_violations = self._analyze_diff(file_diff)
-                    violations.extend(file_violations)
+            file_diffs = [self._parse_file_diff(file_data) for file_data in files]
+            await self._load_unpatched_files(client, owner, repo, files, file_diffs)
+            total_additions = sum(file_diff.additions for file_diff in file_diffs)
+            total_deletions = sum(file_diff.deletions for file_diff in file_diffs)
+            violations = await self._analyze_files(file_diffs)
 
             analysis_time = (time.perf_counter() - start_time) * 1000
 
@@ -232,8 +254,8 @@ class PRAnalyzer:
                 pr_number=pr_number,
                 repository=repo,
                 owner=owner,
-                base_sha=pr_data.get("base", {}).get("sha", ""),
-                head_sha=pr_data.get("head", {}).get("sha", ""),
+                base_sha=pr.base_sha,
+                head_sha=pr.head_sha,
                 files_analyzed=len(files),
                 total_additions=total_additions,
                 total_deletions=total_deletions,
@@ -261,34 +283,51 @@ class PRAnalyzer:
             patch=diff_content,
             language=self._detect_language(file_path),
         )
-        return self._analyze_diff(file_diff)
+        return await self._analyze_files([file_diff])
 
-    async def _get_pr_details(
+    async def _get_pr_files(
         self,
         client: GitHubClient,
         owner: str,
         repo: str,
         pr_number: int,
-    ) -> dict[str, Any]:
-        """Get PR details from GitHub."""
-        response = await client._client.get(f"/repos/{owner}/{repo}/pulls/{pr_number}")
-        response.raise_for_status()
-        return response.json()
+    ) -> list[dict[str, Any]]:
+        """Get files changed in a PR."""
+        return await client.get_pull_request_files(owner, repo, pr_number)
 
-    async def _get_pr_files(
+    async def _load_unpatched_files(
         self,
         client: GitHubClient,
         owner: str,
         repo: str,
-        pr_number: int,
-    ) -> list[dict[str, Any]]:
-        """Get files changed in a PR."""
-        response = await client._client.get(
-            f"/repos/{owner}/{repo}/pulls/{pr_number}/files",
-            params={"per_page": 100},
+        files: list[dict[str, Any]],
+        file_diffs: list[FileDiff],
+    ) -> None:
+        """Scan files GitHub sent without a patch in full, at the head revision.
+
+        GitHub leaves the patch out of large diffs. Those files are fetched
+        by blob SHA through the shared blob cache, so a file unchanged since
+        an earlier push or analysis is not downloaded again.
+        """
+        unpatched = {
+            file_diff.path: file_data["sha"]
+            for file_data, file_diff in zip(files, file_diffs, strict=True)
+            if not file_diff.patch and file_diff.status != "removed" and file_data.get("sha")
+        }
+        if not unpatched:
+            return
+        fetched = await client.get_files(
+            owner, repo, [{"path": path, "sha": sha} for path, sha in unpatched.items()]
         )
-        response.raise_for_status()
-        return response.json()
+        for file_diff in file_diffs:
+            file = fetched.get(file_diff.path)
+            if file is None or not file.content:
+                continue
+            lines = file.content.splitlines()
+            file_diff.content = file.content
+            file_diff.patch = f"@@ -0,0 +1,{len(lines)} @@\n" + "\n".join(
+                f"+{line}" for line in lines
+            )
 
     def _parse_file_diff(self, file_data: dict[str, Any]) -> FileDiff:
         """Parse GitHub file data into FileDiff."""
@@ -330,114 +369,106 @@ class PRAnalyzer:
                 return lang
         return "unknown"
 
-    def _analyze_diff(self, file_diff: FileDiff) -> list[ComplianceViolation]:
-        """Analyze a file diff for compliance violations."""
-        violations: list[ComplianceViolation] = []
-
-        if not file_diff.patch:
-            return violations
+    async def _analyze_files(self, file_diffs: list[FileDiff]) -> list[ComplianceViolation]:
+        """Scan every file with a patch, reusing cached findings for unchanged additions.
 
-        # Parse the patch to extract added/modified lines with their positions
-        lines_info = self._parse_patch(file_diff.patch)
-
-        for line_info in lines_info:
-            line_content = line_info["content"]
-            line_number = line_info["new_line"]
-
-            # Only analyze added lines (marked with +)
-            if not line_info["is_addition"]:
-                continue
+        Files whose added lines were scanned before with the same patterns
+        (an earlier push of the PR, a rebase, another PR carrying the same
+        change) come from the result cache with their lines rebased. Only
+        the remaining files are scanned.
+        """
+        changed = [file_diff for file_diff in file_diffs if file_diff.patch]
+        parsed = {id(file_diff): added_lines(file_diff.patch) for file_diff in changed}
+        keys = {
+            id(file_diff): self._result_cache.key(
+                "pr", self._ruleset, "\n".join(parsed[id(file_diff)][1])
+            )
+            for file_diff in changed
+        }
+        cached = await self._result_cache.get_many(keys.values())
 
-            # Check against all patterns
-            for pattern_name, (compiled_pattern, config) in self._compiled_patterns.items():
-                matches = list(compiled_pattern.finditer(line_content))
-                for match in matches:
-                    violation = ComplianceViolation(
-                        file_path=file_diff.path,
-                        line_start=line_number,
-                        line_end=line_number,
-                        column_start=match.start(),
-                        column_end=match.end(),
-                        code=f"{config.get('regulation', 'SEC')}-{pattern_name.upper()[:10]}",
-                        message=config.get("message", f"Pattern {pattern_name} matched"),
-                        severity=config.get("severity", ViolationSeverity.MEDIUM),
-                        regulation=config.get("regulation"),
-                        article_reference=config.get("article"),
-                        category=config.get("category"),
-                        evidence=match.group(),
-                        confidence=0.85,  # Base confidence, can be refined with AI
-                        metadata={
-                            "pattern_name": pattern_name,
-                            "language": file_diff.language,
-                            "line_content": line_content[:200],
-                        },
-                    )
-                    violations.append(violation)
+        misses = [file_diff for file_diff in changed if keys[id(file_diff)] not in cached]
+        scanned = await self._scan_patches(misses)
+        if scanned:
+            await self._result_cache.set_many(
+                {keys[id(file_diff)]: to_records(scanned[id(file_diff)]) for file_diff in misses}
+            )
 
+        violations: list[ComplianceViolation] = []
+        for file_diff in changed:
+            matches = scanned.get(id(file_diff))
+            if matches is None:
+                matches = from_records(cached[keys[id(file_diff)]], *parsed[id(file_diff)])
+            violations.extend(self._to_violations(file_diff, matches))
         return violations
 
-    def _parse_patch(self, patch: str) -> list[dict[str, Any]]:
-        """Parse a unified diff patch into line information.
+    async def _scan_patches(self, file_diffs: list[FileDiff]) -> dict[int, list[PatternMatch]]:
+        """Pattern hits per file (keyed by ``id``), across processes for large PRs."""
+        added = sum(file_diff.additions for file_diff in file_diffs)
+        workers = min(self._scan_workers, len(file_diffs))
+        pool = get_process_pool() if workers > 1 and added >= _PARALLEL_SCAN_LINES else None
+        if pool is None:
+            return {id(file_diff): self._scanner.scan(file_diff.patch) for file_diff in file_diffs}
+
+        # Deal files largest-first onto the least loaded worker
+        batches: list[list[FileDiff]] = [[] for _ in range(workers)]
+        loads = [0] * workers
+        for file_diff in sorted(file_diffs, key=lambda f: len(f.patch), reverse=True):
+            slot = loads.index(min(loads))
+            batches[slot].append(file_diff)
+            loads[slot] += len(file_diff.patch)
+
+        loop = asyncio.get_running_loop()
+        batches = [batch for batch in batches if batch]
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    pool,
+                    scan_patches,
+                    self._pattern_specs,
+                    [file_diff.patch for file_diff in batch],
+                )
+                for batch in batches
+            )
+        )
 
-        Returns list of dicts with:
-            - content: Line content (without +/- prefix)
-            - old_line: Line number in old file (None for additions)
-            - new_line: Line number in new file (None for deletions)
-            - is_addition: True if line was added
-            - is_deletion: True if line was removed
-            - is_context: True if line is context (unchanged)
-        """
-        lines_info = []
-        old_line = 0
-        new_line = 0
-
-        for line in patch.split("\n"):
-            # Parse hunk header: @@ -start,count +start,count @@
-            hunk_match = re.match(r"^@@ -(\d+)(?:,\d+)? \+(\d+)(?:,\d+)? @@", line)
-            if hunk_match:
-                old_line = int(hunk_match.group(1))
-                new_line = int(hunk_match.group(2))
-                continue
+        matches_by_file: dict[int, list[PatternMatch]] = {}
+        for batch, batch_matches in zip(batches, results, strict=True):
+            for file_diff, matches in zip(batch, batch_matches, strict=True):
+                matches_by_file[id(file_diff)] = matches
+        return matches_by_file
 
-            if line.startswith("+") and not line.startswith("+++"):
-                lines_info.append(
-                    {
-                        "content": line[1:],
-                        "old_line": None,
-                        "new_line": new_line,
-                        "is_addition": True,
-                        "is_deletion": False,
-                        "is_context": False,
-                    }
-                )
-                new_line += 1
-            elif line.startswith("-") and not line.startswith("---"):
-                lines_info.append(
-                    {
-                        "content": line[1:],
-                        "old_line": old_line,
-                        "new_line": None,
-                        "is_addition": False,
-                        "is_deletion": True,
-                        "is_context": False,
-                    }
-                )
-                old_line += 1
-            elif not line.startswith("\\"):  # Ignore "\ No newline at end of file"
-                lines_info.append(
-                    {
-                        "content": line.removeprefix(" "),
-                        "old_line": old_line,
-                        "new_line": new_line,
-                        "is_addition": False,
-                        "is_deletion": False,
-                        "is_context": True,
-                    }
+    def _to_violations(
+        self,
+        file_diff: FileDiff,
+        matches: list[PatternMatch],
+    ) -> list[ComplianceViolation]:
+        violations: list[ComplianceViolation] = []
+        for match in matches:
+            config = self._compiled_patterns[match.pattern_name][1]
+            violations.append(
+                ComplianceViolation(
+                    file_path=file_diff.path,
+                    line_start=match.line,
+                    line_end=match.line,
+                    column_start=match.column_start,
+                    column_end=match.column_end,
+                    code=f"{config.get('regulation', 'SEC')}-{match.pattern_name.upper()[:10]}",
+                    message=config.get("message", f"Pattern {match.pattern_name} matched"),
+                    severity=config.get("severity", ViolationSeverity.MEDIUM),
+                    regulation=config.get("regulation"),
+                    article_reference=config.get("article"),
+                    category=config.get("category"),
+                    evidence=match.evidence,
+                    confidence=0.85,  # Base confidence, can be refined with AI
+                    metadata={
+                        "pattern_name": match.pattern_name,
+                        "language": file_diff.language,
+                        "line_content": match.line_content,
+                    },
                 )
-                old_line += 1
-                new_line += 1
-
-        return lines_info
+            )
+        return violations
 
     def add_custom_pattern(
         self,
@@ -0,0 +1,225 @@
+"""Diff scanning for PRAnalyzer.
+
+Only added lines can introduce a violation, so the parser streams a patch
+once and keeps just those lines, grouped by hunk with their new-file line
+numbers. Context and deleted lines only advance the counters.
+
+Each compliance pattern then runs once over a hunk's added lines joined
+with newlines, instead of once per line. Match offsets are mapped back to
+``(line, column)`` with a bisect over the line start offsets. None of the
+built-in patterns can cross a line break (``.`` excludes newlines and
+``^``/``$`` are compiled MULTILINE). A pattern that does cross one, such as
+``\\s*`` running into the next line, has the starting line rescanned on its
+own, so findings match a line-by-line scan.
+
+Findings depend only on the sequence of added lines, not on where they
+sit in the file. ``to_records`` therefore stores each hit against the
+index of its line among the patch's added lines, and ``from_records``
+rebases cached hits onto the line numbers of the diff being viewed. A
+rebase that moved the hunks still reuses the cached findings.
+
+``scan_patches`` is the process-pool entry point used to spread the files
+of large PRs across cores.
+"""
+
+import re
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import NamedTuple
+
+from app.services.analysis_cache import Record
+
+
+# Bump when scanning semantics change so cached findings are not reused
+SCANNER_VERSION = 1
+
+_HUNK_HEADER = re.compile(r"@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+# (name, regex source, flags) triples; hashable so workers can cache scanners
+PatternSpec = tuple[tuple[str, str, int], ...]
+
+
+@dataclass
+class AddedHunk:
+    """Added lines of one hunk and their line numbers in the new file."""
+
+    line_numbers: list[int] = field(default_factory=list)
+    lines: list[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+class PatternMatch(NamedTuple):
+    """One pattern hit on an added line."""
+
+    pattern_name: str
+    line: int
+    column_start: int
+    column_end: int
+    evidence: str
+    line_content: str
+    added_index: int = 0  # position among the patch's added lines
+
+
+def iter_added_hunks(patch: str) -> Iterator[AddedHunk]:
+    """Yield the added lines of each hunk in ``patch``.
+
+    Inside a hunk the header's line counts decide where it ends, so added
+    lines that themselves start with ``++`` are kept. Text outside any hunk
+    is read leniently (``+`` lines are additions, ``+++``/``---`` are file
+    headers) so bare snippets without a header still scan.
+    """
+    hunk = AddedHunk()
+    new_line = 0
+    old_left = new_left = 0
+
+    for line in patch.split("\n"):
+        marker = line[:1]
+        header = _HUNK_HEADER.match(line) if marker == "@" else None
+        if header:
+            if hunk.lines:
+                yield hunk
+                hunk = AddedHunk()
+            old_count, new_start, new_count = header.groups()
+            new_line = int(new_start)
+            old_left = 1 if old_count is None else int(old_count)
+            new_left = 1 if new_count is None else int(new_count)
+            continue
+
+        if old_left > 0 or new_left > 0:
+            if marker == "+":
+                hunk.line_numbers.append(new_line)
+                hunk.lines.append(line[1:])
+                new_line += 1
+                new_left -= 1
+            elif marker == "-":
+                old_left -= 1
+            elif marker != "\\":
+                new_line += 1
+                old_left -= 1
+                new_left -= 1
+            continue
+
+        if marker == "+" and not line.startswith("+++"):
+            hunk.line_numbers.append(new_line)
+            hunk.lines.append(line[1:])
+            new_line += 1
+        elif marker not in {"-", "\\"}:
+            new_line += 1
+
+    if hunk.lines:
+        yield hunk
+
+
+def added_lines(patch: str) -> tuple[list[int], list[str]]:
+    """New-file line numbers and text of every added line in ``patch``."""
+    numbers: list[int] = []
+    lines: list[str] = []
+    for hunk in iter_added_hunks(patch):
+        numbers.extend(hunk.line_numbers)
+        lines.extend(hunk.lines)
+    return numbers, lines
+
+
+def to_records(matches: Iterable[PatternMatch]) -> list[Record]:
+    """Position-independent, JSON-friendly form of ``matches``."""
+    return [
+        (m.pattern_name, m.added_index, m.column_start, m.column_end, m.evidence) for m in matches
+    ]
+
+
+def from_records(
+    records: Iterable[Record],
+    line_numbers: Sequence[int],
+    lines: Sequence[str],
+) -> list[PatternMatch]:
+    """Rebase cached records onto the added lines of the current diff."""
+    return [
+        PatternMatch(name, line_numbers[index], start, end, evidence, lines[index][:200], index)
+        for name, index, start, end, evidence in records
+    ]
+
+
+def _line_matches(
+    pattern: re.Pattern,
+    text: str,
+    starts: Sequence[int],
+    lines: Sequence[str],
+) -> Iterator[tuple[int, int, int, str]]:
+    """``(line index, start, end, evidence)`` for each hit, columns per line."""
+    pos = 0
+    while pos <= len(text):
+        for match in pattern.finditer(text, pos):
+            index = bisect_right(starts, match.start()) - 1
+            start = starts[index]
+            if match.end() <= start + len(lines[index]):
+                yield index, match.start() - start, match.end() - start, match.group()
+                continue
+            # Crossed into the next line: finish this line on its own
+            for line_match in pattern.finditer(lines[index], match.start() - start):
+                yield index, line_match.start(), line_match.end(), line_match.group()
+            pos = start + len(lines[index]) + 1
+            break
+        else:
+            return
+
+
+class DiffScanner:
+    """Runs a fixed set of compiled patterns over the added lines of patches."""
+
+    def __init__(self, patterns: Mapping[str, re.Pattern]):
+        self._patterns = list(patterns.items())
+
+    def scan(self, patch: str) -> list[PatternMatch]:
+        """All pattern hits in ``patch``, ordered by line, then pattern, then column."""
+        matches: list[PatternMatch] = []
+        offset = 0
+        for hunk in iter_added_hunks(patch):
+            matches.extend(self.scan_hunk(hunk, offset))
+            offset += len(hunk.lines)
+        return matches
+
+    def scan_hunk(self, hunk: AddedHunk, first_index: int = 0) -> list[PatternMatch]:
+        text = hunk.text
+        starts: list[int] = []
+        offset = 0
+        for line in hunk.lines:
+            starts.append(offset)
+            offset += len(line) + 1
+
+        found: list[tuple[tuple[int, int], PatternMatch]] = []
+        for order, (name, pattern) in enumerate(self._patterns):
+            for index, start, end, evidence in _line_matches(pattern, text, starts, hunk.lines):
+                line = hunk.lines[index]
+                found.append(
+                    (
+                        (index, order),
+                        PatternMatch(
+                            name,
+                            hunk.line_numbers[index],
+                            start,
+                            end,
+                            evidence,
+                            line[:200],
+                            first_index + index,
+                        ),
+                    )
+                )
+        # Stable, so each pattern's hits on a line stay in column order
+        found.sort(key=lambda item: item[0])
+        return [match for _, match in found]
+
+
+@lru_cache(maxsize=8)
+def _scanner_for(specs: PatternSpec) -> DiffScanner:
+    return DiffScanner({name: re.compile(source, flags) for name, source, flags in specs})
+
+
+def scan_patches(specs: PatternSpec, patches: Sequence[str]) -> list[list[PatternMatch]]:
+    """Scan several patches with the patterns in ``specs`` (process-pool entry point)."""
+    scanner = _scanner_for(specs)
+    return [scanner.scan(patch) for patch in patches]
@@ -1,11 +1,20 @@
 """Regulation Changelog Diff Viewer."""
 
+from app.services.regulation_diff.engine import (
+    HierarchicalDiffEngine,
+    NodeDiff,
+    NodeLevel,
+    TextNode,
+    parse_regulation_text,
+)
 from app.services.regulation_diff.models import (
     ArticleChange,
     ChangeSeverity,
     ChangeType,
     RegulationDiff,
     RegulationVersion,
+    SubsectionChange,
+    TokenChange,
 )
 from app.services.regulation_diff.service import RegulationDiffService
 
@@ -14,7 +23,14 @@ __all__ = [
     "ArticleChange",
     "ChangeSeverity",
     "ChangeType",
+    "HierarchicalDiffEngine",
+    "NodeDiff",
+    "NodeLevel",
     "RegulationDiff",
     "RegulationDiffService",
     "RegulationVersion",
+    "SubsectionChange",
+    "TextNode",
+    "TokenChange",
+    "parse_regulation_text",
 ]
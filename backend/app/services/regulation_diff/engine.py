@@ -0,0 +1,438 @@
+"""Hierarchical, memoized regulation text diff engine.
+
+Regulation texts are parsed into an article → paragraph → sentence tree whose
+nodes carry a content hash and, where the text provides one, a stable section
+identifier (``Art. 22``, ``Req. 8.3.6``, ``¶2``). Diffing walks both trees
+top-down: subtrees with equal hashes are skipped outright, keyed children are
+aligned by identifier, unkeyed children by hash sequence, and only changed
+leaves get a token-level diff. Node diffs are memoized by
+``(old_hash, new_hash)`` so re-diffing consolidated texts that share most of
+their articles only pays for what actually changed.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from app.services.regulation_diff.models import ChangeType
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class NodeLevel(StrEnum):
+    """Granularity of a node in the regulation text tree."""
+
+    DOCUMENT = "document"
+    ARTICLE = "article"
+    PARAGRAPH = "paragraph"
+    SENTENCE = "sentence"
+
+
+@dataclass(frozen=True, slots=True)
+class TextNode:
+    """A node in the parsed regulation tree.
+
+    ``key`` is the stable identifier used for alignment and is empty for
+    nodes whose position is their only identity (e.g. sentences).
+    """
+
+    level: NodeLevel
+    label: str
+    text: str
+    hash: str
+    key: str = ""
+    children: tuple[TextNode, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class TokenOp:
+    """A token-level edit inside a changed leaf."""
+
+    op: str
+    old: str = ""
+    new: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class NodeDiff:
+    """Difference between two aligned nodes (either side may be missing)."""
+
+    level: NodeLevel
+    label: str
+    change_type: ChangeType
+    old_text: str = ""
+    new_text: str = ""
+    similarity: float = 0.0
+    children: tuple[NodeDiff, ...] = ()
+    token_ops: tuple[TokenOp, ...] = ()
+    old_label: str = ""
+
+    def iter_leaves(self, path: tuple[str, ...] = ()) -> Iterator[tuple[tuple[str, ...], NodeDiff]]:
+        """Yield ``(path, diff)`` for the deepest changed nodes below this one."""
+        here = (*path, self.label)
+        if not self.children:
+            yield here, self
+            return
+        for child in self.children:
+            yield from child.iter_leaves(here)
+
+
+@dataclass
+class DiffEngineStats:
+    """Counters describing how much work the engine avoided."""
+
+    nodes_compared: int = 0
+    hash_short_circuits: int = 0
+    memo_hits: int = 0
+    token_diffs: int = 0
+    parse_cache_hits: int = 0
+
+
+# Article-level headings: "Article 22", "Art. 10a", "Section 164.312",
+# "§ 1798.100", "Requirement 8.3.6", "Req. 6.4.3", "Recital 71", "Annex III".
+_HEADING_RE = re.compile(
+    r"^[ \t]*(?P<kind>Article|Art\.|Section|Sec\.|§|Requirement|Req\.|Recital|Annex)"
+    r"[ \t]*(?P<num>(?:\d+[a-z]?|[IVXLC]+)(?:\.\d+[a-z]?)*)\b",
+    re.IGNORECASE | re.MULTILINE,
+)
+_HEADING_KINDS: dict[str, tuple[str, str]] = {
+    "article": ("art", "Art."),
+    "art.": ("art", "Art."),
+    "section": ("sec", "Section"),
+    "sec.": ("sec", "Section"),
+    "§": ("sec", "§"),
+    "requirement": ("req", "Req."),
+    "req.": ("req", "Req."),
+    "recital": ("recital", "Recital"),
+    "annex": ("annex", "Annex"),
+}
+# Paragraph boundaries: blank lines, or a new line opening with "2." / "(b)".
+_PARAGRAPH_SPLIT_RE = re.compile(r"\n[ \t]*\n|\n(?=[ \t]*(?:\(\w{1,4}\)|\d{1,3}\.)\s)")
+_PARAGRAPH_NUMBER_RE = re.compile(r"^\s*(?:\((?P<paren>\w{1,4})\)|(?P<dot>\d{1,3})\.)\s")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.;!?])\s+(?=[A-Z(\"“‘'])")
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_WS_RE = re.compile(r"\s+")
+
+
+def _node_hash(level: NodeLevel, text: str) -> str:
+    normalized = _WS_RE.sub(" ", text).strip()
+    return hashlib.sha256(f"{level.value}:{normalized}".encode()).hexdigest()
+
+
+def _split_sentences(text: str) -> list[str]:
+    return [s.strip() for s in _SENTENCE_SPLIT_RE.split(text) if s.strip()]
+
+
+def _build_paragraph(text: str, index: int, *, is_heading: bool = False) -> TextNode:
+    match = _PARAGRAPH_NUMBER_RE.match(text)
+    number = (match.group("paren") or match.group("dot")) if match else ""
+    body = text[match.end() :] if match else text
+    sentences = tuple(
+        TextNode(
+            level=NodeLevel.SENTENCE,
+            label=f"s{i + 1}",
+            text=sentence,
+            hash=_node_hash(NodeLevel.SENTENCE, sentence),
+        )
+        for i, sentence in enumerate(_split_sentences(body))
+    )
+    if is_heading:
+        label, key = "Heading", "p:heading"
+    else:
+        label, key = f"¶{number or index + 1}", f"p:{number.lower()}" if number else ""
+    return TextNode(
+        level=NodeLevel.PARAGRAPH,
+        label=label,
+        text=text,
+        hash=_node_hash(NodeLevel.PARAGRAPH, text),
+        key=key,
+        children=sentences,
+    )
+
+
+def _build_article(text: str, label: str, key: str) -> TextNode:
+    paragraphs = [p.strip() for p in _PARAGRAPH_SPLIT_RE.split(text) if p.strip()]
+    has_heading = bool(paragraphs) and _HEADING_RE.match(paragraphs[0]) is not None
+    return TextNode(
+        level=NodeLevel.ARTICLE,
+        label=label,
+        text=text,
+        hash=_node_hash(NodeLevel.ARTICLE, text),
+        key=key,
+        children=tuple(
+            _build_paragraph(p, i - has_heading, is_heading=has_heading and i == 0)
+            for i, p in enumerate(paragraphs)
+        ),
+    )
+
+
+def _dedupe_key(key: str, seen: dict[str, int]) -> str:
+    seen[key] = seen.get(key, 0) + 1
+    return key if seen[key] == 1 else f"{key}#{seen[key]}"
+
+
+def parse_regulation_text(text: str, section_delimiter: str = "\n\n") -> TextNode:
+    """Parse a regulation body into a document tree.
+
+    Article headings provide stable keys. Texts without recognisable
+    headings are split on ``section_delimiter`` into unkeyed sections that
+    are aligned by content instead.
+    """
+    headings = list(_HEADING_RE.finditer(text))
+    articles: list[TextNode] = []
+
+    if headings:
+        seen: dict[str, int] = {}
+        preamble = text[: headings[0].start()].strip()
+        if preamble:
+            articles.append(_build_article(preamble, "Preamble", "preamble"))
+        for i, match in enumerate(headings):
+            end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+            body = text[match.start() : end].strip()
+            kind_key, kind_label = _HEADING_KINDS[match.group("kind").lower()]
+            number = match.group("num")
+            key = _dedupe_key(f"{kind_key}:{number.lower()}", seen)
+            articles.append(_build_article(body, f"{kind_label} {number}", key))
+    else:
+        sections = [s.strip() for s in text.split(section_delimiter) if s.strip()]
+        articles.extend(
+            _build_article(section, f"Section {i + 1}", "") for i, section in enumerate(sections)
+        )
+
+    return TextNode(
+        level=NodeLevel.DOCUMENT,
+        label="Document",
+        text="",
+        hash=hashlib.sha256(
+            "".join(a.key + a.hash for a in articles).encode(),
+        ).hexdigest(),
+        children=tuple(articles),
+    )
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text)
+
+
+def _weight(diff: NodeDiff) -> float:
+    size = max(len(diff.old_text), len(diff.new_text), 1)
+    if diff.change_type == ChangeType.MODIFICATION:
+        return size * (1.0 - diff.similarity)
+    if diff.change_type == ChangeType.RENUMBERING:
+        return 0.0
+    return float(size)
+
+
+class HierarchicalDiffEngine:
+    """Multi-level regulation differ with hash short-circuiting and memoization."""
+
+    def __init__(self, max_memo_entries: int = 8192, max_parsed_documents: int = 32) -> None:
+        self._memo: OrderedDict[tuple[str, str], NodeDiff] = OrderedDict()
+        self._parsed: OrderedDict[tuple[str, str], TextNode] = OrderedDict()
+        self._max_memo_entries = max_memo_entries
+        self._max_parsed_documents = max_parsed_documents
+        self.stats = DiffEngineStats()
+
+    def parse(self, text: str, section_delimiter: str = "\n\n") -> TextNode:
+        """Parse ``text``, reusing the tree of a previously parsed identical body."""
+        cache_key = (hashlib.sha256(text.encode()).hexdigest(), section_delimiter)
+        cached = self._parsed.get(cache_key)
+        if cached is not None:
+            self._parsed.move_to_end(cache_key)
+            self.stats.parse_cache_hits += 1
+            return cached
+        tree = parse_regulation_text(text, section_delimiter)
+        self._parsed[cache_key] = tree
+        if len(self._parsed) > self._max_parsed_documents:
+            self._parsed.popitem(last=False)
+        return tree
+
+    def diff_texts(
+        self, old_text: str, new_text: str, section_delimiter: str = "\n\n"
+    ) -> NodeDiff | None:
+        """Diff two regulation bodies; returns ``None`` when they are identical."""
+        return self.diff(
+            self.parse(old_text, section_delimiter),
+            self.parse(new_text, section_delimiter),
+        )
+
+    def diff(self, old: TextNode, new: TextNode) -> NodeDiff | None:
+        """Diff two aligned nodes, returning ``None`` for equal subtrees."""
+        self.stats.nodes_compared += 1
+        if old.hash == new.hash:
+            self.stats.hash_short_circuits += 1
+            return None
+
+        memo_key = (old.hash, new.hash)
+        cached = self._memo.get(memo_key)
+        if cached is not None:
+            self._memo.move_to_end(memo_key)
+            self.stats.memo_hits += 1
+            if cached.label != new.label or cached.old_label != old.label:
+                return replace(cached, label=new.label, old_label=old.label)
+            return cached
+
+        if old.children and new.children:
+            result = self._diff_children(old, new)
+        else:
+            result = self._diff_leaf(old, new)
+
+        self._memo[memo_key] = result
+        if len(self._memo) > self._max_memo_entries:
+            self._memo.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        """Drop all memoized diffs and parsed trees."""
+        self._memo.clear()
+        self._parsed.clear()
+
+    def _diff_leaf(self, old: TextNode, new: TextNode) -> NodeDiff:
+        self.stats.token_diffs += 1
+        old_tokens = _tokens(old.text)
+        new_tokens = _tokens(new.text)
+        matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+        ops = tuple(
+            TokenOp(op=tag, old=" ".join(old_tokens[i1:i2]), new=" ".join(new_tokens[j1:j2]))
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+            if tag != "equal"
+        )
+        return NodeDiff(
+            level=new.level,
+            label=new.label,
+            old_label=old.label,
+            change_type=ChangeType.MODIFICATION,
+            old_text=old.text,
+            new_text=new.text,
+            similarity=matcher.ratio(),
+            token_ops=ops,
+        )
+
+    def _diff_children(self, old: TextNode, new: TextNode) -> NodeDiff:
+        children: list[NodeDiff] = []
+        for old_child, new_child in self._align(old.children, new.children):
+            if old_child is None and new_child is not None:
+                children.append(self._one_sided(new_child, ChangeType.ADDITION))
+            elif new_child is None and old_child is not None:
+                children.append(self._one_sided(old_child, ChangeType.DELETION))
+            elif old_child is not None and new_child is not None:
+                child_diff = self.diff(old_child, new_child)
+                if child_diff is not None:
+                    children.append(child_diff)
+
+        if new.level == NodeLevel.DOCUMENT:
+            children = self._detect_renumbering(children, old, new)
+
+        total = max(len(old.text), len(new.text), 1)
+        if new.level == NodeLevel.DOCUMENT:
+            total = max(
+                sum(len(c.text) for c in old.children),
+                sum(len(c.text) for c in new.children),
+                1,
+            )
+        changed = sum(_weight(c) for c in children)
+        return NodeDiff(
+            level=new.level,
+            label=new.label,
+            old_label=old.label,
+            change_type=ChangeType.MODIFICATION,
+            old_text=old.text,
+            new_text=new.text,
+            similarity=max(0.0, 1.0 - changed / total),
+            children=tuple(children),
+        )
+
+    @staticmethod
+    def _one_sided(node: TextNode, change_type: ChangeType) -> NodeDiff:
+        is_addition = change_type == ChangeType.ADDITION
+        return NodeDiff(
+            level=node.level,
+            label=node.label,
+            old_label="" if is_addition else node.label,
+            change_type=change_type,
+            old_text="" if is_addition else node.text,
+            new_text=node.text if is_addition else "",
+        )
+
+    @staticmethod
+    def _align(
+        old: tuple[TextNode, ...], new: tuple[TextNode, ...]
+    ) -> Iterator[tuple[TextNode | None, TextNode | None]]:
+        """Pair children by stable key when every child has one, else by content."""
+        if all(c.key for c in old) and all(c.key for c in new):
+            old_by_key = {c.key: c for c in old}
+            new_keys = {c.key for c in new}
+            oi = 0
+            for new_child in new:
+                while oi < len(old) and old[oi].key not in new_keys:
+                    yield old[oi], None
+                    oi += 1
+                if oi < len(old) and old[oi].key == new_child.key:
+                    oi += 1
+                yield old_by_key.get(new_child.key), new_child
+            for old_child in old[oi:]:
+                if old_child.key not in new_keys:
+                    yield old_child, None
+            return
+
+        matcher = difflib.SequenceMatcher(
+            None, [c.hash for c in old], [c.hash for c in new], autojunk=False
+        )
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            paired = min(i2 - i1, j2 - j1)
+            for offset in range(paired):
+                yield old[i1 + offset], new[j1 + offset]
+            for idx in range(i1 + paired, i2):
+                yield old[idx], None
+            for idx in range(j1 + paired, j2):
+                yield None, new[idx]
+
+    @staticmethod
+    def _detect_renumbering(
+        children: list[NodeDiff], old: TextNode, new: TextNode
+    ) -> list[NodeDiff]:
+        """Collapse a deleted/added article pair with identical bodies into a renumbering."""
+        body_hash = {
+            (c.label, side): _node_hash(NodeLevel.ARTICLE, c.text.split("\n", 1)[-1])
+            for side, node in (("old", old), ("new", new))
+            for c in node.children
+        }
+        removed = {
+            body_hash[(c.label, "old")]: c
+            for c in children
+            if c.change_type == ChangeType.DELETION and (c.label, "old") in body_hash
+        }
+        if not removed:
+            return children
+
+        result: list[NodeDiff] = []
+        consumed: set[str] = set()
+        for child in children:
+            if child.change_type == ChangeType.ADDITION:
+                source = removed.get(body_hash.get((child.label, "new"), ""))
+                if source is not None and source.label not in consumed:
+                    consumed.add(source.label)
+                    result.append(
+                        replace(
+                            child,
+                            change_type=ChangeType.RENUMBERING,
+                            old_label=source.label,
+                            old_text=source.old_text,
+                            similarity=1.0,
+                        )
+                    )
+                    continue
+            result.append(child)
+        return [
+            c for c in result if not (c.change_type == ChangeType.DELETION and c.label in consumed)
+        ]
@@ -73,3 +73,24 @@ class ArticleChange:
     summary: str = ""
     impact_on_code: str = ""
     affected_controls: list[str] = field(default_factory=list)
+    details: list[SubsectionChange] = field(default_factory=list)
+
+
+@dataclass
+class TokenChange:
+    """A token-level edit within a changed sentence."""
+
+    op: str
+    old_tokens: str = ""
+    new_tokens: str = ""
+
+
+@dataclass
+class SubsectionChange:
+    """A paragraph- or sentence-level change inside an article."""
+
+    path: str
+    change_type: ChangeType
+    old_text: str = ""
+    new_text: str = ""
+    token_changes: list[TokenChange] = field(default_factory=list)
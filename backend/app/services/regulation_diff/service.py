@@ -2,18 +2,20 @@
 
 from __future__ import annotations
 
-import difflib
 import hashlib
 from datetime import UTC, datetime
 
 import structlog
 
+from app.services.regulation_diff.engine import HierarchicalDiffEngine, NodeDiff
 from app.services.regulation_diff.models import (
     ArticleChange,
     ChangeSeverity,
     ChangeType,
     RegulationDiff,
     RegulationVersion,
+    SubsectionChange,
+    TokenChange,
 )
 
 
@@ -175,10 +177,69 @@ def _classify_severity(ratio: float) -> ChangeSeverity:
     return ChangeSeverity.CLARIFICATION
 
 
+def _to_subsection_change(path: tuple[str, ...], leaf: NodeDiff) -> SubsectionChange:
+    return SubsectionChange(
+        path=" › ".join(path),
+        change_type=leaf.change_type,
+        old_text=leaf.old_text[:500],
+        new_text=leaf.new_text[:500],
+        token_changes=[
+            TokenChange(op=op.op, old_tokens=op.old, new_tokens=op.new) for op in leaf.token_ops
+        ],
+    )
+
+
+def _to_article_change(diff: NodeDiff) -> ArticleChange:
+    """Project an article-level tree diff onto the public ArticleChange model."""
+    if diff.change_type == ChangeType.DELETION:
+        return ArticleChange(
+            article=diff.old_label,
+            section="Removed",
+            change_type=ChangeType.DELETION,
+            severity=ChangeSeverity.MAJOR,
+            old_text=diff.old_text[:500],
+            summary=f"Section removed: {diff.old_text[:80]}…",
+        )
+    if diff.change_type == ChangeType.ADDITION:
+        return ArticleChange(
+            article=diff.label,
+            section="Added",
+            change_type=ChangeType.ADDITION,
+            severity=ChangeSeverity.MAJOR,
+            new_text=diff.new_text[:500],
+            summary=f"New section: {diff.new_text[:80]}…",
+        )
+    if diff.change_type == ChangeType.RENUMBERING:
+        return ArticleChange(
+            article=diff.label,
+            section="Renumbered",
+            change_type=ChangeType.RENUMBERING,
+            severity=ChangeSeverity.CLARIFICATION,
+            old_text=diff.old_text[:500],
+            new_text=diff.new_text[:500],
+            summary=f"Renumbered from {diff.old_label}",
+        )
+    return ArticleChange(
+        article=diff.old_label or diff.label,
+        section="Modified",
+        change_type=ChangeType.MODIFICATION,
+        severity=_classify_severity(diff.similarity),
+        old_text=diff.old_text[:500],
+        new_text=diff.new_text[:500],
+        summary=f"Modified ({int((1 - diff.similarity) * 100)}% changed)",
+        details=[_to_subsection_change(path, leaf) for path, leaf in diff.iter_leaves()],
+    )
+
+
+# Shared across service instances so memoized subtree diffs survive per-request services.
+_default_engine = HierarchicalDiffEngine()
+
+
 class RegulationDiffService:
     """Service for regulation changelog diff viewing and text comparison."""
 
-    def __init__(self) -> None:
+    def __init__(self, engine: HierarchicalDiffEngine | None = None) -> None:
+        self._engine = engine or _default_engine
         self._custom_versions: list[RegulationVersion] = []
         self._custom_diffs: list[RegulationDiff] = []
 
@@ -245,105 +306,30 @@ class RegulationDiffService:
     ) -> RegulationDiff:
         """Compute a structured diff between two regulation text bodies.
 
-        Splits both texts into sections (paragraphs by default) and uses
-        difflib.SequenceMatcher to identify additions, deletions, and
-        modifications with severity classification.
+        Both texts are parsed into article → paragraph → sentence trees and
+        diffed hierarchically (see ``HierarchicalDiffEngine``). Articles are
+        aligned by their heading identifiers; texts without headings fall back
+        to ``section_delimiter`` splitting with content-based alignment.
+        Modified articles carry paragraph/sentence details with token edits.
         """
-        old_sections = [s.strip() for s in old_text.split(section_delimiter) if s.strip()]
-        new_sections = [s.strip() for s in new_text.split(section_delimiter) if s.strip()]
-
-        matcher = difflib.SequenceMatcher(None, old_sections, new_sections)
+        tree_diff = self._engine.diff_texts(old_text, new_text, section_delimiter)
         changes: list[ArticleChange] = []
         articles_added = 0
         articles_removed = 0
         articles_modified = 0
         critical_count = 0
 
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-            if tag == "equal":
-                continue
-
-            if tag == "delete":
-                for idx in range(i1, i2):
-                    label = f"Section {idx + 1}"
-                    sev = ChangeSeverity.MAJOR
-                    changes.append(
-                        ArticleChange(
-                            article=label,
-                            section="Removed",
-                            change_type=ChangeType.DELETION,
-                            severity=sev,
-                            old_text=old_sections[idx][:500],
-                            summary=f"Section removed: {old_sections[idx][:80]}…",
-                        )
-                    )
-                    articles_removed += 1
-                    if sev == ChangeSeverity.CRITICAL:
-                        critical_count += 1
-
-            elif tag == "insert":
-                for idx in range(j1, j2):
-                    label = f"Section {idx + 1}"
-                    sev = ChangeSeverity.MAJOR
-                    changes.append(
-                        ArticleChange(
-                            article=label,
-                            section="Added",
-                            change_type=ChangeType.ADDITION,
-                            severity=sev,
-                            new_text=new_sections[idx][:500],
-                            summary=f"New section: {new_sections[idx][:80]}…",
-                        )
-                    )
-                    articles_added += 1
-
-            elif tag == "replace":
-                for old_idx, new_idx in zip(range(i1, i2), range(j1, j2), strict=False):
-                    ratio = difflib.SequenceMatcher(
-                        None, old_sections[old_idx], new_sections[new_idx]
-                    ).ratio()
-                    sev = _classify_severity(ratio)
-                    changes.append(
-                        ArticleChange(
-                            article=f"Section {old_idx + 1}",
-                            section="Modified",
-                            change_type=ChangeType.MODIFICATION,
-                            severity=sev,
-                            old_text=old_sections[old_idx][:500],
-                            new_text=new_sections[new_idx][:500],
-                            summary=f"Modified ({int((1 - ratio) * 100)}% changed)",
-                        )
-                    )
-                    articles_modified += 1
-                    if sev == ChangeSeverity.CRITICAL:
-                        critical_count += 1
-                # Handle unmatched leftovers
-                extra_old = list(range(i1 + (j2 - j1), i2))
-                extra_new = list(range(j1 + (i2 - i1), j2))
-                for idx in extra_old:
-                    changes.append(
-                        ArticleChange(
-                            article=f"Section {idx + 1}",
-                            section="Removed",
-                            change_type=ChangeType.DELETION,
-                            severity=ChangeSeverity.MAJOR,
-                            old_text=old_sections[idx][:500],
-                            summary=f"Section removed: {old_sections[idx][:80]}…",
-                        )
-                    )
-                    articles_removed += 1
-                for idx in extra_new:
-                    changes.append(
-                        ArticleChange(
-                            article=f"Section {idx + 1}",
-                            section="Added",
-                            change_type=ChangeType.ADDITION,
-                            severity=ChangeSeverity.MAJOR,
-                            new_text=new_sections[idx][:500],
-                            summary=f"New section: {new_sections[idx][:80]}…",
-                        )
-                    )
-                    articles_added += 1
+        for article_diff in tree_diff.children if tree_diff else ():
+            change = _to_article_change(article_diff)
+            changes.append(change)
+            if change.change_type == ChangeType.ADDITION:
+                articles_added += 1
+            elif change.change_type == ChangeType.DELETION:
+                articles_removed += 1
+            elif change.change_type == ChangeType.MODIFICATION:
+                articles_modified += 1
+                if change.severity == ChangeSeverity.CRITICAL:
+                    critical_count += 1
 
         diff_id = hashlib.sha256(f"{regulation}:{from_version}:{to_version}".encode()).hexdigest()[
             :12
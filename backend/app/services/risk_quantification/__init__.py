@@ -15,6 +15,16 @@ from app.services.risk_quantification.models import (
     WhatIfResult,
     WhatIfScenario,
 )
+from app.services.risk_quantification.monte_carlo import (
+    DistributionSummary,
+    ExposureSimulation,
+    MonteCarloEngine,
+    QuantileSketch,
+    RiskFactor,
+    correlation_factor,
+    regulation_fine_bounds,
+    risk_factor_for_regulation,
+)
 from app.services.risk_quantification.service import (
     RiskQuantificationService,
     get_risk_quantification_service,
@@ -23,11 +33,16 @@ from app.services.risk_quantification.service import (
 
 __all__ = [
     "REGULATION_FINES",
+    "DistributionSummary",
     "ExecutiveRiskReport",
+    "ExposureSimulation",
+    "MonteCarloEngine",
     "OrganizationRiskDashboard",
+    "QuantileSketch",
     "RegulationFineStructure",
     "RepositoryRiskProfile",
     "RiskCategory",
+    "RiskFactor",
     "RiskQuantificationService",
     "RiskReport",
     "RiskSeverity",
@@ -36,5 +51,8 @@ __all__ = [
     "ViolationRiskAssessment",
     "WhatIfResult",
     "WhatIfScenario",
+    "correlation_factor",
     "get_risk_quantification_service",
+    "regulation_fine_bounds",
+    "risk_factor_for_regulation",
 ]
@@ -0,0 +1,437 @@
+"""Vectorized Monte Carlo engine for compliance loss exposure.
+
+Each risk factor is a compound loss: an enforcement event occurs with the
+factor's likelihood and, when it does, the fine is drawn from a triangular
+distribution bounded by the regulation's fine structure in
+``REGULATION_FINES``. Enforcement events can be correlated through a Gaussian
+copula (one breach typically triggers several regulators at once).
+
+Iterations run in fixed-size chunks so memory stays bounded for millions of
+draws. Mean/variance are merged across chunks with Chan's parallel update and
+quantiles come from a log-bucketed sketch with bounded relative error, from
+which VaR and CVaR are read without ever holding the full sample.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from app.services.risk_quantification.models import REGULATION_FINES
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+
+DEFAULT_CHUNK_SIZE = 262_144
+_DEFAULT_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+@dataclass(frozen=True)
+class RiskFactor:
+    """A single loss source: Bernoulli enforcement times a triangular fine."""
+
+    name: str
+    likelihood: float
+    min_loss: float
+    max_loss: float
+    mode_loss: float | None = None
+
+    @property
+    def mode(self) -> float:
+        if self.mode_loss is not None:
+            return min(max(self.mode_loss, self.min_loss), self.max_loss)
+        # Fines cluster well below statutory maxima.
+        return self.min_loss + (self.max_loss - self.min_loss) * 0.1
+
+
+def regulation_fine_bounds(
+    regulation: str,
+    annual_revenue: float,
+    affected_records: int | None = None,
+) -> tuple[float, float]:
+    """Derive ``(min, max)`` fine bounds for a regulation from ``REGULATION_FINES``."""
+    fines = REGULATION_FINES.get(regulation)
+    if not fines:
+        return 1_000.0, 100_000.0
+
+    if "max_percentage" in fines:
+        return 0.0, max(float(fines["max_fixed"]), annual_revenue * fines["max_percentage"] / 100)
+    if "per_intentional" in fines:
+        violations = max(affected_records or 1, 1)
+        return float(fines["per_violation"]), float(fines["per_intentional"]) * violations
+    if "annual_max" in fines:
+        per_record = float(fines["max_violation"]) * max(affected_records or 1, 1)
+        return float(fines["min_violation"]), min(float(fines["annual_max"]), per_record)
+    if "monthly_max" in fines:
+        return float(fines["monthly_min"]), float(fines["monthly_max"])
+    return 0.0, float(fines.get("max_fine", 100_000.0))
+
+
+def risk_factor_for_regulation(
+    regulation: str,
+    likelihood: float,
+    annual_revenue: float,
+    affected_records: int | None = None,
+) -> RiskFactor:
+    """Build a ``RiskFactor`` for a regulation's statutory fine structure."""
+    min_loss, max_loss = regulation_fine_bounds(regulation, annual_revenue, affected_records)
+    return RiskFactor(
+        name=regulation,
+        likelihood=likelihood,
+        min_loss=min_loss,
+        max_loss=max_loss,
+    )
+
+
+@dataclass
+class _RunningMoments:
+    """Chunk-mergeable count/mean/M2 (Chan et al. parallel variance)."""
+
+    count: int = 0
+    mean: np.ndarray | float = 0.0
+    m2: np.ndarray | float = 0.0
+
+    def update(self, values: np.ndarray) -> None:
+        n = values.shape[0]
+        if n == 0:
+            return
+        chunk_mean = values.mean(axis=0)
+        chunk_m2 = ((values - chunk_mean) ** 2).sum(axis=0)
+        if self.count == 0:
+            self.count, self.mean, self.m2 = n, chunk_mean, chunk_m2
+            return
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean = self.mean + delta * (n / total)
+        self.m2 = self.m2 + chunk_m2 + delta**2 * (self.count * n / total)
+        self.count = total
+
+    @property
+    def variance(self) -> np.ndarray | float:
+        return self.m2 / self.count if self.count else 0.0
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch with bounded relative error.
+
+    Positive values land in bucket ``ceil(log_gamma(x))`` where
+    ``gamma = (1 + a) / (1 - a)``, so any reported quantile is within a
+    relative error ``a`` of the true one. Per-bucket value sums are kept as
+    well so tail expectations (CVaR) are exact up to the boundary bucket.
+    Values at or below ``floor`` share a single bucket.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.005, floor: float = 1.0) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.floor = floor
+        self._offset = math.ceil(math.log(floor) / self._log_gamma)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.sums = np.zeros(0, dtype=np.float64)
+        self.count = 0
+
+    def add(self, values: np.ndarray) -> None:
+        if values.size == 0:
+            return
+        clipped = np.maximum(values, self.floor)
+        keys = np.ceil(np.log(clipped) / self._log_gamma).astype(np.int64) - self._offset
+        size = int(keys.max()) + 1
+        if size > self.counts.size:
+            self.counts = np.pad(self.counts, (0, size - self.counts.size))
+            self.sums = np.pad(self.sums, (0, size - self.sums.size))
+        self.counts[:size] += np.bincount(keys, minlength=size)
+        self.sums[:size] += np.bincount(keys, weights=values, minlength=size)
+        self.count += int(values.size)
+
+    def _bucket_value(self, index: int) -> float:
+        if index == 0:
+            return self.sums[0] / self.counts[0] if self.counts[0] else 0.0
+        key = index + self._offset
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def _rank_index(self, q: float) -> int:
+        rank = q * (self.count - 1)
+        cumulative = np.cumsum(self.counts)
+        return int(np.searchsorted(cumulative, rank, side="right"))
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        return float(self._bucket_value(self._rank_index(q)))
+
+    def tail_mean(self, q: float) -> float:
+        """Mean of the values at or above the ``q`` quantile (CVaR / expected shortfall)."""
+        if self.count == 0:
+            return 0.0
+        index = self._rank_index(q)
+        tail_count = int(self.counts[index:].sum())
+        if tail_count == 0:
+            return self.quantile(q)
+        return float(self.sums[index:].sum() / tail_count)
+
+    def histogram(self, buckets: int = 20) -> list[dict[str, Any]]:
+        """Collapse the sketch into ``buckets`` equal-width display buckets."""
+        if self.count == 0:
+            return []
+        nonzero = np.nonzero(self.counts)[0]
+        values = np.array([self._bucket_value(int(i)) for i in nonzero])
+        low, high = float(values.min()), float(values.max())
+        width = (high - low) / buckets or 1.0
+        slots = np.minimum(((values - low) / width).astype(np.int64), buckets - 1)
+        counts = np.bincount(slots, weights=self.counts[nonzero], minlength=buckets)
+        return [
+            {
+                "bucket": f"{low + i * width:.2f}-{low + (i + 1) * width:.2f}",
+                "count": int(counts[i]),
+            }
+            for i in range(buckets)
+        ]
+
+
+@dataclass
+class DistributionSummary:
+    """Streaming summary of a simulated distribution."""
+
+    iterations: int
+    mean: float
+    std_dev: float
+    percentiles: dict[float, float]
+    var: float
+    cvar: float
+    confidence: float
+    distribution: list[dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "iterations": self.iterations,
+            "mean": self.mean,
+            "std_dev": self.std_dev,
+            "percentiles": {f"p{round(q * 100):g}": v for q, v in self.percentiles.items()},
+            "var": self.var,
+            "cvar": self.cvar,
+            "confidence": self.confidence,
+            "distribution": self.distribution,
+        }
+
+
+@dataclass
+class ExposureSimulation:
+    """Result of a portfolio exposure simulation."""
+
+    total: DistributionSummary
+    seed: int | None
+    chunk_size: int
+    elapsed_ms: float
+    factor_means: dict[str, float] = field(default_factory=dict)
+    factor_trigger_rates: dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **self.total.to_dict(),
+            "seed": self.seed,
+            "chunk_size": self.chunk_size,
+            "elapsed_ms": self.elapsed_ms,
+            "factor_means": self.factor_means,
+            "factor_trigger_rates": self.factor_trigger_rates,
+        }
+
+
+def correlation_factor(
+    size: int, correlation: float | Sequence[Sequence[float]]
+) -> np.ndarray | None:
+    """Cholesky factor of the correlation between ``size`` factors.
+
+    ``correlation`` is either one coefficient shared by every pair or a full
+    matrix. Returns ``None`` when the factors are independent. Raises
+    ``ValueError`` unless it describes a valid correlation matrix: the right
+    shape, symmetric, unit diagonal, entries in [-1, 1] and positive definite.
+    """
+    if isinstance(correlation, int | float):
+        matrix = np.full((size, size), float(correlation))
+        np.fill_diagonal(matrix, 1.0)
+    else:
+        matrix = np.asarray(correlation, dtype=np.float64)
+        if matrix.shape != (size, size):
+            msg = f"correlation matrix must be {size}x{size}, got {matrix.shape}"
+            raise ValueError(msg)
+    if not np.all(np.isfinite(matrix)) or np.any(np.abs(matrix) > 1.0):
+        msg = "correlation coefficients must be finite and between -1 and 1"
+        raise ValueError(msg)
+    if not np.allclose(np.diag(matrix), 1.0) or not np.allclose(matrix, matrix.T):
+        msg = "correlation matrix must be symmetric with a unit diagonal"
+        raise ValueError(msg)
+    if np.allclose(matrix, np.eye(size)):
+        return None
+    try:
+        return np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError as e:
+        msg = "correlation matrix must be positive definite"
+        raise ValueError(msg) from e
+
+
+class MonteCarloEngine:
+    """Chunked, seeded, NumPy-vectorized Monte Carlo simulator.
+
+    Results are reproducible for a given ``(seed, iterations, chunk_size)``:
+    each chunk draws from its own child of ``SeedSequence(seed)`` so chunks
+    are independent streams.
+    """
+
+    def __init__(
+        self,
+        seed: int | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        relative_accuracy: float = 0.005,
+    ) -> None:
+        if chunk_size <= 0:
+            msg = "chunk_size must be positive"
+            raise ValueError(msg)
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.relative_accuracy = relative_accuracy
+
+    def _chunks(self, iterations: int) -> list[tuple[np.random.Generator, int]]:
+        if iterations <= 0:
+            msg = "iterations must be positive"
+            raise ValueError(msg)
+        n_chunks = max(1, math.ceil(iterations / self.chunk_size))
+        children = np.random.SeedSequence(self.seed).spawn(n_chunks)
+        last = iterations - self.chunk_size * (n_chunks - 1)
+        sizes = [self.chunk_size] * (n_chunks - 1) + [last]
+        return [
+            (np.random.default_rng(child), size)
+            for child, size in zip(children, sizes, strict=True)
+        ]
+
+    def _summarize(
+        self,
+        moments: _RunningMoments,
+        sketch: QuantileSketch,
+        confidence: float,
+        quantiles: Sequence[float],
+    ) -> DistributionSummary:
+        return DistributionSummary(
+            iterations=moments.count,
+            mean=float(moments.mean),
+            std_dev=float(np.sqrt(moments.variance)),
+            percentiles={q: sketch.quantile(q) for q in quantiles},
+            var=sketch.quantile(confidence),
+            cvar=sketch.tail_mean(confidence),
+            confidence=confidence,
+            distribution=sketch.histogram(),
+        )
+
+    def simulate(
+        self,
+        sampler: Callable[[np.random.Generator, int], np.ndarray],
+        iterations: int,
+        confidence: float = 0.95,
+        quantiles: Sequence[float] = _DEFAULT_QUANTILES,
+    ) -> DistributionSummary:
+        """Summarize an arbitrary vectorized ``sampler(rng, n) -> ndarray[n]``."""
+        moments = _RunningMoments()
+        sketch = QuantileSketch(self.relative_accuracy)
+        for rng, size in self._chunks(iterations):
+            values = sampler(rng, size)
+            moments.update(values)
+            sketch.add(values)
+        return self._summarize(moments, sketch, confidence, quantiles)
+
+    def simulate_triangular(
+        self,
+        low: float,
+        mode: float,
+        high: float,
+        iterations: int,
+        confidence: float = 0.95,
+    ) -> DistributionSummary:
+        """Summarize a single triangular distribution."""
+        if high <= low:
+            return self.simulate(lambda _rng, n: np.full(n, float(low)), iterations, confidence)
+        mode = min(max(mode, low), high)
+        return self.simulate(
+            lambda rng, n: rng.triangular(low, mode, high, n), iterations, confidence
+        )
+
+    def simulate_exposure(
+        self,
+        factors: Sequence[RiskFactor],
+        iterations: int = 100_000,
+        correlation: float | Sequence[Sequence[float]] = 0.0,
+        confidence: float = 0.95,
+        quantiles: Sequence[float] = _DEFAULT_QUANTILES,
+    ) -> ExposureSimulation:
+        """Simulate aggregate loss across ``factors`` with correlated enforcement."""
+        started = time.perf_counter()
+        moments = _RunningMoments()
+        factor_sums = np.zeros(len(factors), dtype=np.float64)
+        sketch = QuantileSketch(self.relative_accuracy)
+        triggered = np.zeros(len(factors), dtype=np.int64)
+
+        if factors:
+            lows = np.array([f.min_loss for f in factors], dtype=np.float64)
+            highs = np.array([f.max_loss for f in factors], dtype=np.float64)
+            modes = np.array([f.mode for f in factors], dtype=np.float64)
+            # Enforcement happens when the latent normal falls below Φ⁻¹(likelihood).
+            thresholds = np.array(
+                [NormalDist().inv_cdf(min(max(f.likelihood, 1e-12), 1 - 1e-12)) for f in factors]
+            )
+            cholesky = correlation_factor(len(factors), correlation)
+            # Inverse-CDF of the triangular distribution, vectorized across factors.
+            spread = highs - lows
+            split = np.divide(modes - lows, spread, out=np.zeros_like(spread), where=spread > 0)
+
+            for rng, size in self._chunks(iterations):
+                latent = rng.standard_normal((size, len(factors)))
+                if cholesky is not None:
+                    latent = latent @ cholesky.T
+                hits = latent < thresholds
+                # Only triggered cells need a severity draw.
+                rows, cols = np.nonzero(hits)
+                u = rng.random(rows.size)
+                low, high, mode = lows[cols], highs[cols], modes[cols]
+                width = high - low
+                severity = np.where(
+                    u < split[cols],
+                    low + np.sqrt(u * width * (mode - low)),
+                    high - np.sqrt((1 - u) * width * (high - mode)),
+                )
+                totals = np.bincount(rows, weights=severity, minlength=size)
+
+                moments.update(totals)
+                sketch.add(totals)
+                factor_sums += np.bincount(cols, weights=severity, minlength=len(factors))
+                triggered += np.bincount(cols, minlength=len(factors))
+        else:
+            for _rng, size in self._chunks(iterations):
+                zeros = np.zeros(size)
+                moments.update(zeros)
+                sketch.add(zeros)
+
+        factor_means: dict[str, float] = {}
+        trigger_rates: dict[str, float] = {}
+        if factors:
+            for factor, mean, hits_total in zip(
+                factors, factor_sums / iterations, triggered, strict=True
+            ):
+                factor_means[factor.name] = factor_means.get(factor.name, 0.0) + float(mean)
+                trigger_rates[factor.name] = max(
+                    trigger_rates.get(factor.name, 0.0), float(hits_total) / iterations
+                )
+
+        return ExposureSimulation(
+            total=self._summarize(moments, sketch, confidence, quantiles),
+            seed=self.seed,
+            chunk_size=self.chunk_size,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+            factor_means=factor_means,
+            factor_trigger_rates=trigger_rates,
+        )
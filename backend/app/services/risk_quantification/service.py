@@ -1,6 +1,8 @@
 """Compliance Risk Quantification (CRQ) Service."""
 
+import asyncio
 import math
+from collections.abc import Sequence
 from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID
@@ -8,6 +10,7 @@ from uuid import UUID
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.exceptions import ValidationError
 from app.services.risk_quantification.models import (
     REGULATION_FINES,
     OrganizationRiskDashboard,
@@ -707,6 +710,12 @@ from app.services.risk_quantification.models import (  # noqa: E402
     ViolationRiskAssessment,
     WhatIfResult,
 )
+from app.services.risk_quantification.monte_carlo import (  # noqa: E402
+    ExposureSimulation,
+    MonteCarloEngine,
+    RiskFactor,
+    correlation_factor,
+)
 
 
 class RiskQuantificationService:
@@ -764,6 +773,56 @@ class RiskQuantificationService:
         self._assessments.append(assessment)
         return assessment
 
+    async def simulate_exposure(
+        self,
+        iterations: int = 1_000_000,
+        correlation: float | Sequence[Sequence[float]] = 0.0,
+        confidence: float = 0.95,
+        seed: int | None = None,
+    ) -> ExposureSimulation:
+        """Simulate the aggregate exposure distribution of all assessed violations.
+
+        Each assessment contributes a loss that occurs with its ``likelihood``
+        and is triangular between its min/max exposure. Returns percentiles,
+        VaR and CVaR at ``confidence`` instead of a single expected value.
+
+        ``correlation`` is one coefficient for every pair of assessments or a
+        matrix in assessment order. It is checked before the simulation
+        starts; an invalid one raises ``ValidationError``.
+        """
+        try:
+            correlation_factor(len(self._assessments), correlation)
+        except ValueError as e:
+            raise ValidationError(str(e), {"field": "correlation"}) from e
+
+        factors = [
+            RiskFactor(
+                name=a.regulation or a.rule_id,
+                likelihood=a.likelihood,
+                min_loss=a.min_exposure,
+                max_loss=a.max_exposure,
+            )
+            for a in self._assessments
+        ]
+        engine = MonteCarloEngine(seed=seed)
+        loop = asyncio.get_running_loop()
+        simulation = await loop.run_in_executor(
+            None,
+            lambda: engine.simulate_exposure(
+                factors,
+                iterations=iterations,
+                correlation=correlation,
+                confidence=confidence,
+            ),
+        )
+        logger.info(
+            "Exposure simulated",
+            factors=len(factors),
+            iterations=iterations,
+            elapsed_ms=simulation.elapsed_ms,
+        )
+        return simulation
+
     async def generate_repository_profile(
         self,
         repository_id=None,
@@ -4,6 +4,7 @@ from app.services.sbom.analyzer import (
     SBOMComplianceAnalyzer,
     get_sbom_analyzer,
 )
+from app.services.sbom.exporter import iter_sbom, stream_sbom
 from app.services.sbom.generator import (
     SBOMGenerator,
     get_sbom_generator,
@@ -11,18 +12,27 @@ from app.services.sbom.generator import (
 from app.services.sbom.models import (
     ComplianceImpact,
     LicenseRisk,
+    SBOMBatchItem,
     SBOMComponent,
     SBOMDocument,
     SBOMFormat,
     VulnerabilityComplianceMapping,
 )
+from app.services.sbom.parsers import parse_dependency_file
+from app.services.sbom.vulnerability_index import (
+    Advisory,
+    VulnerabilityIndex,
+    parse_version,
+)
 
 
 __all__ = [
+    "Advisory",
     "ComplianceImpact",
     "ComponentComplianceIssue",
     "ComponentVulnerability",
     "LicenseRisk",
+    "SBOMBatchItem",
     "SBOMComplianceAnalyzer",
     "SBOMComplianceReport",
     "SBOMComponent",
@@ -30,7 +40,12 @@ __all__ = [
     "SBOMFormat",
     "SBOMGenerator",
     "VulnerabilityComplianceMapping",
+    "VulnerabilityIndex",
     "VulnerabilitySeverity",
     "get_sbom_analyzer",
     "get_sbom_generator",
+    "iter_sbom",
+    "parse_dependency_file",
+    "parse_version",
+    "stream_sbom",
 ]
@@ -0,0 +1,293 @@
+"""Streaming SPDX/CycloneDX serialization for SBOM documents.
+
+Documents are emitted as a sequence of text chunks built straight from the
+component attributes, so exporting a monorepo SBOM never materializes the
+whole output (or a per-component ``model_dump``) in memory at once.
+"""
+
+import asyncio
+import json
+import zlib
+from collections.abc import AsyncIterator, Iterable, Iterator
+from typing import TYPE_CHECKING, Any
+from xml.sax.saxutils import escape, quoteattr
+
+
+if TYPE_CHECKING:
+    from app.services.sbom.models import (
+        ComponentVulnerability,
+        SBOMComponent,
+        SBOMDocument,
+        SBOMFormat,
+    )
+
+
+# Components serialized per yielded chunk
+DEFAULT_CHUNK_SIZE = 500
+
+_encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+
+# ─── Per-item serializers (shared with SBOMDocument.to_spdx / to_cyclonedx) ───
+
+
+def spdx_header(sbom: "SBOMDocument") -> dict[str, Any]:
+    return {
+        "spdxVersion": "SPDX-2.3",
+        "dataLicense": "CC0-1.0",
+        "SPDXID": f"SPDXRef-DOCUMENT-{sbom.id}",
+        "name": sbom.name,
+        "documentNamespace": f"https://complianceagent.ai/sbom/{sbom.id}",
+        "creationInfo": {
+            "created": sbom.created_at.isoformat(),
+            "creators": [
+                f"Tool: {sbom.tool_name}-{sbom.tool_version}",
+                f"Organization: {sbom.organization_id}"
+                if sbom.organization_id
+                else "Organization: Unknown",
+            ],
+        },
+    }
+
+
+def spdx_package(c: "SBOMComponent") -> dict[str, Any]:
+    return {
+        "SPDXID": f"SPDXRef-Package-{c.id}",
+        "name": c.name,
+        "versionInfo": c.version,
+        "downloadLocation": c.download_url or "NOASSERTION",
+        "licenseConcluded": c.license or "NOASSERTION",
+        "supplier": f"Organization: {c.supplier}" if c.supplier else "NOASSERTION",
+        "checksums": [{"algorithm": "SHA256", "checksumValue": c.hash_sha256}]
+        if c.hash_sha256
+        else [],
+    }
+
+
+def spdx_relationship(sbom: "SBOMDocument", c: "SBOMComponent") -> dict[str, Any]:
+    return {
+        "spdxElementId": f"SPDXRef-DOCUMENT-{sbom.id}",
+        "relatedSpdxElement": f"SPDXRef-Package-{c.id}",
+        "relationshipType": "DESCRIBES",
+    }
+
+
+def cyclonedx_header(sbom: "SBOMDocument") -> dict[str, Any]:
+    return {
+        "bomFormat": "CycloneDX",
+        "specVersion": "1.5",
+        "serialNumber": f"urn:uuid:{sbom.id}",
+        "version": 1,
+        "metadata": {
+            "timestamp": sbom.created_at.isoformat(),
+            "tools": [
+                {
+                    "vendor": "ComplianceAgent",
+                    "name": sbom.tool_name,
+                    "version": sbom.tool_version,
+                }
+            ],
+            "component": {
+                "type": "application",
+                "name": sbom.name,
+                "version": sbom.version,
+            },
+        },
+    }
+
+
+def cyclonedx_component(c: "SBOMComponent") -> dict[str, Any]:
+    return {
+        "type": c.type,
+        "bom-ref": str(c.id),
+        "name": c.name,
+        "version": c.version,
+        "purl": c.purl,
+        "licenses": [{"license": {"id": c.license}}] if c.license else [],
+        "hashes": [{"alg": "SHA-256", "content": c.hash_sha256}] if c.hash_sha256 else [],
+        "supplier": {"name": c.supplier} if c.supplier else None,
+    }
+
+
+def cyclonedx_vulnerability(v: "ComponentVulnerability") -> dict[str, Any]:
+    return {
+        "id": v.id,
+        "source": {"name": "NVD"},
+        "ratings": [
+            {
+                "severity": v.severity.value,
+                "score": v.cvss_score,
+                "vector": v.cvss_vector,
+            }
+        ]
+        if v.cvss_score
+        else [],
+        "description": v.description,
+        "recommendation": f"Upgrade to {v.fixed_in_version}"
+        if v.fixed_in_version
+        else "Review and mitigate",
+    }
+
+
+# ─── Streaming encoders ───────────────────────────────────────────────────────
+
+
+def _json_document(
+    header: dict[str, Any],
+    arrays: list[tuple[str, Iterable[dict[str, Any]]]],
+    chunk_size: int,
+) -> Iterator[str]:
+    """Yield ``header`` followed by each named array, ``chunk_size`` items at a time."""
+    head = _encode(header)
+    yield head[:-1] if arrays else head
+    for index, (key, items) in enumerate(arrays):
+        yield f"{',' if header or index else ''}{_encode(key)}:["
+        batch: list[str] = []
+        first = True
+        for item in items:
+            batch.append(_encode(item))
+            if len(batch) >= chunk_size:
+                yield ("" if first else ",") + ",".join(batch)
+                batch, first = [], False
+        if batch:
+            yield ("" if first else ",") + ",".join(batch)
+        yield "]"
+    if arrays:
+        yield "}"
+
+
+def iter_spdx_json(sbom: "SBOMDocument", chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Stream an SBOM as SPDX 2.3 JSON."""
+    return _json_document(
+        spdx_header(sbom),
+        [
+            ("packages", (spdx_package(c) for c in sbom.components)),
+            ("relationships", (spdx_relationship(sbom, c) for c in sbom.components)),
+        ],
+        chunk_size,
+    )
+
+
+def iter_cyclonedx_json(
+    sbom: "SBOMDocument", chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """Stream an SBOM as CycloneDX 1.5 JSON."""
+    return _json_document(
+        cyclonedx_header(sbom),
+        [
+            ("components", (cyclonedx_component(c) for c in sbom.components)),
+            (
+                "vulnerabilities",
+                (cyclonedx_vulnerability(v) for c in sbom.components for v in c.vulnerabilities),
+            ),
+        ],
+        chunk_size,
+    )
+
+
+def _xml_component(c: "SBOMComponent") -> str:
+    parts = [
+        f"<component type={quoteattr(c.type)} bom-ref={quoteattr(str(c.id))}>",
+        f"<name>{escape(c.name)}</name>",
+        f"<version>{escape(c.version)}</version>",
+    ]
+    if c.supplier:
+        parts.append(f"<supplier><name>{escape(c.supplier)}</name></supplier>")
+    if c.hash_sha256:
+        parts.append(f'<hashes><hash alg="SHA-256">{escape(c.hash_sha256)}</hash></hashes>')
+    if c.license:
+        parts.append(f"<licenses><license><id>{escape(c.license)}</id></license></licenses>")
+    if c.purl:
+        parts.append(f"<purl>{escape(c.purl)}</purl>")
+    parts.append("</component>")
+    return "".join(parts)
+
+
+def _xml_vulnerability(c: "SBOMComponent", v: "ComponentVulnerability") -> str:
+    parts = [
+        f"<vulnerability><id>{escape(v.id)}</id><source><name>NVD</name></source>",
+    ]
+    if v.cvss_score:
+        parts.append(
+            f"<ratings><rating><score>{v.cvss_score}</score>"
+            f"<severity>{escape(v.severity.value)}</severity>"
+            + (f"<vector>{escape(v.cvss_vector)}</vector>" if v.cvss_vector else "")
+            + "</rating></ratings>"
+        )
+    recommendation = (
+        f"Upgrade to {v.fixed_in_version}" if v.fixed_in_version else "Review and mitigate"
+    )
+    parts.append(
+        f"<description>{escape(v.description)}</description>"
+        f"<recommendation>{escape(recommendation)}</recommendation>"
+        f"<affects><target><ref>{escape(str(c.id))}</ref></target></affects>"
+        "</vulnerability>"
+    )
+    return "".join(parts)
+
+
+def iter_cyclonedx_xml(sbom: "SBOMDocument", chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Stream an SBOM as CycloneDX 1.5 XML."""
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<bom xmlns="http://cyclonedx.org/schema/bom/1.5" '
+        f'serialNumber="urn:uuid:{sbom.id}" version="1">'
+        f"<metadata><timestamp>{sbom.created_at.isoformat()}</timestamp>"
+        "<tools><tool><vendor>ComplianceAgent</vendor>"
+        f"<name>{escape(sbom.tool_name)}</name><version>{escape(sbom.tool_version)}</version>"
+        "</tool></tools>"
+        f'<component type="application"><name>{escape(sbom.name)}</name>'
+        f"<version>{escape(sbom.version)}</version></component></metadata>"
+        "<components>"
+    )
+    for start in range(0, len(sbom.components), chunk_size):
+        yield "".join(_xml_component(c) for c in sbom.components[start : start + chunk_size])
+    yield "</components><vulnerabilities>"
+    batch: list[str] = []
+    for c in sbom.components:
+        for v in c.vulnerabilities:
+            batch.append(_xml_vulnerability(c, v))
+            if len(batch) >= chunk_size:
+                yield "".join(batch)
+                batch = []
+    if batch:
+        yield "".join(batch)
+    yield "</vulnerabilities></bom>"
+
+
+def iter_sbom(
+    sbom: "SBOMDocument", format: "SBOMFormat", chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """Stream an SBOM in ``format`` (SPDX XML is served as SPDX JSON)."""
+    if format.value.startswith("spdx"):
+        return iter_spdx_json(sbom, chunk_size)
+    if format.value == "cyclonedx-xml":
+        return iter_cyclonedx_xml(sbom, chunk_size)
+    return iter_cyclonedx_json(sbom, chunk_size)
+
+
+def media_type_for(format: "SBOMFormat") -> str:
+    return "application/xml" if format.value == "cyclonedx-xml" else "application/json"
+
+
+async def stream_sbom(
+    sbom: "SBOMDocument",
+    format: "SBOMFormat",
+    gzip: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """Yield encoded (optionally gzip-compressed) export chunks.
+
+    Control returns to the event loop between chunks so large exports do
+    not stall other requests.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    for text in iter_sbom(sbom, format, chunk_size):
+        data = text.encode()
+        if compressor is not None:
+            data = compressor.compress(data)
+        if data:
+            yield data
+        await asyncio.sleep(0)
+    if compressor is not None:
+        yield compressor.flush()
@@ -1,27 +1,44 @@
 """SBOM Generator - Creates Software Bill of Materials from dependency files."""
 
+import asyncio
 import hashlib
-import json
-import re
 import time
-from typing import Any
-from uuid import UUID
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any
+from uuid import UUID, uuid4
 
 import structlog
 
+from app.core.process_pool import get_process_pool, process_pool_size
+from app.services.ingestion import Checkout, FileFilter
+from app.services.sbom.exporter import stream_sbom
 from app.services.sbom.models import (
     LICENSE_COMPLIANCE_INFO,
     ComponentVulnerability,
     LicenseRisk,
+    SBOMBatchItem,
     SBOMComponent,
     SBOMDocument,
     SBOMFormat,
     VulnerabilitySeverity,
 )
+from app.services.sbom.parsers import parse_dependency_file, parser_kind
+from app.services.sbom.vulnerability_index import (
+    VulnerabilityIndex,
+    ecosystem_from_purl,
+    parse_version,
+)
+
+
+if TYPE_CHECKING:
+    from app.services.github.client import GitHubClient
 
 
 logger = structlog.get_logger()
 
+# Files smaller than this are parsed inline; shipping them to a worker costs more
+_INLINE_PARSE_BYTES = 256 * 1024
 
 # Known package licenses (sample data - in production, this would query registries)
 KNOWN_LICENSES = {
@@ -51,11 +68,15 @@ KNOWN_LICENSES = {
     "github.com/gorilla/mux": "BSD-3-Clause",
 }
 
-# Known vulnerabilities (sample data - in production, this would query NVD/OSV)
+# Known vulnerabilities (sample data - in production, this would query NVD/OSV).
+# Affected ranges are half-open ``[introduced, fixed)``; ``fixed_in`` alone means
+# every version before the fix.
 KNOWN_VULNERABILITIES = {
-    "log4j-core": [
+    "org.apache.logging.log4j:log4j-core": [
         {
             "id": "CVE-2021-44228",
+            "ecosystem": "maven",
+            "affected": [{"introduced": "2.0-beta9", "fixed": "2.17.0"}],
             "severity": "critical",
             "cvss": 10.0,
             "description": "Log4Shell - Remote code execution via JNDI lookup",
@@ -65,6 +86,7 @@ KNOWN_VULNERABILITIES = {
     "lodash": [
         {
             "id": "CVE-2021-23337",
+            "ecosystem": "npm",
             "severity": "high",
             "cvss": 7.2,
             "description": "Command injection via template function",
@@ -74,6 +96,7 @@ KNOWN_VULNERABILITIES = {
     "cryptography": [
         {
             "id": "CVE-2023-49083",
+            "ecosystem": "pypi",
             "severity": "high",
             "cvss": 7.5,
             "description": "NULL pointer dereference in PKCS7 parsing",
@@ -86,8 +109,20 @@ KNOWN_VULNERABILITIES = {
 class SBOMGenerator:
     """Generates SBOM documents from dependency files."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        vulnerability_index: VulnerabilityIndex | None = None,
+        parse_workers: int | None = None,
+        parse_cache_size: int = 1024,
+    ):
         self._sboms: dict[UUID, SBOMDocument] = {}
+        self._vulnerability_index = vulnerability_index or VulnerabilityIndex.from_feed(
+            KNOWN_VULNERABILITIES
+        )
+        self._parse_workers = parse_workers or process_pool_size()
+        self._parse_cache: OrderedDict[str, list[SBOMComponent]] = OrderedDict()
+        self._parse_cache_size = parse_cache_size
+        self._parse_inflight: dict[str, asyncio.Future[list[SBOMComponent]]] = {}
 
     async def generate_sbom(
         self,
@@ -126,20 +161,25 @@ class SBOMGenerator:
             source_files=list(dependency_files.keys()),
         )
 
-        # Parse all dependency files
-        for filename, content in dependency_files.items():
-            components = await self._parse_dependency_file(filename, content)
+        # Parse all dependency files concurrently (cached by content hash)
+        parsed = await asyncio.gather(
+            *(
+                self._parse_dependency_file(filename, content)
+                for filename, content in dependency_files.items()
+            )
+        )
 
-            for component in components:
-                # Enrich with license info
-                if include_licenses:
-                    self._enrich_license(component)
+        # The same package often appears in several files (manifest + lockfile)
+        for component in self._deduplicate(parsed):
+            # Enrich with license info
+            if include_licenses:
+                self._enrich_license(component)
 
-                # Check for vulnerabilities
-                if include_vulnerabilities:
-                    await self._check_vulnerabilities(component)
+            # Check for vulnerabilities
+            if include_vulnerabilities:
+                self._check_vulnerabilities(component)
 
-                sbom.components.append(component)
+            sbom.components.append(component)
 
         # Calculate summaries
         self._calculate_summaries(sbom)
@@ -162,344 +202,148 @@ class SBOMGenerator:
 
         return sbom
 
-    async def _parse_dependency_file(
+    async def generate_sbom_batch(
         self,
-        filename: str,
-        content: str,
-    ) -> list[SBOMComponent]:
-        """Parse a dependency file into components."""
-        components = []
-
-        try:
-            if filename.endswith("package.json"):
-                components = self._parse_npm(content)
-            elif filename.endswith("package-lock.json"):
-                components = self._parse_npm_lock(content)
-            elif filename.endswith("requirements.txt"):
-                components = self._parse_requirements(content)
-            elif filename.endswith("Pipfile.lock"):
-                components = self._parse_pipfile_lock(content)
-            elif filename.endswith("pyproject.toml"):
-                components = self._parse_pyproject(content)
-            elif filename.endswith("go.mod"):
-                components = self._parse_gomod(content)
-            elif filename.endswith("go.sum"):
-                components = self._parse_gosum(content)
-            elif filename.endswith("Cargo.lock"):
-                components = self._parse_cargo_lock(content)
-            elif filename.endswith("pom.xml"):
-                components = self._parse_pom(content)
-            elif filename.endswith("Gemfile.lock"):
-                components = self._parse_gemfile_lock(content)
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
-            logger.warning(f"Failed to parse {filename}: {e}")
-
-        return components
-
-    def _parse_npm(self, content: str) -> list[SBOMComponent]:
-        """Parse npm package.json."""
-        components = []
-
-        try:
-            data = json.loads(content)
-
-            for name, version in data.get("dependencies", {}).items():
-                components.append(
-                    SBOMComponent(
-                        name=name,
-                        version=self._clean_version(version),
-                        purl=f"pkg:npm/{name}@{self._clean_version(version)}",
-                        type="library",
-                        is_direct=True,
-                    )
-                )
+        organization_id: UUID | None,
+        repositories: list[SBOMBatchItem],
+        format: SBOMFormat = SBOMFormat.CYCLONEDX_JSON,
+        include_vulnerabilities: bool = True,
+        include_licenses: bool = True,
+        max_concurrency: int = 16,
+    ) -> list[SBOMDocument]:
+        """Generate SBOMs for many repositories.
 
-            for name, version in data.get("devDependencies", {}).items():
-                comp = SBOMComponent(
-                    name=name,
-                    version=self._clean_version(version),
-                    purl=f"pkg:npm/{name}@{self._clean_version(version)}",
-                    type="library",
-                    scope="optional",
-                    is_direct=True,
-                )
-                comp.metadata["dev_dependency"] = True
-                components.append(comp)
-        except json.JSONDecodeError:
-            pass
-
-        return components
-
-    def _parse_npm_lock(self, content: str) -> list[SBOMComponent]:
-        """Parse npm package-lock.json for complete dependency tree."""
-        components = []
-
-        try:
-            data = json.loads(content)
-            packages = data.get("packages", {})
-
-            for path, info in packages.items():
-                if not path or path == "":
-                    continue  # Skip root
-
-                name = path.split("node_modules/")[-1]
-                version = info.get("version", "")
-
-                if name and version:
-                    components.append(
-                        SBOMComponent(
-                            name=name,
-                            version=version,
-                            purl=f"pkg:npm/{name}@{version}",
-                            type="library",
-                            is_direct=not info.get("dev", False)
-                            and "node_modules" not in path.rsplit("node_modules/", 1)[0],
-                            hash_sha256=info.get("integrity", "").replace("sha512-", "")[:64]
-                            if info.get("integrity")
-                            else None,
-                        )
-                    )
-        except json.JSONDecodeError:
-            pass
-
-        return components
-
-    def _parse_requirements(self, content: str) -> list[SBOMComponent]:
-        """Parse Python requirements.txt."""
-        components = []
-
-        for line in content.strip().split("\n"):
-            line = line.strip()
-            if not line or line.startswith(("#", "-")):
-                continue
-
-            match = re.match(r"^([a-zA-Z0-9_-]+)\s*([<>=!~]+)?\s*(.+)?$", line)
-            if match:
-                name = match.group(1).lower()
-                version = match.group(3) or ""
-
-                components.append(
-                    SBOMComponent(
-                        name=name,
-                        version=version,
-                        purl=f"pkg:pypi/{name}@{version}" if version else f"pkg:pypi/{name}",
-                        type="library",
-                        is_direct=True,
-                    )
-                )
+        Lockfiles shared between repositories (identical content) are parsed
+        once and reused via the content-hash cache.
 
-        return components
-
-    def _parse_pipfile_lock(self, content: str) -> list[SBOMComponent]:
-        """Parse Pipfile.lock."""
-        components = []
-
-        try:
-            data = json.loads(content)
-
-            for section in ["default", "develop"]:
-                for name, info in data.get(section, {}).items():
-                    version = info.get("version", "").lstrip("=")
-                    hashes = info.get("hashes", [])
-
-                    comp = SBOMComponent(
-                        name=name.lower(),
-                        version=version,
-                        purl=f"pkg:pypi/{name.lower()}@{version}",
-                        type="library",
-                        is_direct=section == "default",
-                    )
-
-                    if hashes:
-                        for h in hashes:
-                            if h.startswith("sha256:"):
-                                comp.hash_sha256 = h.replace("sha256:", "")
-                                break
-
-                    components.append(comp)
-        except json.JSONDecodeError:
-            pass
-
-        return components
-
-    def _parse_pyproject(self, content: str) -> list[SBOMComponent]:
-        """Parse pyproject.toml (simplified)."""
-        components = []
-
-        in_deps = False
-        for line in content.split("\n"):
-            if "[project.dependencies]" in line or "[tool.poetry.dependencies]" in line:
-                in_deps = True
-                continue
-            if line.startswith("["):
-                in_deps = False
-                continue
-
-            if in_deps:
-                match = re.match(r'^"?([a-zA-Z0-9_-]+)"?\s*[=<>]', line)
-                if match:
-                    name = match.group(1).lower()
-                    components.append(
-                        SBOMComponent(
-                            name=name,
-                            version="",
-                            purl=f"pkg:pypi/{name}",
-                            type="library",
-                            is_direct=True,
-                        )
-                    )
-
-        return components
-
-    def _parse_gomod(self, content: str) -> list[SBOMComponent]:
-        """Parse go.mod."""
-        components = []
-
-        for line in content.split("\n"):
-            line = line.strip()
-            if line.startswith("require ") or (
-                line and not line.startswith("//") and not line.startswith("module")
-            ):
-                match = re.match(r"(?:require\s+)?([^\s]+)\s+v?([^\s]+)", line)
-                if match:
-                    name = match.group(1)
-                    version = match.group(2)
-
-                    components.append(
-                        SBOMComponent(
-                            name=name,
-                            version=version,
-                            purl=f"pkg:golang/{name}@{version}",
-                            type="library",
-                            is_direct=True,
-                        )
-                    )
-
-        return components
-
-    def _parse_gosum(self, content: str) -> list[SBOMComponent]:
-        """Parse go.sum for hashes."""
-        components = []
-        seen = set()
-
-        for line in content.split("\n"):
-            parts = line.strip().split()
-            if len(parts) >= 3:
-                name = parts[0]
-                version = parts[1].split("/")[0].lstrip("v")
-                hash_val = parts[2]
-
-                key = f"{name}@{version}"
-                if key not in seen:
-                    seen.add(key)
-                    components.append(
-                        SBOMComponent(
-                            name=name,
-                            version=version,
-                            purl=f"pkg:golang/{name}@{version}",
-                            type="library",
-                            hash_sha256=hash_val.replace("h1:", "")[:64]
-                            if hash_val.startswith("h1:")
-                            else None,
-                        )
-                    )
-
-        return components
-
-    def _parse_cargo_lock(self, content: str) -> list[SBOMComponent]:
-        """Parse Cargo.lock."""
-        components = []
-        current = {}
-
-        for line in content.split("\n"):
-            line = line.strip()
-
-            if line == "[[package]]":
-                if current.get("name"):
-                    components.append(
-                        SBOMComponent(
-                            name=current["name"],
-                            version=current.get("version", ""),
-                            purl=f"pkg:cargo/{current['name']}@{current.get('version', '')}",
-                            type="library",
-                            hash_sha256=current.get("checksum"),
-                        )
-                    )
-                current = {}
-            elif "=" in line:
-                key, value = line.split("=", 1)
-                current[key.strip()] = value.strip().strip('"')
-
-        if current.get("name"):
-            components.append(
-                SBOMComponent(
-                    name=current["name"],
-                    version=current.get("version", ""),
-                    purl=f"pkg:cargo/{current['name']}@{current.get('version', '')}",
-                    type="library",
+        Returns:
+            SBOMDocuments in the same order as ``repositories``
+        """
+        start_time = time.perf_counter()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _generate(item: SBOMBatchItem) -> SBOMDocument:
+            async with semaphore:
+                return await self.generate_sbom(
+                    organization_id=organization_id,
+                    repository_id=item.repository_id,
+                    name=item.name,
+                    version=item.version,
+                    dependency_files=item.dependency_files,
+                    format=format,
+                    include_vulnerabilities=include_vulnerabilities,
+                    include_licenses=include_licenses,
                 )
-            )
 
-        return components
+        sboms = await asyncio.gather(*(_generate(item) for item in repositories))
 
-    def _parse_pom(self, content: str) -> list[SBOMComponent]:
-        """Parse Maven pom.xml."""
-        components = []
-
-        # Simple regex extraction
-        deps = re.findall(
-            r"<dependency>.*?<groupId>([^<]+)</groupId>.*?<artifactId>([^<]+)</artifactId>.*?(?:<version>([^<]*)</version>)?.*?</dependency>",
-            content,
-            re.DOTALL,
+        logger.info(
+            "Generated SBOM batch",
+            repositories=len(repositories),
+            parse_cache_entries=len(self._parse_cache),
+            duration_ms=(time.perf_counter() - start_time) * 1000,
         )
 
-        for group_id, artifact_id, version in deps:
-            components.append(
-                SBOMComponent(
-                    name=f"{group_id}:{artifact_id}",
-                    version=version or "",
-                    purl=f"pkg:maven/{group_id}/{artifact_id}@{version}"
-                    if version
-                    else f"pkg:maven/{group_id}/{artifact_id}",
-                    type="library",
-                    supplier=group_id,
-                )
-            )
+        return list(sboms)
+
+    async def fetch_dependency_files(
+        self,
+        github: "GitHubClient",
+        owner: str,
+        repo: str,
+        ref: str = "HEAD",
+    ) -> dict[str, str]:
+        """Collect supported dependency files from a GitHub repository.
+
+        Files are fetched by blob SHA through the shared blob cache, so
+        lockfiles unchanged since an earlier analysis or SBOM run are not
+        downloaded again.
+        """
+        tree = await github.get_repository_tree(owner, repo, ref)
+        entries = [
+            item
+            for item in tree
+            if item.get("type") == "blob" and parser_kind(item["path"].rsplit("/", 1)[-1])
+        ]
+        files = await github.get_files(owner, repo, entries)
+        return {path: file.content for path, file in files.items()}
+
+    async def dependency_files_from_checkout(self, checkout: Checkout) -> dict[str, str]:
+        """Collect supported dependency files from a local checkout."""
+        everything = FileFilter(max_size=None)
+        paths = [
+            entry.path
+            for entry in checkout.iter_files(everything)
+            if parser_kind(entry.path.rsplit("/", 1)[-1])
+        ]
+        return await checkout.load_files(everything, paths=paths)
 
-        return components
-
-    def _parse_gemfile_lock(self, content: str) -> list[SBOMComponent]:
-        """Parse Gemfile.lock."""
-        components = []
-        in_specs = False
-
-        for line in content.split("\n"):
-            if line.strip() == "specs:":
-                in_specs = True
-                continue
-            if line and not line.startswith(" "):
-                in_specs = False
-
-            if in_specs:
-                match = re.match(r"^\s{4}([a-zA-Z0-9_-]+)\s+\(([^)]+)\)", line)
-                if match:
-                    name = match.group(1)
-                    version = match.group(2)
-
-                    components.append(
-                        SBOMComponent(
-                            name=name,
-                            version=version,
-                            purl=f"pkg:gem/{name}@{version}",
-                            type="library",
-                        )
-                    )
-
-        return components
-
-    def _clean_version(self, version: str) -> str:
-        """Clean version string."""
-        return version.strip("^~>=<")
+    async def _parse_dependency_file(
+        self,
+        filename: str,
+        content: str,
+    ) -> list[SBOMComponent]:
+        """Parse a dependency file into fresh components.
+
+        Parsed results are cached by (parser, content hash), and identical
+        files being parsed concurrently share one parse. Large files are
+        parsed in the shared process pool so the event loop stays responsive.
+        """
+        kind = parser_kind(filename)
+        if kind is None:
+            return []
+
+        key = f"{kind}:{hashlib.sha256(content.encode()).hexdigest()}"
+        templates = self._parse_cache.get(key)
+        if templates is not None:
+            self._parse_cache.move_to_end(key)
+        else:
+            inflight = self._parse_inflight.get(key)
+            if inflight is None:
+                inflight = asyncio.ensure_future(self._run_parser(filename, content))
+                self._parse_inflight[key] = inflight
+                try:
+                    templates = await inflight
+                finally:
+                    del self._parse_inflight[key]
+                self._parse_cache[key] = templates
+                if len(self._parse_cache) > self._parse_cache_size:
+                    self._parse_cache.popitem(last=False)
+            else:
+                templates = await asyncio.shield(inflight)
+
+        # Cached templates are shared; hand out independent copies
+        return [c.model_copy(update={"id": uuid4()}, deep=True) for c in templates]
+
+    async def _run_parser(self, filename: str, content: str) -> list[SBOMComponent]:
+        if len(content) < _INLINE_PARSE_BYTES:
+            return parse_dependency_file(filename, content)
+
+        # Without the shared process pool, parse on the default thread pool
+        pool = get_process_pool() if self._parse_workers > 1 else None
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, parse_dependency_file, filename, content)
+
+    def _deduplicate(self, parsed: list[list[SBOMComponent]]) -> list[SBOMComponent]:
+        """Merge identical components (same purl) listed by several files."""
+        merged: dict[str, SBOMComponent] = {}
+        for components in parsed:
+            for component in components:
+                key = component.purl or f"{component.name}@{component.version}"
+                existing = merged.get(key)
+                if existing is None:
+                    merged[key] = component
+                    continue
+                existing.is_direct = existing.is_direct or component.is_direct
+                if component.scope == "required":
+                    existing.scope = "required"
+                existing.hash_sha256 = existing.hash_sha256 or component.hash_sha256
+                existing.supplier = existing.supplier or component.supplier
+                for dep in component.dependencies:
+                    if dep not in existing.dependencies:
+                        existing.dependencies.append(dep)
+                existing.metadata = {**component.metadata, **existing.metadata}
+        return list(merged.values())
 
     def _enrich_license(self, component: SBOMComponent) -> None:
         """Add license information to component."""
@@ -514,43 +358,33 @@ class SBOMGenerator:
         else:
             component.license_risk = LicenseRisk.UNKNOWN
 
-    async def _check_vulnerabilities(self, component: SBOMComponent) -> None:
-        """Check component for known vulnerabilities."""
-        name_lower = component.name.lower()
+    def _check_vulnerabilities(self, component: SBOMComponent) -> None:
+        """Check component for known vulnerabilities.
 
-        if name_lower in KNOWN_VULNERABILITIES:
-            for vuln_data in KNOWN_VULNERABILITIES[name_lower]:
-                # Check if version is affected
-                if self._version_affected(component.version, vuln_data.get("fixed_in")):
-                    component.vulnerabilities.append(
-                        ComponentVulnerability(
-                            id=vuln_data["id"],
-                            severity=VulnerabilitySeverity(vuln_data["severity"]),
-                            cvss_score=vuln_data.get("cvss"),
-                            description=vuln_data["description"],
-                            fixed_in_version=vuln_data.get("fixed_in"),
-                        )
-                    )
-
-    def _version_affected(self, current: str, fixed_in: str | None) -> bool:
-        """Check if current version is affected (before fixed_in)."""
-        if not fixed_in or not current:
-            return True
-
-        # Simple version comparison (in production, use packaging.version)
-        try:
-            current_parts = [int(x) for x in current.split(".")[:3]]
-            fixed_parts = [int(x) for x in fixed_in.split(".")[:3]]
-
-            # Pad to same length
-            while len(current_parts) < 3:
-                current_parts.append(0)
-            while len(fixed_parts) < 3:
-                fixed_parts.append(0)
-
-            return current_parts < fixed_parts
-        except (ValueError, AttributeError):
-            return True  # Assume affected if can't parse
+        Components whose version cannot be resolved are not reported as
+        affected; they are flagged in metadata for manual review instead.
+        """
+        ecosystem = ecosystem_from_purl(component.purl)
+        if ecosystem is None or not self._vulnerability_index.has_package(
+            ecosystem, component.name
+        ):
+            return
+
+        version = parse_version(component.version)
+        if version is None:
+            component.metadata["vulnerability_check"] = "unresolved_version"
+            return
+
+        for advisory in self._vulnerability_index.lookup(ecosystem, component.name, version):
+            component.vulnerabilities.append(
+                ComponentVulnerability(
+                    id=advisory.id,
+                    severity=VulnerabilitySeverity(advisory.severity),
+                    cvss_score=advisory.cvss,
+                    description=advisory.description,
+                    fixed_in_version=advisory.fixed_in,
+                )
+            )
 
     def _calculate_summaries(self, sbom: SBOMDocument) -> None:
         """Calculate summary statistics for SBOM."""
@@ -614,6 +448,22 @@ class SBOMGenerator:
             return sbom.to_spdx()
         return sbom.to_cyclonedx()
 
+    def stream_export(
+        self,
+        sbom_id: UUID,
+        format: SBOMFormat,
+        gzip: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """Export SBOM in specified format as a stream of encoded chunks.
+
+        Raises ``ValueError`` up front (before any bytes are produced) if the
+        SBOM does not exist.
+        """
+        sbom = self._sboms.get(sbom_id)
+        if not sbom:
+            raise ValueError(f"SBOM {sbom_id} not found")
+        return stream_sbom(sbom, format, gzip=gzip)
+
 
 # Global instance
 _generator: SBOMGenerator | None = None
@@ -7,6 +7,8 @@ from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
 
+from app.services.sbom import exporter
+
 
 class SBOMFormat(str, Enum):
     """Supported SBOM output formats."""
@@ -165,105 +167,33 @@ class SBOMDocument(BaseModel):
     def to_spdx(self) -> dict[str, Any]:
         """Convert to SPDX format."""
         return {
-            "spdxVersion": "SPDX-2.3",
-            "dataLicense": "CC0-1.0",
-            "SPDXID": f"SPDXRef-DOCUMENT-{self.id}",
-            "name": self.name,
-            "documentNamespace": f"https://complianceagent.ai/sbom/{self.id}",
-            "creationInfo": {
-                "created": self.created_at.isoformat(),
-                "creators": [
-                    f"Tool: {self.tool_name}-{self.tool_version}",
-                    f"Organization: {self.organization_id}"
-                    if self.organization_id
-                    else "Organization: Unknown",
-                ],
-            },
-            "packages": [
-                {
-                    "SPDXID": f"SPDXRef-Package-{c.id}",
-                    "name": c.name,
-                    "versionInfo": c.version,
-                    "downloadLocation": c.download_url or "NOASSERTION",
-                    "licenseConcluded": c.license or "NOASSERTION",
-                    "supplier": f"Organization: {c.supplier}" if c.supplier else "NOASSERTION",
-                    "checksums": [{"algorithm": "SHA256", "checksumValue": c.hash_sha256}]
-                    if c.hash_sha256
-                    else [],
-                }
-                for c in self.components
-            ],
-            "relationships": [
-                {
-                    "spdxElementId": f"SPDXRef-DOCUMENT-{self.id}",
-                    "relatedSpdxElement": f"SPDXRef-Package-{c.id}",
-                    "relationshipType": "DESCRIBES",
-                }
-                for c in self.components
-            ],
+            **exporter.spdx_header(self),
+            "packages": [exporter.spdx_package(c) for c in self.components],
+            "relationships": [exporter.spdx_relationship(self, c) for c in self.components],
         }
 
     def to_cyclonedx(self) -> dict[str, Any]:
         """Convert to CycloneDX format."""
         return {
-            "bomFormat": "CycloneDX",
-            "specVersion": "1.5",
-            "serialNumber": f"urn:uuid:{self.id}",
-            "version": 1,
-            "metadata": {
-                "timestamp": self.created_at.isoformat(),
-                "tools": [
-                    {
-                        "vendor": "ComplianceAgent",
-                        "name": self.tool_name,
-                        "version": self.tool_version,
-                    }
-                ],
-                "component": {
-                    "type": "application",
-                    "name": self.name,
-                    "version": self.version,
-                },
-            },
-            "components": [
-                {
-                    "type": c.type,
-                    "bom-ref": str(c.id),
-                    "name": c.name,
-                    "version": c.version,
-                    "purl": c.purl,
-                    "licenses": [{"license": {"id": c.license}}] if c.license else [],
-                    "hashes": [{"alg": "SHA-256", "content": c.hash_sha256}]
-                    if c.hash_sha256
-                    else [],
-                    "supplier": {"name": c.supplier} if c.supplier else None,
-                }
-                for c in self.components
-            ],
+            **exporter.cyclonedx_header(self),
+            "components": [exporter.cyclonedx_component(c) for c in self.components],
             "vulnerabilities": [
-                {
-                    "id": v.id,
-                    "source": {"name": "NVD"},
-                    "ratings": [
-                        {
-                            "severity": v.severity.value,
-                            "score": v.cvss_score,
-                            "vector": v.cvss_vector,
-                        }
-                    ]
-                    if v.cvss_score
-                    else [],
-                    "description": v.description,
-                    "recommendation": f"Upgrade to {v.fixed_in_version}"
-                    if v.fixed_in_version
-                    else "Review and mitigate",
-                }
+                exporter.cyclonedx_vulnerability(v)
                 for c in self.components
                 for v in c.vulnerabilities
             ],
         }
 
 
+class SBOMBatchItem(BaseModel):
+    """One repository in a bulk SBOM generation request."""
+
+    repository_id: UUID | None = None
+    name: str
+    version: str
+    dependency_files: dict[str, str] = Field(default_factory=dict)
+
+
 class SBOMComplianceReport(BaseModel):
     """Compliance report for an SBOM."""
 
@@ -0,0 +1,372 @@
+"""Dependency-file parsers for SBOM generation.
+
+Parsers are plain module-level functions over ``(filename, content)`` so they
+can run in a worker process and their output can be cached by content hash.
+"""
+
+import json
+import re
+from collections.abc import Callable
+
+import structlog
+
+from app.services.sbom.models import SBOMComponent
+
+
+logger = structlog.get_logger()
+
+
+def parse_dependency_file(filename: str, content: str) -> list[SBOMComponent]:
+    """Parse a dependency file into components."""
+    parser = _parser_for(filename)
+    if parser is None:
+        return []
+
+    try:
+        return parser(content)
+    except (json.JSONDecodeError, KeyError, ValueError) as e:
+        logger.warning(f"Failed to parse {filename}: {e}")
+        return []
+
+
+def parser_kind(filename: str) -> str | None:
+    """Name of the parser that handles ``filename`` (``None`` if unsupported)."""
+    parser = _parser_for(filename)
+    return parser.__name__ if parser else None
+
+
+def _parser_for(filename: str) -> Callable[[str], list[SBOMComponent]] | None:
+    for suffix, parser in _PARSERS:
+        if filename.endswith(suffix):
+            return parser
+    return None
+
+
+def _parse_npm(content: str) -> list[SBOMComponent]:
+    """Parse npm package.json."""
+    components = []
+
+    try:
+        data = json.loads(content)
+
+        for name, version in data.get("dependencies", {}).items():
+            components.append(
+                SBOMComponent(
+                    name=name,
+                    version=_clean_version(version),
+                    purl=f"pkg:npm/{name}@{_clean_version(version)}",
+                    type="library",
+                    is_direct=True,
+                )
+            )
+
+        for name, version in data.get("devDependencies", {}).items():
+            comp = SBOMComponent(
+                name=name,
+                version=_clean_version(version),
+                purl=f"pkg:npm/{name}@{_clean_version(version)}",
+                type="library",
+                scope="optional",
+                is_direct=True,
+            )
+            comp.metadata["dev_dependency"] = True
+            components.append(comp)
+    except json.JSONDecodeError:
+        pass
+
+    return components
+
+
+def _parse_npm_lock(content: str) -> list[SBOMComponent]:
+    """Parse npm package-lock.json for complete dependency tree."""
+    components = []
+
+    try:
+        data = json.loads(content)
+        packages = data.get("packages", {})
+
+        for path, info in packages.items():
+            if not path or path == "":
+                continue  # Skip root
+
+            name = path.split("node_modules/")[-1]
+            version = info.get("version", "")
+
+            if name and version:
+                components.append(
+                    SBOMComponent(
+                        name=name,
+                        version=version,
+                        purl=f"pkg:npm/{name}@{version}",
+                        type="library",
+                        is_direct=not info.get("dev", False)
+                        and "node_modules" not in path.rsplit("node_modules/", 1)[0],
+                        hash_sha256=info.get("integrity", "").replace("sha512-", "")[:64]
+                        if info.get("integrity")
+                        else None,
+                    )
+                )
+    except json.JSONDecodeError:
+        pass
+
+    return components
+
+
+def _parse_requirements(content: str) -> list[SBOMComponent]:
+    """Parse Python requirements.txt."""
+    components = []
+
+    for line in content.strip().split("\n"):
+        line = line.strip()
+        if not line or line.startswith(("#", "-")):
+            continue
+
+        match = re.match(r"^([a-zA-Z0-9_-]+)\s*([<>=!~]+)?\s*(.+)?$", line)
+        if match:
+            name = match.group(1).lower()
+            version = match.group(3) or ""
+
+            components.append(
+                SBOMComponent(
+                    name=name,
+                    version=version,
+                    purl=f"pkg:pypi/{name}@{version}" if version else f"pkg:pypi/{name}",
+                    type="library",
+                    is_direct=True,
+                )
+            )
+
+    return components
+
+
+def _parse_pipfile_lock(content: str) -> list[SBOMComponent]:
+    """Parse Pipfile.lock."""
+    components = []
+
+    try:
+        data = json.loads(content)
+
+        for section in ["default", "develop"]:
+            for name, info in data.get(section, {}).items():
+                version = info.get("version", "").lstrip("=")
+                hashes = info.get("hashes", [])
+
+                comp = SBOMComponent(
+                    name=name.lower(),
+                    version=version,
+                    purl=f"pkg:pypi/{name.lower()}@{version}",
+                    type="library",
+                    is_direct=section == "default",
+                )
+
+                if hashes:
+                    for h in hashes:
+                        if h.startswith("sha256:"):
+                            comp.hash_sha256 = h.replace("sha256:", "")
+                            break
+
+                components.append(comp)
+    except json.JSONDecodeError:
+        pass
+
+    return components
+
+
+def _parse_pyproject(content: str) -> list[SBOMComponent]:
+    """Parse pyproject.toml (simplified)."""
+    components = []
+
+    in_deps = False
+    for line in content.split("\n"):
+        if "[project.dependencies]" in line or "[tool.poetry.dependencies]" in line:
+            in_deps = True
+            continue
+        if line.startswith("["):
+            in_deps = False
+            continue
+
+        if in_deps:
+            match = re.match(r'^"?([a-zA-Z0-9_-]+)"?\s*[=<>]', line)
+            if match:
+                name = match.group(1).lower()
+                components.append(
+                    SBOMComponent(
+                        name=name,
+                        version="",
+                        purl=f"pkg:pypi/{name}",
+                        type="library",
+                        is_direct=True,
+                    )
+                )
+
+    return components
+
+
+def _parse_gomod(content: str) -> list[SBOMComponent]:
+    """Parse go.mod."""
+    components = []
+
+    for line in content.split("\n"):
+        line = line.strip()
+        if line.startswith("require ") or (
+            line and not line.startswith("//") and not line.startswith("module")
+        ):
+            match = re.match(r"(?:require\s+)?([^\s]+)\s+v?([^\s]+)", line)
+            if match:
+                name = match.group(1)
+                version = match.group(2)
+
+                components.append(
+                    SBOMComponent(
+                        name=name,
+                        version=version,
+                        purl=f"pkg:golang/{name}@{version}",
+                        type="library",
+                        is_direct=True,
+                    )
+                )
+
+    return components
+
+
+def _parse_gosum(content: str) -> list[SBOMComponent]:
+    """Parse go.sum for hashes."""
+    components = []
+    seen = set()
+
+    for line in content.split("\n"):
+        parts = line.strip().split()
+        if len(parts) >= 3:
+            name = parts[0]
+            version = parts[1].split("/")[0].lstrip("v")
+            hash_val = parts[2]
+
+            key = f"{name}@{version}"
+            if key not in seen:
+                seen.add(key)
+                components.append(
+                    SBOMComponent(
+                        name=name,
+                        version=version,
+                        purl=f"pkg:golang/{name}@{version}",
+                        type="library",
+                        hash_sha256=hash_val.replace("h1:", "")[:64]
+                        if hash_val.startswith("h1:")
+                        else None,
+                    )
+                )
+
+    return components
+
+
+def _parse_cargo_lock(content: str) -> list[SBOMComponent]:
+    """Parse Cargo.lock."""
+    components = []
+    current = {}
+
+    for line in content.split("\n"):
+        line = line.strip()
+
+        if line == "[[package]]":
+            if current.get("name"):
+                components.append(
+                    SBOMComponent(
+                        name=current["name"],
+                        version=current.get("version", ""),
+                        purl=f"pkg:cargo/{current['name']}@{current.get('version', '')}",
+                        type="library",
+                        hash_sha256=current.get("checksum"),
+                    )
+                )
+            current = {}
+        elif "=" in line:
+            key, value = line.split("=", 1)
+            current[key.strip()] = value.strip().strip('"')
+
+    if current.get("name"):
+        components.append(
+            SBOMComponent(
+                name=current["name"],
+                version=current.get("version", ""),
+                purl=f"pkg:cargo/{current['name']}@{current.get('version', '')}",
+                type="library",
+            )
+        )
+
+    return components
+
+
+def _parse_pom(content: str) -> list[SBOMComponent]:
+    """Parse Maven pom.xml."""
+    components = []
+
+    # Simple regex extraction
+    deps = re.findall(
+        r"<dependency>.*?<groupId>([^<]+)</groupId>.*?<artifactId>([^<]+)</artifactId>.*?(?:<version>([^<]*)</version>)?.*?</dependency>",
+        content,
+        re.DOTALL,
+    )
+
+    for group_id, artifact_id, version in deps:
+        components.append(
+            SBOMComponent(
+                name=f"{group_id}:{artifact_id}",
+                version=version or "",
+                purl=f"pkg:maven/{group_id}/{artifact_id}@{version}"
+                if version
+                else f"pkg:maven/{group_id}/{artifact_id}",
+                type="library",
+                supplier=group_id,
+            )
+        )
+
+    return components
+
+
+def _parse_gemfile_lock(content: str) -> list[SBOMComponent]:
+    """Parse Gemfile.lock."""
+    components = []
+    in_specs = False
+
+    for line in content.split("\n"):
+        if line.strip() == "specs:":
+            in_specs = True
+            continue
+        if line and not line.startswith(" "):
+            in_specs = False
+
+        if in_specs:
+            match = re.match(r"^\s{4}([a-zA-Z0-9_-]+)\s+\(([^)]+)\)", line)
+            if match:
+                name = match.group(1)
+                version = match.group(2)
+
+                components.append(
+                    SBOMComponent(
+                        name=name,
+                        version=version,
+                        purl=f"pkg:gem/{name}@{version}",
+                        type="library",
+                    )
+                )
+
+    return components
+
+
+def _clean_version(version: str) -> str:
+    """Clean version string."""
+    return version.strip("^~>=<")
+
+
+_PARSERS: tuple[tuple[str, Callable[[str], list[SBOMComponent]]], ...] = (
+    ("package.json", _parse_npm),
+    ("package-lock.json", _parse_npm_lock),
+    ("requirements.txt", _parse_requirements),
+    ("Pipfile.lock", _parse_pipfile_lock),
+    ("pyproject.toml", _parse_pyproject),
+    ("go.mod", _parse_gomod),
+    ("go.sum", _parse_gosum),
+    ("Cargo.lock", _parse_cargo_lock),
+    ("pom.xml", _parse_pom),
+    ("Gemfile.lock", _parse_gemfile_lock),
+)
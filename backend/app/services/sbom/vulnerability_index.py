@@ -0,0 +1,151 @@
+"""Indexed vulnerability matching for SBOM components.
+
+Advisories are grouped by ``(ecosystem, package)`` with their affected ranges
+pre-parsed into ``packaging`` versions, so matching a component is a dict
+lookup plus a bisect over range start points rather than a rescan of the
+advisory feed with ad-hoc string comparison.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion, Version
+
+
+@dataclass(frozen=True)
+class Advisory:
+    """A known vulnerability affecting one package."""
+
+    id: str
+    ecosystem: str
+    package: str
+    severity: str
+    description: str
+    cvss: float | None = None
+    fixed_in: str | None = None
+
+
+@dataclass(frozen=True)
+class AffectedRange:
+    """Half-open version interval ``[introduced, fixed)`` covered by an advisory."""
+
+    advisory: Advisory
+    introduced: Version | None = None
+    fixed: Version | None = None
+
+    def contains(self, version: Version) -> bool:
+        if self.introduced is not None and version < self.introduced:
+            return False
+        return self.fixed is None or version < self.fixed
+
+
+@dataclass
+class _PackageRanges:
+    """Ranges for one package, sorted by start version for bisect lookup."""
+
+    starts: list[Version] = field(default_factory=list)
+    ranges: list[AffectedRange] = field(default_factory=list)
+
+
+_MIN_VERSION = Version("0.dev0")
+
+
+def ecosystem_from_purl(purl: str | None) -> str | None:
+    """Return the purl type (``npm``, ``pypi``, ``maven``...) of a package URL."""
+    if not purl or not purl.startswith("pkg:"):
+        return None
+    return purl[4:].split("/", 1)[0].lower() or None
+
+
+def normalize_package_name(ecosystem: str, name: str) -> str:
+    """Normalize a package name the way its ecosystem compares names."""
+    if ecosystem == "pypi":
+        return canonicalize_name(name)
+    if ecosystem == "golang":
+        return name
+    return name.lower()
+
+
+@lru_cache(maxsize=65536)
+def parse_version(raw: str | None) -> Version | None:
+    """Parse a version string leniently; ``None`` when it is not a version.
+
+    Accepts a leading ``v`` and semver-style pre-release suffixes
+    (``1.2.3-rc.1``), which PEP 440 normalization orders before the release.
+    """
+    if not raw:
+        return None
+    candidate = raw.strip().lstrip("=").strip()
+    try:
+        return Version(candidate)
+    except InvalidVersion:
+        return None
+
+
+class VulnerabilityIndex:
+    """Lookup of advisories by ``(ecosystem, package)`` and version interval."""
+
+    def __init__(self):
+        self._packages: dict[tuple[str, str], _PackageRanges] = {}
+        self.unparsed_ranges = 0
+
+    @classmethod
+    def from_feed(cls, feed: dict[str, list[dict[str, Any]]]) -> "VulnerabilityIndex":
+        """Build an index from a ``{package: [advisory dict, ...]}`` feed.
+
+        Each advisory dict carries ``ecosystem`` and either an ``affected``
+        list of ``{"introduced", "fixed"}`` ranges or a single ``fixed_in``.
+        """
+        index = cls()
+        for package, entries in feed.items():
+            for entry in entries:
+                advisory = Advisory(
+                    id=entry["id"],
+                    ecosystem=entry.get("ecosystem", ""),
+                    package=package,
+                    severity=entry["severity"],
+                    description=entry["description"],
+                    cvss=entry.get("cvss"),
+                    fixed_in=entry.get("fixed_in"),
+                )
+                affected = entry.get("affected") or [{"fixed": entry.get("fixed_in", "")}]
+                index.add(advisory, affected)
+        return index
+
+    def add(self, advisory: Advisory, affected: list[dict[str, str]]) -> None:
+        """Index an advisory under each of its affected ranges."""
+        key = (advisory.ecosystem, normalize_package_name(advisory.ecosystem, advisory.package))
+        bucket = self._packages.setdefault(key, _PackageRanges())
+        for bounds in affected:
+            introduced = parse_version(bounds.get("introduced"))
+            fixed = parse_version(bounds.get("fixed"))
+            if (bounds.get("introduced") and introduced is None) or (
+                bounds.get("fixed") and fixed is None
+            ):
+                self.unparsed_ranges += 1
+                continue
+            start = introduced or _MIN_VERSION
+            position = bisect_right(bucket.starts, start)
+            bucket.starts.insert(position, start)
+            bucket.ranges.insert(position, AffectedRange(advisory, introduced, fixed))
+
+    def lookup(self, ecosystem: str, package: str, version: Version) -> list[Advisory]:
+        """Advisories whose affected ranges contain ``version``."""
+        bucket = self._packages.get((ecosystem, normalize_package_name(ecosystem, package)))
+        if bucket is None:
+            return []
+        candidates = bucket.ranges[: bisect_right(bucket.starts, version)]
+        matched: dict[str, Advisory] = {}
+        for affected in candidates:
+            if affected.contains(version):
+                matched.setdefault(affected.advisory.id, affected.advisory)
+        return list(matched.values())
+
+    def has_package(self, ecosystem: str, package: str) -> bool:
+        return (ecosystem, normalize_package_name(ecosystem, package)) in self._packages
+
+    def __len__(self) -> int:
+        return sum(len(bucket.ranges) for bucket in self._packages.values())
@@ -6,6 +6,11 @@ from app.services.scoring.models import (
     GapDetail,
     ScoringResult,
 )
+from app.services.scoring.repository_scores import (
+    install_score_maintenance,
+    mapping_status_counts,
+    recompute_repository_scores,
+)
 from app.services.scoring.service import ComplianceScoringService
 
 
@@ -15,4 +20,7 @@ __all__ = [
     "FrameworkScore",
     "GapDetail",
     "ScoringResult",
+    "install_score_maintenance",
+    "mapping_status_counts",
+    "recompute_repository_scores",
 ]
@@ -0,0 +1,190 @@
+"""Set-based maintenance of per-repository compliance summaries.
+
+``Repository.total_requirements``, ``compliant_requirements`` and
+``compliance_score`` are derived from the repository's ``CodebaseMapping``
+rows. They are recomputed with one grouped aggregate joined into a single
+``UPDATE repositories ... FROM (SELECT ... GROUP BY repository_id)``, so
+refreshing every repository costs two statements rather than one query
+per repository.
+
+``install_score_maintenance`` hooks the ORM flush so that any session
+inserting, deleting or re-statusing mappings refreshes just the affected
+repositories in the same transaction. The daily ``update_compliance_scores``
+task then only catches changes made outside the ORM (bulk ``UPDATE``
+statements, manual SQL).
+"""
+
+from collections.abc import Collection, Iterable
+from itertools import chain
+from typing import Any
+from uuid import UUID
+
+import structlog
+from sqlalchemy import (
+    Float,
+    Select,
+    Update,
+    cast,
+    event,
+    exists,
+    func,
+    inspect,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.codebase import CodebaseMapping, ComplianceStatus, Repository
+
+
+logger = structlog.get_logger()
+
+_PENDING_KEY = "repository_scores.pending"
+
+# Mapping columns that feed the summaries
+_TRACKED_ATTRIBUTES = ("repository_id", "compliance_status")
+
+_SUMMARY_COLUMNS = (
+    Repository.id,
+    Repository.total_requirements,
+    Repository.compliant_requirements,
+    Repository.compliance_score,
+)
+
+
+def mapping_status_counts(repository_ids: Collection[UUID] | None = None) -> Select:
+    """Per-repository mapping totals and compliant counts in one grouped query."""
+    query = select(
+        CodebaseMapping.repository_id,
+        func.count().label("total"),
+        func.count()
+        .filter(CodebaseMapping.compliance_status == ComplianceStatus.COMPLIANT)
+        .label("compliant"),
+    ).group_by(CodebaseMapping.repository_id)
+    if repository_ids is not None:
+        query = query.where(CodebaseMapping.repository_id.in_(repository_ids))
+    return query
+
+
+def score_update_statements(repository_ids: Collection[UUID] | None = None) -> list[Update]:
+    """Bulk UPDATEs refreshing summaries for active repositories.
+
+    The first statement writes counts and scores for repositories with
+    mappings. The second zeroes the counts of repositories whose mappings
+    are all gone, leaving their last score in place as the per-row loop
+    did. Both skip repositories whose summary is already current, so an
+    unchanged repository keeps its ``updated_at``, and both return the new
+    summary columns of the rows they wrote.
+    """
+    counts = mapping_status_counts(repository_ids).subquery()
+    score = cast(counts.c.compliant, Float) * 100 / counts.c.total
+    scored = (
+        update(Repository)
+        .where(
+            Repository.id == counts.c.repository_id,
+            Repository.is_active.is_(True),
+            or_(
+                Repository.total_requirements.is_distinct_from(counts.c.total),
+                Repository.compliant_requirements.is_distinct_from(counts.c.compliant),
+                Repository.compliance_score.is_distinct_from(score),
+            ),
+        )
+        .values(
+            total_requirements=counts.c.total,
+            compliant_requirements=counts.c.compliant,
+            compliance_score=score,
+        )
+        .returning(*_SUMMARY_COLUMNS)
+    )
+
+    unmapped = (
+        update(Repository)
+        .where(
+            Repository.is_active.is_(True),
+            ~exists().where(CodebaseMapping.repository_id == Repository.id),
+            or_(
+                Repository.total_requirements.is_distinct_from(0),
+                Repository.compliant_requirements.is_distinct_from(0),
+            ),
+        )
+        .values(total_requirements=0, compliant_requirements=0)
+        .returning(*_SUMMARY_COLUMNS)
+    )
+    if repository_ids is not None:
+        unmapped = unmapped.where(Repository.id.in_(repository_ids))
+    return [scored, unmapped]
+
+
+def _sync_identity_map(session: Session, rows: Iterable[Any]) -> None:
+    """Copy updated summaries onto Repository objects already loaded."""
+    for repository_id, total, compliant, score in rows:
+        repository = session.identity_map.get(session.identity_key(Repository, repository_id))
+        if repository is None:
+            continue
+        set_committed_value(repository, "total_requirements", total)
+        set_committed_value(repository, "compliant_requirements", compliant)
+        set_committed_value(repository, "compliance_score", score)
+
+
+async def recompute_repository_scores(
+    db: AsyncSession,
+    repository_ids: Collection[UUID] | None = None,
+) -> int:
+    """Recompute summaries for ``repository_ids`` (all active repositories if None).
+
+    Returns the number of repositories whose summary was written.
+    """
+    connection = await db.connection()
+    updated = 0
+    for statement in score_update_statements(repository_ids):
+        rows = (await connection.execute(statement)).all()
+        _sync_identity_map(db.sync_session, rows)
+        updated += len(rows)
+    return updated
+
+
+def _changed_repositories(session: Session) -> set[UUID]:
+    affected: set[UUID] = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, CodebaseMapping):
+            continue
+        state = inspect(obj)
+        if obj in session.dirty and not any(
+            state.attrs[name].history.has_changes() for name in _TRACKED_ATTRIBUTES
+        ):
+            continue
+        if obj.repository_id is not None:
+            affected.add(obj.repository_id)
+        # A mapping moved between repositories changes both
+        affected.update(v for v in state.attrs.repository_id.history.deleted if v is not None)
+    return affected
+
+
+def _collect_changes(session: Session, flush_context: Any) -> None:
+    affected = _changed_repositories(session)
+    if affected:
+        session.info.setdefault(_PENDING_KEY, set()).update(affected)
+
+
+def _refresh_pending(session: Session, flush_context: Any) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    connection = session.connection()
+    for statement in score_update_statements(pending):
+        _sync_identity_map(session, connection.execute(statement).all())
+    logger.debug("repository_scores.refreshed", repositories=len(pending))
+
+
+def install_score_maintenance() -> None:
+    """Refresh repository summaries whenever a flush changes mappings.
+
+    Idempotent; called at application and worker start-up.
+    """
+    if event.contains(Session, "after_flush", _collect_changes):
+        return
+    event.listen(Session, "after_flush", _collect_changes)
+    event.listen(Session, "after_flush_postexec", _refresh_pending)
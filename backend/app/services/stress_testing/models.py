@@ -51,6 +51,8 @@ class SimulationResult:
     p99: float = 0.0
     mean: float = 0.0
     std_dev: float = 0.0
+    value_at_risk: float = 0.0
+    conditional_value_at_risk: float = 0.0
     distribution: list[dict] = field(default_factory=list)
 
 
@@ -10,6 +10,8 @@ from urllib.parse import urlparse
 import httpx
 import structlog
 
+from app.core.http import get_shared_http_client
+
 
 logger = structlog.get_logger(__name__)
 
@@ -81,10 +83,16 @@ async def deliver(
 
     for attempt in range(max_retries + 1):
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
+            shared = get_shared_http_client()
+            if shared is not None:
+                response = await shared.post(
                     url, content=body, headers=request_headers, timeout=timeout
                 )
+            else:
+                async with httpx.AsyncClient() as client:
+                    response = await client.post(
+                        url, content=body, headers=request_headers, timeout=timeout
+                    )
             last_status = response.status_code
 
             if response.status_code < 400:
@@ -0,0 +1,244 @@
+"""Fan-out of webhook events to subscribed receivers.
+
+A burst of events is resolved against the cached subscription index and
+delivered in one pass: events for receivers that opted in to batching are
+coalesced into batched payloads, deliveries run concurrently with a cap per
+destination host (connections are pooled per host by the shared httpx
+transport), counters are aggregated and written once per webhook, and
+payloads that exhaust their retries land in the dead-letter queue.
+"""
+
+import asyncio
+import secrets
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+from urllib.parse import urlparse
+from uuid import UUID
+
+import structlog
+from sqlalchemy import DateTime, Integer, bindparam, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.webhooks.delivery import deliver
+from app.services.webhooks.subscriptions import SubscriptionIndex, WebhookTarget
+
+
+logger = structlog.get_logger(__name__)
+
+BATCH_EVENT_TYPE = "batch"
+
+
+def build_event(event_type: str, data: dict) -> dict[str, Any]:
+    """Wrap event data in the envelope sent to receivers."""
+    return {
+        "event_type": event_type,
+        "delivery_id": secrets.token_hex(8),
+        "timestamp": datetime.now(UTC).isoformat(),
+        "data": data,
+    }
+
+
+def coalesce(events: list[dict[str, Any]], max_batch_size: int) -> list[dict[str, Any]]:
+    """Group event envelopes into batched payloads of at most ``max_batch_size``."""
+    return [
+        {
+            "event_type": BATCH_EVENT_TYPE,
+            "delivery_id": secrets.token_hex(8),
+            "timestamp": datetime.now(UTC).isoformat(),
+            "events": events[start : start + max_batch_size],
+        }
+        for start in range(0, len(events), max_batch_size)
+    ]
+
+
+@dataclass
+class DeadLetter:
+    """A payload that could not be delivered."""
+
+    webhook_id: UUID
+    payload: dict[str, Any]
+    error: str
+    status_code: int
+    attempts: int
+
+    @property
+    def retryable(self) -> bool:
+        # Receivers rejecting a payload (4xx) will reject it again
+        return not 400 <= self.status_code < 500
+
+
+@dataclass
+class DeliveryStats:
+    """Delivery counters accumulated in memory and flushed in one statement."""
+
+    delivered: dict[UUID, int] = field(default_factory=lambda: defaultdict(int))
+    failed: dict[UUID, int] = field(default_factory=lambda: defaultdict(int))
+    last_delivery_at: dict[UUID, datetime] = field(default_factory=dict)
+
+    def record(self, webhook_id: UUID, success: bool) -> None:
+        if success:
+            self.delivered[webhook_id] += 1
+            self.last_delivery_at[webhook_id] = datetime.now(UTC)
+        else:
+            self.failed[webhook_id] += 1
+
+    async def flush(self, db: AsyncSession) -> None:
+        """Add the accumulated counts to each webhook row, then reset."""
+        from app.models.production_features import WebhookIntegrationRecord
+
+        table = WebhookIntegrationRecord.__table__
+        rows = [
+            {
+                "webhook_id": webhook_id,
+                "delivered": self.delivered.get(webhook_id, 0),
+                "failed": self.failed.get(webhook_id, 0),
+                "delivered_at": self.last_delivery_at.get(webhook_id),
+            }
+            for webhook_id in {*self.delivered, *self.failed}
+        ]
+        if not rows:
+            return
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("webhook_id"))
+            .values(
+                delivery_count=func.coalesce(table.c.delivery_count, 0)
+                + bindparam("delivered", type_=Integer),
+                failure_count=func.coalesce(table.c.failure_count, 0)
+                + bindparam("failed", type_=Integer),
+                last_delivery_at=func.coalesce(
+                    bindparam("delivered_at", type_=DateTime(timezone=True)),
+                    table.c.last_delivery_at,
+                ),
+            )
+        )
+        await db.execute(stmt, rows)
+        self.delivered.clear()
+        self.failed.clear()
+        self.last_delivery_at.clear()
+
+
+@dataclass
+class DispatchReport:
+    """Outcome of delivering one burst of events."""
+
+    deliveries: int = 0
+    succeeded: int = 0
+    stats: DeliveryStats = field(default_factory=DeliveryStats)
+    dead_letters: list[DeadLetter] = field(default_factory=list)
+
+    async def persist(self, db: AsyncSession) -> None:
+        """Flush counters and write dead letters."""
+        from app.models.production_features import WebhookDeadLetterRecord
+
+        await self.stats.flush(db)
+        for letter in self.dead_letters:
+            db.add(
+                WebhookDeadLetterRecord(
+                    webhook_id=letter.webhook_id,
+                    event_type=letter.payload.get("event_type", ""),
+                    payload=letter.payload,
+                    error=letter.error,
+                    status_code=letter.status_code,
+                    attempts=letter.attempts,
+                )
+            )
+        self.dead_letters = []
+
+
+class WebhookDispatcher:
+    """Deliver event bursts to the receivers subscribed to them."""
+
+    def __init__(
+        self,
+        index: SubscriptionIndex,
+        per_host_concurrency: int = 8,
+        max_batch_size: int = 100,
+        max_retries: int = 2,
+    ):
+        self.index = index
+        self.per_host_concurrency = per_host_concurrency
+        self.max_batch_size = max_batch_size
+        self.max_retries = max_retries
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+
+    def plan(self, events: list[dict[str, Any]]) -> list[tuple[WebhookTarget, dict[str, Any]]]:
+        """Resolve subscribers and build the payloads each one receives."""
+        per_target: dict[UUID, list[dict[str, Any]]] = defaultdict(list)
+        for event in events:
+            for target in self.index.subscribers(event["event_type"]):
+                per_target[target.id].append(event)
+
+        deliveries: list[tuple[WebhookTarget, dict[str, Any]]] = []
+        for webhook_id, target_events in per_target.items():
+            target = self.index.targets[webhook_id]
+            if target.batch_events and len(target_events) > 1:
+                payloads = coalesce(target_events, self.max_batch_size)
+            else:
+                payloads = target_events
+            deliveries.extend((target, payload) for payload in payloads)
+        return deliveries
+
+    async def dispatch(self, events: list[dict[str, Any]]) -> DispatchReport:
+        """Deliver ``events`` to every subscribed webhook."""
+        report = await self.deliver_all(self.plan(events))
+        logger.info(
+            "webhook_dispatch.completed",
+            events=len(events),
+            deliveries=report.deliveries,
+            succeeded=report.succeeded,
+            failed=len(report.dead_letters),
+        )
+        return report
+
+    async def deliver_all(
+        self,
+        deliveries: list[tuple[WebhookTarget, dict[str, Any]]],
+        prior_attempts: int = 0,
+    ) -> DispatchReport:
+        """Send planned deliveries; failures are returned as dead letters.
+
+        ``prior_attempts`` counts earlier tries of the same payloads, so
+        dead letters record the total number of attempts.
+        """
+        report = DispatchReport(deliveries=len(deliveries))
+        if not deliveries:
+            return report
+
+        outcomes = await asyncio.gather(
+            *(self.send(target, payload) for target, payload in deliveries)
+        )
+        for (target, payload), (success, status_code, error) in zip(
+            deliveries, outcomes, strict=True
+        ):
+            report.stats.record(target.id, success)
+            if success:
+                report.succeeded += 1
+            else:
+                report.dead_letters.append(
+                    DeadLetter(
+                        webhook_id=target.id,
+                        payload=payload,
+                        error=error,
+                        status_code=status_code,
+                        # 4xx responses are not retried by ``deliver``
+                        attempts=prior_attempts
+                        + (1 if 400 <= status_code < 500 else self.max_retries + 1),
+                    )
+                )
+        return report
+
+    async def send(self, target: WebhookTarget, payload: dict[str, Any]) -> tuple[bool, int, str]:
+        """Deliver one payload, respecting the per-host concurrency cap."""
+        host = urlparse(target.url).netloc
+        limit = self._host_limits.setdefault(host, asyncio.Semaphore(self.per_host_concurrency))
+        async with limit:
+            return await deliver(
+                url=target.url,
+                payload=payload,
+                secret=target.secret,
+                headers=target.headers,
+                max_retries=self.max_retries,
+            )
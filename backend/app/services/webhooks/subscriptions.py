@@ -0,0 +1,169 @@
+"""Cached event-type → webhook subscription index.
+
+Dispatch used to load every active webhook and filter subscriptions in
+Python for each event. The index is built once from a single query, held
+per process, and rebuilt only when a webhook changes (signalled through a
+version counter in Redis) or its TTL lapses.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+
+logger = structlog.get_logger(__name__)
+
+WILDCARD = "*"
+_VERSION_KEY = "webhooks:subscriptions:version"
+
+
+@dataclass(frozen=True)
+class WebhookTarget:
+    """Everything needed to deliver to one webhook without re-reading its row."""
+
+    id: UUID
+    url: str
+    secret: str = ""
+    headers: dict[str, str] | None = None
+    batch_events: bool = False
+
+
+@dataclass
+class SubscriptionIndex:
+    """Active webhooks keyed by the event types they subscribe to."""
+
+    targets: dict[UUID, WebhookTarget] = field(default_factory=dict)
+    by_event: dict[str, tuple[UUID, ...]] = field(default_factory=dict)
+    wildcard: tuple[UUID, ...] = ()
+
+    @classmethod
+    async def load(cls, db: AsyncSession) -> "SubscriptionIndex":
+        from app.models.production_features import WebhookIntegrationRecord as W
+
+        result = await db.execute(
+            select(W.id, W.url, W.secret, W.headers, W.event_types, W.batch_events).where(
+                W.active.is_(True)
+            )
+        )
+        targets: dict[UUID, WebhookTarget] = {}
+        by_event: dict[str, list[UUID]] = {}
+        wildcard: list[UUID] = []
+        for row in result.all():
+            targets[row.id] = WebhookTarget(
+                id=row.id,
+                url=row.url,
+                secret=row.secret or "",
+                headers=dict(row.headers) if row.headers else None,
+                batch_events=bool(row.batch_events),
+            )
+            for event_type in set(row.event_types or []):
+                if event_type == WILDCARD:
+                    wildcard.append(row.id)
+                else:
+                    by_event.setdefault(event_type, []).append(row.id)
+        return cls(
+            targets=targets,
+            by_event={k: tuple(v) for k, v in by_event.items()},
+            wildcard=tuple(wildcard),
+        )
+
+    def subscribers(self, event_type: str) -> list[WebhookTarget]:
+        """Targets subscribed to ``event_type`` directly or via ``*``."""
+        ids = dict.fromkeys(self.by_event.get(event_type, ()))
+        ids.update(dict.fromkeys(self.wildcard))
+        return [self.targets[i] for i in ids]
+
+    def get(self, webhook_id: UUID) -> WebhookTarget | None:
+        return self.targets.get(webhook_id)
+
+
+class SubscriptionCache:
+    """Per-process holder of the subscription index.
+
+    ``invalidate()`` drops the local copy and bumps a Redis version counter
+    so other processes rebuild on their next lookup. Without Redis, the TTL
+    bounds how stale another process's index can get.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, redis_url: str | None = None):
+        self.ttl_seconds = ttl_seconds
+        self.redis_url = redis_url
+        self._redis: Any = None
+        self._index: SubscriptionIndex | None = None
+        self._version: int | None = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self, db: AsyncSession) -> SubscriptionIndex:
+        version = await self._remote_version()
+        if self._is_fresh(version):
+            return self._index
+        async with self._lock:
+            if self._is_fresh(version):
+                return self._index
+            self._index = await SubscriptionIndex.load(db)
+            self._version = version
+            self._loaded_at = time.monotonic()
+            logger.debug(
+                "webhook_subscriptions.reloaded",
+                webhooks=len(self._index.targets),
+                version=version,
+            )
+            return self._index
+
+    async def invalidate(self) -> None:
+        self._index = None
+        client = self._client()
+        if client is None:
+            return
+        try:
+            await client.incr(_VERSION_KEY)
+        except Exception as e:
+            logger.warning("webhook_subscriptions.invalidate_failed", error=str(e))
+
+    def _is_fresh(self, version: int | None) -> bool:
+        return (
+            self._index is not None
+            and version == self._version
+            and time.monotonic() - self._loaded_at < self.ttl_seconds
+        )
+
+    async def _remote_version(self) -> int | None:
+        client = self._client()
+        if client is None:
+            return None
+        try:
+            value = await client.get(_VERSION_KEY)
+        except Exception as e:
+            logger.debug("webhook_subscriptions.version_unavailable", error=str(e))
+            return None
+        return int(value) if value is not None else 0
+
+    def _client(self) -> Any:
+        if self._redis is None and self.redis_url:
+            try:
+                import redis.asyncio as aioredis
+            except ImportError:
+                self.redis_url = None
+                return None
+            self._redis = aioredis.from_url(self.redis_url)
+        return self._redis
+
+
+_cache: SubscriptionCache | None = None
+
+
+def get_subscription_cache() -> SubscriptionCache:
+    """Get or create the process-wide subscription cache."""
+    global _cache
+    if _cache is None:
+        _cache = SubscriptionCache(redis_url=settings.redis_url)
+    return _cache
@@ -18,6 +18,7 @@ celery_app = Celery(
         "app.workers.pattern_marketplace_tasks",
         "app.workers.ide_agent_tasks",
         "app.workers.webhook_delivery_tasks",
+        "app.workers.search_tasks",
     ],
 )
 
@@ -31,7 +32,8 @@ celery_app.conf.update(
     task_time_limit=3600,  # 1 hour
     task_soft_time_limit=3300,  # 55 minutes
     worker_prefetch_multiplier=1,
-    worker_concurrency=4,
+    worker_pool=settings.celery_worker_pool,
+    worker_concurrency=settings.celery_worker_concurrency,
 )
 
 # Beat schedule for periodic tasks
@@ -40,6 +42,10 @@ celery_app.conf.beat_schedule = {
         "task": "app.workers.monitoring_tasks.check_all_sources",
         "schedule": 6 * 3600,  # Every 6 hours
     },
+    "reindex-regulations": {
+        "task": "app.workers.search_tasks.reindex_regulations",
+        "schedule": 3600,  # Hourly
+    },
     "update-compliance-scores": {
         "task": "app.workers.analysis_tasks.update_all_compliance_scores",
         "schedule": 24 * 3600,  # Daily
@@ -62,6 +68,11 @@ celery_app.conf.beat_schedule = {
         "task": "app.workers.pattern_marketplace_tasks.cleanup_expired_installations",
         "schedule": 24 * 3600,  # Daily
     },
+    # PR Bot tasks
+    "requeue-expired-pr-analyses": {
+        "task": "app.workers.pr_bot_tasks.requeue_expired_analyses",
+        "schedule": 60,  # Every minute
+    },
     # IDE Agent tasks
     "cleanup-stale-sessions": {
         "task": "app.workers.ide_agent_tasks.cleanup_stale_sessions",
@@ -2,12 +2,15 @@
 
 import asyncio
 from datetime import UTC, datetime, timedelta
+from typing import Any
 from uuid import UUID
 
 import structlog
 
 from app.core.database import get_db_context
+from app.core.exceptions import RepositoryError
 from app.workers import celery_app
+from app.workers.runtime import run_async
 
 
 logger = structlog.get_logger()
@@ -17,7 +20,105 @@ logger = structlog.get_logger()
 def analyze_repository(repository_id: str, organization_id: str):
     """Analyze a repository for compliance."""
     logger.info(f"Analyzing repository: {repository_id}")
-    asyncio.run(_analyze_repository_async(repository_id, organization_id))
+    run_async(_analyze_repository_async(repository_id, organization_id))
+
+
+async def _ingest_repository(
+    db: Any, repository: Any, organization_id: UUID, run: Any
+) -> dict[str, str]:
+    """Read a repository from one local checkout and feed every analyzer.
+
+    Refreshes the repository's cached structure, languages and commit, then
+    generates its SBOM, scans its IaC files, builds its codebase graph and
+    (with ``fulltext_index_dir``) reindexes its source files for search, all
+    from the same working tree. Returns the compliance-relevant file
+    contents, by path, for requirement mapping.
+    """
+    from app.core.config import settings
+    from app.services.digital_twin.codebase_graph import (
+        SOURCE_EXTENSIONS,
+        get_codebase_graph_builder,
+    )
+    from app.services.fulltext import (
+        CODEBASE_FILES,
+        codebase_file_document,
+        codebase_file_id,
+        get_local_search_engine,
+        replace_documents,
+    )
+    from app.services.github.analyzer import analyze_repository, repository_clone_url
+    from app.services.iac_scanner.service import IaCScannerService
+    from app.services.ingestion import FileFilter
+    from app.services.sbom.generator import get_sbom_generator
+
+    analysis = await analyze_repository(repository, run.access_token, run=run)
+    checkout = await run.checkout(repository_clone_url(repository))
+
+    repository.structure_cache = {
+        entry["path"]: {"type": "dir"} if entry["type"] == "tree" else entry["size"]
+        for entry in checkout.tree()
+    }
+    repository.structure_cached_at = datetime.now(UTC)
+    repository.languages = analysis["languages"]
+    repository.primary_language = analysis["repository"]["primary_language"]
+    repository.file_count = analysis["file_count"]
+    repository.last_analyzed_commit = checkout.commit_sha
+
+    async def sbom() -> int:
+        generator = get_sbom_generator()
+        dependency_files = await generator.dependency_files_from_checkout(checkout)
+        if not dependency_files:
+            return 0
+        document = await generator.generate_sbom(
+            organization_id=organization_id,
+            repository_id=repository.id,
+            name=repository.full_name,
+            version=checkout.commit_sha,
+            dependency_files=dependency_files,
+        )
+        return len(document.components)
+
+    async def iac_scan() -> int:
+        result = await IaCScannerService(db).scan_repository(
+            str(organization_id), checkout.url, checkout=checkout
+        )
+        return len(result.violations)
+
+    async def graph() -> int:
+        built = await get_codebase_graph_builder().build_graph_from_checkout(
+            repository.id, organization_id, checkout
+        )
+        return len(built.nodes)
+
+    async def search_index() -> int:
+        if not settings.fulltext_index_dir:
+            return 0
+        name = repository.full_name
+        files = await checkout.load_files(FileFilter(extensions=SOURCE_EXTENSIONS))
+        documents = {
+            codebase_file_id(name, path): codebase_file_document(name, path, content)
+            for path, content in files.items()
+        }
+        index = get_local_search_engine().get_index(CODEBASE_FILES)
+        await asyncio.to_thread(
+            replace_documents, index, documents, lambda source: source.get("repository") == name
+        )
+        return len(documents)
+
+    components, violations, nodes, indexed = await asyncio.gather(
+        sbom(), iac_scan(), graph(), search_index()
+    )
+    logger.info(
+        "Repository ingested",
+        repository=repository.full_name,
+        commit=checkout.commit_sha,
+        files=analysis["file_count"],
+        sbom_components=components,
+        iac_violations=violations,
+        graph_nodes=nodes,
+        indexed_files=indexed,
+    )
+    return analysis["file_samples"]
 
 
 async def _analyze_repository_async(repository_id: str, organization_id: str):
@@ -27,7 +128,9 @@ async def _analyze_repository_async(repository_id: str, organization_id: str):
 
     from app.agents.orchestrator import ComplianceOrchestrator
     from app.models.codebase import Repository
+    from app.models.organization import Organization
     from app.models.requirement import Requirement
+    from app.services.ingestion import IngestionRun
 
     async with get_db_context() as db:
         # Get repository
@@ -67,9 +170,32 @@ async def _analyze_repository_async(repository_id: str, organization_id: str):
                 await db.commit()
                 return
 
+            organization = await db.get(Organization, UUID(organization_id))
+            access_token = (
+                organization.settings.get("github_access_token")
+                if organization and organization.settings
+                else None
+            )
+
+            # Read the repository once from a local checkout; if it cannot be
+            # cloned, requirement mapping runs on the cached structure alone.
+            # The checkout is released before the (slow) mapping starts.
+            sample_files = None
+            async with IngestionRun(access_token=access_token) as run:
+                try:
+                    sample_files = await _ingest_repository(
+                        db, repository, UUID(organization_id), run
+                    )
+                except RepositoryError as e:
+                    logger.warning(
+                        "Repository checkout failed",
+                        repository=repository.full_name,
+                        error=e.message,
+                    )
+
             # Run analysis
             orchestrator = ComplianceOrchestrator(db, UUID(organization_id))
-            mappings = await orchestrator.analyze_repository(repository, requirements)
+            mappings = await orchestrator.analyze_repository(repository, requirements, sample_files)
 
             # Update repository stats
             repository.last_analyzed_at = datetime.now(UTC)
@@ -101,7 +227,7 @@ async def _analyze_repository_async(repository_id: str, organization_id: str):
 def generate_compliance_fix(mapping_id: str, organization_id: str):
     """Generate compliance fix for a mapping."""
     logger.info(f"Generating fix for mapping: {mapping_id}")
-    asyncio.run(_generate_fix_async(mapping_id, organization_id))
+    run_async(_generate_fix_async(mapping_id, organization_id))
 
 
 async def _generate_fix_async(mapping_id: str, organization_id: str):
@@ -161,46 +287,28 @@ async def _generate_fix_async(mapping_id: str, organization_id: str):
 def update_all_compliance_scores():
     """Update compliance scores for all repositories."""
     logger.info("Updating all compliance scores")
-    asyncio.run(_update_scores_async())
+    run_async(_update_scores_async())
 
 
 async def _update_scores_async():
-    """Async implementation of score updates."""
-    from sqlalchemy import func, select
+    """Async implementation of score updates.
 
-    from app.models.codebase import CodebaseMapping, ComplianceStatus, Repository
+    Mapping changes already refresh their repository on flush, so this
+    full, set-based pass only repairs drift from writes made outside the ORM.
+    """
+    from app.services.scoring.repository_scores import recompute_repository_scores
 
     async with get_db_context() as db:
-        result = await db.execute(select(Repository).where(Repository.is_active))
-        repositories = list(result.scalars().all())
-
-        for repo in repositories:
-            # Count mappings by status
-            mapping_result = await db.execute(
-                select(CodebaseMapping.compliance_status, func.count(CodebaseMapping.id))
-                .where(CodebaseMapping.repository_id == repo.id)
-                .group_by(CodebaseMapping.compliance_status)
-            )
-
-            status_counts = {row[0]: row[1] for row in mapping_result}
-
-            total = sum(status_counts.values())
-            compliant = status_counts.get(ComplianceStatus.COMPLIANT, 0)
-
-            repo.total_requirements = total
-            repo.compliant_requirements = compliant
-            if total > 0:
-                repo.compliance_score = compliant / total * 100
-
+        updated = await recompute_repository_scores(db)
         await db.commit()
-        logger.info(f"Updated scores for {len(repositories)} repositories")
+        logger.info(f"Updated scores for {updated} repositories")
 
 
 @celery_app.task(name="app.workers.analysis_tasks.cleanup_old_data")
 def cleanup_old_data():
     """Cleanup old audit trail entries and temporary data."""
     logger.info("Running data cleanup")
-    asyncio.run(_cleanup_async())
+    run_async(_cleanup_async())
 
 
 async def _cleanup_async():
@@ -222,7 +330,7 @@ async def _cleanup_async():
 def create_compliance_pr(action_id: str, organization_id: str):
     """Create a PR for a compliance action."""
     logger.info(f"Creating PR for action: {action_id}")
-    asyncio.run(_create_pr_async(action_id, organization_id))
+    run_async(_create_pr_async(action_id, organization_id))
 
 
 async def _create_pr_async(action_id: str, organization_id: str):
@@ -1,6 +1,5 @@
 """Background tasks for IDE Agent service."""
 
-import asyncio
 from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
@@ -8,6 +7,7 @@ import structlog
 
 from app.core.database import get_db_context
 from app.workers import celery_app
+from app.workers.runtime import run_async
 
 
 logger = structlog.get_logger()
@@ -26,7 +26,7 @@ def run_full_analysis(
     triggered by IDE events like file save or manual request.
     """
     logger.info(f"Running IDE agent analysis: session={session_id}, org={organization_id}")
-    asyncio.run(_run_full_analysis_async(session_id, organization_id, repository_id, target_files))
+    run_async(_run_full_analysis_async(session_id, organization_id, repository_id, target_files))
 
 
 async def _run_full_analysis_async(
@@ -109,7 +109,7 @@ def generate_fixes(
     Creates fix suggestions that can be reviewed and applied.
     """
     logger.info(f"Generating fixes for {len(violation_ids)} violations in session: {session_id}")
-    asyncio.run(_generate_fixes_async(session_id, organization_id, violation_ids))
+    run_async(_generate_fixes_async(session_id, organization_id, violation_ids))
 
 
 async def _generate_fixes_async(
@@ -195,7 +195,7 @@ def apply_approved_fixes(
     Executes the approved fixes and updates the codebase.
     """
     logger.info(f"Applying approved fixes: action={action_id}")
-    asyncio.run(_apply_approved_fixes_async(session_id, organization_id, action_id))
+    run_async(_apply_approved_fixes_async(session_id, organization_id, action_id))
 
 
 async def _apply_approved_fixes_async(
@@ -294,7 +294,7 @@ def create_github_issue(
     Creates an issue with details about the violation and suggested fixes.
     """
     logger.info(f"Creating GitHub issue for violation: {violation_id}")
-    asyncio.run(_create_github_issue_async(session_id, organization_id, violation_id))
+    run_async(_create_github_issue_async(session_id, organization_id, violation_id))
 
 
 async def _create_github_issue_async(
@@ -369,7 +369,7 @@ def cleanup_stale_sessions():
     Should be scheduled to run hourly.
     """
     logger.info("Cleaning up stale IDE agent sessions")
-    asyncio.run(_cleanup_stale_sessions_async())
+    run_async(_cleanup_stale_sessions_async())
 
 
 async def _cleanup_stale_sessions_async():
@@ -414,7 +414,7 @@ def aggregate_session_stats(organization_id: str):
     and time saved for an organization.
     """
     logger.info(f"Aggregating IDE agent stats for organization: {organization_id}")
-    asyncio.run(_aggregate_session_stats_async(organization_id))
+    run_async(_aggregate_session_stats_async(organization_id))
 
 
 async def _aggregate_session_stats_async(organization_id: str):
@@ -1,25 +1,29 @@
 """Regulatory monitoring background tasks."""
 
-import asyncio
 from datetime import UTC, datetime
 
 import structlog
 
 from app.core.database import get_db_context
 from app.models.regulation import RegulatorySource
+from app.services.copilot_chat.service import index_regulation_change
 from app.services.monitoring.gdpr_sources import GDPRSourceMonitor
 from app.services.monitoring.service import monitoring_service
 from app.workers import celery_app
+from app.workers.runtime import run_async
 
 
 logger = structlog.get_logger()
 
+# Keep the copilot chat corpus in step with crawled regulation changes
+monitoring_service.on_change(index_regulation_change)
+
 
 @celery_app.task(name="app.workers.monitoring_tasks.check_all_sources")
 def check_all_sources():
     """Check all regulatory sources for updates."""
     logger.info("Starting regulatory source check")
-    asyncio.run(_check_all_sources_async())
+    run_async(_check_all_sources_async())
     logger.info("Completed regulatory source check")
 
 
@@ -32,7 +36,7 @@ async def _check_all_sources_async():
 def check_single_source(source_id: str):
     """Check a single regulatory source for updates."""
     logger.info(f"Checking source: {source_id}")
-    asyncio.run(_check_single_source_async(source_id))
+    run_async(_check_single_source_async(source_id))
 
 
 async def _check_single_source_async(source_id: str):
@@ -57,7 +61,7 @@ async def _check_single_source_async(source_id: str):
 def check_gdpr_sources():
     """Check all GDPR regulatory sources."""
     logger.info("Checking GDPR sources")
-    asyncio.run(_check_gdpr_sources_async())
+    run_async(_check_gdpr_sources_async())
 
 
 async def _check_gdpr_sources_async():
@@ -100,7 +104,7 @@ async def _check_gdpr_sources_async():
 def process_regulatory_change(source_id: str, change_data: dict):
     """Process a detected regulatory change."""
     logger.info(f"Processing regulatory change from source: {source_id}")
-    asyncio.run(_process_change_async(source_id, change_data))
+    run_async(_process_change_async(source_id, change_data))
 
 
 async def _process_change_async(source_id: str, change_data: dict):
@@ -167,7 +171,7 @@ async def _process_change_async(source_id: str, change_data: dict):
 def analyze_regulation_for_org(regulation_id: str, organization_id: str, profile_id: str):
     """Analyze a regulation for a specific organization."""
     logger.info(f"Analyzing regulation {regulation_id} for org {organization_id}")
-    asyncio.run(_analyze_for_org_async(regulation_id, organization_id, profile_id))
+    run_async(_analyze_for_org_async(regulation_id, organization_id, profile_id))
 
 
 async def _analyze_for_org_async(regulation_id: str, organization_id: str, profile_id: str):
@@ -1,6 +1,5 @@
 """Notification background tasks."""
 
-import asyncio
 from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID
@@ -10,6 +9,7 @@ import structlog
 
 from app.core.database import get_db_context
 from app.workers import celery_app
+from app.workers.runtime import run_async
 
 
 logger = structlog.get_logger()
@@ -19,7 +19,7 @@ logger = structlog.get_logger()
 def send_email(to: str, subject: str, body: str, html_body: str | None = None):
     """Send an email notification."""
     logger.info(f"Sending email to {to}: {subject}")
-    asyncio.run(_send_email_async(to, subject, body, html_body))
+    run_async(_send_email_async(to, subject, body, html_body))
 
 
 async def _send_email_async(to: str, subject: str, body: str, html_body: str | None):
@@ -60,7 +60,7 @@ async def _send_email_async(to: str, subject: str, body: str, html_body: str | N
 def send_slack_notification(webhook_url: str, message: dict[str, Any]):
     """Send a Slack notification."""
     logger.info("Sending Slack notification")
-    asyncio.run(_send_slack_async(webhook_url, message))
+    run_async(_send_slack_async(webhook_url, message))
 
 
 async def _send_slack_async(webhook_url: str, message: dict[str, Any]):
@@ -75,7 +75,7 @@ async def _send_slack_async(webhook_url: str, message: dict[str, Any]):
 def notify_regulatory_change(organization_id: str, regulation_data: dict[str, Any]):
     """Notify organization of a regulatory change."""
     logger.info(f"Notifying org {organization_id} of regulatory change")
-    asyncio.run(_notify_change_async(organization_id, regulation_data))
+    run_async(_notify_change_async(organization_id, regulation_data))
 
 
 async def _notify_change_async(organization_id: str, regulation_data: dict[str, Any]):
@@ -118,7 +118,7 @@ Please review the changes in your ComplianceAgent dashboard.
 def notify_compliance_gap(organization_id: str, gap_data: dict[str, Any]):
     """Notify organization of a compliance gap."""
     logger.info(f"Notifying org {organization_id} of compliance gap")
-    asyncio.run(_notify_gap_async(organization_id, gap_data))
+    run_async(_notify_gap_async(organization_id, gap_data))
 
 
 async def _notify_gap_async(organization_id: str, gap_data: dict[str, Any]):
@@ -164,7 +164,7 @@ Immediate action is recommended. Review in your ComplianceAgent dashboard.
 def send_daily_digest():
     """Send daily compliance digest to all organizations."""
     logger.info("Sending daily compliance digests")
-    asyncio.run(_send_digest_async())
+    run_async(_send_digest_async())
 
 
 async def _send_digest_async():
@@ -249,7 +249,7 @@ Review your full dashboard at: https://app.complianceagent.ai/dashboard
 def notify_deadline_approaching():
     """Notify organizations of approaching compliance deadlines."""
     logger.info("Checking for approaching deadlines")
-    asyncio.run(_check_deadlines_async())
+    run_async(_check_deadlines_async())
 
 
 async def _check_deadlines_async():
@@ -1,6 +1,5 @@
 """Background tasks for Pattern Marketplace service."""
 
-import asyncio
 from datetime import UTC, datetime
 from uuid import UUID
 
@@ -8,6 +7,7 @@ import structlog
 
 from app.core.database import get_db_context
 from app.workers import celery_app
+from app.workers.runtime import run_async
 
 
 logger = structlog.get_logger()
@@ -20,7 +20,7 @@ def update_pattern_metrics(pattern_id: str):
     Called when patterns are installed or rated.
     """
     logger.info(f"Updating metrics for pattern: {pattern_id}")
-    asyncio.run(_update_pattern_metrics_async(pattern_id))
+    run_async(_update_pattern_metrics_async(pattern_id))
 
 
 async def _update_pattern_metrics_async(pattern_id: str):
@@ -89,7 +89,7 @@ def process_publisher_payout(organization_id: str):
     Calculates earnings from recent purchases and initiates transfer.
     """
     logger.info(f"Processing payout for publisher: {organization_id}")
-    asyncio.run(_process_publisher_payout_async(organization_id))
+    run_async(_process_publisher_payout_async(organization_id))
 
 
 async def _process_publisher_payout_async(organization_id: str):
@@ -160,7 +160,7 @@ def check_pattern_updates(organization_id: str):
     Notifies organization when updates are available for installed patterns.
     """
     logger.info(f"Checking pattern updates for organization: {organization_id}")
-    asyncio.run(_check_pattern_updates_async(organization_id))
+    run_async(_check_pattern_updates_async(organization_id))
 
 
 async def _check_pattern_updates_async(organization_id: str):
@@ -236,7 +236,7 @@ def update_marketplace_stats():
     Should be scheduled to run hourly.
     """
     logger.info("Updating marketplace statistics")
-    asyncio.run(_update_marketplace_stats_async())
+    run_async(_update_marketplace_stats_async())
 
 
 async def _update_marketplace_stats_async():
@@ -299,7 +299,7 @@ def cleanup_expired_installations():
     or where licenses have expired.
     """
     logger.info("Cleaning up expired installations")
-    asyncio.run(_cleanup_expired_installations_async())
+    run_async(_cleanup_expired_installations_async())
 
 
 async def _cleanup_expired_installations_async():
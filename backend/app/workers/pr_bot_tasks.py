@@ -1,78 +1,159 @@
 """PR Bot Celery tasks - Background processing for PR analysis."""
 
 import asyncio
+from typing import TYPE_CHECKING
 from uuid import UUID
 
 import structlog
 
 from app.core.database import get_db_context
 from app.workers import celery_app
+from app.workers.runtime import async_task, run_async
+
+
+if TYPE_CHECKING:
+    from app.services.pr_bot.queue import PRAnalysisJob, RedisPRAnalysisQueue
 
 
 logger = structlog.get_logger()
 
 
-@celery_app.task(
-    name="app.workers.pr_bot_tasks.analyze_pr",
-    bind=True,
-    max_retries=3,
-    default_retry_delay=60,
-)
-def analyze_pr(
-    self,
+# Most wake-ups one enqueue sends; each drain runs until the queue is empty
+_MAX_WAKEUPS = 8
+_DRAIN_BATCH = 20
+
+
+def _shared_queue() -> "RedisPRAnalysisQueue | None":
+    """The Redis analysis queue, or None when this process only has an in-memory one."""
+    from app.services.pr_bot.queue import RedisPRAnalysisQueue
+    from app.services.pr_bot.service import get_pr_bot_service
+
+    queue = get_pr_bot_service().queue
+    if isinstance(queue, RedisPRAnalysisQueue):
+        return queue
+    logger.warning("PR analysis queue is in memory, workers cannot drain it")
+    return None
+
+
+async def enqueue_analyses(jobs: list["PRAnalysisJob"]) -> list[str]:
+    """Queue PR analysis jobs and wake workers to run them.
+
+    Returns the live job id for each PR, which is the id of an already
+    queued job when the same head was pushed before.
+    """
+    from app.services.pr_bot.service import get_pr_bot_service
+
+    service = get_pr_bot_service()
+    job_ids = [await service.enqueue(job) for job in jobs]
+    for _ in range(min(len(job_ids), _MAX_WAKEUPS)):
+        process_analysis_queue.delay()
+    return job_ids
+
+
+@async_task(name="app.workers.pr_bot_tasks.analyze_pr")
+async def analyze_pr(
     task_data: dict,
-    access_token: str,
+    access_token: str = "",
     organization_id: str | None = None,
 ):
-    """Analyze a PR for compliance issues.
+    """Queue a serialized PR analysis job.
 
-    Args:
-        task_data: PRAnalysisTask data as dictionary
-        access_token: GitHub access token
-        organization_id: Optional organization ID for context
+    Producers enqueue directly; this accepts messages published before they
+    did. The worker reads the GitHub token from the organization settings.
     """
-    logger.info(
-        "Starting PR analysis task",
-        task_data=task_data,
-        celery_task_id=self.request.id,
-    )
+    from app.services.pr_bot.queue import PRAnalysisJob
 
-    try:
-        result = asyncio.run(_analyze_pr_async(task_data, access_token, organization_id))
-        return result
-    except (OSError, RuntimeError, ValueError) as e:
-        logger.exception("PR analysis failed", error=str(e))
-        # Retry with exponential backoff
-        raise self.retry(exc=e, countdown=60 * (2**self.request.retries)) from e
+    job = PRAnalysisJob.from_dict(task_data)
+    if organization_id and job.organization_id is None:
+        job.organization_id = UUID(organization_id)
+    [job_id] = await enqueue_analyses([job])
+    return {"status": "queued", "task_id": job_id}
 
 
-async def _analyze_pr_async(
-    task_data: dict,
-    access_token: str,
-    organization_id: str | None,
-) -> dict:
-    """Async implementation of PR analysis."""
-    from app.services.pr_bot import PRBot, PRBotConfig
-    from app.services.pr_bot.queue import PRAnalysisTask
+@async_task(name="app.workers.pr_bot_tasks.process_analysis_queue")
+async def process_analysis_queue(max_jobs: int = _DRAIN_BATCH):
+    """Lease PR analysis jobs one at a time and run them until the queue is empty.
 
-    task = PRAnalysisTask.from_dict(task_data)
+    After ``max_jobs`` the drain hands over to a fresh task, so one worker
+    slot is not held for an unbounded backlog.
+    """
+    queue = _shared_queue()
+    if queue is None:
+        return {"processed": 0}
+
+    processed = 0
+    while processed < max_jobs:
+        job = await queue.dequeue()
+        if job is None:
+            break
+        await _run_job(queue, job)
+        processed += 1
+
+    if processed == max_jobs:
+        process_analysis_queue.delay(max_jobs)
+    return {"processed": processed}
+
+
+@async_task(name="app.workers.pr_bot_tasks.requeue_expired_analyses")
+async def requeue_expired_analyses():
+    """Re-deliver analyses whose worker died holding the lease.
+
+    Also wakes a drain whenever work is pending, which covers wake-ups that
+    were lost or jobs put back for a retry after their drain finished.
+    """
+    queue = _shared_queue()
+    if queue is None:
+        return {"reaped": 0}
+
+    reaped = await queue.requeue_expired()
+    if reaped or await queue.get_queue_size():
+        process_analysis_queue.delay()
+    return {"reaped": reaped}
+
+
+async def _run_job(queue: "RedisPRAnalysisQueue", job: "PRAnalysisJob") -> None:
+    """Run one leased job, renewing the lease until the analysis finishes."""
+    analysis = asyncio.ensure_future(_analyze_job(job))
+    while not analysis.done():
+        await asyncio.wait({analysis}, timeout=queue.lease_seconds / 3)
+        if not analysis.done() and not await queue.heartbeat(job):
+            # Superseded by a newer push or the lease was lost; a superseded
+            # job is cancelled by the reaper once its lease runs out
+            analysis.cancel()
+            await asyncio.wait({analysis})
+            logger.info("PR analysis dropped", task_id=str(job.id), pr=job.pr_key)
+            return
+
+    try:
+        result = analysis.result()
+    except Exception as e:
+        logger.exception("PR analysis failed", task_id=str(job.id), error=str(e))
+        await queue.fail(job, str(e))
+        return
+    await queue.complete(job, result)
+
+
+async def _analyze_job(job: "PRAnalysisJob") -> dict:
+    """Run the PR bot on ``job`` with its organization's config and token."""
+    from app.services.pr_bot.bot import PRBot, PRBotConfig
 
-    # Load organization-specific config if available
     config = PRBotConfig()
-    if organization_id:
+    access_token = ""
+    if job.organization_id:
         async with get_db_context() as db:
             from sqlalchemy import select
 
             from app.models.organization import Organization
 
             result = await db.execute(
-                select(Organization).where(Organization.id == UUID(organization_id))
+                select(Organization).where(Organization.id == job.organization_id)
             )
             org = result.scalar_one_or_none()
 
             if org and org.settings:
                 # Override config from organization settings
                 settings = org.settings
+                access_token = settings.get("github_access_token") or ""
                 config.enabled_regulations = settings.get(
                     "enabled_regulations", config.enabled_regulations
                 )
@@ -82,13 +163,12 @@ async def _analyze_pr_async(
                 config.block_on_high = settings.get("block_on_high", config.block_on_high)
                 config.deep_analysis = settings.get("deep_analysis", config.deep_analysis)
 
-    # Initialize bot and process
     bot = PRBot(config=config)
-    result = await bot.process_task(task, access_token)
+    result = await bot.process_task(job, access_token)
 
     # Store result in database
-    if organization_id:
-        await _store_analysis_result(result, organization_id)
+    if job.organization_id:
+        await _store_analysis_result(result, str(job.organization_id))
 
     return result.to_dict()
 
@@ -162,7 +242,7 @@ def process_pr_webhook(
         return {"status": "ignored", "reason": f"Action {action} not handled"}
 
     # Create task and queue for processing
-    return asyncio.run(_process_webhook_async(event_data, organization_id, access_token))
+    return run_async(_process_webhook_async(event_data, organization_id, access_token))
 
 
 async def _process_webhook_async(
@@ -171,23 +251,19 @@ async def _process_webhook_async(
     access_token: str,
 ) -> dict:
     """Async implementation of webhook processing."""
-    from app.services.pr_bot import PRBot, PRBotConfig
+    from app.services.pr_bot.bot import PRBot, PRBotConfig
 
     bot = PRBot(config=PRBotConfig())
-    task = await bot.handle_pr_event(event_data, access_token, UUID(organization_id))
+    job = await bot.handle_pr_event(event_data, access_token, UUID(organization_id))
 
-    # Queue the analysis task
-    analyze_pr.delay(
-        task_data=task.to_dict(),
-        access_token=access_token,
-        organization_id=organization_id,
-    )
+    # A push to a PR with a job still queued supersedes it
+    [job_id] = await enqueue_analyses([job])
 
     return {
         "status": "queued",
-        "task_id": str(task.id),
-        "pr_number": task.pr_number,
-        "repo": f"{task.owner}/{task.repo}",
+        "task_id": job_id,
+        "pr_number": job.pr_number,
+        "repo": f"{job.owner}/{job.repo}",
     }
 
 
@@ -200,7 +276,7 @@ def reanalyze_pr(
     organization_id: str | None = None,
 ):
     """Re-analyze an existing PR (e.g., after config change or fix applied)."""
-    return asyncio.run(_reanalyze_pr_async(owner, repo, pr_number, access_token, organization_id))
+    return run_async(_reanalyze_pr_async(owner, repo, pr_number, access_token, organization_id))
 
 
 async def _reanalyze_pr_async(
@@ -212,14 +288,13 @@ async def _reanalyze_pr_async(
 ) -> dict:
     """Async implementation of PR re-analysis."""
     from app.services.github.client import GitHubClient
-    from app.services.pr_bot import PRBot, PRBotConfig
-    from app.services.pr_bot.queue import PRAnalysisTask, PRTaskPriority
+    from app.services.pr_bot.queue import PRAnalysisJob, PRTaskPriority
 
     # Get current PR info
     async with GitHubClient(access_token=access_token) as client:
         pr = await client.get_pull_request(owner, repo, pr_number)
 
-    task = PRAnalysisTask(
+    job = PRAnalysisJob(
         owner=owner,
         repo=repo,
         pr_number=pr_number,
@@ -227,11 +302,9 @@ async def _reanalyze_pr_async(
         organization_id=UUID(organization_id) if organization_id else None,
         priority=PRTaskPriority.HIGH,  # Re-analysis gets higher priority
     )
+    [job_id] = await enqueue_analyses([job])
 
-    bot = PRBot(config=PRBotConfig())
-    result = await bot.process_task(task, access_token)
-
-    return result.to_dict()
+    return {"status": "queued", "task_id": job_id, "pr": job.pr_key}
 
 
 @celery_app.task(name="app.workers.pr_bot_tasks.create_fix_pr")
@@ -244,7 +317,7 @@ def create_fix_pr(
     organization_id: str | None = None,
 ):
     """Create a PR with automated compliance fixes."""
-    return asyncio.run(
+    return run_async(
         _create_fix_pr_async(owner, repo, pr_number, fixes, access_token, organization_id)
     )
 
@@ -286,44 +359,32 @@ async def _create_fix_pr_async(
     return result
 
 
-@celery_app.task(name="app.workers.pr_bot_tasks.batch_analyze_prs")
-def batch_analyze_prs(
+@async_task(name="app.workers.pr_bot_tasks.batch_analyze_prs")
+async def batch_analyze_prs(
     pr_list: list[dict],
     access_token: str,
     organization_id: str,
 ):
     """Analyze multiple PRs in batch (e.g., for backfill or re-analysis)."""
-    results = []
-    for pr_info in pr_list:
-        try:
-            result = analyze_pr.delay(
-                task_data={
-                    "owner": pr_info["owner"],
-                    "repo": pr_info["repo"],
-                    "pr_number": pr_info["pr_number"],
-                    "head_sha": pr_info.get("head_sha", ""),
-                },
-                access_token=access_token,
-                organization_id=organization_id,
-            )
-            results.append(
-                {
-                    "pr": f"{pr_info['owner']}/{pr_info['repo']}#{pr_info['pr_number']}",
-                    "task_id": result.id,
-                    "status": "queued",
-                }
-            )
-        except (OSError, RuntimeError, ValueError) as e:
-            results.append(
-                {
-                    "pr": f"{pr_info['owner']}/{pr_info['repo']}#{pr_info['pr_number']}",
-                    "status": "failed",
-                    "error": str(e),
-                }
-            )
+    from app.services.pr_bot.queue import PRAnalysisJob
+
+    jobs = [
+        PRAnalysisJob(
+            owner=pr_info["owner"],
+            repo=pr_info["repo"],
+            pr_number=pr_info["pr_number"],
+            head_sha=pr_info.get("head_sha", ""),
+            organization_id=UUID(organization_id),
+        )
+        for pr_info in pr_list
+    ]
+    job_ids = await enqueue_analyses(jobs)
 
     return {
         "total": len(pr_list),
-        "queued": sum(1 for r in results if r["status"] == "queued"),
-        "results": results,
+        "queued": len(job_ids),
+        "results": [
+            {"pr": job.pr_key, "task_id": job_id, "status": "queued"}
+            for job, job_id in zip(jobs, job_ids, strict=True)
+        ],
     }
@@ -1,6 +1,5 @@
 """Background tasks for Risk Quantification service."""
 
-import asyncio
 from datetime import UTC, datetime
 from uuid import UUID
 
@@ -8,6 +7,7 @@ import structlog
 
 from app.core.database import get_db_context
 from app.workers import celery_app
+from app.workers.runtime import run_async
 
 
 logger = structlog.get_logger()
@@ -21,7 +21,7 @@ def calculate_repository_risk(repository_id: str, organization_id: str):
     aggregating violation risks and generating a risk profile.
     """
     logger.info(f"Calculating risk for repository: {repository_id}")
-    asyncio.run(_calculate_repository_risk_async(repository_id, organization_id))
+    run_async(_calculate_repository_risk_async(repository_id, organization_id))
 
 
 async def _calculate_repository_risk_async(repository_id: str, organization_id: str):
@@ -117,7 +117,7 @@ def generate_org_risk_snapshot(organization_id: str):
     and creates a point-in-time snapshot.
     """
     logger.info(f"Generating risk snapshot for organization: {organization_id}")
-    asyncio.run(_generate_org_risk_snapshot_async(organization_id))
+    run_async(_generate_org_risk_snapshot_async(organization_id))
 
 
 async def _generate_org_risk_snapshot_async(organization_id: str):
@@ -238,7 +238,7 @@ def generate_executive_report(
     and recommendations.
     """
     logger.info(f"Generating {report_type} executive report for organization: {organization_id}")
-    asyncio.run(_generate_executive_report_async(organization_id, report_type, user_id))
+    run_async(_generate_executive_report_async(organization_id, report_type, user_id))
 
 
 async def _generate_executive_report_async(
@@ -306,7 +306,7 @@ def update_all_risk_scores():
     Should be scheduled to run daily.
     """
     logger.info("Updating risk scores for all organizations")
-    asyncio.run(_update_all_risk_scores_async())
+    run_async(_update_all_risk_scores_async())
 
 
 async def _update_all_risk_scores_async():
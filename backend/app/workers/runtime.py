@@ -0,0 +1,206 @@
+"""Async runtime shared by the Celery tasks of one worker process.
+
+Each worker process owns a single event loop, running on a daemon thread for
+the lifetime of the process, together with the pools bound to it: the
+SQLAlchemy engine from ``app.core.database``, a Redis client and an httpx
+connection pool. Tasks submit their coroutine to that loop instead of
+calling ``asyncio.run`` (which built a fresh loop per task and stranded
+pooled database connections on loops that no longer existed).
+
+With the default prefork pool the runtime starts on ``worker_process_init``
+in every child. With ``--pool threads`` several tasks run concurrently in
+one process and their coroutines interleave on the shared loop, which suits
+I/O-bound work (GitHub, LLM and webhook calls).
+"""
+
+import asyncio
+import functools
+import threading
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import httpx
+import structlog
+from celery.signals import (
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+
+from app.core.config import settings
+from app.core.http import http2_available, set_shared_http
+from app.core.process_pool import shutdown_process_pool
+from app.workers import celery_app
+
+
+logger = structlog.get_logger()
+
+_SHUTDOWN_TIMEOUT_SECONDS = 30
+
+
+class WorkerRuntime:
+    """A persistent event loop plus the connection pools that live on it."""
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.http_client: httpx.AsyncClient | None = None
+        self.redis: Any = None
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None and self._loop.is_running()
+
+    def start(self) -> None:
+        """Start the loop thread and open pools; a no-op when already running."""
+        with self._lock:
+            if self.running:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_run, name="worker-event-loop", daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop, self._thread = loop, thread
+            asyncio.run_coroutine_threadsafe(self._open_resources(), loop).result()
+            logger.info("worker_runtime.started")
+
+    def run[T](self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Run ``coro`` on the worker loop and block until it finishes.
+
+        Exceptions raised by the coroutine, including Celery's ``Retry``,
+        propagate to the calling task unchanged. If the wait ends early, by
+        timeout or by an exception raised in the calling thread such as a
+        soft time limit, the coroutine is cancelled.
+        """
+        if not self.running:
+            self.start()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("run() cannot be called from the worker event loop")
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def stop(self) -> None:
+        """Close pools, stop the loop and join its thread."""
+        with self._lock:
+            if not self.running:
+                return
+            loop, thread = self._loop, self._thread
+            try:
+                asyncio.run_coroutine_threadsafe(self._close_resources(), loop).result(
+                    _SHUTDOWN_TIMEOUT_SECONDS
+                )
+            except Exception as e:
+                logger.warning("worker_runtime.close_failed", error=str(e))
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(_SHUTDOWN_TIMEOUT_SECONDS)
+            loop.close()
+            self._loop = self._thread = None
+            logger.info("worker_runtime.stopped")
+
+    async def _open_resources(self) -> None:
+        transport = httpx.AsyncHTTPTransport(
+            http2=http2_available(),
+            limits=httpx.Limits(
+                max_connections=settings.worker_http_max_connections,
+                max_keepalive_connections=settings.worker_http_max_keepalive,
+            ),
+        )
+        self.http_client = httpx.AsyncClient(transport=transport, timeout=30.0)
+        set_shared_http(self.http_client, transport)
+
+        try:
+            import redis.asyncio as aioredis
+
+            self.redis = aioredis.from_url(settings.redis_url, decode_responses=True)
+        except ImportError:
+            self.redis = None
+
+    async def _close_resources(self) -> None:
+        from app.core.database import engine
+
+        set_shared_http(None, None)
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+        if self.redis is not None:
+            await self.redis.aclose()
+            self.redis = None
+        await engine.dispose()
+
+
+_runtime: WorkerRuntime | None = None
+
+
+def get_worker_runtime() -> WorkerRuntime:
+    """Get or create the runtime for this process."""
+    global _runtime
+    if _runtime is None:
+        _runtime = WorkerRuntime()
+    return _runtime
+
+
+def run_async[T](coro: Coroutine[Any, Any, T]) -> T:
+    """Run a task coroutine on this process's persistent worker loop."""
+    return get_worker_runtime().run(coro)
+
+
+def get_worker_redis() -> Any:
+    """The worker's pooled async Redis client, or ``None`` outside a worker."""
+    return get_worker_runtime().redis
+
+
+def async_task(**options: Any) -> Callable[[Callable[..., Coroutine[Any, Any, Any]]], Any]:
+    """Register a coroutine function as a Celery task run on the worker loop.
+
+    Accepts the same options as ``celery_app.task``. With ``bind=True`` the
+    task instance is passed as the first argument, as for sync tasks.
+    """
+
+    def decorator(func: Callable[..., Coroutine[Any, Any, Any]]) -> Any:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return run_async(func(*args, **kwargs))
+
+        return celery_app.task(**options)(wrapper)
+
+    return decorator
+
+
+@worker_init.connect
+def _on_worker_init(**kwargs: Any) -> None:
+    from app.services.scoring.repository_scores import install_score_maintenance
+
+    # Registered before prefork children are forked, so every pool inherits it
+    install_score_maintenance()
+
+
+@worker_process_init.connect
+def _on_worker_process_init(**kwargs: Any) -> None:
+    from app.core.database import engine
+
+    # Connections inherited from the parent over fork belong to the parent;
+    # drop them without closing so each child builds its own pool.
+    engine.sync_engine.dispose(close=False)
+    get_worker_runtime().start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _on_worker_shutdown(**kwargs: Any) -> None:
+    if _runtime is not None:
+        _runtime.stop()
+    shutdown_process_pool()
@@ -0,0 +1,51 @@
+"""Background tasks for the local full-text search indexes."""
+
+import asyncio
+
+import structlog
+
+from app.core.config import settings
+from app.core.database import get_db_context
+from app.workers import celery_app
+from app.workers.runtime import run_async
+
+
+logger = structlog.get_logger()
+
+
+@celery_app.task(name="app.workers.search_tasks.reindex_regulations")
+def reindex_regulations():
+    """Sync the local regulations index with the database.
+
+    Only runs when ``fulltext_index_dir`` is configured.
+    """
+    run_async(_reindex_regulations_async())
+
+
+async def _reindex_regulations_async() -> int:
+    """Async implementation of regulation reindexing; returns documents changed."""
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+
+    from app.models.regulation import Regulation
+    from app.services.fulltext import (
+        REGULATIONS,
+        get_local_search_engine,
+        regulation_document,
+        replace_documents,
+    )
+
+    if not settings.fulltext_index_dir:
+        return 0
+
+    async with get_db_context() as db:
+        result = await db.execute(select(Regulation).options(selectinload(Regulation.requirements)))
+        documents = {
+            str(regulation.id): regulation_document(regulation)
+            for regulation in result.scalars().all()
+        }
+
+    index = get_local_search_engine().get_index(REGULATIONS)
+    changed = await asyncio.to_thread(replace_documents, index, documents)
+    logger.info("Regulations reindexed", regulations=len(documents), changed=changed)
+    return changed
@@ -1,28 +1,37 @@
 """Celery tasks for outgoing webhook delivery with retry."""
 
 import asyncio
+from collections import defaultdict
 from datetime import UTC, datetime
 from uuid import UUID
 
 import structlog
 
 from app.core.database import get_db_context
-from app.services.webhooks.delivery import backoff_seconds, deliver
-from app.workers import celery_app
+from app.services.webhooks.delivery import backoff_seconds
+from app.services.webhooks.dispatcher import (
+    DeadLetter,
+    DispatchReport,
+    WebhookDispatcher,
+    build_event,
+)
+from app.services.webhooks.subscriptions import SubscriptionIndex, get_subscription_cache
+from app.workers.runtime import async_task
 
 
 logger = structlog.get_logger(__name__)
 
 _MAX_RETRIES = 5
+_REPLAY_BATCH_SIZE = 500
 
 
-@celery_app.task(
+@async_task(
     name="app.workers.webhook_delivery_tasks.deliver_webhook",
     bind=True,
     max_retries=_MAX_RETRIES,
     default_retry_delay=1,
 )
-def deliver_webhook(
+async def deliver_webhook(
     self,
     webhook_id: str,
     payload: dict,
@@ -40,104 +49,232 @@ def deliver_webhook(
         webhook_id=webhook_id,
         retry=retry_count,
     )
-    asyncio.run(_deliver_async(self, webhook_id, payload, retry_count))
+    await _deliver_async(self, webhook_id, payload, retry_count)
 
 
 async def _deliver_async(task, webhook_id: str, payload: dict, retry_count: int):
-    from sqlalchemy import select
+    index = await _subscriptions()
+    target = index.get(UUID(webhook_id))
+    if target is None:
+        logger.warning("webhook_task.skipped_inactive", webhook_id=webhook_id)
+        return
 
-    from app.models.production_features import WebhookIntegrationRecord
+    success, status_code, error = await WebhookDispatcher(index).send(target, payload)
+    report = DispatchReport(deliveries=1, succeeded=int(success))
+    report.stats.record(target.id, success)
 
-    async with get_db_context() as db:
-        result = await db.execute(
-            select(WebhookIntegrationRecord).where(WebhookIntegrationRecord.id == UUID(webhook_id))
+    if success:
+        await _persist(report)
+        logger.info(
+            "webhook_task.delivered",
+            webhook_id=webhook_id,
+            status=status_code,
         )
-        record = result.scalar_one_or_none()
+        return
 
-        if not record or not record.active:
-            logger.warning("webhook_task.skipped_inactive", webhook_id=webhook_id)
-            return
+    if retry_count >= _MAX_RETRIES:
+        report.dead_letters.append(
+            DeadLetter(target.id, payload, error, status_code, attempts=retry_count + 1)
+        )
+    await _persist(report)
 
-        success, status_code, error = await deliver(
-            url=record.url,
-            payload=payload,
-            secret=record.secret or "",
-            headers=dict(record.headers) if record.headers else None,
+    if retry_count < _MAX_RETRIES:
+        delay = backoff_seconds(retry_count)
+        logger.warning(
+            "webhook_task.retrying",
+            webhook_id=webhook_id,
+            error=error,
+            retry=retry_count + 1,
+            delay=delay,
+        )
+        task.retry(
+            kwargs={
+                "webhook_id": webhook_id,
+                "payload": payload,
+                "retry_count": retry_count + 1,
+            },
+            countdown=delay,
+        )
+    else:
+        logger.error(
+            "webhook_task.exhausted_retries",
+            webhook_id=webhook_id,
+            error=error,
         )
 
-        if success:
-            record.delivery_count = (record.delivery_count or 0) + 1
-            record.last_delivery_at = datetime.now(UTC)
-            await db.commit()
-            logger.info(
-                "webhook_task.delivered",
-                webhook_id=webhook_id,
-                status=status_code,
-            )
-            return
-
-        record.failure_count = (record.failure_count or 0) + 1
-        await db.commit()
-
-        if retry_count < _MAX_RETRIES:
-            delay = backoff_seconds(retry_count)
-            logger.warning(
-                "webhook_task.retrying",
-                webhook_id=webhook_id,
-                error=error,
-                retry=retry_count + 1,
-                delay=delay,
-            )
-            task.retry(
-                kwargs={
-                    "webhook_id": webhook_id,
-                    "payload": payload,
-                    "retry_count": retry_count + 1,
-                },
-                countdown=delay,
-            )
-        else:
-            logger.error(
-                "webhook_task.exhausted_retries",
-                webhook_id=webhook_id,
-                error=error,
-            )
 
+@async_task(name="app.workers.webhook_delivery_tasks.deliver_events", acks_late=True)
+async def deliver_events(events: list[dict]):
+    """Fan a burst of event envelopes out to every subscribed webhook.
 
-def dispatch_event(event_type: str, data: dict):
-    """Dispatch an event to all active webhooks subscribed to this event type.
+    Replaces one broker message per (event, webhook) pair with one per
+    burst. Failed deliveries are re-queued per webhook with exponential
+    backoff (see ``redeliver``).
+    """
+    index = await _subscriptions()
+    report = await WebhookDispatcher(index).dispatch(events)
+    retries = take_retries(report, retry_count=0)
+    await _persist(report)
+    schedule_retries(retries, retry_count=0)
+    return {
+        "events": len(events),
+        "deliveries": report.deliveries,
+        "succeeded": report.succeeded,
+    }
 
-    Call this from any service that wants to trigger outgoing webhooks.
+
+@async_task(name="app.workers.webhook_delivery_tasks.redeliver", acks_late=True)
+async def redeliver(webhook_id: str, payloads: list[dict], retry_count: int):
+    """Retry payloads that failed to reach one webhook.
+
+    Payloads failing again are re-queued with a longer delay until
+    ``_MAX_RETRIES`` is reached, then dead-lettered.
     """
-    asyncio.run(_dispatch_async(event_type, data))
+    index = await _subscriptions()
+    target = index.get(UUID(webhook_id))
+    if target is None:
+        logger.warning("webhook_task.skipped_inactive", webhook_id=webhook_id)
+        return {"payloads": len(payloads), "succeeded": 0}
 
+    dispatcher = WebhookDispatcher(index)
+    report = await dispatcher.deliver_all(
+        [(target, payload) for payload in payloads],
+        prior_attempts=retry_count * (dispatcher.max_retries + 1),
+    )
+    retries = take_retries(report, retry_count)
+    await _persist(report)
+    schedule_retries(retries, retry_count)
+    return {"payloads": len(payloads), "succeeded": report.succeeded}
+
+
+async def _subscriptions() -> SubscriptionIndex:
+    """The subscription index, read in a session closed before any delivery."""
+    async with get_db_context() as db:
+        return await get_subscription_cache().get(db)
+
+
+async def _persist(report: DispatchReport) -> None:
+    """Write a report's counters and dead letters in a short session of its own."""
+    async with get_db_context() as db:
+        await report.persist(db)
+
+
+def take_retries(report: DispatchReport, retry_count: int) -> dict[UUID, list[dict]]:
+    """Remove retryable failures from ``report``'s dead letters, by webhook.
+
+    Nothing is taken once ``retry_count`` reaches ``_MAX_RETRIES``, so
+    those failures stay dead-lettered.
+    """
+    retries: dict[UUID, list[dict]] = defaultdict(list)
+    if retry_count >= _MAX_RETRIES:
+        return retries
+    kept: list[DeadLetter] = []
+    for letter in report.dead_letters:
+        if letter.retryable:
+            retries[letter.webhook_id].append(letter.payload)
+        else:
+            kept.append(letter)
+    report.dead_letters = kept
+    return retries
 
-async def _dispatch_async(event_type: str, data: dict):
-    import secrets
 
+def schedule_retries(retries: dict[UUID, list[dict]], retry_count: int) -> None:
+    """Queue one ``redeliver`` per webhook after the backoff for ``retry_count``."""
+    delay = backoff_seconds(retry_count)
+    for webhook_id, payloads in retries.items():
+        logger.warning(
+            "webhook_task.retrying",
+            webhook_id=str(webhook_id),
+            payloads=len(payloads),
+            retry=retry_count + 1,
+            delay=delay,
+        )
+        redeliver.apply_async(
+            kwargs={
+                "webhook_id": str(webhook_id),
+                "payloads": payloads,
+                "retry_count": retry_count + 1,
+            },
+            countdown=delay,
+        )
+
+
+@async_task(name="app.workers.webhook_delivery_tasks.replay_dead_letters")
+async def replay_dead_letters(webhook_id: str | None = None, limit: int = _REPLAY_BATCH_SIZE):
+    """Redeliver pending dead letters, oldest first.
+
+    Successful entries are marked replayed; failures stay pending with an
+    incremented attempt count.
+    """
     from sqlalchemy import select
 
-    from app.models.production_features import WebhookIntegrationRecord
+    from app.models.production_features import WebhookDeadLetterRecord
+
+    query = (
+        select(WebhookDeadLetterRecord)
+        .where(WebhookDeadLetterRecord.replayed_at.is_(None))
+        .order_by(WebhookDeadLetterRecord.created_at)
+        .limit(limit)
+    )
+    if webhook_id:
+        query = query.where(WebhookDeadLetterRecord.webhook_id == UUID(webhook_id))
+    async with get_db_context() as db:
+        letters = [
+            (letter.id, letter.webhook_id, letter.payload)
+            for letter in (await db.execute(query)).scalars()
+        ]
+        index = await get_subscription_cache().get(db)
+
+    dispatcher = WebhookDispatcher(index)
+    pending = [
+        (letter_id, target, payload)
+        for letter_id, target_id, payload in letters
+        if (target := index.get(target_id)) is not None
+    ]
+    outcomes = await asyncio.gather(
+        *(dispatcher.send(target, payload) for _, target, payload in pending)
+    )
+
+    report = DispatchReport()
+    results: dict[UUID, tuple[bool, int, str | None]] = {}
+    for (letter_id, target, _), outcome in zip(pending, outcomes, strict=True):
+        report.stats.record(target.id, outcome[0])
+        results[letter_id] = outcome
 
+    replayed = 0
     async with get_db_context() as db:
-        result = await db.execute(
-            select(WebhookIntegrationRecord).where(WebhookIntegrationRecord.active.is_(True))
+        records = await db.execute(
+            select(WebhookDeadLetterRecord).where(WebhookDeadLetterRecord.id.in_(list(results)))
         )
-        webhooks = result.scalars().all()
-
-        for wh in webhooks:
-            subscribed = "*" in (wh.event_types or []) or event_type in (wh.event_types or [])
-            if not subscribed:
-                continue
-
-            payload = {
-                "event_type": event_type,
-                "delivery_id": secrets.token_hex(8),
-                "timestamp": datetime.now(UTC).isoformat(),
-                "data": data,
-            }
-
-            deliver_webhook.delay(
-                webhook_id=str(wh.id),
-                payload=payload,
-            )
+        for letter in records.scalars():
+            success, status_code, error = results[letter.id]
+            if success:
+                letter.replayed_at = datetime.now(UTC)
+                replayed += 1
+            else:
+                letter.attempts = (letter.attempts or 0) + 1
+                letter.status_code = status_code
+                letter.error = error
+        await report.persist(db)
+
+    logger.info("webhook_task.replayed_dead_letters", pending=len(letters), replayed=replayed)
+    return {"pending": len(letters), "replayed": replayed}
+
+
+def dispatch_event(event_type: str, data: dict):
+    """Dispatch an event to all active webhooks subscribed to this event type.
+
+    Call this from any service that wants to trigger outgoing webhooks.
+    """
+    dispatch_events([(event_type, data)])
+
+
+def dispatch_events(events: list[tuple[str, dict]]):
+    """Dispatch a burst of ``(event_type, data)`` events as one broker message.
+
+    Receivers that opted in to batching get the burst coalesced into
+    batched payloads.
+    """
+    if not events:
+        return
+    deliver_events.delay(events=[build_event(event_type, data) for event_type, data in events])
@@ -1,10 +1,14 @@
 """Tests for RequirementExtractor with mocked Copilot."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from app.agents.copilot import CircuitBreaker, CircuitBreakerOpenError
+from app.agents.requirement_chunks import chunk_regulation, estimate_tokens, merge_requirements
 from app.agents.requirement_extractor import RequirementExtractor
+from app.services.analysis_cache import AnalysisCache
 
 
 def _make_regulation(**overrides) -> MagicMock:
@@ -73,3 +77,151 @@ class TestRequirementExtractor:
 
         with pytest.raises(CopilotError, match="API failure"):
             await extractor.extract(_make_regulation(), "Some text")
+
+
+def _statute(articles: int = 40, changed: int | None = None) -> str:
+    lines = []
+    for n in range(1, articles + 1):
+        lines.append(f"Article {n}")
+        duty = "erase" if n == changed else "record"
+        lines.extend(f"The controller shall {duty} processing activity {n}.{i}." for i in range(12))
+    return "\n".join(lines)
+
+
+def _chunk_copilot(calls: list[str], active: list[int] | None = None) -> AsyncMock:
+    async def analyze_legal_text(text, regulation_name, jurisdiction, framework):
+        if active is not None:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+            await asyncio.sleep(0.01)
+            active[0] -= 1
+        calls.append(text)
+        first = text.split("\n", 1)[0]
+        return [
+            {
+                "reference_id": "REQ-001",
+                "title": first,
+                "description": f"Obligations of {first}",
+                "obligation_type": "MUST",
+                "data_types": ["personal"],
+                "confidence": 0.8,
+            }
+        ]
+
+    copilot = _make_copilot()
+    copilot.analyze_legal_text = AsyncMock(side_effect=analyze_legal_text)
+    return copilot
+
+
+class TestChunking:
+    def test_chunks_align_to_articles_and_respect_the_budget(self):
+        chunks = chunk_regulation(_statute(), max_tokens=800)
+
+        assert len(chunks) > 3
+        assert all(chunk.tokens <= 800 for chunk in chunks)
+        assert all(chunk.text.startswith("Article ") for chunk in chunks)
+        headings = [heading for chunk in chunks for heading in chunk.headings]
+        assert headings == [f"Article {n}" for n in range(1, 41)]
+
+    def test_oversized_articles_overlap_at_the_seams(self):
+        text = "Article 9\n" + "\n".join(
+            f"Sentence {i} of the processing rules." for i in range(200)
+        )
+
+        chunks = chunk_regulation(text, max_tokens=400, overlap_tokens=40)
+
+        assert len(chunks) > 3
+        second = chunks[1].text.split("\n")
+        assert second[0] == "Article 9 (continued)"
+        # The tail of the first chunk is repeated
+        assert second[1] in chunks[0].text
+        assert estimate_tokens(chunks[1].text) <= 400
+
+    def test_editing_one_article_keeps_other_chunks(self):
+        before = [chunk.text for chunk in chunk_regulation(_statute(), max_tokens=800)]
+        after = [chunk.text for chunk in chunk_regulation(_statute(changed=17), max_tokens=800)]
+
+        changed = [text for text in after if text not in before]
+        assert len(changed) == 1
+        assert "shall erase processing activity 17.0" in changed[0]
+
+    def test_merge_deduplicates_and_renumbers(self):
+        consent = {
+            "reference_id": "REQ-001",
+            "description": "Obtain consent before processing personal data",
+            "obligation_type": "MUST",
+            "source_text": "The controller shall obtain consent.",
+            "data_types": ["personal"],
+            "citations": [{"article": "7"}],
+            "confidence": 0.7,
+        }
+        restated = {
+            **consent,
+            "source_text": "",
+            "description": "Obtain consent before processing of personal data",
+            "data_types": ["health"],
+            "confidence": 0.9,
+        }
+        erasure = {
+            "reference_id": "REQ-001",
+            "description": "Erase data on request",
+            "obligation_type": "MUST",
+            "citations": [{"article": "17"}],
+        }
+
+        merged = merge_requirements([[consent], [restated, erasure]], "gdpr")
+
+        assert [r["reference_id"] for r in merged] == ["REQ-GDPR-001", "REQ-GDPR-002"]
+        assert merged[0]["data_types"] == ["personal", "health"]
+        assert merged[0]["confidence"] == 0.9
+        assert consent["reference_id"] == "REQ-001"
+
+
+class TestChunkedExtraction:
+    @pytest.mark.asyncio
+    async def test_only_changed_chunks_are_re_extracted(self):
+        calls: list[str] = []
+        extractor = RequirementExtractor(
+            _chunk_copilot(calls), result_cache=AnalysisCache(), max_chunk_tokens=800
+        )
+
+        first = await extractor.extract(_make_regulation(), _statute())
+        chunk_count = len(calls)
+        calls.clear()
+        second = await extractor.extract(_make_regulation(), _statute(changed=17))
+
+        assert chunk_count > 3
+        assert len(calls) == 1
+        assert "Article 17" in calls[0]
+        assert [r["reference_id"] for r in second] == [r["reference_id"] for r in first]
+        assert len({r["reference_id"] for r in first}) == chunk_count
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        calls: list[str] = []
+        active = [0, 0]
+        extractor = RequirementExtractor(
+            _chunk_copilot(calls, active),
+            result_cache=AnalysisCache(),
+            max_chunk_tokens=800,
+            max_concurrency=2,
+        )
+
+        await extractor.extract(_make_regulation(), _statute())
+
+        assert len(calls) > 3
+        assert active[1] == 2
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, monkeypatch):
+        breaker = CircuitBreaker(failure_threshold=1)
+        await breaker.record_failure()
+        monkeypatch.setattr("app.agents.requirement_extractor.get_circuit_breaker", lambda: breaker)
+        calls: list[str] = []
+        extractor = RequirementExtractor(
+            _chunk_copilot(calls), result_cache=AnalysisCache(), max_chunk_tokens=800
+        )
+
+        with pytest.raises(CircuitBreakerOpenError):
+            await extractor.extract(_make_regulation(), _statute())
+        assert calls == []
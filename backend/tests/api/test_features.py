@@ -354,3 +354,44 @@ class TestIDECopilotAPI:
         )
 
         assert response.status_code in [200, 422]
+
+
+class TestRiskExposureAPI:
+    """Test the exposure simulation endpoint."""
+
+    async def test_simulate_exposure(self, client: AsyncClient, auth_headers: dict):
+        response = await client.post(
+            "/api/v1/risk-quantification/exposure/simulate",
+            headers=auth_headers,
+            json={
+                "violations": [
+                    {"rule_id": "GDPR-1", "regulation": "GDPR", "severity": "high"},
+                    {"rule_id": "CCPA-1", "regulation": "CCPA"},
+                ],
+                "iterations": 10_000,
+                "correlation": 0.5,
+                "seed": 7,
+            },
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["iterations"] == 10_000
+        assert body["cvar"] >= body["var"]
+
+    async def test_invalid_correlation_is_unprocessable(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        response = await client.post(
+            "/api/v1/risk-quantification/exposure/simulate",
+            headers=auth_headers,
+            json={
+                "violations": [
+                    {"rule_id": "GDPR-1", "regulation": "GDPR"},
+                    {"rule_id": "CCPA-1", "regulation": "CCPA"},
+                ],
+                "correlation": [[1.0, 1.2], [1.2, 1.0]],
+            },
+        )
+
+        assert response.status_code == 422
@@ -0,0 +1,156 @@
+"""Small, valid PDF documents built in memory for extraction tests."""
+
+import zlib
+
+
+def _literal(text: str) -> bytes:
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return b"(" + escaped.encode("cp1252") + b")"
+
+
+def _dict(entries: str) -> bytes:
+    return f"<< {entries} >>".encode()
+
+
+def _stream(attrs: str, data: bytes, compress: bool) -> bytes:
+    if compress:
+        data = zlib.compress(data)
+        attrs += " /Filter /FlateDecode"
+    return _dict(f"{attrs} /Length {len(data)}") + b"\nstream\n" + data + b"\nendstream"
+
+
+def build_pdf(
+    pages: list[list[str]],
+    *,
+    compress: bool = False,
+    object_streams: bool = False,
+    reverse: bool = False,
+    split_words: bool = False,
+) -> bytes:
+    """A PDF with one line of text per entry of each page.
+
+    Lines that cp1252 cannot encode use a composite font with a
+    ``ToUnicode`` map. ``reverse`` draws each page's lines bottom-up and
+    ``split_words`` draws words as ``TJ`` items separated by kerning gaps,
+    as typesetting software does. ``object_streams`` packs the document
+    structure into a compressed object stream with an xref stream.
+    """
+    unicode_chars = sorted(
+        {
+            char
+            for page in pages
+            for line in page
+            if any(ord(c) > 0xFF for c in line)
+            for char in line
+        }
+    )
+    codes = {char: index + 1 for index, char in enumerate(unicode_chars)}
+
+    # 1 catalog, 2 page tree, 3 Latin font, 4 composite font, 5 CID font,
+    # 6 ToUnicode map, then a content stream and a page object per page
+    first_page = 7
+    kids = " ".join(f"{first_page + 2 * i + 1} 0 R" for i in range(len(pages)))
+    structure: dict[int, bytes] = {
+        1: _dict("/Type /Catalog /Pages 2 0 R"),
+        2: _dict(f"/Type /Pages /Kids [{kids}] /Count {len(pages)}"),
+        3: _dict("/Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding"),
+        4: _dict(
+            "/Type /Font /Subtype /Type0 /BaseFont /NotoSansCJK /Encoding /Identity-H "
+            "/DescendantFonts [5 0 R] /ToUnicode 6 0 R"
+        ),
+        5: _dict(
+            "/Type /Font /Subtype /CIDFontType2 /BaseFont /NotoSansCJK /DW 1000 "
+            "/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >>"
+        ),
+    }
+    streams: dict[int, bytes] = {}
+
+    bfchar = "\n".join(f"<{code:04X}> <{ord(char):04X}>" for char, code in codes.items())
+    cmap = (
+        "/CIDInit /ProcSet findresource begin 12 dict begin begincmap\n"
+        "1 begincodespacerange <0000> <FFFF> endcodespacerange\n"
+        f"{len(codes)} beginbfchar\n{bfchar}\nendbfchar\n"
+        "endcmap CMapName currentdict /CMap defineresource pop end end"
+    ).encode()
+    streams[6] = _stream("", cmap, compress)
+
+    for index, lines in enumerate(pages):
+        ops = []
+        ordered = list(enumerate(lines))
+        for row, line in reversed(ordered) if reverse else ordered:
+            y = 760 - row * 14
+            if any(ord(char) > 0xFF for char in line):
+                hex_codes = "".join(f"{codes[char]:04X}" for char in line)
+                ops.append(f"BT /F2 11 Tf 72 {y} Td <{hex_codes}> Tj ET".encode())
+            elif split_words:
+                words = b" -300 ".join(_literal(word) for word in line.split())
+                ops.append(b"BT /F1 11 Tf 1 0 0 1 72 %d Tm [" % y + words + b"] TJ ET")
+            else:
+                ops.append(b"BT /F1 11 Tf 72 %d Td " % y + _literal(line) + b" Tj ET")
+        content = first_page + 2 * index
+        streams[content] = _stream("", b"\n".join(ops), compress)
+        structure[content + 1] = _dict(
+            f"/Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {content} 0 R "
+            "/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >>"
+        )
+
+    out = bytearray(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+    offsets: dict[int, int] = {}
+
+    def write(number: int, body: bytes) -> None:
+        offsets[number] = len(out)
+        out.extend(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    for number, body in sorted(streams.items()):
+        write(number, body)
+
+    if not object_streams:
+        for number, body in sorted(structure.items()):
+            write(number, body)
+        size = max(offsets) + 1
+        xref = len(out)
+        out.extend(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        for number in range(1, size):
+            out.extend(b"%010d 00000 n \n" % offsets[number])
+        out.extend(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref))
+        return bytes(out)
+
+    # Structure objects live in an object stream, located by an xref stream
+    numbers = sorted(structure)
+    bodies = b""
+    header = []
+    for number in numbers:
+        header.append(f"{number} {len(bodies)}")
+        bodies += structure[number] + b"\n"
+    header_bytes = " ".join(header).encode() + b"\n"
+    object_stream = max(*streams, *structure) + 1
+    write(
+        object_stream,
+        _stream(
+            f"/Type /ObjStm /N {len(numbers)} /First {len(header_bytes)}",
+            header_bytes + bodies,
+            compress=True,
+        ),
+    )
+
+    xref_number = object_stream + 1
+    rows = [bytes([0]) + (0).to_bytes(4, "big") + (65535).to_bytes(2, "big")]
+    for number in range(1, xref_number + 1):
+        if number in structure:
+            entry = bytes([2]) + object_stream.to_bytes(4, "big")
+            entry += numbers.index(number).to_bytes(2, "big")
+        else:
+            offset = offsets.get(number, len(out))
+            entry = bytes([1]) + offset.to_bytes(4, "big") + (0).to_bytes(2, "big")
+        rows.append(entry)
+    xref = len(out)
+    write(
+        xref_number,
+        _stream(
+            f"/Type /XRef /Size {xref_number + 1} /W [1 4 2] /Root 1 0 R",
+            b"".join(rows),
+            compress=True,
+        ),
+    )
+    out.extend(b"startxref\n%d\n%%%%EOF\n" % xref)
+    return bytes(out)
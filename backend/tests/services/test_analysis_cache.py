@@ -0,0 +1,205 @@
+"""Tests for the shared analysis result cache."""
+
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services.analysis_cache import AnalysisCache, decode_records
+from app.services.iac_scanner.models import IaCPlatform
+from app.services.iac_scanner.service import IaCScannerService
+from app.services.ide.analyzer import IDEComplianceAnalyzer
+from app.services.pr_review.analyzer import PRAnalyzer
+
+
+pytestmark = pytest.mark.asyncio
+
+PATCH = """\
+@@ -10,2 +10,3 @@ def register(form):
+     name = form["name"]
++    password = "hunter2hunter2"
+     save(name)"""
+
+# The same addition after a rebase moved it 30 lines down
+REBASED_PATCH = PATCH.replace("@@ -10,2 +10,3 @@", "@@ -40,2 +40,3 @@")
+
+TERRAFORM = 'resource "aws_s3_bucket" "data" {\n  bucket = "records"\n}\n'
+
+
+class _FakeRedis:
+    """Just enough of redis.asyncio for MGET and pipelined SET."""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.down = False
+        self.closed = False
+
+    async def mget(self, keys):
+        if self.down:
+            raise RedisConnectionError("Connection refused")
+        return [self.data.get(key) for key in keys]
+
+    async def aclose(self):
+        self.closed = True
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis: _FakeRedis):
+        self.redis = redis
+        self.pending: list[tuple[str, bytes]] = []
+
+    def set(self, key, value, ex=None):
+        self.pending.append((key, value))
+
+    async def execute(self):
+        self.redis.data.update(self.pending)
+
+
+class TestPRAnalyzer:
+    """Test cached PR diff findings."""
+
+    async def test_repush_reuses_findings_with_rebased_lines(self):
+        cache = AnalysisCache()
+        analyzer = PRAnalyzer(result_cache=cache)
+
+        first = await analyzer.analyze_diff_content(PATCH, "app/a.py")
+        second = await analyzer.analyze_diff_content(REBASED_PATCH, "app/b.py")
+
+        assert cache.hits == 1
+        assert len(second) == len(first) > 0
+        assert {v.line_start for v in first} == {11}
+        assert {v.line_start for v in second} == {41}
+        assert {v.file_path for v in second} == {"app/b.py"}
+        assert [v.evidence for v in second] == [v.evidence for v in first]
+
+    async def test_adding_a_pattern_invalidates_cached_findings(self):
+        cache = AnalysisCache()
+        analyzer = PRAnalyzer(result_cache=cache)
+        await analyzer.analyze_diff_content(PATCH, "app/a.py")
+
+        analyzer.add_custom_pattern("form_access", r"form\[", "Form field access")
+        violations = await analyzer.analyze_diff_content(PATCH, "app/a.py")
+
+        assert cache.hits == 0
+        assert "form_access" not in {v.metadata["pattern_name"] for v in violations}
+        assert "hardcoded_secrets" in {v.metadata["pattern_name"] for v in violations}
+
+        added = await analyzer.analyze_diff_content(PATCH + '\n+    email = form["email"]')
+        assert "form_access" in {v.metadata["pattern_name"] for v in added}
+
+
+class TestIDEAnalyzer:
+    """Test cached IDE diagnostics."""
+
+    CONTENT = 'import pickle\nlogger.info(f"user email {user.email}")\n'
+
+    async def test_repeat_analysis_is_served_from_cache(self):
+        cache = AnalysisCache()
+        analyzer = IDEComplianceAnalyzer(result_cache=cache)
+
+        first = analyzer.analyze_document("file:///a.py", self.CONTENT)
+        second = await analyzer.analyze_document_async("file:///b.py", self.CONTENT)
+
+        assert cache.hits == 1
+        assert second.uri == "file:///b.py"
+        assert [(d.code, d.range, d.severity, d.category) for d in second.diagnostics] == [
+            (d.code, d.range, d.severity, d.category) for d in first.diagnostics
+        ]
+        # Code actions are rebuilt, not shared between results
+        assert all(
+            a is not b
+            for a, b in zip(first.diagnostics, second.diagnostics, strict=True)
+            if a.code_actions
+        )
+
+    async def test_language_and_patterns_are_part_of_the_key(self):
+        cache = AnalysisCache()
+        analyzer = IDEComplianceAnalyzer(result_cache=cache)
+        analyzer.analyze_document("file:///a.py", self.CONTENT)
+
+        analyzer.analyze_document("file:///a.js", self.CONTENT)
+        analyzer.add_custom_pattern("pickle_import", r"import pickle", "No pickle")
+        result = analyzer.analyze_document("file:///a.py", self.CONTENT)
+
+        assert cache.hits == 0
+        assert "CUSTOM-PICKLE_IMPORT" in {d.code for d in result.diagnostics}
+
+
+class TestIaCScanner:
+    """Test cached IaC findings."""
+
+    async def test_identical_content_is_scanned_once(self, db_session):
+        cache = AnalysisCache()
+        service = IaCScannerService(db_session, result_cache=cache)
+
+        first = await service.scan_file(TERRAFORM, IaCPlatform.TERRAFORM, "a/main.tf")
+        second = await service.scan_file(TERRAFORM, IaCPlatform.TERRAFORM, "b/main.tf")
+
+        assert cache.hits == 1
+        assert [v.rule_id for v in second] == [v.rule_id for v in first]
+        assert {v.file_path for v in second} == {"b/main.tf"}
+        assert {v.id for v in first}.isdisjoint(v.id for v in second)
+
+        service._rules[0].enabled = False
+        try:
+            third = await service.scan_file(TERRAFORM, IaCPlatform.TERRAFORM, "a/main.tf")
+        finally:
+            service._rules[0].enabled = True
+        assert cache.hits == 1
+        assert service._rules[0].id not in {v.rule_id for v in third}
+
+
+class TestAnalysisCache:
+    """Test the cache tiers."""
+
+    async def test_redis_tier_is_shared_between_instances(self, monkeypatch):
+        redis = _FakeRedis()
+        writer = AnalysisCache(redis_url="redis://fake")
+        reader = AnalysisCache(redis_url="redis://fake")
+        for cache in (writer, reader):
+            monkeypatch.setattr(cache, "_client", lambda: redis)
+
+        await writer.set_many({"pr:abc:1": [("secret", 0, 4, 9, "token")]})
+        found = await reader.get_many(["pr:abc:1", "pr:abc:2"])
+
+        assert found == {"pr:abc:1": [("secret", 0, 4, 9, "token")]}
+        assert decode_records(redis.data["complianceagent:analysis:pr:abc:1"]) == (
+            ("secret", 0, 4, 9, "token"),
+        )
+        # Promoted into the local tier
+        assert reader.get_local("pr:abc:1") == [("secret", 0, 4, 9, "token")]
+        assert (reader.hits, reader.misses) == (2, 1)
+
+    async def test_local_tier_evicts_least_recently_used(self):
+        cache = AnalysisCache(max_entries=2)
+        await cache.set("a", [])
+        await cache.set("b", [])
+        cache.get_local("a")
+        await cache.set("c", [])
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == []
+        assert len(cache) == 2
+
+    async def test_worker_client_is_shared(self, monkeypatch):
+        redis = _FakeRedis()
+        monkeypatch.setattr("app.workers.runtime.get_worker_redis", lambda: redis)
+        cache = AnalysisCache(redis_url="redis://fake")
+
+        assert cache._client() is redis
+        assert cache._redis is None
+
+    async def test_failed_client_is_closed_and_retried_later(self):
+        redis = _FakeRedis()
+        redis.down = True
+        cache = AnalysisCache(redis_url="redis://fake")
+        cache._redis, cache._redis_loop = redis, asyncio.get_running_loop()
+
+        assert await cache.get_many(["pr:abc:1"]) == {}
+        await asyncio.sleep(0)
+
+        assert redis.closed
+        assert cache._client() is None
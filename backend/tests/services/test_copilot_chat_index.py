@@ -0,0 +1,189 @@
+"""Tests for the precomputed copilot chat corpus index."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.core.config import settings
+from app.services.copilot_chat import CopilotChatService, CorpusIndex
+from app.services.copilot_chat import corpus_index as corpus_index_module
+from app.services.copilot_chat.corpus_index import get_corpus_index, seed_fingerprint
+from app.services.copilot_chat.models import RAGChunk
+from app.services.copilot_chat.service import index_regulation_change
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _chunk(source_id: str, title: str, text: str) -> RAGChunk:
+    return RAGChunk(text=text, source_type="regulation", source_id=source_id, title=title)
+
+
+@pytest.fixture
+def index():
+    idx = CorpusIndex()
+    idx.add(
+        [
+            _chunk("gdpr-art17", "GDPR Art. 17", "Right to erasure of personal data"),
+            _chunk("pci-req3", "PCI-DSS Req 3", "Protect stored cardholder data with encryption"),
+            _chunk("soc2-cc6", "SOC 2 CC6.1", "Logical access controls for information assets"),
+        ]
+    )
+    return idx
+
+
+@pytest.fixture
+def fresh_index(monkeypatch):
+    monkeypatch.setattr(corpus_index_module, "_index", None)
+
+
+@pytest.fixture
+def embedded(monkeypatch) -> list[str]:
+    """Record the text of every chunk that gets embedded."""
+    calls: list[str] = []
+    original = RAGChunk.compute_embedding
+
+    def compute_embedding(self):
+        calls.append(self.text)
+        return original(self)
+
+    monkeypatch.setattr(RAGChunk, "compute_embedding", compute_embedding)
+    return calls
+
+
+class TestCorpusIndex:
+    """Test hybrid search and incremental updates."""
+
+    def test_keyword_match_ranks_first(self, index):
+        results = index.search("encryption of cardholder data", top_k=2)
+
+        assert results[0].chunk.source_id == "pci-req3"
+        assert results[0].matched_terms >= 2
+        assert len(results) == 2
+
+    def test_min_relevance_filters_results(self, index):
+        assert index.search("quarterly revenue", min_relevance=0.3) == []
+
+    def test_replace_source_reuses_unchanged_embeddings(self, index, embedded):
+        original = index.search("erasure", top_k=1)[0].chunk
+        unchanged = _chunk("", original.title, original.text)
+        amended = _chunk("", "GDPR Art. 17(3)", "Exemptions from erasure for legal claims")
+        embedded.clear()
+
+        index.replace_source("gdpr-art17", [unchanged, amended])
+
+        assert embedded == [amended.text]
+        assert len(index) == 4
+        matches = {r.chunk.title for r in index.search("erasure", top_k=5) if r.matched_terms}
+        assert matches == {"GDPR Art. 17", "GDPR Art. 17(3)"}
+
+    def test_remove_source(self, index):
+        assert index.remove_source("pci-req3") == 1
+
+        assert "pci-req3" not in index.sources
+        assert all(r.chunk.source_id != "pci-req3" for r in index.search("cardholder", top_k=5))
+
+    def test_lsh_path_matches_exact_neighbour(self):
+        idx = CorpusIndex(exact_search_max_rows=8)
+        idx.add(_chunk(f"src-{i}", f"Doc {i}", f"document number {i}") for i in range(50))
+
+        results = idx.search("document number 17", top_k=1)
+
+        assert results[0].chunk.source_id == "src-17"
+
+    def test_save_and_load_round_trip(self, index, tmp_path):
+        index.save(tmp_path)
+        loaded = CorpusIndex.load(tmp_path)
+
+        assert loaded.sources == index.sources
+        before = index.search("access controls", top_k=1)[0]
+        after = loaded.search("access controls", top_k=1)[0]
+        assert after.chunk.id == before.chunk.id
+        assert after.similarity == pytest.approx(before.similarity, abs=1e-6)
+
+
+class TestRetrieveContext:
+    """Test CopilotChatService retrieval through the shared index."""
+
+    async def test_corpus_is_embedded_once(self, fresh_index, embedded):
+        service = CopilotChatService(MagicMock())
+
+        await service.retrieve_context("right to erasure of personal data", min_relevance=0.1)
+        first = len(embedded)
+        context = await service.retrieve_context(
+            "right to erasure of personal data", min_relevance=0.1
+        )
+
+        # Second query only embeds the query itself
+        assert len(embedded) == first + 1
+        assert context.citations[0].source_id == "gdpr-art17"
+
+
+class TestPersistedIndex:
+    """Test reusing a saved index only while the seed corpus is unchanged."""
+
+    @pytest.fixture
+    def index_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "copilot_corpus_index_dir", str(tmp_path))
+        return tmp_path
+
+    def test_unchanged_seed_is_loaded(self, index_dir, embedded):
+        seed = [_chunk("gdpr-art17", "GDPR Art. 17", "Right to erasure of personal data")]
+        corpus_index_module._open_index(lambda: seed)
+        built = len(embedded)
+
+        index = corpus_index_module._open_index(lambda: seed)
+
+        assert len(embedded) == built
+        assert index.sources == {"gdpr-art17"}
+
+    def test_changed_seed_is_rebuilt(self, index_dir):
+        corpus_index_module._open_index(
+            lambda: [_chunk("gdpr-art17", "GDPR Art. 17", "Right to erasure of personal data")]
+        )
+        amended = [
+            _chunk("gdpr-art17", "GDPR Art. 17", "Right to erasure without undue delay"),
+            _chunk("dora-art9", "DORA Art. 9", "ICT protection and prevention"),
+        ]
+
+        index = corpus_index_module._open_index(lambda: amended)
+        reloaded = corpus_index_module._open_index(lambda: amended)
+
+        assert index.sources == reloaded.sources == {"gdpr-art17", "dora-art9"}
+        assert CorpusIndex.saved_fingerprint(index_dir) == seed_fingerprint(amended)
+
+
+class TestRegulationUpdates:
+    """Test feeding crawled regulation changes into the shared index."""
+
+    def _result(self, source, content: str) -> SimpleNamespace:
+        return SimpleNamespace(source=source, content=content, metadata={"document_type": "pdf"})
+
+    async def test_changed_source_replaces_its_sections(self, fresh_index, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "copilot_corpus_index_dir", str(tmp_path))
+        source = SimpleNamespace(id=uuid4(), name="DORA")
+        first = "Article 9\nFinancial entities shall protect ICT systems.\n"
+        amended = (
+            "Article 9\nFinancial entities shall protect and monitor ICT systems.\n"
+            "Article 10\nFinancial entities shall detect anomalous activities.\n"
+        )
+
+        await index_regulation_change(None, self._result(source, first))
+        added = await index_regulation_change(None, self._result(source, amended))
+
+        index = get_corpus_index()
+        rows = [c for c in index._chunks if c is not None and c.source_id == str(source.id)]
+        assert added == 2
+        assert [(c.title, c.section) for c in rows] == [
+            ("DORA Article 9", "9"),
+            ("DORA Article 10", "10"),
+        ]
+        results = index.search("detect anomalous activities", top_k=1)
+        assert results[0].chunk.title == "DORA Article 10"
+
+        # The saved copy carries the update and still matches the seed
+        reloaded = corpus_index_module._open_index(CopilotChatService._build_rag_corpus)
+        assert str(source.id) in reloaded.sources
+        assert len(reloaded) == len(index)
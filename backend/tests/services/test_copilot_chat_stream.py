@@ -0,0 +1,168 @@
+"""Tests for token-level streaming in copilot chat."""
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from app.agents import copilot as copilot_module
+from app.agents.copilot import CopilotClient, CopilotMessage
+from app.core.exceptions import CopilotConnectionError
+from app.services.copilot_chat import CopilotChatService, UserPersona
+from app.services.copilot_chat.models import SSEEvent
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class _SSEStream(httpx.AsyncByteStream):
+    def __init__(self, lines: list[str]):
+        self.lines = lines
+        self.closed = False
+
+    async def __aiter__(self):
+        for line in self.lines:
+            yield f"{line}\n\n".encode()
+
+    async def aclose(self):
+        self.closed = True
+
+
+def _delta(text: str) -> str:
+    return "data: " + json.dumps({"choices": [{"delta": {"content": text}}]})
+
+
+class _GatedCopilot:
+    """Fake client that yields one token, then waits until released."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+    async def chat_stream(self, messages, system_message=None):
+        try:
+            yield "GDPR "
+            await self.release.wait()
+            yield "Art. 17 covers erasure."
+        finally:
+            self.closed = True
+
+
+async def _session(service: CopilotChatService):
+    return await service.create_session(persona=UserPersona.CCO)
+
+
+def _events(events):
+    return [e.event for e in events]
+
+
+class TestCopilotClientStreaming:
+    """Test CopilotClient.chat_stream."""
+
+    @pytest.fixture
+    def transport(self, monkeypatch):
+        streams: list[_SSEStream] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert json.loads(request.content)["stream"] is True
+            stream = _SSEStream([_delta("Hello"), _delta(", world"), "data: [DONE]"])
+            streams.append(stream)
+            return httpx.Response(200, stream=stream)
+
+        monkeypatch.setattr(
+            copilot_module, "get_shared_http_transport", lambda: httpx.MockTransport(handler)
+        )
+        return streams
+
+    async def test_yields_deltas(self, transport):
+        async with CopilotClient(api_key="k", max_retries=1) as client:
+            tokens = [t async for t in client.chat_stream([CopilotMessage("user", "hi")])]
+
+        assert tokens == ["Hello", ", world"]
+        assert transport[0].closed
+
+    async def test_closing_early_closes_upstream(self, transport):
+        async with CopilotClient(api_key="k", max_retries=1) as client:
+            stream = client.chat_stream([CopilotMessage("user", "hi")])
+            assert await anext(stream) == "Hello"
+            await stream.aclose()
+
+        assert transport[0].closed
+
+
+class TestStreamChat:
+    """Test CopilotChatService.stream_chat."""
+
+    @pytest.fixture(autouse=True)
+    def clear_sessions(self, monkeypatch):
+        monkeypatch.setattr(CopilotChatService, "_sessions", {})
+
+    async def test_first_token_arrives_before_generation_finishes(self):
+        copilot = _GatedCopilot()
+        service = CopilotChatService(MagicMock(), copilot_client=copilot)
+        session = await _session(service)
+
+        stream = service.stream_chat(
+            session.id, "Does the data subject have a right to obtain erasure of personal data?"
+        )
+        first = await anext(stream)
+        assert first.event == "message"
+        assert json.loads(first.data)["text"] == "GDPR "
+
+        copilot.release.set()
+        rest = [event async for event in stream]
+
+        names = _events(rest)
+        assert names[-2:] == ["guardrail", "done"]
+        assert "citation" in names
+        assert session.messages[-1].content.startswith("GDPR Art. 17 covers erasure.")
+
+    async def test_disconnect_cancels_generation(self):
+        copilot = _GatedCopilot()
+        service = CopilotChatService(MagicMock(), copilot_client=copilot)
+        session = await _session(service)
+
+        stream = service.stream_chat(session.id, "erasure")
+        await anext(stream)
+        await stream.aclose()
+        await asyncio.sleep(0)
+
+        assert copilot.closed
+        assert session.messages[-1].role == "user"
+
+    async def test_fallback_answer_is_streamed(self):
+        service = CopilotChatService(MagicMock())
+        session = await _session(service)
+
+        events = [e async for e in service.stream_chat(session.id, "What is our status?")]
+
+        text = "".join(json.loads(e.data)["text"] for e in events if e.event == "message")
+        assert text == session.messages[-1].content
+        assert events[-1].event == "done"
+
+    async def test_failure_after_first_token_emits_error(self):
+        class _Broken(_GatedCopilot):
+            async def chat_stream(self, messages, system_message=None):
+                yield "partial"
+                raise CopilotConnectionError("stream interrupted")
+
+        service = CopilotChatService(MagicMock(), copilot_client=_Broken())
+        session = await _session(service)
+
+        events = [e async for e in service.stream_chat(session.id, "erasure")]
+
+        assert events[0].event == "message"
+        assert events[-1].event == "error"
+
+    def test_encode(self):
+        event = SSEEvent(event="message", data="a\nb", id="1")
+
+        assert event.encode() == "id: 1\nevent: message\ndata: a\ndata: b\n\n"
@@ -0,0 +1,210 @@
+"""Tests for the Compliance Digital Twin simulator."""
+
+from uuid import uuid4
+
+import pytest
+
+from app.core.config import settings
+from app.services.digital_twin.models import BaselineContext, ScenarioType
+from app.services.digital_twin.simulator import ComplianceSimulator
+from app.services.digital_twin.snapshot import SnapshotManager
+
+
+pytestmark = pytest.mark.asyncio
+
+
+BASELINE_DATA = {
+    "score": 0.8,
+    "regulations": [
+        {"regulation": "GDPR", "status": "partial", "score": 0.75},
+        {"regulation": "HIPAA", "status": "compliant", "score": 0.9},
+    ],
+    "issues": [
+        {"code": "SEC-CRED-001", "severity": "high", "file_path": "app/config.py"},
+        {"code": "GDPR-RET-001", "severity": "medium", "regulation": "GDPR"},
+        {"code": "GDPR-DSR-002", "severity": "high", "regulation": "GDPR"},
+    ],
+}
+
+
+@pytest.fixture
+async def simulator():
+    manager = SnapshotManager()
+    return ComplianceSimulator(snapshot_manager=manager)
+
+
+@pytest.fixture
+async def baseline(simulator):
+    return await simulator.snapshot_manager.create_snapshot(
+        organization_id=uuid4(), compliance_data=BASELINE_DATA
+    )
+
+
+async def _expansion_variants(simulator, baseline, count):
+    variants = [["EU"], ["Brazil", "India"], ["China"], ["Japan", "South Korea"]]
+    return [
+        await simulator.create_scenario(
+            organization_id=baseline.organization_id,
+            name=f"Expansion {i % len(variants)}",
+            scenario_type=ScenarioType.JURISDICTION_EXPANSION,
+            parameters={"jurisdictions": variants[i % len(variants)]},
+        )
+        for i in range(count)
+    ]
+
+
+class TestBaselineContext:
+    """Test the shared baseline index."""
+
+    async def test_indexes_issues(self, baseline):
+        context = BaselineContext.from_snapshot(baseline)
+
+        assert context.snapshot_id == baseline.id
+        assert context.compliance == {"GDPR": 0.75, "HIPAA": 0.9}
+        assert [i.code for i in context.issues_by_file["app/config.py"]] == ["SEC-CRED-001"]
+        assert len(context.issues_by_regulation["GDPR"]) == 2
+
+
+class TestComplianceSimulatorBatch:
+    """Test batch and parallel scenario execution."""
+
+    async def test_run_simulation_uses_baseline_index(self, simulator, baseline):
+        scenario = await simulator.create_scenario(
+            organization_id=baseline.organization_id,
+            name="Drop GDPR",
+            scenario_type=ScenarioType.REGULATION_ADOPTION,
+            parameters={"removed_regulations": ["GDPR"]},
+        )
+        code_change = await simulator.create_scenario(
+            organization_id=baseline.organization_id,
+            name="Fix config",
+            scenario_type=ScenarioType.CODE_CHANGE,
+            parameters={"file_changes": [{"path": "app/config.py", "content": "x = 1"}]},
+        )
+
+        dropped = await simulator.run_simulation(scenario.id)
+        fixed = await simulator.run_simulation(code_change.id)
+
+        assert {i.code for i in dropped.resolved_issues} == {"GDPR-RET-001", "GDPR-DSR-002"}
+        assert "GDPR" not in dropped.compliance_after
+        assert [i.code for i in fixed.resolved_issues] == ["SEC-CRED-001"]
+        assert fixed.cost_estimate is not None
+        assert fixed.blast_radius is not None
+        assert fixed.completed_at is not None
+
+    async def test_batch_inline_matches_single_runs(self, simulator, baseline):
+        scenarios = await _expansion_variants(simulator, baseline, 4)
+
+        batch = [
+            r async for r in simulator.simulate_batch([s.id for s in scenarios], max_workers=1)
+        ]
+        singles = [await simulator.run_simulation(s.id) for s in scenarios]
+
+        assert [r.scenario_id for r in batch] == [s.id for s in scenarios]
+        for got, expected in zip(batch, singles, strict=True):
+            assert got.simulated_score == expected.simulated_score
+            assert [i.code for i in got.new_issues] == [i.code for i in expected.new_issues]
+            assert got.cost_estimate == expected.cost_estimate
+            assert await simulator.get_result(got.id) is got
+
+    async def test_batch_reuses_memoized_sub_results(self, simulator, baseline):
+        scenarios = await _expansion_variants(simulator, baseline, 8)
+
+        results = {
+            r.scenario_id: r
+            async for r in simulator.simulate_batch([s.id for s in scenarios], max_workers=1)
+        }
+
+        first, repeat = results[scenarios[0].id], results[scenarios[4].id]
+        assert first.id != repeat.id
+        assert first.cost_estimate is repeat.cost_estimate
+        assert first.blast_radius is repeat.blast_radius
+        assert len(simulator._blast_radius_cache) == 4
+
+    async def test_blast_radius_memo_ignores_scenario_name(self, simulator, baseline):
+        scenarios = [
+            await simulator.create_scenario(
+                organization_id=baseline.organization_id,
+                name=name,
+                scenario_type=ScenarioType.JURISDICTION_EXPANSION,
+                parameters={"jurisdictions": ["EU"]},
+            )
+            for name in ("Enter EU", "European launch")
+        ]
+
+        results = [
+            r async for r in simulator.simulate_batch([s.id for s in scenarios], max_workers=1)
+        ]
+
+        assert len(simulator._blast_radius_cache) == 1
+        for scenario, result in zip(scenarios, results, strict=True):
+            assert result.blast_radius.center == scenario.name
+            assert result.blast_radius.nodes[0].name == scenario.name
+        assert results[0].blast_radius.nodes[1:] == results[1].blast_radius.nodes[1:]
+
+    async def test_baselines_are_bounded(self, simulator, baseline, monkeypatch):
+        monkeypatch.setattr("app.services.digital_twin.simulator._BASELINE_CACHE_SIZE", 2)
+        for _ in range(3):
+            snapshot = await simulator.snapshot_manager.create_snapshot(
+                organization_id=baseline.organization_id, compliance_data=BASELINE_DATA
+            )
+            await simulator._load_baseline(snapshot.id, None)
+
+        assert len(simulator._baselines) == 2
+        assert snapshot.id in simulator._baselines
+
+    async def test_small_batch_runs_inline(self, simulator, baseline, monkeypatch):
+        monkeypatch.setattr(
+            "app.services.digital_twin.simulator.get_process_pool",
+            lambda: pytest.fail("small batches must not use the process pool"),
+        )
+        scenarios = await _expansion_variants(simulator, baseline, 4)
+
+        results = [r async for r in simulator.simulate_batch([s.id for s in scenarios])]
+
+        assert len(results) == 4
+
+    async def test_batch_process_pool(self, simulator, baseline, monkeypatch):
+        monkeypatch.setattr(settings, "process_pool_workers", 2)
+        simulator.inline_batch_size = 0
+        scenarios = await _expansion_variants(simulator, baseline, 4)
+
+        results = [
+            r async for r in simulator.simulate_batch([s.id for s in scenarios], max_workers=2)
+        ]
+
+        assert {r.scenario_id for r in results} == {s.id for s in scenarios}
+        for result in results:
+            assert result.baseline_snapshot_id == baseline.id
+            assert result.new_issues
+            assert result.cost_estimate is not None
+            assert result.completed_at is not None
+
+    async def test_batch_unknown_scenario(self, simulator, baseline):
+        with pytest.raises(ValueError, match="not found"):
+            [r async for r in simulator.simulate_batch([uuid4()])]
+
+    async def test_batch_mixed_organizations_need_explicit_baseline(self, simulator, baseline):
+        first = await simulator.create_scenario(
+            organization_id=baseline.organization_id,
+            name="A",
+            scenario_type=ScenarioType.MERGER_ACQUISITION,
+            parameters={"target_company": "Acme"},
+        )
+        second = await simulator.create_scenario(
+            organization_id=uuid4(),
+            name="B",
+            scenario_type=ScenarioType.MERGER_ACQUISITION,
+            parameters={"target_company": "Globex"},
+        )
+
+        with pytest.raises(ValueError, match="span organizations"):
+            [r async for r in simulator.simulate_batch([first.id, second.id])]
+
+        results = [
+            r
+            async for r in simulator.simulate_batch(
+                [first.id, second.id], baseline_snapshot_id=baseline.id, max_workers=1
+            )
+        ]
+        assert len(results) == 2
@@ -0,0 +1,226 @@
+"""Tests for streaming evidence package archives and resumable downloads."""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+import zipfile
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.downloads import ranged_file_response
+from app.services.evidence_archive import (
+    MANIFEST_NAME,
+    ArchiveStore,
+    MerkleTree,
+    bytes_entry,
+    json_entry,
+    leaf_hash,
+    verify_proof,
+    write_archive,
+)
+from app.services.evidence_archive import writer as archive_writer
+from app.services.evidence_collector import AuditPackageStatus, EvidenceCollectorService
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _leaf(path: str, content: bytes) -> bytes:
+    return leaf_hash(path, hashlib.sha256(content).hexdigest())
+
+
+class TestMerkleTree:
+    """Test inclusion proofs."""
+
+    @pytest.mark.parametrize("count", [1, 2, 3, 5, 8, 13])
+    def test_every_leaf_has_a_valid_proof(self, count):
+        leaves = [_leaf(f"f{i}", str(i).encode()) for i in range(count)]
+        tree = MerkleTree(leaves)
+
+        for index, leaf in enumerate(leaves):
+            assert verify_proof(leaf, tree.proof(index), tree.root)
+
+    def test_tampered_leaf_fails(self):
+        leaves = [_leaf(f"f{i}", str(i).encode()) for i in range(4)]
+        tree = MerkleTree(leaves)
+
+        assert not verify_proof(_leaf("f1", b"forged"), tree.proof(1), tree.root)
+
+
+class TestWriteArchive:
+    """Test the streaming ZIP writer."""
+
+    async def test_manifest_verifies_subsets(self, tmp_path):
+        blobs = {f"evidence/{i}.txt": f"evidence {i}\n".encode() * 1000 for i in range(6)}
+
+        async def entries():
+            for path, content in blobs.items():
+                yield bytes_entry(path, content)
+
+        result = await write_archive(tmp_path / "pkg.zip", entries(), {"name": "Q3"})
+
+        with zipfile.ZipFile(result.path) as zf:
+            manifest = json.loads(zf.read(MANIFEST_NAME))
+            subset = {name: zf.read(name) for name in list(blobs)[:2]}
+
+        assert result.entries == 6
+        assert manifest["merkle"]["root"] == result.merkle_root
+        assert manifest["package"] == {"name": "Q3"}
+        # An auditor holding only the manifest and two files can verify both
+        by_path = {e["path"]: e for e in manifest["entries"]}
+        for path, content in subset.items():
+            assert by_path[path]["sha256"] == hashlib.sha256(content).hexdigest()
+        leaves = [leaf_hash(e["path"], e["sha256"]) for e in manifest["entries"]]
+        assert MerkleTree(leaves).root == result.merkle_root
+
+    async def test_store_builds_each_version_once(self, tmp_path):
+        store = ArchiveStore(tmp_path)
+
+        async def write(target):
+            return await write_archive(target, [bytes_entry("a.txt", "a")], {})
+
+        build = AsyncMock(side_effect=write)
+
+        first = await store.get_or_build("pkg-1", build, filename="pkg.zip")
+        second = await store.get_or_build("pkg-1", build)
+
+        assert build.await_count == 1
+        assert second.path == first.path
+        assert second.merkle_root == first.merkle_root
+        assert second.filename == "pkg.zip"
+        assert not list(tmp_path.glob("*.partial"))
+
+    async def test_same_content_gives_the_same_etag(self, tmp_path):
+        def entries():
+            return [bytes_entry("a.txt", "a"), json_entry("b.json", {"b": 1})]
+
+        first = await write_archive(tmp_path / "first.zip", entries(), {"name": "Q3"})
+        await asyncio.sleep(1.1)
+        second = await write_archive(tmp_path / "second.zip", entries(), {"name": "Q3"})
+
+        content = first.path.read_bytes()
+        assert second.path.read_bytes() == content
+        assert first.etag == second.etag == f'"{hashlib.sha256(content).hexdigest()}"'
+
+    async def test_store_evicts_expired_and_least_recently_served(self, tmp_path):
+        store = ArchiveStore(tmp_path, max_archives=2)
+
+        async def write(target):
+            return await write_archive(target, [bytes_entry("a.txt", "a")], {})
+
+        old = await store.get_or_build("pkg-old", write)
+        stale = await store.get_or_build("pkg-stale", write)
+        past = time.time() - 60
+        os.utime(old.path, (past, past))
+        os.utime(stale.path, (past - 60, past - 60))
+        await store.get_or_build("pkg-old", write)  # served again
+        newest = await store.get_or_build("pkg-new", write)
+
+        assert sorted(p.name for p in tmp_path.glob("*.zip")) == [
+            "pkg-new.zip",
+            "pkg-old.zip",
+        ]
+        assert not (tmp_path / "pkg-stale.json").exists()
+
+        store.ttl_seconds = 0
+        assert store.prune(keep=newest.path) == 1
+        assert [p.name for p in tmp_path.glob("*.zip")] == ["pkg-new.zip"]
+
+
+class TestEvidencePackageExport:
+    """Test exporting a collected audit package as an archive."""
+
+    async def test_export_package_archive(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(archive_writer, "_store", ArchiveStore(tmp_path))
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = []
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=result)
+        service = EvidenceCollectorService(db)
+        now = datetime.now(UTC)
+        package = await service.create_audit_package(
+            organization_id=uuid4(),
+            name="SOC2 FY",
+            frameworks=["SOC2"],
+            audit_period_start=now - timedelta(days=90),
+            audit_period_end=now,
+            created_by=uuid4(),
+        )
+        await service.collect_evidence(package.id)
+        package.status = AuditPackageStatus.READY
+
+        archive = await service.export_package_archive(package.id)
+
+        items = [item for ce in package.control_evidence for item in ce.evidence_items]
+        with zipfile.ZipFile(archive.path) as zf:
+            manifest = json.loads(zf.read(MANIFEST_NAME))
+            item = items[0]
+            blob = next(n for n in zf.namelist() if n.endswith(f"{item.id}.txt"))
+            content = zf.read(blob).decode()
+
+        assert package.status == AuditPackageStatus.EXPORTED
+        assert manifest["package"]["package_id"] == str(package.id)
+        assert manifest["merkle"]["leaf_count"] == len(items) + len(package.control_evidence)
+        assert content == item.content
+        assert hashlib.sha256(content.encode()).hexdigest() == item.content_hash
+
+
+class TestRangedDownload:
+    """Test resumable downloads."""
+
+    @pytest.fixture
+    def client(self, tmp_path):
+        payload = bytes(range(256)) * 40
+        path = tmp_path / "pkg.zip"
+        path.write_bytes(payload)
+        app = FastAPI()
+
+        @app.get("/download")
+        async def download(request: Request):
+            return ranged_file_response(request, path, "application/zip", "pkg.zip", '"v1"')
+
+        return TestClient(app), payload
+
+    def test_full_download_advertises_ranges(self, client):
+        http, payload = client
+        response = http.get("/download")
+
+        assert response.status_code == 200
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.content == payload
+
+    def test_resume_from_offset(self, client):
+        http, payload = client
+        response = http.get("/download", headers={"Range": "bytes=1000-", "If-Range": '"v1"'})
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 1000-{len(payload) - 1}/{len(payload)}"
+        assert response.content == payload[1000:]
+
+    def test_suffix_range(self, client):
+        http, payload = client
+        response = http.get("/download", headers={"Range": "bytes=-10"})
+
+        assert response.status_code == 206
+        assert response.content == payload[-10:]
+
+    def test_changed_file_restarts_download(self, client):
+        http, payload = client
+        response = http.get("/download", headers={"Range": "bytes=1000-", "If-Range": '"old"'})
+
+        assert response.status_code == 200
+        assert response.content == payload
+
+    def test_unsatisfiable_range(self, client):
+        http, payload = client
+        response = http.get("/download", headers={"Range": f"bytes={len(payload)}-"})
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(payload)}"
@@ -0,0 +1,200 @@
+"""Tests for planned, incremental audit-package evidence collection."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.services.evidence_collector import (
+    AuditPackage,
+    CollectionPlan,
+    CollectionSchedule,
+    EvidenceCollectorService,
+    EvidenceType,
+    PackageStore,
+    SourceCache,
+    planner,
+)
+from app.services.evidence_collector.models import CONTROL_FRAMEWORKS
+
+
+pytestmark = pytest.mark.asyncio
+
+FRAMEWORKS = list(CONTROL_FRAMEWORKS)
+
+
+@pytest.fixture
+def db():
+    mapping = SimpleNamespace(
+        id=uuid4(),
+        file_path="app/auth.py",
+        start_line=1,
+        end_line=20,
+        code_snippet="def login(): ...",
+    )
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = [mapping]
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+@pytest.fixture
+def schedule():
+    return CollectionSchedule()
+
+
+@pytest.fixture
+async def package_and_service(db, schedule):
+    service = EvidenceCollectorService(db, max_concurrency=4, schedule=schedule)
+    now = datetime.now(UTC)
+    package = await service.create_audit_package(
+        organization_id=uuid4(),
+        name="FY audit",
+        frameworks=FRAMEWORKS,
+        audit_period_start=now - timedelta(days=365),
+        audit_period_end=now,
+        created_by=uuid4(),
+    )
+    return package, service
+
+
+def _code_artifact_controls() -> int:
+    return sum(
+        EvidenceType.CODE_ARTIFACT in mapping.required_evidence_types
+        for framework in FRAMEWORKS
+        for mapping in CONTROL_FRAMEWORKS[framework]
+    )
+
+
+class TestCollectionPlanning:
+    """Test query deduplication and incremental re-collection."""
+
+    async def test_shared_query_runs_once_per_package(self, db, package_and_service):
+        package, service = package_and_service
+        assert _code_artifact_controls() > 1
+
+        await service.collect_evidence(package.id)
+
+        assert db.execute.await_count == 1
+        collected = [ce for ce in package.control_evidence if ce.last_collected]
+        assert len(collected) == package.total_controls
+        code_items = [
+            item
+            for ce in package.control_evidence
+            for item in ce.evidence_items
+            if item.evidence_type == EvidenceType.CODE_ARTIFACT
+        ]
+        assert len(code_items) == _code_artifact_controls()
+
+    async def test_only_due_controls_are_recollected(self, db, package_and_service, schedule):
+        package, service = package_and_service
+        await service.collect_evidence(package.id)
+        stale = package.control_evidence[0]
+        schedule.set_due(package.id, None, stale, datetime.now(UTC) - timedelta(minutes=1))
+        previous = {ce.id: ce.last_collected for ce in package.control_evidence}
+
+        plan = CollectionPlan.build(package, schedule=schedule)
+        # A later request gets a new service; the due dates outlive it
+        await EvidenceCollectorService(db, schedule=schedule).collect_evidence(package.id)
+
+        assert [ce.id for ce, _ in plan.controls] == [stale.id]
+        assert plan.skipped == package.total_controls - 1
+        refreshed = [
+            ce.id for ce in package.control_evidence if ce.last_collected != previous[ce.id]
+        ]
+        assert refreshed == [stale.id]
+
+    async def test_force_recollects_everything(self, package_and_service, schedule):
+        package, service = package_and_service
+        await service.collect_evidence(package.id)
+
+        plan = CollectionPlan.build(package, force=True, schedule=schedule)
+
+        assert len(plan.controls) == package.total_controls
+        assert plan.skipped == 0
+
+    async def test_due_dates_are_kept_per_repository(self, package_and_service, schedule):
+        package, service = package_and_service
+        repository_a, repository_b = uuid4(), uuid4()
+        await service.collect_evidence(package.id, repository_id=repository_a)
+
+        again = CollectionPlan.build(package, repository_a, schedule=schedule)
+        other = CollectionPlan.build(package, repository_b, schedule=schedule)
+
+        assert again.controls == []
+        assert len(other.controls) == package.total_controls
+
+
+class TestSourceCache:
+    """Test per-package query memoization."""
+
+    async def test_concurrent_callers_share_one_query(self):
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+            return ["row"]
+
+        cache = SourceCache()
+        results = await asyncio.gather(*(cache.get("mappings", loader) for _ in range(10)))
+
+        assert calls == 1
+        assert cache.queries_run == 1
+        assert all(r == ["row"] for r in results)
+
+
+class TestPackageStore:
+    """Test the bounded, idle-expiring audit package store."""
+
+    def _package(self) -> AuditPackage:
+        return AuditPackage(organization_id=uuid4(), name="FY audit")
+
+    async def test_least_recently_used_package_is_evicted(self):
+        store = PackageStore(max_packages=2)
+        first, second, third = self._package(), self._package(), self._package()
+        store.put(first)
+        store.put(second)
+
+        assert store.get(first.id) is first
+        store.put(third)
+
+        assert store.get(second.id) is None
+        assert {p.id for p in store.values()} == {first.id, third.id}
+
+    async def test_idle_packages_expire(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(planner, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+        store = PackageStore(ttl_seconds=60)
+        idle, used = self._package(), self._package()
+        store.put(idle)
+        store.put(used)
+
+        clock[0] += 40
+        assert store.get(used.id) is used
+        clock[0] += 40
+
+        assert store.get(idle.id) is None
+        assert store.values() == [used]
+
+    async def test_services_share_the_store(self, db, schedule):
+        store = PackageStore()
+        now = datetime.now(UTC)
+        service = EvidenceCollectorService(db, schedule=schedule, packages=store)
+        package = await service.create_audit_package(
+            organization_id=uuid4(),
+            name="FY audit",
+            frameworks=FRAMEWORKS[:1],
+            audit_period_start=now - timedelta(days=365),
+            audit_period_end=now,
+            created_by=uuid4(),
+        )
+
+        other = EvidenceCollectorService(db, schedule=schedule, packages=store)
+
+        assert await other.get_package(package.id) is package
@@ -0,0 +1,260 @@
+"""Tests for the embedded full-text index."""
+
+import random
+import threading
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services.chat.rag import RAGPipeline, RAGSource
+from app.services.fulltext import (
+    FullTextIndex,
+    LocalSearchEngine,
+    analyze,
+    regulation_document,
+    replace_documents,
+    stem,
+)
+from app.services.fulltext.engine import compile_query
+from app.services.fulltext.postings import decode_postings, encode_postings
+
+
+pytestmark = pytest.mark.asyncio
+
+REGULATION_FIELDS = {"name": 3.0, "description": 2.0, "content": 1.0}
+
+
+class TestAnalysis:
+    """Test tokenization and stemming."""
+
+    def test_identifiers_are_split_and_stemmed(self):
+        assert analyze("processPersonalData") == [
+            "processpersonaldata",
+            "process",
+            "person",
+            "data",
+        ]
+        assert analyze("encrypt_user_records") == ["encrypt", "user", "record"]
+
+    @pytest.mark.parametrize(
+        ("word", "expected"),
+        [("processing", "process"), ("relational", "relat"), ("encryption", "encrypt")],
+    )
+    def test_porter_stems(self, word, expected):
+        assert stem(word) == expected
+
+    def test_postings_round_trip(self):
+        postings = [(3, ((0, 1),)), (200, ((0, 2), (2, 5))), (70000, ((1, 1),))]
+
+        docnos, payloads = decode_postings(encode_postings(postings))
+
+        assert list(zip(docnos, payloads, strict=True)) == postings
+
+
+class TestFullTextIndex:
+    """Test BM25F scoring, top-k retrieval and persistence."""
+
+    def test_field_boosts_rank_name_matches_first(self):
+        index = FullTextIndex()
+        index.add("body", {"name": "Data retention", "content": "erasure of records on request"})
+        index.add("title", {"name": "Right to erasure", "content": "data subject requests"})
+
+        hits = index.search("erasure", REGULATION_FIELDS)
+
+        assert [hit.id for hit in hits] == ["title", "body"]
+
+    def test_max_score_matches_exhaustive_ranking(self):
+        rng = random.Random(3)  # noqa: S311
+        vocabulary = [f"term{i}" for i in range(40)]
+        index = FullTextIndex(flush_docs=50)
+        for i in range(300):
+            words = rng.choices(vocabulary, weights=range(40, 0, -1), k=rng.randint(5, 30))
+            index.add(str(i), {"name": " ".join(words[:3]), "content": " ".join(words)})
+
+        query = "term1 term7 term22 term35"
+        everything = index.search(query, REGULATION_FIELDS, size=300)
+        top = index.search(query, REGULATION_FIELDS, size=10)
+
+        assert [h.score for h in top] == pytest.approx([h.score for h in everything[:10]])
+
+    def test_filters_and_deletes(self):
+        index = FullTextIndex()
+        index.add("gdpr", {"name": "erasure", "framework": "GDPR"})
+        index.add("ccpa", {"name": "erasure", "framework": "CCPA"})
+        index.add("old", {"name": "erasure", "framework": "GDPR"})
+        index.delete("old")
+
+        hits = index.search("erasure", {"name": 1.0}, predicate=lambda s: s["framework"] == "GDPR")
+
+        assert [hit.id for hit in hits] == ["gdpr"]
+
+    def test_persists_segments_and_tombstones(self, tmp_path):
+        index = FullTextIndex(tmp_path, flush_docs=2, max_segments=2)
+        for i in range(7):
+            index.add(f"doc-{i}", {"content": f"encryption requirement {i}"})
+        index.add("doc-3", {"content": "updated access control"})
+        index.delete("doc-5")
+        index.flush()
+
+        reopened = FullTextIndex(tmp_path)
+
+        assert len(reopened) == 6
+        assert reopened.get("doc-3") == {"content": "updated access control"}
+        hits = reopened.search("encryption", {"content": 1.0}, size=10)
+        assert {hit.id for hit in hits} == {"doc-0", "doc-1", "doc-2", "doc-4", "doc-6"}
+        assert len(list(tmp_path.glob("seg-*.post"))) <= 2
+
+    def test_processes_sharing_a_directory_see_each_others_commits(self, tmp_path):
+        # Each instance stands in for another process with its own in-memory state
+        writers = [FullTextIndex(tmp_path, max_segments=3) for _ in range(2)]
+
+        def write(index: FullTextIndex, prefix: str) -> None:
+            for i in range(20):
+                index.add(f"{prefix}-{i}", {"content": f"encryption requirement {prefix}"})
+
+        threads = [
+            threading.Thread(target=write, args=(index, f"w{n}")) for n, index in enumerate(writers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writers[0].delete("w1-0")
+
+        assert len(writers[1]) == len(FullTextIndex(tmp_path)) == 39
+        assert "w1-0" not in writers[1]
+        hits = writers[1].search("w0", {"content": 1.0}, size=50)
+        assert len(hits) == 20
+
+
+class TestFeeds:
+    """Test syncing documents into an index."""
+
+    def test_replace_documents_within_scope(self, tmp_path):
+        index = FullTextIndex(tmp_path)
+        index.add("a:1", {"repository": "a", "content": "old"})
+        index.add("a:2", {"repository": "a", "content": "gone"})
+        index.add("b:1", {"repository": "b", "content": "other"})
+
+        changed = replace_documents(
+            index,
+            {"a:1": {"repository": "a", "content": "new"}},
+            lambda source: source["repository"] == "a",
+        )
+
+        assert changed == 2
+        assert dict(FullTextIndex(tmp_path).iter_documents()) == {
+            "a:1": {"repository": "a", "content": "new"},
+            "b:1": {"repository": "b", "content": "other"},
+        }
+        assert replace_documents(index, {"a:1": {"repository": "a", "content": "new"}}) == 1
+
+    def test_regulation_document_matches_the_rag_query(self):
+        requirement = SimpleNamespace(
+            reference_id="Art. 17", title="Right to erasure", description="Erase without delay"
+        )
+        regulation = SimpleNamespace(
+            name="GDPR",
+            content_summary="Data protection regulation",
+            framework=SimpleNamespace(value="gdpr"),
+            requirements=[requirement],
+        )
+
+        document = regulation_document(regulation)
+
+        assert document["framework"] == "gdpr"
+        assert "Art. 17 Right to erasure" in document["content"]
+
+
+class TestLocalSearchEngine:
+    """Test the Elasticsearch-compatible facade."""
+
+    async def test_rag_regulation_query(self):
+        engine = LocalSearchEngine()
+        await engine.index(
+            "regulations",
+            "1",
+            {"name": "GDPR", "description": "Data protection", "framework": "gdpr"},
+        )
+        await engine.index(
+            "regulations",
+            "2",
+            {"name": "HIPAA", "description": "Health data protection", "framework": "hipaa"},
+        )
+
+        response = await engine.search(
+            index="regulations",
+            body={
+                "query": {
+                    "bool": {
+                        "must": [
+                            {
+                                "multi_match": {
+                                    "query": "data protection",
+                                    "fields": ["name^3", "description^2", "content"],
+                                }
+                            }
+                        ],
+                        "filter": [{"terms": {"framework": ["hipaa"]}}],
+                    }
+                },
+                "size": 5,
+            },
+        )
+
+        assert [hit["_id"] for hit in response["hits"]["hits"]] == ["2"]
+
+    async def test_filter_only_query_reads_the_index_off_the_event_loop(self, monkeypatch):
+        engine = LocalSearchEngine()
+        for n, framework in enumerate(["gdpr", "hipaa", "gdpr", "gdpr"]):
+            await engine.index("regulations", str(n), {"name": f"R{n}", "framework": framework})
+        target = engine.get_index("regulations")
+        threads = []
+        iter_documents = target.iter_documents
+
+        def spy():
+            threads.append(threading.get_ident())
+            return iter_documents()
+
+        monkeypatch.setattr(target, "iter_documents", spy)
+
+        response = await engine.search(
+            index="regulations",
+            body={"query": {"term": {"framework": "gdpr"}}, "size": 2},
+        )
+
+        assert [hit["_id"] for hit in response["hits"]["hits"]] == ["0", "2"]
+        assert threads
+        assert threads[0] != threading.get_ident()
+
+    def test_unsupported_clause_raises(self):
+        with pytest.raises(ValueError, match="more_like_this"):
+            compile_query({"more_like_this": {"like": "x"}})
+
+    async def test_rag_pipeline_searches_codebase_locally(self):
+        engine = LocalSearchEngine()
+        await engine.index(
+            "codebase_files",
+            "f1",
+            {
+                "path": "app/users.py",
+                "repository": "acme/api",
+                "content": "def deleteUserData(): ...",
+            },
+        )
+        await engine.index(
+            "codebase_files",
+            "f2",
+            {
+                "path": "app/users.py",
+                "repository": "other/api",
+                "content": "def deleteUserData(): ...",
+            },
+        )
+        pipeline = RAGPipeline(elasticsearch_client=engine)
+
+        docs = await pipeline._search_codebase("delete user data", uuid4(), "acme/api")
+
+        assert [doc.id for doc in docs] == ["f1"]
+        assert docs[0].source == RAGSource.CODEBASE
@@ -0,0 +1,268 @@
+"""Tests for GitHub content fetching, caching and rate-limit handling."""
+
+import asyncio
+import base64
+from collections import OrderedDict
+
+import httpx
+import pytest
+
+from app.services.analysis_cache import AnalysisCache
+from app.services.github import cache as github_cache
+from app.services.github import client as github_client
+from app.services.github.cache import BlobCache, RateLimitBudget
+from app.services.github.client import GitHubClient
+from app.services.pr_review.analyzer import PRAnalyzer
+from app.services.sbom.generator import SBOMGenerator
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _blob(content: str) -> dict:
+    return {"content": base64.b64encode(content.encode()).decode(), "encoding": "base64"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    monkeypatch.setattr(github_cache, "_blob_cache", BlobCache())
+    monkeypatch.setattr(github_cache, "_etag_cache", None)
+    monkeypatch.setattr(github_cache, "_budgets", OrderedDict())
+
+
+@pytest.fixture
+def github(monkeypatch):
+    """GitHubClient wired to an in-process handler; records every request."""
+    requests: list[httpx.Request] = []
+    routes: dict[str, object] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        route = routes[request.url.path]
+        return route(request) if callable(route) else httpx.Response(200, json=route)
+
+    monkeypatch.setattr(github_client, "_github_transport", lambda: httpx.MockTransport(handler))
+    return GitHubClient(access_token="test-token"), routes, requests
+
+
+class TestBlobCache:
+    """Test content-addressed blob caching."""
+
+    async def test_files_are_downloaded_once_per_blob_sha(self, github):
+        client, routes, requests = github
+        routes["/repos/acme/api/git/blobs/aaa"] = _blob("import os\n")
+        routes["/repos/acme/api/git/blobs/bbb"] = _blob("SECRET = 1\n")
+        entries = [{"path": "app/user.py", "sha": "aaa"}, {"path": "app/auth.py", "sha": "bbb"}]
+
+        async with client:
+            first = await client.get_files("acme", "api", entries)
+            # Same blob under a different path (e.g. a fork or another repo)
+            second = await client.get_files("acme", "api", [{"path": "copy.py", "sha": "aaa"}])
+
+        assert first["app/user.py"].content == "import os\n"
+        assert first["app/auth.py"].content == "SECRET = 1\n"
+        assert second["copy.py"].content == "import os\n"
+        assert len(requests) == 2
+
+    async def test_get_file_content_uses_known_sha(self, github):
+        client, routes, requests = github
+        routes["/repos/acme/api/contents/README.md"] = {
+            "path": "README.md",
+            "sha": "ccc",
+            "size": 5,
+            **_blob("hello"),
+        }
+
+        async with client:
+            fetched = await client.get_file_content("acme", "api", "README.md")
+            cached = await client.get_file_content("acme", "api", "README.md", sha="ccc")
+
+        assert fetched.content == cached.content == "hello"
+        assert len(requests) == 1
+
+    async def test_undecodable_files_are_skipped(self, github):
+        client, routes, _ = github
+        routes["/repos/acme/api/git/blobs/bin"] = {
+            "content": base64.b64encode(b"\xff\xfe\x00").decode(),
+            "encoding": "base64",
+        }
+        routes["/repos/acme/api/git/blobs/ok"] = _blob("x = 1")
+
+        async with client:
+            files = await client.get_files(
+                "acme", "api", [{"path": "logo.png", "sha": "bin"}, {"path": "a.py", "sha": "ok"}]
+            )
+
+        assert list(files) == ["a.py"]
+
+    def test_evicts_least_recently_used_by_size(self):
+        blobs = BlobCache(max_bytes=10)
+        blobs.put("a", "12345")
+        blobs.put("b", "12345")
+        blobs.get("a")
+        blobs.put("c", "123")
+
+        assert "a" in blobs
+        assert "b" not in blobs
+        assert "c" in blobs
+
+
+class TestConditionalRequests:
+    """Test ETag revalidation and pagination."""
+
+    async def test_not_modified_reuses_cached_body(self, github):
+        client, routes, requests = github
+
+        def repo(request: httpx.Request) -> httpx.Response:
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"default_branch": "main"}, headers={"ETag": '"v1"'})
+
+        routes["/repos/acme/api"] = repo
+
+        async with client:
+            first = await client.get_repository("acme", "api")
+            second = await client.get_repository("acme", "api")
+
+        assert first == second == {"default_branch": "main"}
+        assert "If-None-Match" not in requests[0].headers
+        assert requests[1].headers["If-None-Match"] == '"v1"'
+
+    async def test_pull_request_files_follow_every_page(self, github):
+        client, routes, requests = github
+        base = "https://api.github.com/repos/acme/api/pulls/7/files"
+
+        def files(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params.get("page", "1"))
+            headers = {}
+            if page < 3:
+                headers["Link"] = f'<{base}?per_page=100&page={page + 1}>; rel="next"'
+            body = [{"filename": f"f{page}_{i}.py"} for i in range(100 if page < 3 else 5)]
+            return httpx.Response(200, json=body, headers=headers)
+
+        routes["/repos/acme/api/pulls/7/files"] = files
+
+        async with client:
+            result = await client.get_pull_request_files("acme", "api", 7)
+
+        assert len(result) == 205
+        assert len(requests) == 3
+        assert requests[0].url.params["per_page"] == "100"
+
+
+class TestRateLimitBudget:
+    """Test rate-limit-aware concurrency."""
+
+    def test_limit_shrinks_with_remaining_budget(self):
+        budget = RateLimitBudget(max_concurrency=16, reserve=50)
+        assert budget.limit() == 16
+
+        budget.update({"X-RateLimit-Remaining": "54", "X-RateLimit-Reset": "0"})
+        assert budget.limit() == 4
+
+        budget.update({"X-RateLimit-Remaining": "10"})
+        assert budget.limit() == 1
+
+    async def test_concurrent_fetches_stay_within_budget(self, monkeypatch):
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(
+                200,
+                json=_blob("x"),
+                headers={"X-RateLimit-Remaining": "53", "X-RateLimit-Reset": "0"},
+            )
+
+        monkeypatch.setattr(
+            github_client, "_github_transport", lambda: httpx.MockTransport(handler)
+        )
+        entries = [{"path": f"f{i}.py", "sha": f"sha{i}"} for i in range(12)]
+
+        async with GitHubClient(access_token="test-token") as client:
+            # The first response primes the budget (53 remaining, 50 reserved)
+            await client.get_files("acme", "api", entries[:1])
+            files = await client.get_files("acme", "api", entries[1:])
+
+        assert len(files) == 11
+        assert 1 < peak <= 3
+
+    def test_budgets_are_bounded(self, monkeypatch):
+        monkeypatch.setattr(github_cache, "_MAX_BUDGETS", 2)
+        first = github_cache.get_rate_limit_budget("token-a")
+        github_cache.get_rate_limit_budget("token-b")
+        github_cache.get_rate_limit_budget("token-a")
+        github_cache.get_rate_limit_budget("token-c")
+
+        assert len(github_cache._budgets) == 2
+        assert github_cache.get_rate_limit_budget("token-a") is first
+
+
+class TestCachedConsumers:
+    """Test that PR review and SBOM generation read through the blob cache."""
+
+    async def test_pr_files_without_patch_are_scanned_from_blobs(self, github):
+        _, routes, requests = github
+        routes["/repos/acme/api/pulls/7"] = {
+            "number": 7,
+            "url": "",
+            "html_url": "",
+            "state": "open",
+            "title": "Add settings",
+            "body": "",
+            "head": {"sha": "head1", "ref": "feature"},
+            "base": {"sha": "base1", "ref": "main"},
+        }
+        routes["/repos/acme/api/pulls/7/files"] = [
+            {"filename": "app/settings.py", "status": "added", "sha": "big", "additions": 2},
+            {"filename": "app/old.py", "status": "removed", "sha": "gone", "deletions": 9},
+        ]
+        routes["/repos/acme/api/git/blobs/big"] = _blob(
+            'DEBUG = True\npassword = "hunter2hunter2"\n'
+        )
+        analyzer = PRAnalyzer(scan_workers=1, result_cache=AnalysisCache())
+
+        first = await analyzer.analyze_pr("acme", "api", 7, access_token="test-token")
+        second = await analyzer.analyze_pr("acme", "api", 7, access_token="test-token")
+
+        assert (first.base_sha, first.head_sha) == ("base1", "head1")
+        secret = next(
+            v for v in first.violations if v.metadata["pattern_name"] == "hardcoded_secrets"
+        )
+        assert (secret.file_path, secret.line_start) == ("app/settings.py", 2)
+        assert len(second.violations) == len(first.violations)
+        blob_requests = [r for r in requests if "/git/blobs/" in r.url.path]
+        assert [r.url.path for r in blob_requests] == ["/repos/acme/api/git/blobs/big"]
+
+    async def test_sbom_dependency_files_come_from_blobs(self, github):
+        client, routes, requests = github
+        routes["/repos/acme/api/git/trees/main"] = {
+            "tree": [
+                {"path": "requirements.txt", "type": "blob", "sha": "req"},
+                {"path": "web/package.json", "type": "blob", "sha": "pkg"},
+                {"path": "README.md", "type": "blob", "sha": "doc"},
+                {"path": "web", "type": "tree", "sha": "dir"},
+            ]
+        }
+        routes["/repos/acme/api/git/blobs/req"] = _blob("requests==2.31.0\n")
+        routes["/repos/acme/api/git/blobs/pkg"] = _blob('{"dependencies": {}}')
+        generator = SBOMGenerator(parse_workers=1)
+
+        async with client:
+            files = await generator.fetch_dependency_files(client, "acme", "api", "main")
+            again = await generator.fetch_dependency_files(client, "acme", "api", "main")
+
+        assert (
+            files
+            == again
+            == {
+                "requirements.txt": "requests==2.31.0\n",
+                "web/package.json": '{"dependencies": {}}',
+            }
+        )
+        assert sum("/git/blobs/" in r.url.path for r in requests) == 2
@@ -0,0 +1,236 @@
+"""Tests for shallow-checkout repository ingestion."""
+
+import subprocess
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import RepositoryError
+from app.services.digital_twin.codebase_graph import CodebaseGraphBuilder
+from app.services.fulltext import CODEBASE_FILES, LocalSearchEngine
+from app.services.fulltext import engine as fulltext_engine
+from app.services.iac_scanner import IaCPlatform, IaCScannerService, ScanConfiguration
+from app.services.ingestion import FileFilter, IngestionRun, RepositoryWorkspace
+from app.services.ingestion.files import MMAP_THRESHOLD
+from app.services.sbom.generator import SBOMGenerator
+from app.workers.analysis_tasks import _ingest_repository
+
+
+pytestmark = pytest.mark.asyncio
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+    "PATH": "/usr/bin:/bin",
+}
+
+
+def git(cwd: Path, *args: str) -> str:
+    return subprocess.run(  # noqa: S603 - fixed git invocations on test-owned paths
+        ["git", *args],  # noqa: S607
+        cwd=cwd,
+        env=GIT_ENV,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+class Origin:
+    """A local bare repository plus a clone used to push commits to it."""
+
+    def __init__(self, root: Path):
+        self.bare = root / "origin.git"
+        self.work = root / "work"
+        self.bare.mkdir(parents=True)
+        git(self.bare, "init", "--quiet", "--bare", "--initial-branch=main")
+        git(root, "clone", "--quiet", str(self.bare), str(self.work))
+        git(self.work, "checkout", "--quiet", "-b", "main")
+
+    @property
+    def url(self) -> str:
+        return self.bare.as_uri()
+
+    def commit(self, files: dict[str, str | bytes], message: str = "update") -> str:
+        for path, content in files.items():
+            target = self.work / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, bytes):
+                target.write_bytes(content)
+            else:
+                target.write_text(content)
+        git(self.work, "add", "-A")
+        git(self.work, "commit", "--quiet", "-m", message)
+        git(self.work, "push", "--quiet", "origin", "main")
+        return git(self.work, "rev-parse", "HEAD").strip()
+
+
+@pytest.fixture
+def origin(tmp_path):
+    repo = Origin(tmp_path)
+    repo.commit(
+        {
+            "app/users.py": "def get_email(user):\n    return user.email\n",
+            "app/big.py": "# padding\n" * (MMAP_THRESHOLD // 10 + 1),
+            "assets/logo.png": b"\x89PNG\r\n\x1a\n\x00\x00binary",
+            "node_modules/lib/index.js": "module.exports = {}\n",
+            "infra/main.tf": 'resource "aws_s3_bucket" "data" {\n  bucket = "data"\n}\n',
+            "k8s/deployment.yaml": "apiVersion: apps/v1\nkind: Deployment\n",
+            "requirements.txt": "requests==2.31.0\n",
+        },
+        message="initial",
+    )
+    return repo
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    return RepositoryWorkspace(root=tmp_path / "workspaces")
+
+
+class TestRepositoryWorkspace:
+    """Test fetching and updating local checkouts."""
+
+    async def test_shallow_checkout_lists_tracked_files(self, origin, workspace):
+        async with workspace.checkout(origin.url) as checkout:
+            paths = {entry.path for entry in checkout.files}
+            shallow = git(checkout.path, "rev-parse", "--is-shallow-repository").strip()
+
+        assert checkout.commit_sha == git(origin.work, "rev-parse", "HEAD").strip()
+        assert "app/users.py" in paths
+        assert "infra/main.tf" in paths
+        assert shallow == "true"
+
+    async def test_later_runs_fetch_incrementally_into_the_same_tree(self, origin, workspace):
+        async with workspace.checkout(origin.url) as first:
+            first_path = first.path
+
+        new_sha = origin.commit({"app/consent.py": "CONSENT = True\n"})
+        async with workspace.checkout(origin.url) as second:
+            contents = second.read_files()
+
+        assert second.path == first_path
+        assert second.commit_sha == new_sha
+        assert contents["app/consent.py"] == "CONSENT = True\n"
+
+    async def test_unknown_repository_raises(self, tmp_path, workspace):
+        with pytest.raises(RepositoryError):
+            async with workspace.checkout((tmp_path / "missing.git").as_uri()):
+                pass
+
+    async def test_prune_keeps_most_recent_checkouts(self, tmp_path, origin, workspace):
+        workspace.max_repositories = 1
+        other = Origin(tmp_path / "other")
+        other.commit({"README.md": "other\n"})
+
+        async with workspace.checkout(origin.url):
+            pass
+        async with workspace.checkout(other.url) as latest:
+            pass
+
+        remaining = [path for path in workspace.root.iterdir() if path.is_dir()]
+        assert remaining == [latest.path]
+
+    async def test_waiting_for_a_locked_checkout_times_out(self, origin, workspace):
+        workspace.lock_timeout_seconds = 0.3
+
+        async with workspace.checkout(origin.url):
+            with pytest.raises(RepositoryError, match="in use"):
+                async with workspace.checkout(origin.url):
+                    pass
+
+        async with workspace.checkout(origin.url) as checkout:
+            assert checkout.files
+
+
+class TestFileIteration:
+    """Test filtered streaming reads."""
+
+    async def test_filters_and_binary_detection(self, origin, workspace):
+        async with workspace.checkout(origin.url) as checkout:
+            python = checkout.read_files(FileFilter(extensions=(".py",)))
+            everything = checkout.read_files()
+            small = [e.path for e in checkout.iter_files(FileFilter(max_size=1024))]
+            logo = next(e for e in checkout.files if e.path == "assets/logo.png")
+
+            assert logo.is_binary()
+
+        assert set(python) == {"app/users.py", "app/big.py"}
+        assert python["app/big.py"].startswith("# padding")
+        assert "assets/logo.png" not in everything
+        assert "node_modules/lib/index.js" not in everything
+        assert "app/big.py" not in small
+
+    async def test_tree_matches_github_shape(self, origin, workspace):
+        async with workspace.checkout(origin.url) as checkout:
+            tree = checkout.tree()
+
+        users = next(item for item in tree if item["path"] == "app/users.py")
+        assert users["type"] == "blob"
+        assert len(users["sha"]) == 40
+        assert {"path": "infra", "type": "tree"} in tree
+
+
+class TestIngestionRun:
+    """Test sharing one checkout across analyzers."""
+
+    async def test_analyzers_share_one_checkout(self, origin, workspace, db_session):
+        fetches = 0
+        sync = workspace._sync
+
+        async def counting_sync(*args, **kwargs):
+            nonlocal fetches
+            fetches += 1
+            return await sync(*args, **kwargs)
+
+        workspace._sync = counting_sync
+
+        async with IngestionRun(workspace) as run:
+            checkout = await run.checkout(origin.url)
+            graph = await CodebaseGraphBuilder().build_graph_from_checkout(
+                uuid4(), uuid4(), await run.checkout(origin.url)
+            )
+            scan = await IaCScannerService(db_session).scan_repository(
+                "org",
+                origin.url,
+                ScanConfiguration(platforms=[IaCPlatform.TERRAFORM, IaCPlatform.KUBERNETES]),
+                checkout=await run.checkout(origin.url),
+            )
+            sbom_files = await SBOMGenerator().dependency_files_from_checkout(checkout)
+
+        assert fetches == 1
+        assert graph.commit_sha == checkout.commit_sha
+        assert graph.files_analyzed == 2
+        assert scan.files_scanned == 2
+        assert list(sbom_files) == ["requirements.txt"]
+
+    async def test_repository_analysis_ingests_from_the_checkout(
+        self, origin, workspace, db_session, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "fulltext_index_dir", str(tmp_path / "search"))
+        engine = LocalSearchEngine(tmp_path / "search")
+        monkeypatch.setattr(fulltext_engine, "_engine", engine)
+        origin.commit({"app/consent.py": "CONSENT_VERSION = 2\n"})
+        repository = SimpleNamespace(
+            id=uuid4(),
+            full_name="acme/api",
+            clone_url=origin.url,
+            default_branch="main",
+        )
+
+        async with IngestionRun(workspace) as run:
+            samples = await _ingest_repository(db_session, repository, uuid4(), run)
+
+        assert repository.last_analyzed_commit == git(origin.work, "rev-parse", "HEAD").strip()
+        assert repository.structure_cache["infra"] == {"type": "dir"}
+        assert "app/users.py" in repository.structure_cache
+        assert repository.primary_language == "Python"
+        assert samples == {"app/consent.py": "CONSENT_VERSION = 2\n"}
+        indexed = engine.get_index(CODEBASE_FILES)
+        assert indexed.get("acme/api:app/users.py")["language"] == "python"
+        assert "acme/api:infra/main.tf" not in indexed
@@ -0,0 +1,243 @@
+"""Tests for early-terminating, hedged multi-LLM consensus."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.multi_llm import (
+    ConsensusExecutor,
+    LLMProvider,
+    MultiLLMConfig,
+    MultiLLMService,
+    ProviderConfig,
+    ProviderResult,
+    ProviderStats,
+)
+from app.services.multi_llm.router import route_request
+
+
+pytestmark = pytest.mark.asyncio
+
+PROVIDERS = [
+    ProviderConfig(provider=LLMProvider.COPILOT, model_name="copilot-default"),
+    ProviderConfig(provider=LLMProvider.OPENAI, model_name="gpt-4o"),
+    ProviderConfig(provider=LLMProvider.ANTHROPIC, model_name="claude"),
+]
+
+CRITICAL_TEXT = "Processing of special categories is prohibited."
+
+
+def _warm(stats: ProviderStats, latency_ms: float, *providers: LLMProvider) -> None:
+    for provider in providers:
+        for _ in range(20):
+            stats.record(provider, latency_ms, 100)
+
+
+def _runner(behaviour: dict[LLMProvider, tuple[float, list[str] | None]], calls: list):
+    """A provider call that sleeps, then returns the given actions (None fails)."""
+
+    async def run(config: ProviderConfig) -> ProviderResult:
+        calls.append(config.provider)
+        delay, actions = behaviour[config.provider]
+        await asyncio.sleep(delay)
+        if actions is None:
+            return ProviderResult(provider=config.provider, error="upstream error")
+        return ProviderResult(
+            provider=config.provider,
+            obligations=[{"action": action} for action in actions],
+            confidence=0.9,
+        )
+
+    return run
+
+
+def _executor(run, stats: ProviderStats, quorum: int = 2) -> ConsensusExecutor:
+    return ConsensusExecutor(run, stats, quorum=quorum, agreement_target=0.7)
+
+
+class TestConsensusExecutor:
+    """Test quorum, hedging and cancellation."""
+
+    async def test_agreeing_quorum_cancels_stragglers(self):
+        calls: list[LLMProvider] = []
+        run = _runner(
+            {
+                LLMProvider.COPILOT: (0.01, ["notify"]),
+                LLMProvider.OPENAI: (0.02, ["notify"]),
+                LLMProvider.ANTHROPIC: (5.0, ["notify"]),
+            },
+            calls,
+        )
+
+        start = time.monotonic()
+        results = await _executor(run, ProviderStats()).run(PROVIDERS)
+
+        # Without history every provider starts at once, as before
+        assert len(calls) == 3
+        assert [r.provider for r in results] == [LLMProvider.COPILOT, LLMProvider.OPENAI]
+        assert time.monotonic() - start < 1.0
+
+    async def test_fast_quorum_does_not_start_backups(self):
+        stats = ProviderStats()
+        _warm(stats, 1000.0, LLMProvider.COPILOT, LLMProvider.OPENAI, LLMProvider.ANTHROPIC)
+        calls: list[LLMProvider] = []
+        run = _runner({p.provider: (0.01, ["notify"]) for p in PROVIDERS}, calls)
+
+        results = await _executor(run, stats).run(PROVIDERS)
+
+        # Equally fast providers are started cheapest first
+        assert calls == [LLMProvider.COPILOT, LLMProvider.OPENAI]
+        assert len(results) == 2
+
+    async def test_provider_past_its_p95_is_hedged(self):
+        stats = ProviderStats()
+        _warm(stats, 20.0, LLMProvider.COPILOT, LLMProvider.OPENAI, LLMProvider.ANTHROPIC)
+        calls: list[LLMProvider] = []
+        run = _runner(
+            {
+                LLMProvider.COPILOT: (5.0, ["notify"]),
+                LLMProvider.OPENAI: (0.01, ["notify"]),
+                LLMProvider.ANTHROPIC: (0.05, ["notify"]),
+            },
+            calls,
+        )
+
+        start = time.monotonic()
+        results = await _executor(run, stats).run(PROVIDERS)
+
+        assert calls == [LLMProvider.COPILOT, LLMProvider.OPENAI, LLMProvider.ANTHROPIC]
+        assert {r.provider for r in results} == {LLMProvider.OPENAI, LLMProvider.ANTHROPIC}
+        assert time.monotonic() - start < 1.0
+
+    async def test_failures_and_split_votes_start_another_provider(self):
+        stats = ProviderStats()
+        _warm(stats, 1000.0, LLMProvider.COPILOT, LLMProvider.OPENAI, LLMProvider.ANTHROPIC)
+        local = ProviderConfig(provider=LLMProvider.LOCAL, model_name="llama")
+        _warm(stats, 1000.0, LLMProvider.LOCAL)
+        calls: list[LLMProvider] = []
+        run = _runner(
+            {
+                LLMProvider.LOCAL: (0.0, None),
+                LLMProvider.COPILOT: (0.01, ["notify"]),
+                LLMProvider.OPENAI: (0.02, ["erase"]),
+                LLMProvider.ANTHROPIC: (0.01, ["notify"]),
+            },
+            calls,
+        )
+
+        results = await _executor(run, stats).run([*PROVIDERS, local])
+
+        assert calls == [
+            LLMProvider.LOCAL,
+            LLMProvider.COPILOT,
+            LLMProvider.OPENAI,
+            LLMProvider.ANTHROPIC,
+        ]
+        assert sum(1 for r in results if r.error is None) == 3
+
+    async def test_unanimous_waits_for_every_provider(self):
+        stats = ProviderStats()
+        _warm(stats, 1000.0, LLMProvider.COPILOT, LLMProvider.OPENAI, LLMProvider.ANTHROPIC)
+        calls: list[LLMProvider] = []
+        run = _runner({p.provider: (0.01, ["notify"]) for p in PROVIDERS}, calls)
+
+        results = await _executor(run, stats, quorum=3).run(PROVIDERS)
+
+        assert len(results) == 3
+
+
+class TestProviderStats:
+    """Test latency and cost tracking and its use in routing."""
+
+    async def test_failed_and_cancelled_requests_raise_effective_cost(self):
+        stats = ProviderStats()
+        for _ in range(10):
+            stats.record(LLMProvider.OPENAI, 100.0, 1000)
+        for _ in range(5):
+            stats.record(LLMProvider.OPENAI, 900.0, 1000, cancelled=True)
+        for _ in range(5):
+            stats.record(LLMProvider.OPENAI, 5.0, 1000, error=True)
+
+        assert stats.cost_per_1k()["openai"] == pytest.approx(0.010)
+        assert stats.latency_p95_ms()["openai"] == 100.0
+        assert stats.usage(LLMProvider.OPENAI).cancelled == 5
+
+    async def test_only_completed_requests_add_latency_samples(self):
+        stats = ProviderStats()
+        for _ in range(10):
+            stats.record(LLMProvider.OPENAI, 100.0, 1000)
+        for _ in range(20):
+            stats.record(LLMProvider.OPENAI, 2.0, 1000, cancelled=True)
+            stats.record(LLMProvider.OPENAI, 1.0, 1000, error=True)
+
+        # Fast cancellations and errors must not make the provider look fast
+        assert stats.p50_ms(LLMProvider.OPENAI) == 100.0
+        assert stats.usage(LLMProvider.OPENAI).requests == 50
+        assert len(stats.usage(LLMProvider.OPENAI).latencies_ms) == 10
+
+    async def test_router_pairs_consensus_with_the_fastest_provider(self):
+        stats = ProviderStats()
+        _warm(stats, 4000.0, LLMProvider.OPENAI)
+        _warm(stats, 800.0, LLMProvider.ANTHROPIC)
+        _warm(stats, 1500.0, LLMProvider.COPILOT)
+
+        decision = route_request(
+            "Cross-border transfers need an adequacy decision.",
+            available_providers=PROVIDERS,
+            latency_p95_ms=stats.latency_p95_ms(),
+        )
+
+        # Equally accurate providers are ranked by latency
+        assert decision.primary_provider == LLMProvider.ANTHROPIC
+        assert decision.secondary_providers == [LLMProvider.COPILOT]
+        assert decision.expected_latency_ms == 1500.0
+
+        critical = route_request(
+            CRITICAL_TEXT, available_providers=PROVIDERS, latency_p95_ms=stats.latency_p95_ms()
+        )
+        assert critical.secondary_providers == [LLMProvider.ANTHROPIC, LLMProvider.OPENAI]
+        assert critical.expected_latency_ms == 1500.0
+
+
+class TestMultiLLMServiceConsensus:
+    """Test the consensus path of parse_regulation."""
+
+    async def test_slow_provider_is_cancelled_and_recorded(self, db_session, mock_copilot_client):
+        service = MultiLLMService(
+            db=db_session,
+            copilot_client=mock_copilot_client,
+            config=MultiLLMConfig(
+                providers=[
+                    ProviderConfig(provider=LLMProvider.OPENAI, model_name="gpt-4o"),
+                    ProviderConfig(provider=LLMProvider.COPILOT, model_name="copilot-default"),
+                    ProviderConfig(provider=LLMProvider.LOCAL, model_name="llama"),
+                ]
+            ),
+        )
+        service._stats = ProviderStats()
+        answer = mock_copilot_client.analyze_legal_text.return_value
+
+        async def analyze(text):
+            await asyncio.sleep(0.05)
+            return answer
+
+        mock_copilot_client.analyze_legal_text.side_effect = analyze
+
+        async def slow_external(config, text, framework):
+            await asyncio.sleep(5)
+            return {"requirements": []}
+
+        service._call_external_llm = slow_external
+
+        start = time.monotonic()
+        result = await service.parse_regulation("The controller shall provide information.")
+
+        assert time.monotonic() - start < 1.0
+        assert result.status.value == "completed"
+        assert {r.provider for r in result.provider_results} == {
+            LLMProvider.COPILOT,
+            LLMProvider.LOCAL,
+        }
+        assert result.agreement_score == 1.0
+        assert service._stats.usage(LLMProvider.OPENAI).cancelled == 1
@@ -0,0 +1,194 @@
+"""Tests for the pattern marketplace search index."""
+
+import random
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.services.pattern_marketplace import (
+    CompliancePattern,
+    LicenseType,
+    PatternCategory,
+    PatternMarketplaceService,
+    PatternSearchIndex,
+    PatternType,
+    PublishStatus,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+PUBLISHED = {"status": [PublishStatus.PUBLISHED]}
+
+
+def _pattern(name: str, **kwargs) -> CompliancePattern:
+    kwargs.setdefault("status", PublishStatus.PUBLISHED)
+    return CompliancePattern(name=name, slug=name.lower().replace(" ", "-"), **kwargs)
+
+
+@pytest.fixture
+def index() -> PatternSearchIndex:
+    index = PatternSearchIndex()
+    for pattern in [
+        _pattern(
+            "GDPR Consent Banner",
+            description="Cookie consent templates",
+            category=PatternCategory.CONSENT_MANAGEMENT,
+            regulations=["GDPR"],
+            tags=["cookies"],
+        ),
+        _pattern(
+            "PII Detection",
+            description="Detect personal data in logs",
+            category=PatternCategory.DATA_PRIVACY,
+            regulations=["GDPR", "CCPA"],
+            languages=["python"],
+        ),
+        _pattern(
+            "HIPAA Audit Trail",
+            description="Immutable audit logging",
+            category=PatternCategory.AUDIT_TRAIL,
+            regulations=["HIPAA"],
+            license_type=LicenseType.COMMERCIAL,
+        ),
+        _pattern("Draft Encryption Helper", status=PublishStatus.DRAFT),
+    ]:
+        index.add(pattern)
+    return index
+
+
+def _names(patterns: list[CompliancePattern]) -> list[str]:
+    return [p.name for p in patterns]
+
+
+class TestTextMatching:
+    """Test tokenized, prefix and typo-tolerant matching."""
+
+    def test_terms_match_whole_tokens_and_prefixes(self, index):
+        patterns, total = index.search("audit log", filters=PUBLISHED)
+
+        assert total == 1
+        assert _names(patterns) == ["HIPAA Audit Trail"]
+        assert index.search("cook", filters=PUBLISHED)[1] == 1
+
+    def test_single_typo_falls_back_to_nearby_tokens(self, index):
+        assert _names(index.search("detcetion")[0]) == ["PII Detection"]
+        assert _names(index.search("consnet")[0]) == ["GDPR Consent Banner"]
+        # Short terms and two-edit typos do not fuzz
+        assert index.search("pxi")[1] == 0
+        assert index.search("detcetoin")[1] == 0
+
+    def test_remove_drops_tokens_and_postings(self, index):
+        (pattern,), _ = index.search("hipaa")
+        index.remove(pattern.id)
+
+        assert index.search("hipaa")[1] == 0
+        assert "hipaa" not in index._vocabulary
+        assert pattern.id not in index
+
+
+class TestFacets:
+    """Test facet filters and counts."""
+
+    def test_filters_or_within_a_field_and_across_fields(self, index):
+        filters = {**PUBLISHED, "regulations": ["CCPA", "HIPAA"]}
+        assert index.search(filters=filters)[1] == 2
+
+        filters["license_type"] = [LicenseType.FREE]
+        assert _names(index.search(filters=filters)[0]) == ["PII Detection"]
+
+    def test_counts_ignore_their_own_field_filter(self, index):
+        counts = index.facet_counts(
+            filters={**PUBLISHED, "category": [PatternCategory.DATA_PRIVACY]}
+        )
+
+        assert counts["category"] == {
+            PatternCategory.CONSENT_MANAGEMENT: 1,
+            PatternCategory.DATA_PRIVACY: 1,
+            PatternCategory.AUDIT_TRAIL: 1,
+        }
+        assert counts["regulations"] == {"GDPR": 1, "CCPA": 1}
+
+
+class TestOrdering:
+    """Test precomputed sort orders and incremental updates."""
+
+    @pytest.mark.parametrize("selective", [False, True])
+    def test_top_k_matches_a_full_sort(self, selective):
+        rng = random.Random(7)  # noqa: S311
+        start = datetime(2026, 1, 1, tzinfo=UTC)
+        patterns = [
+            _pattern(
+                f"Pattern {i}",
+                category=rng.choice(list(PatternCategory)),
+                downloads=rng.randrange(50),
+                avg_rating=rng.randrange(10) / 2,
+                published_at=start + timedelta(hours=rng.randrange(100)),
+            )
+            for i in range(400)
+        ]
+        index = PatternSearchIndex()
+        for pattern in patterns:
+            index.add(pattern)
+
+        filters = {"category": [PatternCategory.OTHER]} if selective else {}
+        matching = [p for p in patterns if not selective or p.category == PatternCategory.OTHER]
+        for sort_by, key in [
+            ("downloads", lambda p: p.downloads),
+            ("rating", lambda p: p.avg_rating),
+            ("newest", lambda p: p.published_at),
+        ]:
+            expected = sorted(matching, key=key, reverse=True)[5:25]
+            got, total = index.search(filters=filters, sort_by=sort_by, limit=20, offset=5)
+
+            assert total == len(matching)
+            assert [p.id for p in got] == [p.id for p in expected]
+
+    def test_batch_load_matches_incremental_adds(self, index):
+        batch = PatternSearchIndex()
+        batch.add_many(index._patterns)
+
+        assert batch._tokens == index._tokens
+        assert batch._facets == index._facets
+        assert batch._orders == index._orders
+        assert batch._deletes == index._deletes
+
+    def test_updates_reorder_and_reindex(self, index):
+        (draft,), _ = index.search("encryption")
+        draft.status = PublishStatus.PUBLISHED
+        draft.downloads = 1_000
+        draft.name = "Field Encryption"
+        index.update(draft)
+
+        top, _ = index.search(filters=PUBLISHED, sort_by="downloads", limit=1)
+        assert _names(top) == ["Field Encryption"]
+        assert index.search("draft")[1] == 0
+        assert len(index) == 4
+
+
+class TestServiceIntegration:
+    """Test the marketplace service keeps its index current."""
+
+    @pytest.fixture
+    def service(self, db_session):
+        return PatternMarketplaceService(db=db_session, organization_id=uuid4())
+
+    def test_published_pattern_becomes_searchable(self, service):
+        pattern = service.create_pattern(
+            name="Zanzibar Access Review",
+            description="Quarterly access review workflow",
+            category=PatternCategory.ACCESS_CONTROL,
+            pattern_type=PatternType.TEMPLATE,
+            content={},
+            regulations=["SOC2"],
+        )
+        assert service.search_patterns(query="zanzibar")[1] == 0
+
+        service.publish_pattern(pattern.id)
+        service.rate_pattern(pattern.id, 5)
+
+        assert service.search_patterns(query="zanzibar")[0] == [pattern]
+        top, _ = service.search_patterns(regulations=["SOC2"], sort_by="rating", limit=1)
+        assert top == [pattern]
+        assert service.get_facet_counts(query="zanzibar")["category"] == {"access_control": 1}
@@ -0,0 +1,163 @@
+"""Tests for page-parallel PDF text extraction."""
+
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import SourceParseError
+from app.core.process_pool import get_process_pool
+from app.services.analysis_cache import AnalysisCache
+from app.services.monitoring import PDFExtractor, RegulatoryDocument
+from app.services.monitoring import pdf as pdf_module
+from app.services.monitoring.crawler import RegulatoryCrawler
+from app.services.monitoring.pdf import is_pdf
+from tests.fixtures.pdf_fixtures import build_pdf
+
+
+STATUTE = [
+    [
+        "Chapter 1 General Provisions",
+        "Article 1 This Law (the Act) protects personal information.",
+        "第2条 自然人的个人信息受法律保护。",
+    ],
+    [
+        "Article 3 A processor shall obtain consent.",
+        "Consent must be freely given.",
+    ],
+]
+
+
+def _extractor(**kwargs) -> PDFExtractor:
+    kwargs.setdefault("workers", 1)
+    kwargs.setdefault("result_cache", AnalysisCache())
+    return PDFExtractor(**kwargs)
+
+
+class TestPDFDocument:
+    """Test reading text and layout out of PDF structure."""
+
+    def test_lines_are_rebuilt_in_reading_order(self):
+        pdf = build_pdf(STATUTE, reverse=True, split_words=True)
+
+        pages = list(_extractor().iter_pages(pdf))
+
+        assert [page.number for page in pages] == [1, 2]
+        assert [line.text for line in pages[0].lines] == STATUTE[0]
+        assert [line.y for line in pages[0].lines] == [760, 746, 732]
+        assert pages[1].text == "\n".join(STATUTE[1])
+
+    def test_object_streams_and_compressed_content(self):
+        plain = [page.text for page in _extractor().iter_pages(build_pdf(STATUTE))]
+        packed = build_pdf(STATUTE, compress=True, object_streams=True)
+
+        assert [page.text for page in _extractor().iter_pages(packed)] == plain
+
+    def test_files_on_disk_are_read_in_place(self, tmp_path):
+        path = tmp_path / "statute.pdf"
+        path.write_bytes(build_pdf(STATUTE))
+
+        with path.open("rb") as file:
+            from_file = _extractor().extract_text(file)
+
+        assert _extractor().extract_text(path) == from_file
+        assert from_file.startswith("Chapter 1 General Provisions\n")
+
+    def test_non_pdf_content_is_rejected(self):
+        with pytest.raises(SourceParseError):
+            list(_extractor().iter_pages(b"<html><body>Moved</body></html>"))
+
+    def test_pdf_detection_needs_the_header_and_content_type(self):
+        pdf = build_pdf(STATUTE)
+
+        assert is_pdf(pdf)
+        assert is_pdf(pdf, "application/pdf; qs=0.9")
+        assert is_pdf(pdf, "application/octet-stream")
+        assert not is_pdf(pdf, "text/html")
+        assert not is_pdf(b"<html><body><pre>%PDF-1.7 sample</pre></body></html>")
+
+
+class TestPDFExtractor:
+    """Test caching, parallelism and bounds."""
+
+    def test_unchanged_pages_are_served_from_cache(self):
+        cache = AnalysisCache()
+        extractor = _extractor(result_cache=cache)
+        list(extractor.iter_pages(build_pdf(STATUTE)))
+
+        amended = [STATUTE[0], ["Article 3 A processor shall obtain separate consent."]]
+        pages = list(extractor.iter_pages(build_pdf(amended, compress=True)))
+
+        # Compression changes the file, not the decoded page content
+        assert cache.hits == 1
+        assert pages[1].text == "Article 3 A processor shall obtain separate consent."
+
+    def test_process_pool_matches_inline_extraction(self, monkeypatch):
+        monkeypatch.setattr(settings, "process_pool_workers", 2)
+        pools = []
+
+        def spy():
+            pools.append(get_process_pool())
+            return pools[-1]
+
+        monkeypatch.setattr(pdf_module, "get_process_pool", spy)
+        document = [[f"Article {n}", f"The controller shall keep record {n}."] for n in range(40)]
+        pdf = build_pdf(document, compress=True)
+
+        parallel = [(page.number, page.lines) for page in _extractor(workers=None).iter_pages(pdf)]
+        serial = [(page.number, page.lines) for page in _extractor().iter_pages(pdf)]
+
+        assert parallel == serial
+        assert pools
+        assert pools[0] is not None
+        assert len(serial) == 40
+
+    def test_page_limit_bounds_the_read(self):
+        pdf = build_pdf([[f"Article {n}"] for n in range(30)])
+
+        pages = list(_extractor(max_pages=5).iter_pages(pdf))
+
+        assert [page.number for page in pages] == [1, 2, 3, 4, 5]
+
+    def test_pages_feed_the_section_segmenter(self):
+        text = _extractor().iter_text(build_pdf(STATUTE))
+
+        sections = list(RegulatoryDocument(text, html=False).sections())
+
+        assert [(s.kind, s.number, s.chapter) for s in sections] == [
+            ("chapter", "1", "1"),
+            ("article", "1", "1"),
+            ("article", "2", "1"),
+            ("article", "3", "1"),
+        ]
+        assert sections[3].lines == STATUTE[1]
+
+
+class TestCrawler:
+    """Test PDF responses in the regulatory crawler."""
+
+    @pytest.mark.asyncio
+    async def test_pdf_responses_are_extracted(self):
+        pdf = build_pdf(STATUTE)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=pdf, headers={"Content-Type": "application/pdf"})
+
+        crawler = RegulatoryCrawler()
+        crawler.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        source = SimpleNamespace(
+            url="https://example.gov/gazette.pdf",
+            last_etag=None,
+            last_content_hash=None,
+            parser_config={"max_pdf_pages": 1},
+        )
+        try:
+            result = await crawler._crawl_with_http(source)
+        finally:
+            await crawler.http_client.aclose()
+
+        assert result.content == "\n".join(STATUTE[0])
+        assert result.metadata["document_type"] == "pdf"
+        assert result.metadata["page_count"] == 1
+        assert result.content_hash == crawler._compute_hash(result.content)
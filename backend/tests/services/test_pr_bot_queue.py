@@ -0,0 +1,342 @@
+"""Tests for the Redis-backed PR analysis queue."""
+
+import asyncio
+import json
+import sys
+from collections import defaultdict
+from uuid import uuid4
+
+import pytest
+
+from app.services.pr_bot import service as service_module
+from app.services.pr_bot.queue import (
+    _ACK_LUA,
+    _CANCEL_LUA,
+    _DEQUEUE_LUA,
+    _ENQUEUE_LUA,
+    _HEARTBEAT_LUA,
+    _REAP_LUA,
+    PRAnalysisJob,
+    PRAnalysisQueue,
+    PRTaskPriority,
+    PRTaskStatus,
+    RedisPRAnalysisQueue,
+)
+from app.services.pr_bot.service import PRBotService
+from app.workers import pr_bot_tasks as tasks_module
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class _Script:
+    def __init__(self, redis: "_FakeRedis", source: str):
+        self.redis = redis
+        self.source = source
+
+    async def __call__(self, keys=None, args=None, client=None):
+        self.redis.keys[self.source].append(list(keys or []))
+        self.redis.calls[self.source].append(list(args or []))
+        if client is not None:
+            client.staged.append(self.redis.replies[self.source].pop(0))
+            return client
+        return self.redis.replies[self.source].pop(0)
+
+
+class _Pipeline:
+    def __init__(self, redis: "_FakeRedis"):
+        self.redis = redis
+        self.staged: list = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def zcard(self, key):
+        self.staged.append(self.redis.zcards.get(key, 0))
+        return self
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        return self.staged
+
+
+class _FakeRedis:
+    """Records script invocations and returns canned replies."""
+
+    def __init__(self):
+        self.keys: dict[str, list] = defaultdict(list)
+        self.calls: dict[str, list] = defaultdict(list)
+        self.replies: dict[str, list] = defaultdict(list)
+        self.zcards: dict[str, int] = {}
+        self.round_trips = 0
+
+    def register_script(self, source):
+        return _Script(self, source)
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    async def smembers(self, key):
+        return {name.rsplit(":", 1)[1] for name in self.zcards}
+
+
+def _job(**overrides) -> PRAnalysisJob:
+    defaults = {"owner": "acme", "repo": "api", "pr_number": 7, "head_sha": "abc123"}
+    return PRAnalysisJob(organization_id=uuid4(), **{**defaults, **overrides})
+
+
+@pytest.fixture
+def redis():
+    return _FakeRedis()
+
+
+@pytest.fixture
+def queue(redis):
+    return RedisPRAnalysisQueue(redis, lease_seconds=30)
+
+
+@pytest.fixture
+def wakeups(monkeypatch):
+    """Records the drains producers and the worker schedule."""
+    calls = []
+    monkeypatch.setattr(
+        tasks_module.process_analysis_queue, "delay", lambda *args: calls.append(args)
+    )
+    return calls
+
+
+class TestRedisPRAnalysisQueue:
+    """Test the client side of the scripted queue operations."""
+
+    def test_priority_dominates_age(self):
+        old_normal = RedisPRAnalysisQueue.queue_score(PRTaskPriority.NORMAL, 1_000)
+        new_critical = RedisPRAnalysisQueue.queue_score(PRTaskPriority.CRITICAL, 9_999_999_999_999)
+
+        assert new_critical < old_normal
+
+    async def test_enqueue_indexes_by_pull_request(self, queue, redis):
+        job = _job()
+        redis.replies[_ENQUEUE_LUA].append(["existing-id", "duplicate"])
+
+        live_id = await queue.enqueue(job)
+
+        (keys,) = redis.keys[_ENQUEUE_LUA]
+        (args,) = redis.calls[_ENQUEUE_LUA]
+        prefix = RedisPRAnalysisQueue.KEY_PREFIX
+        assert live_id == "existing-id"
+        assert keys[:3] == [
+            f"{prefix}task:{job.id}",
+            f"{prefix}pr:acme/api#7",
+            f"{prefix}queue:{job.organization_id}",
+        ]
+        assert args[2] == str(job.organization_id)
+        assert args[3] == "abc123"
+        assert json.loads(args[6])["id"] == str(job.id)
+
+    async def test_enqueue_many_uses_one_round_trip(self, queue, redis):
+        jobs = [_job(pr_number=n) for n in range(5)]
+        redis.replies[_ENQUEUE_LUA].extend([str(j.id), "queued"] for j in jobs)
+
+        ids = await queue.enqueue_many(jobs)
+
+        assert ids == [str(j.id) for j in jobs]
+        assert redis.round_trips == 1
+
+    async def test_dequeue_returns_leased_job(self, queue, redis):
+        job = _job()
+        redis.replies[_DEQUEUE_LUA].extend([[str(job.id), json.dumps(job.to_dict()), 2], None])
+
+        leased = await queue.dequeue()
+
+        assert leased.id == job.id
+        assert leased.status == PRTaskStatus.IN_PROGRESS
+        assert leased.retry_count == 1
+        assert leased.lease_token
+        assert redis.calls[_DEQUEUE_LUA][0][3] == leased.lease_token
+        assert await queue.dequeue() is None
+
+    async def test_fail_retries_then_gives_up(self, queue, redis):
+        job = _job(max_retries=2)
+        job.lease_token = "token-1"
+        redis.replies[_ACK_LUA].extend([1, 1])
+
+        assert await queue.fail(job, "timeout") is True
+        job.lease_token = "token-2"
+        assert await queue.fail(job, "timeout") is False
+
+        retry, final = redis.calls[_ACK_LUA]
+        assert retry[1:3] == ["token-1", "retry"]
+        assert final[1:3] == ["token-2", "failed"]
+        assert redis.keys[_ACK_LUA][0][-1] == f"{RedisPRAnalysisQueue.KEY_PREFIX}pr:acme/api#7"
+        assert job.status == PRTaskStatus.FAILED
+
+    async def test_heartbeat_reports_superseded_task(self, queue, redis):
+        job = _job()
+        job.lease_token = "token"
+        redis.replies[_HEARTBEAT_LUA].extend([1, -1, 0])
+
+        assert [await queue.heartbeat(job) for _ in range(3)] == [True, False, False]
+
+    async def test_cancel_for_pr_is_a_single_script_call(self, queue, redis):
+        redis.replies[_CANCEL_LUA].append(1)
+
+        assert await queue.cancel_for_pr("acme", "api", 7) == 1
+        prefix = RedisPRAnalysisQueue.KEY_PREFIX
+        assert redis.keys[_CANCEL_LUA] == [[f"{prefix}pr:acme/api#7"]]
+        assert redis.calls[_CANCEL_LUA] == [[prefix]]
+
+    async def test_queue_size_sums_org_queues(self, queue, redis):
+        prefix = RedisPRAnalysisQueue.KEY_PREFIX
+        redis.zcards = {f"{prefix}queue:org-a": 3, f"{prefix}queue:org-b": 4}
+
+        assert await queue.get_queue_size() == 7
+
+    async def test_scripts_are_routed_by_their_keys(self, queue, redis):
+        job = _job()
+        redis.replies[_ENQUEUE_LUA].append([str(job.id), "queued"])
+        redis.replies[_DEQUEUE_LUA].append([str(job.id), json.dumps(job.to_dict()), 1])
+        redis.replies[_HEARTBEAT_LUA].append(1)
+        redis.replies[_ACK_LUA].append(1)
+        redis.replies[_CANCEL_LUA].append(0)
+        redis.replies[_REAP_LUA].append(0)
+
+        await queue.enqueue(job)
+        leased = await queue.dequeue()
+        await queue.heartbeat(leased)
+        await queue.complete(leased, {})
+        await queue.cancel_for_pr("acme", "api", 7)
+        await queue.requeue_expired()
+
+        assert len(redis.keys) == 6
+        for calls in redis.keys.values():
+            (keys,) = calls
+            assert keys
+            assert all(key.startswith(RedisPRAnalysisQueue.KEY_PREFIX) for key in keys)
+
+
+class TestPRBotServiceQueue:
+    """Test the queue the service singleton is built with."""
+
+    def test_service_uses_the_redis_queue(self):
+        assert isinstance(service_module._analysis_queue(), RedisPRAnalysisQueue)
+
+    def test_service_falls_back_to_memory_without_redis(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "redis.asyncio", None)
+
+        assert isinstance(service_module._analysis_queue(), PRAnalysisQueue)
+
+    async def test_webhook_job_is_enqueued_on_the_redis_queue(
+        self, monkeypatch, queue, redis, wakeups
+    ):
+        monkeypatch.setattr(service_module, "_service", PRBotService(queue=queue))
+        redis.replies[_ENQUEUE_LUA].append(["live-id", "superseded"])
+        event = {
+            "action": "synchronize",
+            "pull_request": {"number": 7, "head": {"sha": "def456"}, "base": {"sha": "abc"}},
+            "repository": {"full_name": "acme/api"},
+        }
+
+        result = await tasks_module._process_webhook_async(event, str(uuid4()), "")
+
+        (keys,) = redis.keys[_ENQUEUE_LUA]
+        (args,) = redis.calls[_ENQUEUE_LUA]
+        assert result["task_id"] == "live-id"
+        assert keys[1] == f"{RedisPRAnalysisQueue.KEY_PREFIX}pr:acme/api#7"
+        assert args[3] == "def456"
+        assert wakeups == [()]
+
+
+class _WorkerQueue(RedisPRAnalysisQueue):
+    """Analysis queue stand-in that hands out a fixed list of jobs."""
+
+    def __init__(self, jobs, heartbeats=()):
+        self.lease_seconds = 0.03
+        self.jobs = list(jobs)
+        self.heartbeats = list(heartbeats)
+        self.completed: list = []
+        self.failed: list = []
+
+    async def dequeue(self):
+        return self.jobs.pop(0) if self.jobs else None
+
+    async def heartbeat(self, task):
+        return self.heartbeats.pop(0) if self.heartbeats else True
+
+    async def complete(self, task, result):
+        self.completed.append((task.id, result))
+
+    async def fail(self, task, error):
+        self.failed.append((task.id, error))
+        return True
+
+    async def requeue_expired(self):
+        return 1
+
+
+class TestAnalysisWorker:
+    """Test the worker loop that drains the analysis queue."""
+
+    def _use(self, monkeypatch, queue, analyze):
+        monkeypatch.setattr(tasks_module, "_shared_queue", lambda: queue)
+        monkeypatch.setattr(tasks_module, "_analyze_job", analyze)
+
+    async def test_jobs_are_completed_or_failed(self, monkeypatch, wakeups):
+        ok, broken = _job(), _job(pr_number=8)
+        queue = _WorkerQueue([ok, broken])
+
+        async def analyze(job):
+            if job is broken:
+                raise RuntimeError("GitHub unavailable")
+            return {"passed": True}
+
+        self._use(monkeypatch, queue, analyze)
+
+        result = await tasks_module.process_analysis_queue.run.__wrapped__()
+
+        assert result == {"processed": 2}
+        assert queue.completed == [(ok.id, {"passed": True})]
+        assert queue.failed == [(broken.id, "GitHub unavailable")]
+        assert wakeups == []
+
+    async def test_lease_is_renewed_and_superseded_job_is_dropped(self, monkeypatch, wakeups):
+        queue = _WorkerQueue([_job()], heartbeats=[True, False])
+        cancelled = []
+
+        async def analyze(job):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(job.id)
+                raise
+
+        self._use(monkeypatch, queue, analyze)
+
+        await tasks_module.process_analysis_queue.run.__wrapped__()
+
+        assert len(cancelled) == 1
+        assert queue.heartbeats == []
+        assert queue.completed == queue.failed == []
+
+    async def test_full_batch_hands_over_to_a_fresh_drain(self, monkeypatch, wakeups):
+        queue = _WorkerQueue([_job(pr_number=n) for n in range(3)])
+
+        async def analyze(job):
+            return {}
+
+        self._use(monkeypatch, queue, analyze)
+
+        await tasks_module.process_analysis_queue.run.__wrapped__(max_jobs=2)
+
+        assert len(queue.completed) == 2
+        assert wakeups == [(2,)]
+
+    async def test_reaper_wakes_a_drain(self, monkeypatch, wakeups):
+        self._use(monkeypatch, _WorkerQueue([]), None)
+
+        result = await tasks_module.requeue_expired_analyses.run.__wrapped__()
+
+        assert result == {"reaped": 1}
+        assert wakeups == [()]
@@ -0,0 +1,128 @@
+"""Tests for hunk-level diff scanning in PRAnalyzer."""
+
+import re
+
+import pytest
+
+from app.core.config import settings
+from app.services.analysis_cache import AnalysisCache
+from app.services.pr_review.analyzer import PRAnalyzer
+from app.services.pr_review.diff_scan import DiffScanner, iter_added_hunks
+from app.services.pr_review.models import FileDiff
+
+
+pytestmark = pytest.mark.asyncio
+
+PATCH = """\
+@@ -10,3 +10,4 @@ def register(form):
+     name = form["name"]
+-    email = form["email"]
++    user_email = form["email"]
++    password = "hunter2hunter2"
+     save(name)
+\\ No newline at end of file
+@@ -40,2 +42,3 @@ def charge(card):
+     total = 0
++    log.debug("card number %s", card.number)
+     return total"""
+
+
+def _line_by_line(patterns: dict[str, re.Pattern], patch: str) -> list[tuple]:
+    """Reference scan: every pattern over every added line separately."""
+    found = []
+    for hunk in iter_added_hunks(patch):
+        for number, line in zip(hunk.line_numbers, hunk.lines, strict=True):
+            for name, pattern in patterns.items():
+                found.extend(
+                    (name, number, m.start(), m.end(), m.group()) for m in pattern.finditer(line)
+                )
+    return found
+
+
+def _key(matches) -> list[tuple]:
+    return [(m.pattern_name, m.line, m.column_start, m.column_end, m.evidence) for m in matches]
+
+
+class TestIterAddedHunks:
+    """Test the added-lines parser."""
+
+    def test_yields_only_added_lines_with_new_file_numbers(self):
+        hunks = list(iter_added_hunks(PATCH))
+
+        assert [h.line_numbers for h in hunks] == [[11, 12], [43]]
+        assert hunks[0].lines[0] == '    user_email = form["email"]'
+
+    def test_added_lines_starting_with_plus_are_kept_inside_hunks(self):
+        (hunk,) = iter_added_hunks("@@ -1 +1,2 @@\n i = 0\n+++i;")
+
+        assert hunk.lines == ["++i;"]
+        assert hunk.line_numbers == [2]
+
+    def test_bare_snippets_without_header_are_scanned(self):
+        (hunk,) = iter_added_hunks("+++ b/app.py\ncontext\n+added")
+
+        assert hunk.lines == ["added"]
+
+
+class TestDiffScanner:
+    """Test hunk-level matching against a per-line reference."""
+
+    def test_matches_equal_a_per_line_scan(self):
+        analyzer = PRAnalyzer()
+        patterns = {name: compiled for name, (compiled, _) in analyzer._compiled_patterns.items()}
+
+        matches = DiffScanner(patterns).scan(PATCH)
+
+        assert sorted(_key(matches)) == sorted(_line_by_line(patterns, PATCH))
+        assert {m.pattern_name for m in matches} >= {"hardcoded_secrets", "payment_logging"}
+
+    def test_matches_crossing_a_line_break_are_rescanned_per_line(self):
+        # "\s*" would run from "token =" into the next line's quoted value
+        patterns = {"secret": re.compile(r"token\s*=\s*['\"][^'\"]{8,}['\"]|api_key")}
+        patch = '@@ -1,0 +1,3 @@\n+token =\n+"abcdefghijkl" api_key\n+api_key'
+
+        matches = DiffScanner(patterns).scan(patch)
+
+        assert _key(matches) == _line_by_line(patterns, patch)
+        assert [m.line for m in matches] == [2, 3]
+
+
+class TestAnalyzer:
+    """Test PRAnalyzer's use of the scanner."""
+
+    def _files(self) -> list[FileDiff]:
+        return [
+            FileDiff(
+                path=f"app/file_{i}.py",
+                old_path=None,
+                status="modified",
+                additions=3,
+                deletions=1,
+                patch=PATCH,
+                language="python",
+            )
+            for i in range(4)
+        ]
+
+    async def test_violations_carry_line_and_column(self):
+        violations = await PRAnalyzer().analyze_diff_content(PATCH, "app/register.py")
+        secret = next(v for v in violations if v.metadata["pattern_name"] == "hardcoded_secrets")
+
+        assert (secret.line_start, secret.column_start) == (12, 4)
+        assert secret.evidence == 'password = "hunter2hunter2"'
+        assert secret.metadata["line_content"] == '    password = "hunter2hunter2"'
+
+    async def test_parallel_scan_matches_inline_scan(self, monkeypatch):
+        files = self._files()
+        inline = await PRAnalyzer(scan_workers=1, result_cache=AnalysisCache())._analyze_files(
+            files
+        )
+
+        monkeypatch.setattr("app.services.pr_review.analyzer._PARALLEL_SCAN_LINES", 1)
+        monkeypatch.setattr(settings, "process_pool_workers", 2)
+        parallel = await PRAnalyzer(result_cache=AnalysisCache())._analyze_files(files)
+
+        def key(v):
+            return (v.file_path, v.line_start, v.column_start, v.code, v.evidence)
+
+        assert [key(v) for v in parallel] == [key(v) for v in inline]
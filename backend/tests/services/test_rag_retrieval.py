@@ -0,0 +1,166 @@
+"""Tests for concurrent, cached multi-source retrieval in RAGPipeline."""
+
+import asyncio
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.services.chat.rag import RAGDocument, RAGPipeline, RAGSource, RetrievalCache
+from app.services.chat.reranker import fuse_rankings, reciprocal_rank_fusion
+
+
+pytestmark = pytest.mark.asyncio
+
+# "compliance status" selects regulations, requirements, codebase and mappings
+QUERY = "What is our compliance status for GDPR?"
+
+
+class _SlowSearch:
+    """Elasticsearch stand-in that records overlapping calls."""
+
+    def __init__(self, delay: float = 0.05, hang: set[str] | None = None):
+        self.delay = delay
+        self.hang = hang or set()
+        self.calls: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def search(self, index, body):
+        self.calls.append(index)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(3600 if index in self.hang else self.delay)
+        finally:
+            self.in_flight -= 1
+        return {
+            "hits": {"hits": [{"_id": f"{index}-1", "_score": 9.0, "_source": {"name": index}}]}
+        }
+
+
+def _db():
+    state = {"in_flight": 0, "peak": 0}
+
+    async def execute(statement, params=None):
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = []
+        return result
+
+    db = MagicMock()
+    db.execute = execute
+    return db, state
+
+
+def _doc(doc_id: str) -> RAGDocument:
+    return RAGDocument(id=doc_id, source=RAGSource.REGULATION, title=doc_id, content="")
+
+
+class TestFuseRankings:
+    """Test N-way reciprocal rank fusion."""
+
+    def test_documents_ranked_by_several_sources_win(self):
+        fused = fuse_rankings([[_doc("a"), _doc("b")], [_doc("b"), _doc("c")], [_doc("b")]])
+
+        assert [d.id for d in fused] == ["b", "a", "c"]
+
+    def test_keyword_vector_fusion_is_the_weighted_two_list_case(self):
+        keyword = [_doc("a"), _doc("b")]
+        vector = [_doc("b"), _doc("c")]
+
+        fused = reciprocal_rank_fusion(keyword, vector, keyword_weight=0.4, vector_weight=0.6)
+
+        assert [d.id for d in fused] == ["b", "c", "a"]
+        assert fused[0].relevance_score == pytest.approx(0.4 / 61 + 0.6 / 60)
+
+
+class TestConcurrentRetrieval:
+    """Test the retrieval executor."""
+
+    async def test_sources_are_searched_concurrently(self):
+        es = _SlowSearch()
+        db, state = _db()
+        pipeline = RAGPipeline(
+            elasticsearch_client=es, db_session=db, retrieval_cache=RetrievalCache()
+        )
+
+        context = await pipeline.retrieve(QUERY, uuid4(), repository="acme/api")
+
+        assert sorted(es.calls) == ["codebase_files", "regulations"]
+        assert es.peak == 2
+        # DB-backed sources share one session and never overlap
+        assert state["peak"] == 1
+        assert {d.id for d in context.documents} == {"regulations-1", "codebase_files-1"}
+
+    async def test_timed_out_source_is_skipped_and_not_cached(self):
+        es = _SlowSearch(hang={"codebase_files"})
+        cache = RetrievalCache()
+        pipeline = RAGPipeline(
+            elasticsearch_client=es,
+            retrieval_cache=cache,
+            source_timeouts={"codebase": 0.05},
+        )
+
+        context = await pipeline.retrieve(QUERY, uuid4(), repository="acme/api")
+
+        assert [d.id for d in context.documents] == ["regulations-1"]
+        assert len(cache._entries) == 0
+
+    async def test_timed_out_statement_is_not_cancelled(self):
+        delays = [0.3, 0.01]
+        finished: list[float] = []
+
+        async def execute(statement, params=None):
+            delay = delays.pop(0)
+            await asyncio.sleep(delay)
+            finished.append(delay)
+            result = MagicMock()
+            result.scalars.return_value.all.return_value = []
+            return result
+
+        db = MagicMock()
+        db.execute = execute
+        pipeline = RAGPipeline(
+            db_session=db, source_timeouts={"requirements": 0.1, "mappings": 0.1}
+        )
+
+        rankings, complete = await pipeline._run_searches(
+            {
+                "requirements": lambda: pipeline._search_requirements(QUERY, uuid4(), None),
+                "mappings": lambda: pipeline._search_mappings(QUERY, uuid4(), None),
+            }
+        )
+
+        # The slow statement runs to completion before the session is handed
+        # back, and the wait for it does not count against the next source
+        assert finished == [0.3, 0.01]
+        assert list(rankings) == ["mappings"]
+        assert not complete
+
+    async def test_repeated_query_is_served_from_cache(self):
+        es = _SlowSearch(delay=0)
+        pipeline = RAGPipeline(elasticsearch_client=es, retrieval_cache=RetrievalCache())
+        org_id = uuid4()
+
+        first = await pipeline.retrieve(QUERY, org_id)
+        first.documents[0].relevance_score = -1.0
+        second = await pipeline.retrieve(f"  {QUERY.upper()} ", org_id)
+        other_org = await pipeline.retrieve(QUERY, uuid4())
+
+        assert es.calls == ["regulations", "regulations"]
+        assert [d.id for d in second.documents] == [d.id for d in other_org.documents]
+        assert second.documents[0].relevance_score > 0
+
+    async def test_cache_entries_expire(self, monkeypatch):
+        cache = RetrievalCache(ttl_seconds=10)
+        now = [100.0]
+        monkeypatch.setattr("app.services.chat.rag.time.monotonic", lambda: now[0])
+        cache.put(("q",), [_doc("a")])
+
+        assert cache.get(("q",))[0].id == "a"
+        now[0] += 11
+        assert cache.get(("q",)) is None
@@ -0,0 +1,254 @@
+"""Tests for streaming, sectioned regulatory document parsing."""
+
+import io
+import tracemalloc
+
+from app.services.monitoring import (
+    ChinaPIPLParser,
+    ExtractionRule,
+    GDPRParser,
+    RegulatoryDocument,
+    SectionSegmenter,
+    extract,
+    iter_text_blocks,
+)
+from app.services.monitoring.ccpa_sources import CCPAParser, parse_ccpa_text
+from app.services.monitoring.korea_pipa_sources import KoreaPIPAParser
+
+
+EUR_LEX = """<html><head><title>GDPR</title><script>var a = "Article 9";</script></head>
+<body>
+<p class="oj-doc-ti">REGULATION (EU) 2016/679</p>
+<p>Having regard to Article 16 of the Treaty,</p>
+<div class="eli-subdivision" id="art_1">
+  <p class="oj-ti-art">Article 1</p><p class="oj-sti-art">Subject-matter</p>
+  <div class="eli-subdivision" id="001.001"><p>This Regulation lays down rules &amp; safeguards.</p></div>
+</div>
+<div class="eli-subdivision" id="art_2">
+  <p class="oj-ti-art">Article 2</p>
+  <div class="eli-subdivision"><p>The controller shall keep records.</p><p>Processors must assist.</p></div>
+</div>
+<p class="oj-signatory">Done at Brussels</p>
+</body></html>"""
+
+STATUTE = """<html><head><title>Personal Information Protection Law</title></head><body>
+<h1>中华人民共和国个人信息保护法</h1>
+<p>Chapter 1 General Provisions</p>
+<p>Article 1 This Law is enacted to protect personal information rights.</p>
+<p>Processors shall comply with Article 13 when processing.</p>
+<p>第2条 自然人的个人信息受法律保护。</p>
+<p>Chapter 2 Rules for Processing</p>
+<p>Article 13 A processor may process personal information only with consent.</p>
+</body></html>"""
+
+# leginfo.legislature.ca.gov markup, and the same sections as plain text
+CCPA_LEGISLATURE = (
+    '<div class="law-section"><div class="law-section-header">1798.100.</div>'
+    '<div class="law-section-body"><p>A business shall inform consumers.</p></div></div>'
+    '<div class="law-section"><div class="law-section-header">1798.105.</div>'
+    '<div class="law-section-body"><p>A business must delete data.</p></div></div>'
+)
+CCPA_TEXT = (
+    "1798.100. (a) A business shall inform consumers of the categories collected.\n"
+    "§ 1798.105 A business must delete data on request.\n"
+)
+
+
+def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+class TestTokenizer:
+    """Test incremental decoding and HTML block extraction."""
+
+    def test_chunked_bytes_match_a_single_read(self):
+        data = STATUTE.encode()
+        whole = list(iter_text_blocks(data))
+
+        # 5-byte chunks split multi-byte characters and tags
+        assert list(iter_text_blocks(_chunks(data, 5))) == whole
+        assert "中华人民共和国个人信息保护法" in [block.text for block in whole]
+
+    def test_script_is_skipped_and_markup_kept(self):
+        blocks = list(iter_text_blocks(EUR_LEX))
+
+        assert all("var a" not in block.text for block in blocks)
+        rules = next(b for b in blocks if b.text.startswith("This Regulation"))
+        assert rules.text == "This Regulation lays down rules & safeguards."
+        assert rules.anchors == ("art_1", "001.001")
+
+    def test_plain_text_files_stream_by_line(self):
+        blocks = list(iter_text_blocks(io.StringIO("Article 1\r\n\r\nText\nlast"), chunk_size=3))
+
+        assert [block.text for block in blocks] == ["Article 1", "Text", "last"]
+
+
+class TestSegmenter:
+    """Test the shared article/section segmenter."""
+
+    def test_headings_open_sections_and_track_chapters(self):
+        sections = list(RegulatoryDocument(STATUTE).sections())
+
+        assert [(s.kind, s.number, s.chapter) for s in sections] == [
+            ("preamble", None, None),
+            ("chapter", "1", "1"),
+            ("article", "1", "1"),
+            ("article", "2", "1"),
+            ("chapter", "2", "2"),
+            ("article", "13", "2"),
+        ]
+        # Cross-references inside a line do not start a new article
+        assert sections[2].lines[1].startswith("Processors shall comply with Article 13")
+
+    def test_korean_sub_articles_are_numbered(self):
+        text = "제15조 수집\n동의를 받아야 한다.\n제15조의2 가명정보\n내용"
+
+        numbers = [s.number for s in RegulatoryDocument(text).sections("article")]
+
+        assert numbers == ["15", "15-2"]
+
+    def test_eur_lex_anchors_define_articles(self):
+        sections = list(RegulatoryDocument(EUR_LEX).sections())
+
+        assert [(s.kind, s.number) for s in sections] == [
+            ("preamble", None),
+            ("article", "1"),
+            ("article", "2"),
+            ("other", None),
+        ]
+        assert sections[2].title == "Article 2"
+        assert sections[2].lines == [
+            "The controller shall keep records.",
+            "Processors must assist.",
+        ]
+
+    def test_oversized_sections_arrive_in_parts(self):
+        text = "Article 1\n" + "The provider shall act.\n" * 50 + "Article 2\nEnd."
+        segmenter = SectionSegmenter(max_chars=200)
+
+        parts = list(RegulatoryDocument(text, segmenter=segmenter).sections("article"))
+        merged = list(
+            RegulatoryDocument(text, segmenter=segmenter).sections("article", merge_parts=True)
+        )
+
+        assert len(parts) > 3
+        assert all(len(p.text) < 300 for p in parts)
+        assert {p.number for p in parts if p.part} == {"1"}
+        assert [len(m.lines) for m in merged] == [51, 2]
+
+    def test_peak_memory_is_bounded_by_the_section(self):
+        article = "Article {n}\n" + "The controller shall record each processing activity.\n" * 40
+
+        def document():
+            for n in range(2_000):
+                yield article.format(n=n).encode()
+
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in RegulatoryDocument(document()).sections("article"))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert count == 2_000
+        # The document is ~4.3 MB; only one chunk and one article are live
+        assert peak < 1_000_000
+
+
+class TestParsers:
+    """Test framework parsers on the shared stream."""
+
+    def test_pipl_statute(self):
+        parsed = ChinaPIPLParser().parse_pipl_statute(STATUTE.encode())
+
+        assert parsed["title"] == "中华人民共和国个人信息保护法"
+        assert [a["number"] for a in parsed["articles"]] == ["1", "2", "13"]
+        assert parsed["articles"][2]["title"] == "Lawful bases for processing"
+        assert [c["number"] for c in parsed["chapters"]] == ["1", "2"]
+
+    def test_korea_pipa_statute(self):
+        parsed = KoreaPIPAParser().parse_pipa_statute("제15조 수집\n내용\n제15조의2 가명정보")
+
+        assert [a["number"] for a in parsed["articles"]] == ["15", "15-2"]
+
+    def test_eur_lex_articles(self):
+        parsed = GDPRParser().parse_eur_lex(EUR_LEX)
+
+        assert parsed["title"] == "REGULATION (EU) 2016/679"
+        assert parsed["articles"] == [
+            {
+                "number": "1",
+                "title": "Article 1",
+                "content": "This Regulation lays down rules & safeguards.",
+            },
+            {
+                "number": "2",
+                "title": "Article 2",
+                "content": "The controller shall keep records.\nProcessors must assist.",
+            },
+        ]
+
+    def test_ccpa_legislature_sections(self):
+        sections = CCPAParser().parse_california_legislature(CCPA_LEGISLATURE)["sections"]
+
+        assert sections == [
+            {"number": "1798.100", "content": "A business shall inform consumers."},
+            {"number": "1798.105", "content": "A business must delete data."},
+        ]
+
+    def test_text_obligations_stop_at_the_limit(self):
+        text = "".join(f"Section {n}.1\nA business shall do thing {n}.\n" for n in range(30))
+
+        parsed = parse_ccpa_text(text)
+
+        assert len(parsed["requirements"]) == 20
+        assert parsed["requirements"][0]["action"] == "do thing 0."
+        assert len(parsed["sections_found"]) == 30
+
+
+class TestExtract:
+    """Test registered extraction rules over a single pass."""
+
+    def test_frameworks_share_one_pass(self):
+        records = list(extract(STATUTE, ["china_pipl", "eu_ai_act"]))
+        frameworks = {framework for framework, _ in records}
+
+        assert frameworks == {"china_pipl", "eu_ai_act"}
+        pipl = [r for f, r in records if f == "china_pipl"]
+        assert {r["article"] for r in pipl} >= {"1", "13"}
+
+    def test_ccpa_rule_finds_civil_code_sections(self):
+        for source in (CCPA_LEGISLATURE, CCPA_TEXT):
+            records = [record for _, record in extract(source, ["ccpa"])]
+
+            assert [r["section"] for r in records] == ["1798.100", "1798.105"]
+        assert records[0]["action"] == "inform consumers of the categories collected"
+
+    def test_every_registered_rule_runs_in_one_pass(self):
+        records = list(extract(STATUTE + CCPA_LEGISLATURE + EUR_LEX))
+        frameworks = {framework for framework, _ in records}
+
+        assert {"ccpa", "china_pipl", "gdpr"} <= frameworks
+        ccpa = [r for f, r in records if f == "ccpa"]
+        assert {r["section"] for r in ccpa} == {"1798.100", "1798.105"}
+
+    def test_limited_rules_stop_reading_the_source(self):
+        consumed = 0
+
+        def document():
+            nonlocal consumed
+            for n in range(1_000):
+                consumed += 1
+                yield f"Article {n}\nThe provider shall comply.\n"
+
+        rule = ExtractionRule(
+            "first_articles",
+            lambda section: [{"article": section.number}],
+            kinds=frozenset({"article"}),
+            limit=3,
+        )
+        records = [record for _, record in extract(document(), rules=[rule])]
+
+        assert records == [{"article": "0"}, {"article": "1"}, {"article": "2"}]
+        assert consumed < 10
@@ -0,0 +1,170 @@
+"""Tests for set-based repository score maintenance."""
+
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.codebase import CodebaseMapping, ComplianceStatus, Repository
+from app.services.scoring.repository_scores import (
+    install_score_maintenance,
+    recompute_repository_scores,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Repository.metadata.create_all,
+            tables=[Repository.__table__, CodebaseMapping.__table__],
+        )
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db(engine):
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+
+
+def _repository(name: str, active: bool = True) -> Repository:
+    return Repository(
+        customer_profile_id=uuid.uuid4(),
+        provider="github",
+        owner="acme",
+        name=name,
+        full_name=f"acme/{name}",
+        is_active=active,
+    )
+
+
+def _mappings(repository: Repository, *statuses: ComplianceStatus) -> list[CodebaseMapping]:
+    return [
+        CodebaseMapping(
+            repository_id=repository.id,
+            requirement_id=uuid.uuid4(),
+            compliance_status=status,
+        )
+        for status in statuses
+    ]
+
+
+def _count_statements(engine) -> list[str]:
+    statements: list[str] = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+class TestRecomputeRepositoryScores:
+    """Test the full, set-based recompute."""
+
+    async def test_recompute_uses_constant_statements(self, engine, db: AsyncSession):
+        repos = [_repository(f"svc-{i}") for i in range(20)]
+        db.add_all(repos)
+        await db.flush()
+        for i, repo in enumerate(repos):
+            statuses = [ComplianceStatus.COMPLIANT] * i + [ComplianceStatus.NON_COMPLIANT]
+            db.add_all(_mappings(repo, *statuses))
+        inactive = _repository("archived", active=False)
+        db.add(inactive)
+        await db.flush()
+        await db.commit()
+
+        statements = _count_statements(engine)
+        updated = await recompute_repository_scores(db)
+
+        assert updated == 20
+        assert len(statements) == 2
+        assert repos[3].total_requirements == 4
+        assert repos[3].compliant_requirements == 3
+        assert repos[3].compliance_score == pytest.approx(75.0)
+        assert inactive.compliance_score is None
+
+    async def test_unchanged_summaries_are_not_rewritten(self, db: AsyncSession):
+        repo = _repository("api")
+        db.add(repo)
+        await db.flush()
+        db.add_all(_mappings(repo, ComplianceStatus.COMPLIANT, ComplianceStatus.NON_COMPLIANT))
+        await db.flush()
+        assert await recompute_repository_scores(db) == 1
+        await db.commit()
+        stamped = await db.scalar(select(Repository.updated_at).where(Repository.id == repo.id))
+
+        assert await recompute_repository_scores(db) == 0
+        await db.commit()
+        assert (
+            await db.scalar(select(Repository.updated_at).where(Repository.id == repo.id))
+        ) == stamped
+
+    async def test_repository_without_mappings_keeps_last_score(self, db: AsyncSession):
+        repo = _repository("empty")
+        repo.total_requirements, repo.compliant_requirements, repo.compliance_score = 4, 2, 50.0
+        db.add(repo)
+        await db.flush()
+
+        await recompute_repository_scores(db)
+
+        assert (repo.total_requirements, repo.compliant_requirements) == (0, 0)
+        assert repo.compliance_score == 50.0
+
+
+class TestIncrementalMaintenance:
+    """Test flush-triggered refreshes."""
+
+    @pytest.fixture(autouse=True)
+    def _installed(self):
+        install_score_maintenance()
+
+    async def test_mapping_changes_refresh_only_their_repository(self, db: AsyncSession):
+        repo, other = _repository("api"), _repository("web")
+        db.add_all([repo, other])
+        await db.flush()
+        mappings = _mappings(repo, ComplianceStatus.COMPLIANT, ComplianceStatus.NON_COMPLIANT)
+        db.add_all(mappings)
+        await db.flush()
+
+        assert repo.compliance_score == pytest.approx(50.0)
+        assert other.compliance_score is None
+
+        mappings[1].compliance_status = ComplianceStatus.COMPLIANT
+        await db.flush()
+        assert repo.compliance_score == pytest.approx(100.0)
+
+        mappings[0].repository_id = other.id
+        await db.flush()
+        assert (repo.total_requirements, other.total_requirements) == (1, 1)
+
+        await db.delete(mappings[1])
+        await db.flush()
+        await db.commit()
+
+        stored = await db.scalar(
+            select(Repository.total_requirements).where(Repository.id == repo.id)
+        )
+        assert stored == 0
+
+    async def test_unrelated_mapping_edits_do_not_refresh(self, engine, db: AsyncSession):
+        repo = _repository("api")
+        db.add(repo)
+        await db.flush()
+        (mapping,) = _mappings(repo, ComplianceStatus.COMPLIANT)
+        db.add(mapping)
+        await db.flush()
+
+        statements = _count_statements(engine)
+        mapping.compliance_notes = "Reviewed"
+        await db.flush()
+
+        assert len(statements) == 1
@@ -2,9 +2,11 @@
 
 from uuid import uuid4
 
+import numpy as np
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.exceptions import ValidationError
 from app.services.risk_quantification.models import (
     REGULATION_FINES,
     ExecutiveRiskReport,
@@ -17,10 +19,18 @@ from app.services.risk_quantification.models import (
     WhatIfResult,
     WhatIfScenario,
 )
+from app.services.risk_quantification.monte_carlo import (
+    MonteCarloEngine,
+    RiskFactor,
+    correlation_factor,
+    regulation_fine_bounds,
+    risk_factor_for_regulation,
+)
 from app.services.risk_quantification.service import (
     RiskQuantificationService,
     get_risk_quantification_service,
 )
+from app.services.stress_testing import ScenarioType, StressTestingService
 
 
 pytestmark = pytest.mark.asyncio
@@ -481,3 +491,152 @@ class TestGetRiskQuantificationService:
 
         assert isinstance(service, RiskQuantificationService)
         assert service.annual_revenue >= 0
+
+
+class TestMonteCarloEngine:
+    """Test the vectorized Monte Carlo exposure engine."""
+
+    @pytest.fixture
+    def factors(self):
+        return [
+            risk_factor_for_regulation(reg, likelihood=0.3, annual_revenue=50_000_000.0)
+            for reg in ["GDPR", "CCPA", "HIPAA", "PCI-DSS"]
+        ]
+
+    def test_regulation_fine_bounds_use_revenue(self):
+        """GDPR max fine is the greater of the fixed cap and 4% of revenue."""
+        assert regulation_fine_bounds("GDPR", 1_000_000_000.0) == (0.0, 40_000_000.0)
+        assert regulation_fine_bounds("GDPR", 10_000_000.0) == (0.0, 20_000_000.0)
+        assert regulation_fine_bounds("Unknown", 10_000_000.0) == (1_000.0, 100_000.0)
+
+    def test_seeded_runs_are_reproducible(self, factors):
+        first = MonteCarloEngine(seed=7).simulate_exposure(factors, iterations=50_000)
+        second = MonteCarloEngine(seed=7).simulate_exposure(factors, iterations=50_000)
+        other = MonteCarloEngine(seed=8).simulate_exposure(factors, iterations=50_000)
+
+        assert first.total.mean == second.total.mean
+        assert first.total.percentiles == second.total.percentiles
+        assert first.total.mean != other.total.mean
+
+    def test_streaming_estimates_match_exact_statistics(self):
+        """Chunked moments are exact; sketch quantiles stay within relative accuracy."""
+        samples: list[np.ndarray] = []
+
+        def sampler(rng: np.random.Generator, n: int) -> np.ndarray:
+            values = rng.lognormal(10, 1, n)
+            samples.append(values)
+            return values
+
+        summary = MonteCarloEngine(seed=1, chunk_size=7_000).simulate(sampler, 100_000)
+        exact = np.concatenate(samples)
+
+        assert summary.iterations == 100_000
+        assert summary.mean == pytest.approx(exact.mean(), rel=1e-9)
+        assert summary.std_dev == pytest.approx(exact.std(), rel=1e-9)
+        assert summary.var == pytest.approx(np.quantile(exact, 0.95), rel=0.01)
+        tail = exact[exact >= np.quantile(exact, 0.95)]
+        assert summary.cvar == pytest.approx(tail.mean(), rel=0.01)
+
+    def test_exposure_statistics_are_consistent(self, factors):
+        result = MonteCarloEngine(seed=3).simulate_exposure(
+            factors, iterations=100_000, confidence=0.95
+        )
+        total = result.total
+        p = total.percentiles
+
+        assert p[0.5] <= p[0.9] <= p[0.95] <= p[0.99]
+        assert total.var == p[0.95]
+        assert total.cvar >= total.var
+        assert sum(result.factor_means.values()) == pytest.approx(total.mean, rel=1e-6)
+        for rate in result.factor_trigger_rates.values():
+            assert rate == pytest.approx(0.3, abs=0.01)
+
+    def test_correlation_fattens_the_tail(self):
+        factors = [
+            RiskFactor(name=f"reg-{i}", likelihood=0.1, min_loss=0.0, max_loss=1_000_000.0)
+            for i in range(5)
+        ]
+        independent = MonteCarloEngine(seed=5).simulate_exposure(factors, iterations=100_000)
+        correlated = MonteCarloEngine(seed=5).simulate_exposure(
+            factors, iterations=100_000, correlation=0.9
+        )
+
+        assert correlated.total.mean == pytest.approx(independent.total.mean, rel=0.05)
+        assert correlated.total.cvar > 1.5 * independent.total.cvar
+
+    def test_invalid_correlation_matrix_rejected(self, factors):
+        with pytest.raises(ValueError, match="4x4"):
+            MonteCarloEngine(seed=1).simulate_exposure(factors, 10, correlation=[[1.0]])
+
+    def test_correlation_must_be_a_correlation_matrix(self):
+        with pytest.raises(ValueError, match="positive definite"):
+            correlation_factor(3, [[1.0, 0.9, -0.9], [0.9, 1.0, 0.9], [-0.9, 0.9, 1.0]])
+        with pytest.raises(ValueError, match="symmetric"):
+            correlation_factor(2, [[1.0, 0.5], [0.2, 1.0]])
+        with pytest.raises(ValueError, match="between -1 and 1"):
+            correlation_factor(2, 1.5)
+        assert correlation_factor(3, 0.0) is None
+
+    async def test_service_rejects_invalid_correlation_up_front(self, db_session: AsyncSession):
+        service = RiskQuantificationService(db=db_session, organization_id=uuid4())
+        for reg in ["GDPR", "CCPA"]:
+            await service.assess_violation_risk(rule_id=f"{reg}-1", regulation=reg)
+
+        with pytest.raises(ValidationError, match="positive definite"):
+            await service.simulate_exposure(iterations=10, correlation=[[1.0, 1.0], [1.0, 1.0]])
+
+    async def test_service_simulate_exposure(self, db_session: AsyncSession):
+        service = RiskQuantificationService(db=db_session, organization_id=uuid4())
+        for reg in ["GDPR", "CCPA"]:
+            await service.assess_violation_risk(rule_id=f"{reg}-1", regulation=reg, severity="high")
+
+        result = await service.simulate_exposure(iterations=20_000, seed=11)
+
+        assert result.total.iterations == 20_000
+        assert set(result.factor_means) == {"GDPR", "CCPA"}
+        assert result.total.cvar >= result.total.var > 0
+
+
+class TestStressTestingSimulation:
+    """Test Monte Carlo simulation runs in the stress testing service."""
+
+    async def test_run_simulation_produces_reproducible_metrics(self, db_session: AsyncSession):
+        service = StressTestingService(db=db_session)
+        scenario = await service.create_scenario(
+            name="Breach",
+            scenario_type=ScenarioType.DATA_BREACH,
+            description="Customer database exfiltration",
+            parameters={"annual_revenue": 200_000_000.0},
+        )
+
+        run = await service.run_simulation(scenario.id, iterations=20_000, seed=42)
+        again = await service.run_simulation(scenario.id, iterations=20_000, seed=42)
+
+        assert run.status == "completed"
+        assert [r.metric for r in run.results] == [
+            "response_time_hours",
+            "financial_impact_usd",
+            "records_affected",
+            "compliance_recovery_days",
+        ]
+        for result in run.results:
+            assert result.p50 <= result.p95 <= result.p99
+            assert result.conditional_value_at_risk >= result.value_at_risk
+            assert sum(b["count"] for b in result.distribution) == 20_000
+        assert [r.mean for r in run.results] == [r.mean for r in again.results]
+
+    async def test_invalid_correlation_override_rejected(self, db_session: AsyncSession):
+        service = StressTestingService(db=db_session)
+
+        with pytest.raises(ValidationError):
+            await service.create_scenario(
+                name="Breach",
+                scenario_type=ScenarioType.DATA_BREACH,
+                description="Customer database exfiltration",
+                parameters={"regulations": ["GDPR", "CCPA"], "correlation": [[1.0]]},
+            )
+
+    async def test_run_simulation_unknown_scenario(self, db_session: AsyncSession):
+        service = StressTestingService(db=db_session)
+        run = await service.run_simulation(uuid4())
+        assert run.status == "failed"
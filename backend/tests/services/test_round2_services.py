@@ -35,7 +35,11 @@ from app.services.prediction_market import (
     MarketStatus,
     PredictionMarketService,
 )
-from app.services.regulation_diff import RegulationDiffService
+from app.services.regulation_diff import (
+    ChangeType,
+    HierarchicalDiffEngine,
+    RegulationDiffService,
+)
 
 
 class TestDAOGovernanceService:
@@ -699,3 +703,68 @@ class TestRegulationDiffService:
             result = await svc.compare_versions(versions[0].id, versions[1].id)
             # May return None if no diff exists between these versions
             assert result is None or result.from_version is not None
+
+    @pytest.mark.asyncio
+    async def test_compute_text_diff_aligns_articles_and_reports_sentence_edits(self):
+        old = (
+            "Article 1\nSubject matter\n1. This Regulation lays down rules. It protects rights.\n"
+            "\nArticle 2\nScope\n1. This Regulation applies to processing."
+        )
+        new = (
+            "Article 1\nSubject matter\n1. This Regulation lays down rules. "
+            "It protects fundamental rights.\n"
+            "\nArticle 3\nDefinitions\n1. Personal data means any information."
+        )
+        svc = RegulationDiffService(engine=HierarchicalDiffEngine())
+        diff = await svc.compute_text_diff(old, new, "GDPR", "v1", "v2")
+
+        by_article = {c.article: c for c in diff.changes}
+        assert by_article["Art. 1"].change_type == ChangeType.MODIFICATION
+        assert by_article["Art. 2"].change_type == ChangeType.DELETION
+        assert by_article["Art. 3"].change_type == ChangeType.ADDITION
+        assert (diff.articles_added, diff.articles_removed, diff.articles_modified) == (1, 1, 1)
+
+        [detail] = by_article["Art. 1"].details
+        assert detail.path == "Art. 1 › ¶1 › s2"
+        assert [t.new_tokens for t in detail.token_changes] == ["fundamental"]
+
+    @pytest.mark.asyncio
+    async def test_compute_text_diff_detects_renumbering(self):
+        svc = RegulationDiffService(engine=HierarchicalDiffEngine())
+        diff = await svc.compute_text_diff(
+            "Article 5\nUnchanged body.\n\nArticle 6\nMoved body.",
+            "Article 5\nUnchanged body.\n\nArticle 7\nMoved body.",
+            "GDPR",
+            "v1",
+            "v2",
+        )
+        [change] = diff.changes
+        assert change.change_type == ChangeType.RENUMBERING
+        assert change.summary == "Renumbered from Art. 6"
+
+    @pytest.mark.asyncio
+    async def test_compute_text_diff_without_headings_uses_delimiter(self):
+        svc = RegulationDiffService(engine=HierarchicalDiffEngine())
+        diff = await svc.compute_text_diff(
+            "alpha one.\n\nbeta two.", "alpha one.\n\nbeta three.\n\ngamma.", "X", "1", "2"
+        )
+        assert [(c.article, c.change_type) for c in diff.changes] == [
+            ("Section 2", ChangeType.MODIFICATION),
+            ("Section 3", ChangeType.ADDITION),
+        ]
+
+    def test_engine_short_circuits_equal_subtrees_and_memoizes(self):
+        engine = HierarchicalDiffEngine()
+        old = "\n\n".join(f"Article {i}\nBody of article {i}." for i in range(1, 201))
+        new = old.replace("Body of article 100.", "Revised body of article 100.")
+
+        first = engine.diff_texts(old, new)
+        assert first is not None
+        assert [c.label for c in first.children] == ["Art. 100"]
+        assert engine.stats.hash_short_circuits >= 199
+        assert engine.stats.token_diffs == 1
+
+        assert engine.diff_texts(old, new) is first
+        assert engine.stats.memo_hits == 1
+        assert engine.stats.token_diffs == 1
+        assert engine.diff_texts(old, old) is None
@@ -0,0 +1,267 @@
+"""Tests for SBOM generation and vulnerability matching."""
+
+import gzip
+import json
+from uuid import uuid4
+
+import pytest
+from defusedxml import ElementTree
+
+from app.core.config import settings
+from app.core.process_pool import get_process_pool
+from app.services.sbom import (
+    Advisory,
+    SBOMBatchItem,
+    SBOMFormat,
+    SBOMGenerator,
+    VulnerabilityIndex,
+    iter_sbom,
+    parse_dependency_file,
+    parse_version,
+)
+from app.services.sbom import generator as generator_module
+
+
+pytestmark = pytest.mark.asyncio
+
+
+PACKAGE_JSON = json.dumps({"dependencies": {"lodash": "^4.17.20", "react": "^18.2.0"}})
+PACKAGE_LOCK = json.dumps(
+    {
+        "packages": {
+            "": {"name": "app"},
+            "node_modules/lodash": {"version": "4.17.20", "integrity": "sha512-abc"},
+            "node_modules/react": {"version": "18.2.0"},
+            "node_modules/loose-envify": {"version": "1.4.0"},
+        }
+    }
+)
+
+
+class TestVulnerabilityIndex:
+    """Test indexed, packaging-aware vulnerability matching."""
+
+    def _index(self) -> VulnerabilityIndex:
+        index = VulnerabilityIndex()
+        index.add(
+            Advisory(
+                id="ADV-1",
+                ecosystem="pypi",
+                package="Some_Pkg",
+                severity="high",
+                description="old line",
+            ),
+            [{"introduced": "1.0", "fixed": "1.4.2"}, {"introduced": "2.0", "fixed": "2.1"}],
+        )
+        index.add(
+            Advisory(
+                id="ADV-2",
+                ecosystem="pypi",
+                package="some-pkg",
+                severity="low",
+                description="everything before 3",
+            ),
+            [{"fixed": "3.0"}],
+        )
+        return index
+
+    def test_interval_lookup(self):
+        index = self._index()
+
+        assert {a.id for a in index.lookup("pypi", "some.pkg", parse_version("1.2"))} == {
+            "ADV-1",
+            "ADV-2",
+        }
+        assert [a.id for a in index.lookup("pypi", "some-pkg", parse_version("1.4.2"))] == ["ADV-2"]
+        assert {a.id for a in index.lookup("pypi", "some-pkg", parse_version("2.0.5"))} == {
+            "ADV-1",
+            "ADV-2",
+        }
+        assert [a.id for a in index.lookup("pypi", "some-pkg", parse_version("2.5"))] == ["ADV-2"]
+        assert index.lookup("pypi", "some-pkg", parse_version("3.0")) == []
+        assert index.lookup("npm", "some-pkg", parse_version("1.2")) == []
+
+    def test_prerelease_ordering(self):
+        index = self._index()
+
+        # A pre-release of the fixed version is still affected...
+        assert index.lookup("pypi", "some-pkg", parse_version("1.4.2rc1"))
+        # ...but a pre-release after the fix is not
+        assert [a.id for a in index.lookup("pypi", "some-pkg", parse_version("1.4.3-beta.1"))] == [
+            "ADV-2"
+        ]
+
+    def test_parse_version(self):
+        assert str(parse_version("v1.2.3")) == "1.2.3"
+        assert str(parse_version("==2.0")) == "2.0"
+        assert parse_version("") is None
+        assert parse_version("0.0.0-20210101-abcdef123456") is None
+
+
+class TestSBOMGenerator:
+    """Test SBOM generation."""
+
+    async def test_detects_vulnerable_versions(self):
+        generator = SBOMGenerator(parse_workers=1)
+
+        sbom = await generator.generate_sbom(
+            organization_id=None,
+            repository_id=None,
+            name="app",
+            version="1.0.0",
+            dependency_files={
+                "requirements.txt": "cryptography==41.0.5\nrequests==2.31.0\n",
+                "pom.xml": (
+                    "<dependency><groupId>org.apache.logging.log4j</groupId>"
+                    "<artifactId>log4j-core</artifactId><version>2.14.1</version></dependency>"
+                ),
+            },
+        )
+
+        vulnerable = {c.name: [v.id for v in c.vulnerabilities] for c in sbom.components}
+        assert vulnerable["cryptography"] == ["CVE-2023-49083"]
+        assert vulnerable["org.apache.logging.log4j:log4j-core"] == ["CVE-2021-44228"]
+        assert vulnerable["requests"] == []
+        assert sbom.critical_vulnerabilities == 1
+
+    async def test_no_false_positive_for_unparsable_or_newer_prerelease(self):
+        generator = SBOMGenerator(parse_workers=1)
+
+        sbom = await generator.generate_sbom(
+            organization_id=None,
+            repository_id=None,
+            name="app",
+            version="1.0.0",
+            dependency_files={
+                "package.json": json.dumps({"dependencies": {"lodash": "4.17.22-rc.1"}}),
+                "requirements.txt": "cryptography==nightly\n",
+            },
+        )
+
+        by_name = {c.name: c for c in sbom.components}
+        assert by_name["lodash"].vulnerabilities == []
+        assert by_name["cryptography"].vulnerabilities == []
+        assert by_name["cryptography"].metadata["vulnerability_check"] == "unresolved_version"
+        assert sbom.total_vulnerabilities == 0
+
+    async def test_deduplicates_components_across_files(self):
+        generator = SBOMGenerator(parse_workers=1)
+
+        sbom = await generator.generate_sbom(
+            organization_id=None,
+            repository_id=None,
+            name="web",
+            version="1.0.0",
+            dependency_files={"package.json": PACKAGE_JSON, "package-lock.json": PACKAGE_LOCK},
+        )
+
+        names = [c.name for c in sbom.components]
+        assert sorted(names) == ["lodash", "loose-envify", "react"]
+        lodash = next(c for c in sbom.components if c.name == "lodash")
+        assert lodash.is_direct
+        assert lodash.hash_sha256 == "abc"
+        assert [v.id for v in lodash.vulnerabilities] == ["CVE-2021-23337"]
+
+    async def test_batch_reuses_parsed_lockfiles(self):
+        generator = SBOMGenerator(parse_workers=1)
+        repositories = [
+            SBOMBatchItem(
+                repository_id=uuid4(),
+                name=f"service-{i}",
+                version="1.0.0",
+                dependency_files={"package-lock.json": PACKAGE_LOCK},
+            )
+            for i in range(5)
+        ]
+
+        sboms = await generator.generate_sbom_batch(None, repositories)
+
+        assert [s.name for s in sboms] == [r.name for r in repositories]
+        assert len(generator._parse_cache) == 1
+        assert all(s.total_components == 3 for s in sboms)
+        # Components are independent copies, not shared cache entries
+        first, second = sboms[0].components[0], sboms[1].components[0]
+        assert first.id != second.id
+        assert first.vulnerabilities is not second.vulnerabilities
+
+    async def test_large_files_are_parsed_on_the_shared_pool(self, monkeypatch):
+        monkeypatch.setattr(settings, "process_pool_workers", 2)
+        pools = []
+
+        def spy():
+            pools.append(get_process_pool())
+            return pools[-1]
+
+        monkeypatch.setattr(generator_module, "get_process_pool", spy)
+        packages = {"": {"name": "app"}}
+        packages.update({f"node_modules/pkg-{n}": {"version": f"1.0.{n}"} for n in range(8000)})
+        lockfile = json.dumps({"packages": packages})
+
+        components = await SBOMGenerator()._parse_dependency_file("package-lock.json", lockfile)
+
+        assert pools
+        assert pools[0] is not None
+        assert len(lockfile) > generator_module._INLINE_PARSE_BYTES
+        inline = parse_dependency_file("package-lock.json", lockfile)
+        assert [c.purl for c in components] == [c.purl for c in inline]
+
+
+class TestSBOMExport:
+    """Test streaming SPDX/CycloneDX export."""
+
+    async def _sbom(self):
+        generator = SBOMGenerator(parse_workers=1)
+        sbom = await generator.generate_sbom(
+            organization_id=uuid4(),
+            repository_id=None,
+            name="web & api",
+            version="2.0.0",
+            dependency_files={"package.json": PACKAGE_JSON, "package-lock.json": PACKAGE_LOCK},
+        )
+        return generator, sbom
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 500])
+    async def test_streamed_json_matches_document(self, chunk_size):
+        _, sbom = await self._sbom()
+
+        spdx = "".join(iter_sbom(sbom, SBOMFormat.SPDX_JSON, chunk_size))
+        cyclonedx = "".join(iter_sbom(sbom, SBOMFormat.CYCLONEDX_JSON, chunk_size))
+
+        assert json.loads(spdx) == sbom.to_spdx()
+        assert json.loads(cyclonedx) == sbom.to_cyclonedx()
+
+    async def test_streamed_cyclonedx_xml(self):
+        _, sbom = await self._sbom()
+
+        root = ElementTree.fromstring("".join(iter_sbom(sbom, SBOMFormat.CYCLONEDX_XML, 2)))
+
+        ns = {"bom": "http://cyclonedx.org/schema/bom/1.5"}
+        assert len(root.findall("bom:components/bom:component", ns)) == 3
+        assert root.find("bom:metadata/bom:component/bom:name", ns).text == "web & api"
+        vulns = root.findall("bom:vulnerabilities/bom:vulnerability", ns)
+        assert [v.find("bom:id", ns).text for v in vulns] == ["CVE-2021-23337"]
+
+    async def test_stream_export_gzip(self):
+        generator, sbom = await self._sbom()
+
+        chunks = [
+            c async for c in generator.stream_export(sbom.id, SBOMFormat.CYCLONEDX_JSON, gzip=True)
+        ]
+
+        assert json.loads(gzip.decompress(b"".join(chunks))) == sbom.to_cyclonedx()
+
+    async def test_stream_export_unknown_sbom(self):
+        generator = SBOMGenerator(parse_workers=1)
+
+        with pytest.raises(ValueError, match="not found"):
+            generator.stream_export(uuid4(), SBOMFormat.SPDX_JSON)
+
+
+class TestDependencyParsers:
+    """Test dependency-file parsing."""
+
+    def test_unsupported_file(self):
+        assert parse_dependency_file("README.md", "lodash") == []
+
+    def test_invalid_json_is_ignored(self):
+        assert parse_dependency_file("package-lock.json", "{not json") == []
@@ -0,0 +1,299 @@
+"""Tests for webhook subscription indexing and fan-out."""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from app.models.production_features import WebhookDeadLetterRecord, WebhookIntegrationRecord
+from app.services.webhooks.dispatcher import (
+    BATCH_EVENT_TYPE,
+    DeadLetter,
+    DeliveryStats,
+    DispatchReport,
+    WebhookDispatcher,
+    build_event,
+)
+from app.services.webhooks.subscriptions import SubscriptionCache, SubscriptionIndex
+from app.workers import webhook_delivery_tasks as tasks_module
+from app.workers.webhook_delivery_tasks import (
+    _MAX_RETRIES,
+    deliver_events,
+    redeliver,
+    replay_dead_letters,
+    schedule_retries,
+    take_retries,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+async def webhooks(db_session):
+    records = {
+        "scans": WebhookIntegrationRecord(
+            name="scans",
+            url="https://hooks.example.com/scans",
+            event_types=["scan.completed"],
+        ),
+        "all": WebhookIntegrationRecord(
+            name="all",
+            url="https://collector.example.org/all",
+            event_types=["*"],
+            batch_events=True,
+        ),
+        "inactive": WebhookIntegrationRecord(
+            name="inactive",
+            url="https://hooks.example.com/old",
+            event_types=["scan.completed"],
+            active=False,
+        ),
+    }
+    db_session.add_all(records.values())
+    await db_session.flush()
+    return records
+
+
+class TestSubscriptionIndex:
+    """Test the event-type → webhook index."""
+
+    async def test_resolves_direct_and_wildcard_subscribers(self, db_session, webhooks):
+        index = await SubscriptionIndex.load(db_session)
+
+        scan_subs = {t.id for t in index.subscribers("scan.completed")}
+        other_subs = {t.id for t in index.subscribers("regulation.changed")}
+
+        assert scan_subs == {webhooks["scans"].id, webhooks["all"].id}
+        assert other_subs == {webhooks["all"].id}
+        assert index.get(webhooks["inactive"].id) is None
+        assert index.get(webhooks["all"].id).batch_events is True
+
+    async def test_cache_reuses_index_until_invalidated(self, db_session, webhooks):
+        cache = SubscriptionCache(redis_url=None)
+
+        first = await cache.get(db_session)
+        assert await cache.get(db_session) is first
+
+        webhooks["scans"].active = False
+        await db_session.flush()
+        await cache.invalidate()
+        reloaded = await cache.get(db_session)
+
+        assert reloaded is not first
+        assert reloaded.get(webhooks["scans"].id) is None
+
+    async def test_cache_expires_after_ttl(self, db_session, webhooks):
+        cache = SubscriptionCache(ttl_seconds=0, redis_url=None)
+
+        first = await cache.get(db_session)
+        assert await cache.get(db_session) is not first
+
+
+class TestWebhookDispatcher:
+    """Test event fan-out, coalescing and dead-lettering."""
+
+    async def test_plan_coalesces_only_for_opted_in_receivers(self, db_session, webhooks):
+        index = await SubscriptionIndex.load(db_session)
+        events = [build_event("scan.completed", {"n": i}) for i in range(5)]
+
+        plan = WebhookDispatcher(index, max_batch_size=2).plan(events)
+
+        to_scans = [p for t, p in plan if t.id == webhooks["scans"].id]
+        to_all = [p for t, p in plan if t.id == webhooks["all"].id]
+        assert len(to_scans) == 5
+        assert [p["event_type"] for p in to_all] == [BATCH_EVENT_TYPE] * 3
+        assert [len(p["events"]) for p in to_all] == [2, 2, 1]
+
+    async def test_dispatch_dead_letters_failures_and_flushes_counters(self, db_session, webhooks):
+        index = await SubscriptionIndex.load(db_session)
+        events = [build_event("scan.completed", {"n": i}) for i in range(3)]
+
+        async def fake_deliver(url, payload, **kwargs):
+            if "collector" in url:
+                return False, 503, "unavailable"
+            return True, 200, ""
+
+        with patch(
+            "app.services.webhooks.dispatcher.deliver", AsyncMock(side_effect=fake_deliver)
+        ) as deliver:
+            report = await WebhookDispatcher(index).dispatch(events)
+
+        assert deliver.await_count == 4
+        assert report.deliveries == 4
+        assert report.succeeded == 3
+        assert len(report.dead_letters) == 1
+        assert report.dead_letters[0].payload["event_type"] == BATCH_EVENT_TYPE
+
+        await report.persist(db_session)
+        await db_session.flush()
+        for record in webhooks.values():
+            await db_session.refresh(record)
+        letters = (await db_session.execute(select(WebhookDeadLetterRecord))).scalars().all()
+
+        assert webhooks["scans"].delivery_count == 3
+        assert webhooks["scans"].last_delivery_at is not None
+        assert webhooks["all"].failure_count == 1
+        assert webhooks["all"].last_delivery_at is None
+        assert [(dl.webhook_id, dl.status_code) for dl in letters] == [(webhooks["all"].id, 503)]
+
+    async def test_unsubscribed_event_sends_nothing(self, db_session, webhooks):
+        webhooks["all"].active = False
+        await db_session.flush()
+        index = await SubscriptionIndex.load(db_session)
+
+        with patch("app.services.webhooks.dispatcher.deliver", AsyncMock()) as deliver:
+            report = await WebhookDispatcher(index).dispatch(
+                [build_event("regulation.changed", {})]
+            )
+
+        deliver.assert_not_awaited()
+        assert report.deliveries == 0
+
+
+class TestDeliveryRetries:
+    """Test re-queueing of failed deliveries."""
+
+    def _report(self, webhooks):
+        report = DispatchReport()
+        for status_code in (503, 0, 410):
+            report.dead_letters.append(
+                DeadLetter(webhooks["all"].id, {"n": status_code}, "error", status_code, 3)
+            )
+        return report
+
+    async def test_transient_failures_are_requeued(self, webhooks):
+        report = self._report(webhooks)
+
+        with patch.object(redeliver, "apply_async") as apply_async:
+            retries = take_retries(report, retry_count=1)
+            schedule_retries(retries, retry_count=1)
+
+        assert retries == {webhooks["all"].id: [{"n": 503}, {"n": 0}]}
+        assert [letter.status_code for letter in report.dead_letters] == [410]
+        apply_async.assert_called_once_with(
+            kwargs={
+                "webhook_id": str(webhooks["all"].id),
+                "payloads": [{"n": 503}, {"n": 0}],
+                "retry_count": 2,
+            },
+            countdown=2,
+        )
+
+    async def test_exhausted_failures_stay_dead_lettered(self, webhooks):
+        report = self._report(webhooks)
+
+        retries = take_retries(report, retry_count=_MAX_RETRIES)
+
+        assert not retries
+        assert len(report.dead_letters) == 3
+
+    async def test_dead_letters_count_earlier_attempts(self, db_session, webhooks):
+        index = await SubscriptionIndex.load(db_session)
+        target = index.get(webhooks["scans"].id)
+
+        with patch(
+            "app.services.webhooks.dispatcher.deliver",
+            AsyncMock(return_value=(False, 503, "unavailable")),
+        ):
+            report = await WebhookDispatcher(index).deliver_all(
+                [(target, {"n": 1})], prior_attempts=6
+            )
+
+        assert report.dead_letters[0].attempts == 9
+
+
+class TestDeliveryTasks:
+    """Test that delivery tasks hold no database session while sending."""
+
+    @pytest.fixture
+    def open_sessions(self, db_session, monkeypatch):
+        """Sessions the tasks currently hold open, all backed by ``db_session``."""
+        sessions = []
+
+        @asynccontextmanager
+        async def session():
+            sessions.append(db_session)
+            try:
+                yield db_session
+                await db_session.flush()
+            finally:
+                sessions.pop()
+
+        cache = SubscriptionCache(redis_url=None)
+        monkeypatch.setattr(tasks_module, "get_db_context", session)
+        monkeypatch.setattr(tasks_module, "get_subscription_cache", lambda: cache)
+        return sessions
+
+    async def test_bursts_are_delivered_outside_a_session(
+        self, db_session, webhooks, open_sessions
+    ):
+        async def fake_deliver(url, payload, **kwargs):
+            assert not open_sessions
+            return True, 200, ""
+
+        with (
+            patch(
+                "app.services.webhooks.dispatcher.deliver", AsyncMock(side_effect=fake_deliver)
+            ) as deliver,
+        ):
+            result = await deliver_events.run.__wrapped__([build_event("scan.completed", {"n": 1})])
+        await db_session.refresh(webhooks["scans"])
+
+        assert deliver.await_count == 2
+        assert result["succeeded"] == 2
+        assert webhooks["scans"].delivery_count == 1
+
+    async def test_replayed_dead_letters_are_updated_after_delivery(
+        self, db_session, webhooks, open_sessions
+    ):
+        letters = [
+            WebhookDeadLetterRecord(
+                webhook_id=webhooks[name].id,
+                event_type="scan.completed",
+                payload={"name": name},
+                attempts=3,
+            )
+            for name in ("scans", "all")
+        ]
+        db_session.add_all(letters)
+        await db_session.flush()
+
+        async def fake_deliver(url, payload, **kwargs):
+            assert not open_sessions
+            if "collector" in url:
+                return False, 503, "unavailable"
+            return True, 200, ""
+
+        with (
+            patch("app.services.webhooks.dispatcher.deliver", AsyncMock(side_effect=fake_deliver)),
+        ):
+            result = await replay_dead_letters.run.__wrapped__()
+        for letter in letters:
+            await db_session.refresh(letter)
+
+        assert result == {"pending": 2, "replayed": 1}
+        assert letters[0].replayed_at is not None
+        assert letters[1].replayed_at is None
+        assert letters[1].attempts == 4
+        assert letters[1].status_code == 503
+
+
+class TestDeliveryStats:
+    """Test aggregated counter flushing."""
+
+    async def test_flush_adds_to_existing_counts(self, db_session, webhooks):
+        record = webhooks["scans"]
+        record.delivery_count = 10
+        await db_session.flush()
+
+        stats = DeliveryStats()
+        for success in (True, True, False):
+            stats.record(record.id, success)
+        await stats.flush(db_session)
+        await db_session.refresh(record)
+
+        assert record.delivery_count == 12
+        assert record.failure_count == 1
+        assert not stats.delivered
@@ -0,0 +1,193 @@
+"""Tests for keyset (cursor) pagination."""
+
+import uuid
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import Date, DateTime, String, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from app.core.pagination import (
+    CountMode,
+    CursorError,
+    Pagination,
+    SortKey,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    keyset_paginate,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class Event(_Base):
+    __tablename__ = "pagination_events"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    kind: Mapped[str] = mapped_column(String(20))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    due: Mapped[date | None] = mapped_column(Date, nullable=True)
+
+
+EVENT_KEYS = [SortKey(Event.created_at), SortKey(Event.id)]
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(_Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        start = datetime(2026, 1, 1, tzinfo=UTC)
+        for i in range(25):
+            db.add(
+                Event(
+                    kind="even" if i % 2 == 0 else "odd",
+                    # Every timestamp is shared by three rows so the id tiebreak matters
+                    created_at=start + timedelta(minutes=i // 3),
+                    due=None if i % 4 == 0 else date(2026, 2, 1 + i % 5),
+                )
+            )
+        await db.commit()
+        yield db
+    await engine.dispose()
+
+
+async def _walk(db: AsyncSession, keys: list[SortKey], limit: int) -> list[uuid.UUID]:
+    seen: list[uuid.UUID] = []
+    cursor = None
+    while True:
+        page = await keyset_paginate(
+            db, select(Event), keys, scope="events", limit=limit, cursor=cursor
+        )
+        seen.extend(row.id for row in page.items)
+        if page.next_cursor is None:
+            return seen
+        cursor = page.next_cursor
+
+
+class TestCursorCodec:
+    """Test cursor signing and decoding."""
+
+    def test_round_trip_preserves_types(self):
+        values = [datetime(2026, 3, 1, 12, tzinfo=UTC), date(2026, 3, 1), uuid.uuid4(), None, 7]
+
+        assert decode_cursor(encode_cursor("events", values), "events", 5) == values
+
+    def test_tampered_cursor_is_rejected(self):
+        payload, signature = encode_cursor("events", [1]).split(".")
+        forged = encode_cursor("events", [2]).split(".")[0]
+
+        with pytest.raises(CursorError, match="signature"):
+            decode_cursor(f"{forged}.{signature}", "events", 1)
+        with pytest.raises(CursorError, match="Malformed"):
+            decode_cursor(payload, "events", 1)
+
+    def test_cursor_is_bound_to_its_listing(self):
+        with pytest.raises(CursorError, match="belong"):
+            decode_cursor(encode_cursor("events", [1, 2]), "actions", 2)
+
+
+class TestKeysetPaginate:
+    """Test page walks against a real database."""
+
+    async def test_walk_matches_full_ordering(self, session):
+        expected = [
+            row.id
+            for row in (
+                await session.execute(
+                    select(Event).order_by(Event.created_at.desc(), Event.id.desc())
+                )
+            ).scalars()
+        ]
+
+        assert await _walk(session, EVENT_KEYS, limit=4) == expected
+
+    async def test_nullable_key_sorts_nulls_last(self, session):
+        keys = [SortKey(Event.due, nullable=True), SortKey(Event.id, descending=False)]
+
+        ids = await _walk(session, keys, limit=3)
+        rows = {row.id: row for row in (await session.execute(select(Event))).scalars()}
+        dues = [rows[i].due for i in ids]
+
+        assert len(set(ids)) == 25
+        assert dues[-7:] == [None] * 7
+        assert dues[:-7] == sorted(dues[:-7], reverse=True)
+
+    async def test_offset_first_page_returns_cursor_for_the_rest(self, session):
+        first = await keyset_paginate(
+            session, select(Event), EVENT_KEYS, scope="events", limit=5, skip=20
+        )
+        rest = await keyset_paginate(
+            session,
+            select(Event),
+            EVENT_KEYS,
+            scope="events",
+            limit=5,
+            cursor=encode_cursor("events", [first.items[-1].created_at, first.items[-1].id]),
+        )
+
+        assert len(first.items) == 5
+        assert first.next_cursor is None
+        assert rest.items == []
+
+    async def test_failed_estimate_leaves_the_session_usable(self, session, monkeypatch):
+        # EXPLAIN (FORMAT JSON) fails here as it would on a broken plan
+        monkeypatch.setattr(session.bind.dialect, "name", "postgresql")
+        query = select(Event).where(Event.kind == "even")
+
+        assert await count_rows(session, query, CountMode.ESTIMATED) == 13
+        assert len((await session.execute(select(Event))).scalars().all()) == 25
+
+
+class TestPaginationDependency:
+    """Test headers produced for list endpoints."""
+
+    @pytest_asyncio.fixture
+    async def client(self, session):
+        app = FastAPI()
+
+        @app.get("/events")
+        async def list_events(page: Pagination, kind: str | None = None) -> list[str]:
+            query = select(Event)
+            if kind:
+                query = query.where(Event.kind == kind)
+            result = await page.fetch(session, query, EVENT_KEYS, scope="events")
+            return [str(row.id) for row in result.items]
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            yield ac
+
+    async def test_link_header_pages_through_results(self, client):
+        response = await client.get("/events", params={"kind": "odd", "limit": 5, "count": "exact"})
+        seen = response.json()
+
+        assert response.headers["X-Total-Count"] == "12"
+        while "Link" in response.headers:
+            href = response.headers["Link"].split(">")[0].lstrip("<")
+            assert "kind=odd" in href
+            response = await client.get(href)
+            seen += response.json()
+
+        assert len(seen) == len(set(seen)) == 12
+
+    async def test_invalid_cursor_is_a_client_error(self, client):
+        response = await client.get("/events", params={"cursor": "bogus.cursor"})
+
+        assert response.status_code == 400
+
+    async def test_estimated_count_falls_back_to_exact_off_postgres(self, client):
+        response = await client.get("/events", params={"count": "estimated"})
+
+        assert response.headers["X-Total-Count"] == "25"
+        assert response.headers["X-Total-Count-Mode"] == "estimated"
@@ -0,0 +1,138 @@
+"""Tests for the persistent Celery worker runtime."""
+
+import asyncio
+import threading
+
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+
+from app.core.http import get_shared_http_client, get_shared_http_transport
+from app.workers import runtime as runtime_module
+from app.workers.runtime import WorkerRuntime, async_task, run_async
+
+
+@pytest.fixture
+def worker_runtime(monkeypatch):
+    rt = WorkerRuntime()
+    monkeypatch.setattr(runtime_module, "_runtime", rt)
+    yield rt
+    rt.stop()
+
+
+async def _current_loop():
+    return asyncio.get_running_loop()
+
+
+class TestWorkerRuntime:
+    def test_reuses_one_loop_across_tasks(self, worker_runtime):
+        first = run_async(_current_loop())
+        second = run_async(_current_loop())
+
+        assert first is second
+        assert worker_runtime.running
+
+    def test_runs_off_the_calling_thread(self, worker_runtime):
+        async def thread_name():
+            return threading.current_thread().name
+
+        assert run_async(thread_name()) == "worker-event-loop"
+
+    def test_exceptions_propagate(self, worker_runtime):
+        async def boom():
+            raise ValueError("bad payload")
+
+        with pytest.raises(ValueError, match="bad payload"):
+            run_async(boom())
+        assert run_async(_current_loop()) is not None
+
+    def test_concurrent_tasks_interleave_on_loop(self, worker_runtime):
+        barrier = threading.Barrier(2)
+        entered: list[str] = []
+
+        async def wait_for_peer(name):
+            entered.append(name)
+            while len(entered) < 2:
+                await asyncio.sleep(0.01)
+            return name
+
+        def task(name, out):
+            barrier.wait()
+            out.append(run_async(wait_for_peer(name)))
+
+        results: list[str] = []
+        threads = [threading.Thread(target=task, args=(n, results)) for n in ("a", "b")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+
+        assert sorted(results) == ["a", "b"]
+
+    def test_shared_http_pool_lifecycle(self, worker_runtime):
+        worker_runtime.start()
+        assert get_shared_http_client() is worker_runtime.http_client
+        assert get_shared_http_transport() is not None
+
+        worker_runtime.stop()
+        assert not worker_runtime.running
+        assert get_shared_http_client() is None
+        assert get_shared_http_transport() is None
+
+    def test_timeout_cancels_coroutine(self, worker_runtime):
+        cancelled = threading.Event()
+
+        async def hang():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(TimeoutError):
+            worker_runtime.run(hang(), timeout=0.05)
+        assert cancelled.wait(5)
+
+    def test_interrupted_wait_cancels_coroutine(self, worker_runtime, monkeypatch):
+        worker_runtime.start()
+        cancelled = threading.Event()
+        submit = asyncio.run_coroutine_threadsafe
+
+        def interrupted(coro, loop):
+            future = submit(coro, loop)
+
+            def result(timeout=None):
+                raise SoftTimeLimitExceeded
+
+            future.result = result
+            return future
+
+        async def hang():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        monkeypatch.setattr(runtime_module.asyncio, "run_coroutine_threadsafe", interrupted)
+        with pytest.raises(SoftTimeLimitExceeded):
+            worker_runtime.run(hang())
+        assert cancelled.wait(5)
+
+    def test_rejects_nested_run_from_loop(self, worker_runtime):
+        async def nested():
+            return worker_runtime.run(_current_loop())
+
+        with pytest.raises(RuntimeError, match="worker event loop"):
+            run_async(nested())
+
+
+class TestAsyncTask:
+    def test_registers_bound_coroutine_task(self, worker_runtime):
+        @async_task(name="tests.worker_runtime.echo", bind=True)
+        async def echo(self, value):
+            await asyncio.sleep(0)
+            return f"{self.name}:{value}"
+
+        assert echo.name == "tests.worker_runtime.echo"
+        assert echo("ping") == "tests.worker_runtime.echo:ping"
+        assert echo.apply(args=("pong",)).get() == "tests.worker_runtime.echo:pong"